@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Benchmark: admin booking stats, five queries vs one aggregate vs the stats row.
+
+Fills a throwaway test database (never the project database) with bookings
+spread over flights and payment statuses, then times the three ways of
+answering GET /api/admin/booking-stats/: the previous four counts plus a
+revenue aggregate, the single conditional aggregate the nightly recount
+uses, and the read of the materialized BookingStats row. Run from the
+backend directory:
+
+    python benchmarks/bench_booking_stats.py [bookings] [repeats]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Sum  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+
+from booking.booking_stats import compute_booking_stats, get_booking_stats  # noqa: E402
+from booking.models import Booking, CustomUser, Flight  # noqa: E402
+
+
+def five_queries():
+    return {
+        'total_bookings': Booking.objects.count(),
+        'paid_bookings': Booking.objects.filter(payment_status='paid').count(),
+        'pending_bookings': Booking.objects.filter(payment_status='pending').count(),
+        'failed_bookings': Booking.objects.filter(payment_status='failed').count(),
+        'total_revenue': Booking.objects.filter(payment_status='paid').aggregate(total=Sum('flight__price'))['total'] or 0,
+    }
+
+
+def fill(bookings):
+    user = CustomUser.objects.create_user(username='bench', password='testpass123', status='approved')
+    flights = Flight.objects.bulk_create([
+        Flight(flight_number=f"BS{i}", departure='London', arrival='Paris',
+               date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=50 + i)
+        for i in range(100)
+    ])
+    statuses = ['paid'] * 15 + ['pending'] * 4 + ['failed']
+    Booking.objects.bulk_create([
+        Booking(user=user, flight=flights[i % len(flights)], payment_status=statuses[i % len(statuses)])
+        for i in range(bookings)
+    ], batch_size=5000)
+
+
+def timed(label, func, repeats):
+    func()  # warm up
+    with CaptureQueriesContext(connection) as queries:
+        result = func()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    elapsed = (time.perf_counter() - started) / repeats
+    print(f"{label:<28} {len(queries):>8} {elapsed * 1000:>12.3f}ms")
+    return result
+
+
+def main():
+    bookings = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        fill(bookings)
+        print("=" * 80)
+        print(f"Admin booking stats over {bookings} bookings ({connection.vendor})")
+        print("=" * 80)
+        print(f"{'method':<28} {'queries':>8} {'per request':>14}")
+        before = timed('five queries', five_queries, repeats)
+        single = timed('one conditional aggregate', compute_booking_stats, repeats)
+        row = timed('materialized row', get_booking_stats, repeats)
+        assert before == single == row, (before, single, row)
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
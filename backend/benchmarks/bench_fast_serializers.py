@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Benchmark: DRF serializers vs the .values() fast path for list endpoints.
+
+Fills a throwaway test database (never the project database) with flights
+and bookings, then measures rows/sec through FlightSerializer/BookingSerializer and
+through FastFlightSerializer/FastBookingSerializer, both for serialization
+alone (rows already fetched) and end to end (query included). Run from the backend
+directory:
+
+    python benchmarks/bench_fast_serializers.py [rows]
+"""
+import gc
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+
+from booking.fast_serializers import FastBookingSerializer, FastFlightSerializer  # noqa: E402
+from booking.models import Booking, CustomUser, Flight  # noqa: E402
+from booking.serializers import BookingSerializer, FlightSerializer  # noqa: E402
+
+CITIES = ['London', 'Paris', 'New York', 'Tokyo', 'Dubai', 'Chicago', 'Madrid', 'Rome']
+
+
+def populate(rows):
+    start = datetime(2031, 1, 1, tzinfo=timezone.utc)
+    user = CustomUser.objects.create_user(username='bench', password='x', status='approved')
+    flights = []
+    for i in range(rows):
+        flight = Flight(flight_number=f"BF{i}", departure=CITIES[i % 8], arrival=CITIES[(i * 3 + 1) % 8],
+                        date=start + timedelta(minutes=37 * i), price='199.90')
+        flight.resolve_route()
+        flights.append(flight)
+    Flight.objects.bulk_create(flights, batch_size=5000)
+    Booking.objects.bulk_create([Booking(user=user, flight=flight) for flight in Flight.objects.all()], batch_size=5000)
+
+
+def rate(label, produce, rows, repeat=5):
+    produce()
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        produce()
+    per_second = rows * repeat / (time.perf_counter() - started)
+    print(f"  {label:<28} {per_second:>12,.0f} rows/s")
+    return per_second
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        populate(rows)
+        print("=" * 80)
+        print(f"List serialization throughput ({rows} rows)")
+        print("=" * 80)
+
+        flights = Flight.objects.order_by('-date', '-id')
+        bookings = Booking.objects.select_related('user', 'flight').order_by('-created_at', '-id')
+        for label, queryset, drf, fast_class in (
+            ('Flights', flights, FlightSerializer, FastFlightSerializer),
+            ('Bookings', bookings, BookingSerializer, FastBookingSerializer),
+        ):
+            instances = list(queryset.all())
+            values = list(fast_class(context={}).values(queryset.all()))
+
+            print(f"\n{label}: serialization only")
+            slow = rate('DRF serializer', lambda: drf(instances, many=True).data, rows)
+            quick = rate('.values() fast path', lambda: fast_class(context={}).serialize(values), rows)
+            print(f"  speed-up {quick / slow:.1f}x")
+
+            print(f"{label}: query + serialization")
+            slow = rate('DRF serializer', lambda: drf(queryset.all(), many=True).data, rows)
+
+            def fast_path():
+                fast = fast_class(context={})
+                return fast.serialize(fast.values(queryset.all()))
+            quick = rate('.values() fast path', fast_path, rows)
+            print(f"  speed-up {quick / slow:.1f}x")
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
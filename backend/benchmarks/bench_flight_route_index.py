@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Benchmark: local Flight search with substring/date__date filters vs the
+indexed (origin_iata, destination_iata, date) columns.
+
+Creates a throwaway test database (never the project database), fills it
+with synthetic flights and prints the query plan and timing for each
+predicate style. Use 5000000 rows to reproduce the production-sized run;
+on PostgreSQL the count query becomes an Index Only Scan after VACUUM, on
+SQLite a COVERING INDEX search. Run from the backend directory:
+
+    python benchmarks/bench_flight_route_index.py [rows]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+
+from booking.iata_utils import CITY_TO_IATA  # noqa: E402
+from booking.models import Flight  # noqa: E402
+
+BATCH_SIZE = 10000
+ROUTE_CITIES = sorted({city.title() for city in CITY_TO_IATA if len(city) > 3})[:20]
+
+
+def populate(rows, rng):
+    start = datetime(2031, 1, 1, tzinfo=timezone.utc)
+    codes = {city: CITY_TO_IATA[city.lower()] for city in ROUTE_CITIES}
+    batch = []
+    for i in range(rows):
+        departure, arrival = rng.sample(ROUTE_CITIES, 2)
+        batch.append(Flight(
+            flight_number=f"B{i}", departure=departure, arrival=arrival,
+            origin_iata=codes[departure], destination_iata=codes[arrival],
+            date=start + timedelta(minutes=rng.randrange(90 * 24 * 60)), price=100,
+        ))
+        if len(batch) == BATCH_SIZE:
+            Flight.objects.bulk_create(batch)
+            batch = []
+    Flight.objects.bulk_create(batch)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def timed(queryset, repeat=20):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = queryset.count()
+    return result, (time.perf_counter() - started) / repeat
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = random.Random(16)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        started = time.perf_counter()
+        populate(rows, rng)
+        print("=" * 80)
+        print(f"Flight route index benchmark ({rows} rows on {connection.vendor}, "
+              f"loaded in {time.perf_counter() - started:.1f} s)")
+        print("=" * 80)
+
+        day = date(2031, 2, 1)
+        day_start = datetime(2031, 2, 1, tzinfo=timezone.utc)
+        departure, arrival = ROUTE_CITIES[0], ROUTE_CITIES[1]
+        substring = Flight.objects.filter(
+            departure__icontains=departure, arrival__icontains=arrival, date__date=day
+        )
+        indexed = Flight.objects.filter(
+            origin_iata=CITY_TO_IATA[departure.lower()], destination_iata=CITY_TO_IATA[arrival.lower()],
+            date__gte=day_start, date__lt=day_start + timedelta(days=1),
+        )
+        for label, queryset in (('icontains + date__date', substring), ('route columns + day range', indexed)):
+            count, seconds = timed(queryset)
+            print(f"\n{label}: {count} rows, {seconds * 1e3:.2f} ms/query")
+            print('  plan (ids):   ' + queryset.only('id').explain().replace('\n', '\n                ')[:400])
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Benchmark: geohash cell cache for nearby-airport and hotel geocode searches.
+
+Simulates users clustered around airports and city centres (a few km of
+jitter), then reports the cell hit ratio, nearby-airport time per request
+with and without the cache, and how many hotel provider calls the cache
+saves. Run from the backend directory:
+
+    python benchmarks/bench_geo_cache.py [requests]
+"""
+import os
+import random
+import sys
+import time
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+
+from booking.geo_cache import hotel_geocode_cache, nearby_airports_cache  # noqa: E402
+from booking.iata_utils import IATA_INFO, find_nearby_airports  # noqa: E402
+from booking.views_gps import cached_nearby_airports  # noqa: E402
+
+
+def clustered_points(count, rng, hotspots=40, jitter_deg=0.02):
+    seeds = rng.sample(list(IATA_INFO.values()), hotspots)
+    return [
+        (seed['lat'] + rng.gauss(0, jitter_deg), seed['lon'] + rng.gauss(0, jitter_deg))
+        for seed in (rng.choice(seeds) for _ in range(count))
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(14)
+    points = clustered_points(count, rng)
+    cache.clear()
+
+    print("=" * 80)
+    print(f"Geohash cell cache benchmark ({count} requests around 40 hotspots, precision "
+          f"{nearby_airports_cache.precision})")
+    print("=" * 80)
+
+    started = time.perf_counter()
+    direct = [find_nearby_airports(lat, lon, limit=5, max_distance=500) for lat, lon in points]
+    direct_time = time.perf_counter() - started
+
+    nearby_airports_cache.stats.reset()
+    nearby_airports_cache.clear_local()
+    started = time.perf_counter()
+    cached = [cached_nearby_airports(lat, lon, 5, 500) for lat, lon in points]
+    cached_time = time.perf_counter() - started
+    assert cached == direct, 'cached results differ from direct searches'
+    report = nearby_airports_cache.report()
+
+    print("\nNearby airports (limit 5, 500 km)")
+    print(f"  direct KD-tree search   {direct_time / count * 1e6:9.1f} us/request")
+    print(f"  geohash cell cache      {cached_time / count * 1e6:9.1f} us/request   "
+          f"hit ratio {report['hit_ratio']:.1%}")
+    print("  results identical to direct search")
+
+    provider_calls = []
+
+    def fake_hotel_search(centre_lat, centre_lon, radius):
+        provider_calls.append((centre_lat, centre_lon))
+        return {'data': [{'hotel': {'latitude': centre_lat, 'longitude': centre_lon}}]}
+
+    hotel_geocode_cache.stats.reset()
+    for lat, lon in points:
+        hotel_geocode_cache.get_or_fetch(lat, lon, 50, fake_hotel_search, '2030-05-01', '2030-05-03', 1)
+    print("\nHotel geocode searches (50 km)")
+    print(f"  provider calls: {len(provider_calls)} of {count} requests "
+          f"({1 - len(provider_calls) / count:.1%} saved), hit ratio "
+          f"{hotel_geocode_cache.report()['hit_ratio']:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Benchmark: city -> IATA resolution before and after fuzzy matching.
+
+Times get_iata_code_fuzzy on exact hits (must not get slower), compares a
+full-vocabulary edit-distance scan with the SymSpell index on misspelt
+names, and shows the LRU memo on repeated misspellings. Run from the
+backend directory:
+
+    python benchmarks/bench_iata_resolver.py [iterations]
+"""
+import os
+import random
+import sys
+import time
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from booking.airport_snapshot import get_snapshot  # noqa: E402
+from booking.fuzzy_match import edit_distance, fold  # noqa: E402
+from booking.iata_utils import CITY_TO_IATA, get_iata_code_fuzzy  # noqa: E402
+
+
+def exact_only(city_name):
+    """Exact lookup, as get_iata_code does."""
+    if not city_name:
+        return None
+    normalized = str(city_name).strip().upper()
+    if len(normalized) == 3 and normalized.isalpha():
+        return normalized
+    normalized_lower = str(city_name).strip().lower()
+    if normalized_lower in CITY_TO_IATA:
+        return CITY_TO_IATA[normalized_lower]
+    if 'international' in normalized_lower:
+        city_without_intl = normalized_lower.replace(' international', '').strip()
+        if city_without_intl in CITY_TO_IATA:
+            return CITY_TO_IATA[city_without_intl]
+    return None
+
+
+def scan_fuzzy(city_name, vocabulary):
+    query = fold(city_name)
+    best = min(vocabulary, key=lambda term: edit_distance(query, term, 2))
+    return vocabulary[best] if edit_distance(query, best, 2) <= 2 else None
+
+
+def misspell(word, rng):
+    i = rng.randrange(len(word))
+    return word[:i] + word[i + 1:] if rng.random() < 0.5 else word[:i] + rng.choice('aeiourst') + word[i:]
+
+
+def timed(label, fn, inputs, iterations, baseline=None):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for value in inputs:
+            fn(value)
+    per_call = (time.perf_counter() - started) / (iterations * len(inputs))
+    speedup = f"{baseline / per_call:8.1f}x" if baseline else ''
+    print(f"  {label:<38} {per_call * 1e6:9.2f} us/call {speedup}")
+    return per_call
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(12)
+    names = [name.title() for name in CITY_TO_IATA if len(name) >= 6]
+    typos = [misspell(name, rng) for name in names]
+    snapshot = get_snapshot()
+    vocabulary = snapshot._city_vocabulary()
+
+    print("=" * 80)
+    print(f"City -> IATA resolution ({len(names)} names, {len(vocabulary)} fuzzy terms)")
+    print("=" * 80)
+
+    print("\nExact hits")
+    before = timed('exact lookup (original)', exact_only, names, iterations)
+    after = timed('get_iata_code_fuzzy', get_iata_code_fuzzy, names, iterations, before)
+    print(f"  overhead on exact hits: {(after - before) * 1e9:+.0f} ns/call")
+
+    print("\nMisspelt names (uncached)")
+    scan = timed('full edit-distance scan', lambda v: scan_fuzzy(v, vocabulary), typos, 1)
+    timed('SymSpell index', lambda v: snapshot.city_index.lookup(v), typos, max(iterations // 10, 1), scan)
+    snapshot.fuzzy_iata_code.cache_clear()
+    timed('get_iata_code_fuzzy, first call', get_iata_code_fuzzy, typos, 1, scan)
+    timed('get_iata_code_fuzzy, memoised', get_iata_code_fuzzy, typos, iterations, scan)
+
+    resolved = sum(get_iata_code_fuzzy(t) == CITY_TO_IATA[n.lower()] for t, n in zip(typos, names))
+    print(f"\nResolved {resolved}/{len(typos)} misspellings to the intended airport "
+          f"(original: {sum(exact_only(t) is not None for t in typos)}).")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Benchmark: looping get_nearest_airport vs one vectorized AirportTable batch.
+
+Resolves the same coordinates three ways and reports points per second:
+the original per-point haversine scan, per-point KD-tree lookups (what
+get_nearest_airport does now), and a single AirportTable.nearest call as
+used by POST /api/airports/nearest/batch/. Run from the backend directory:
+
+    python benchmarks/bench_nearest_batch.py [points]
+"""
+import os
+import random
+import sys
+import time
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from booking.airport_table import AirportTable  # noqa: E402
+from booking.iata_utils import IATA_INFO, calculate_distance  # noqa: E402
+from booking.spatial_index import AirportSpatialIndex  # noqa: E402
+
+
+def scan_nearest(airports, latitude, longitude, max_distance=500):
+    best = None
+    for code, info in airports.items():
+        distance = calculate_distance(latitude, longitude, info['lat'], info['lon'])
+        if distance <= max_distance and (best is None or distance < best[0]):
+            best = (distance, code)
+    return best[1] if best else None
+
+
+def synthetic_airports(count, rng):
+    seeds = list(IATA_INFO.values())
+    return {
+        f"X{i:06d}": {
+            'lat': max(min(seeds[i % len(seeds)]['lat'] + rng.gauss(0, 3), 90), -90),
+            'lon': (seeds[i % len(seeds)]['lon'] + rng.gauss(0, 3) + 180) % 360 - 180,
+        }
+        for i in range(count)
+    }
+
+
+def rate(label, elapsed, count, baseline=None):
+    speedup = f"{baseline / elapsed:8.1f}x" if baseline else ''
+    print(f"  {label:<32} {elapsed * 1000:9.1f} ms  {count / elapsed:12,.0f} points/s {speedup}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(11)
+    seeds = list(IATA_INFO.values())
+    points = [
+        (seed['lat'] + rng.gauss(0, 2), seed['lon'] + rng.gauss(0, 2))
+        for seed in (seeds[rng.randrange(len(seeds))] for _ in range(count))
+    ]
+    latitudes = [lat for lat, _ in points]
+    longitudes = [lon for _, lon in points]
+
+    print("=" * 80)
+    print(f"Batch nearest-airport benchmark ({count} points, k=1 within 500 km)")
+    print("=" * 80)
+    for label, airports in (('IATA_INFO', IATA_INFO), ('10k synthetic', synthetic_airports(10_000, rng))):
+        print(f"\n{label} ({len(airports)} airports)")
+        scan_points = points[:max(count // 20, 50)] if len(airports) > 1000 else points
+        started = time.perf_counter()
+        expected = [scan_nearest(airports, lat, lon) for lat, lon in scan_points]
+        scan_time = (time.perf_counter() - started) * count / len(scan_points)
+        rate('loop: full scan (original)', scan_time, count)
+
+        index = AirportSpatialIndex(airports, calculate_distance)
+        started = time.perf_counter()
+        kd = [index.nearest(lat, lon, 1, 500) for lat, lon in points]
+        kd_time = time.perf_counter() - started
+        rate('loop: KD-tree (current)', kd_time, count, scan_time)
+
+        table = AirportTable(airports)
+        started = time.perf_counter()
+        indices, _ = table.nearest(latitudes, longitudes, k=1, max_distance=500)
+        batch_time = time.perf_counter() - started
+        rate('batch: AirportTable', batch_time, count, scan_time)
+
+        batch_codes = [table.codes[i] if i >= 0 else None for i in indices[:, 0].tolist()]
+        assert batch_codes[:len(expected)] == expected, 'batch results differ from the scan'
+        assert batch_codes == [r[0][1] if r else None for r in kd], 'batch results differ from the KD-tree'
+        print(f"  batch vs KD-tree loop: {kd_time / batch_time:.1f}x")
+    print("\nBatch results were identical to both per-point methods.")
+
+
+if __name__ == '__main__':
+    main()
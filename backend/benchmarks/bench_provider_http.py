@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Benchmark: per-call requests.get vs the shared pooled provider session.
+
+Starts a local keep-alive stub server and issues the same number of
+requests both ways, reporting wall time and how many TCP connections the
+server had to accept. Run from the backend directory:
+
+    python benchmarks/bench_provider_http.py [requests]
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+import requests  # noqa: E402
+from booking.provider_http import provider_http  # noqa: E402
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; avoid Nagle + delayed-ACK stalls
+    disable_nagle_algorithm = True
+    body = b'{"data": []}'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections += 1
+        return request
+
+
+def run(label, call, url, count, server):
+    server.connections = 0
+    started = time.perf_counter()
+    for _ in range(count):
+        call(url, timeout=5).content
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms total  {elapsed / count * 1e6:8.1f} us/call  "
+          f"{server.connections:5d} TCP connections")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    server = CountingServer(('127.0.0.1', 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v2/shopping/flight-offers"
+
+    print("=" * 80)
+    print(f"Provider HTTP benchmark ({count} sequential GETs against a local stub)")
+    print("=" * 80)
+    run('requests.get (new conn)', requests.get, url, count, server)
+    run('provider_http.get (pooled)', provider_http.get, url, count, server)
+    print("\nOver TLS, every avoided connection also saves a full TLS handshake.")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
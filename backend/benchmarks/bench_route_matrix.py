@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Benchmark: route matrix lookups vs per-row haversine for flight durations.
+
+Serializes a list of unsaved flights between random built-in airports with
+FlightSerializer (duration and arrival from the matrix), and compares the
+raw pair lookup against computing calculate_distance for every row. Also
+reports the build time and on-disk size of the memory-mapped matrix.
+Run from the backend directory:
+
+    python benchmarks/bench_route_matrix.py [flights]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from django.test import override_settings  # noqa: E402
+
+from booking.airport_snapshot import get_snapshot  # noqa: E402
+from booking.iata_utils import calculate_distance  # noqa: E402
+from booking.models import Flight  # noqa: E402
+from booking.route_matrix import (  # noqa: E402
+    MATRIX_FILE, block_minutes, build_matrix_file, get_route_matrix, reset_route_matrix,
+)
+from booking.serializers import FlightSerializer  # noqa: E402
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(15)
+    snapshot = get_snapshot()
+    codes = list(snapshot.located())
+    pairs = [tuple(rng.sample(codes, 2)) for _ in range(count)]
+
+    print("=" * 80)
+    print(f"Route matrix benchmark ({count} flights over {len(codes)} airports)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as directory, override_settings(ROUTE_MATRIX_DIR=directory):
+        started = time.perf_counter()
+        build_matrix_file(snapshot, directory)
+        build_time = time.perf_counter() - started
+        size = os.path.getsize(os.path.join(directory, MATRIX_FILE))
+        reset_route_matrix()
+        matrix = get_route_matrix()
+        print(f"\nBuild: {build_time * 1e3:.1f} ms, {size / 1024:.1f} KiB on disk, loaded from {matrix.source}")
+
+        started = time.perf_counter()
+        for origin, destination in pairs:
+            a, b = snapshot.info(origin), snapshot.info(destination)
+            block_minutes(calculate_distance(a['lat'], a['lon'], b['lat'], b['lon']))
+        haversine_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for origin, destination in pairs:
+            matrix.block_minutes(origin, destination)
+        matrix_time = time.perf_counter() - started
+
+        print("\nBlock time per pair")
+        print(f"  haversine per row       {haversine_time / count * 1e6:9.2f} us")
+        print(f"  matrix lookup           {matrix_time / count * 1e6:9.2f} us")
+
+        departure = datetime(2030, 5, 1, 9, 30)
+        flights = [
+            Flight(flight_number=f"BM{i}", departure=snapshot.city_name(origin), arrival=snapshot.city_name(destination),
+                   date=departure, price=100)
+            for i, (origin, destination) in enumerate(pairs)
+        ]
+        started = time.perf_counter()
+        FlightSerializer(flights, many=True).data
+        serialize_time = time.perf_counter() - started
+        print(f"\nFlightSerializer: {serialize_time / count * 1e6:.1f} us/flight")
+        reset_route_matrix()
+
+
+if __name__ == '__main__':
+    main()
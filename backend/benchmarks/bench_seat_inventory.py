@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""
+Benchmark: hundreds of concurrent bookings against one flight's seat counter.
+
+Fills a throwaway test database (never the project database), opens a
+cabin with fewer seats than there are buyers and fires POST /api/bookings/
+from many threads at once, each request as a different user. Reports
+throughput, bookings created, 409 refusals and oversell (bookings beyond
+the cabin's seats), which must be zero.
+
+The same race is then run on the model layer alone, once through
+reserve_seats and once with a naive read-check-write counter
+(read seats_left, test it, save the decrement), which is what the
+conditional UPDATE replaces: it loses updates and oversells. On SQLite the
+test database is a temporary file so that threads really share it. Run
+from the backend directory:
+
+    python benchmarks/bench_seat_inventory.py [buyers] [seats] [threads]
+"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection, connections, transaction  # noqa: E402
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from booking.exceptions import SeatsUnavailableException  # noqa: E402
+from booking.models import Booking, CustomUser, Flight, SeatInventory  # noqa: E402
+from booking.seat_inventory import open_cabin, reserve_seats  # noqa: E402
+
+
+def use_file_database(directory):
+    # An in-memory SQLite test database is not safely shared between threads
+    settings_dict = connections['default'].settings_dict
+    if settings_dict['ENGINE'].endswith('sqlite3'):
+        settings_dict['TEST']['NAME'] = os.path.join(directory, 'bench_seats.sqlite3')
+        settings_dict.setdefault('OPTIONS', {})['timeout'] = 60
+
+
+def make_flight(number, seats):
+    flight = Flight.objects.create(
+        flight_number=number, departure='London', arrival='Paris',
+        date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+    )
+    open_cabin(flight, 'ECONOMY', seats)
+    return flight
+
+
+def make_users(buyers):
+    CustomUser.objects.bulk_create([
+        CustomUser(username=f"buyer{i}", email=f"buyer{i}@example.com", status='approved')
+        for i in range(buyers)
+    ], batch_size=1000)
+    return list(CustomUser.objects.filter(username__startswith='buyer').order_by('id'))
+
+
+def run_concurrently(task, items, threads):
+    """Run ``task(item)`` for every item from ``threads`` threads released together."""
+    barrier = threading.Barrier(threads)
+
+    def worker(chunk):
+        barrier.wait()
+        try:
+            return [task(item) for item in chunk]
+        finally:
+            connection.close()
+
+    chunks = [items[i::threads] for i in range(threads)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = [result for chunk in pool.map(worker, chunks) for result in chunk]
+    return results, time.perf_counter() - started
+
+
+def book_through_api(flight):
+    def book(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post('/api/bookings/', {'flight_id': flight.id}, format='json').status_code
+    return book
+
+
+def book_directly(flight):
+    def book(user):
+        try:
+            with transaction.atomic():
+                reserve_seats(flight.id, 'ECONOMY')
+                Booking.objects.create(user=user, flight=flight)
+        except SeatsUnavailableException:
+            return 409
+        return 201
+    return book
+
+
+def book_naively(flight):
+    def book(user):
+        inventory = SeatInventory.objects.get(flight=flight, cabin='ECONOMY')
+        if inventory.seats_left <= 0:
+            return 409
+        inventory.seats_left -= 1
+        with transaction.atomic():
+            inventory.save(update_fields=['seats_left'])
+            Booking.objects.create(user=user, flight=flight)
+        return 201
+    return book
+
+
+def report(label, flight, seats, statuses, elapsed):
+    created = Booking.objects.filter(flight=flight).count()
+    left = SeatInventory.objects.get(flight=flight).seats_left
+    other = len(statuses) - statuses.count(201) - statuses.count(409)
+    print(f"{label:<28} {len(statuses) / elapsed:>9.0f}/s {created:>8} {statuses.count(409):>6} "
+          f"{other:>6} {left:>6} {max(created - seats, 0):>9}")
+
+
+def main():
+    buyers = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    seats = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    logging.disable(logging.WARNING)  # one log line per refused request
+    with tempfile.TemporaryDirectory() as directory:
+        use_file_database(directory)
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            users = make_users(buyers)
+            print("=" * 80)
+            print(f"{buyers} buyers, {seats} seats, {threads} threads ({connection.vendor})")
+            print("=" * 80)
+            print(f"{'counter':<28} {'throughput':>11} {'created':>8} {'409':>6} {'other':>6} {'left':>6} {'oversold':>9}")
+
+            flight = make_flight('BENCH1', seats)
+            statuses, elapsed = run_concurrently(book_through_api(flight), users, threads)
+            report('conditional UPDATE (API)', flight, seats, statuses, elapsed)
+            cache.clear()  # booking throttle history
+
+            flight = make_flight('BENCH2', seats)
+            statuses, elapsed = run_concurrently(book_directly(flight), users, threads)
+            report('conditional UPDATE (direct)', flight, seats, statuses, elapsed)
+
+            flight = make_flight('BENCH3', seats)
+            statuses, elapsed = run_concurrently(book_naively(flight), users, threads)
+            report('naive read-check-write', flight, seats, statuses, elapsed)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Benchmark: booking latency on one hot flight, single seat counter vs sharded.
+
+Fills a throwaway test database (never the project database) and has many
+threads book the same cabin at once through BookingSerializer.create (seat
+reservation, booking insert and seat hold in one transaction), first with
+one counter row, then with SEAT_COUNTER_SHARDS sub-counters. Reports p50,
+p99 and max latency per booking, throughput, and checks that exactly the
+cabin's seats were sold.
+
+Row-level contention is what sharding removes, so the comparison is only
+meaningful on PostgreSQL. SQLite takes one lock for the whole database on
+every write; there the two runs should come out about the same. Run from
+the backend directory:
+
+    python benchmarks/bench_seat_shards.py [buyers] [threads] [shards]
+"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from django.db import connection, connections  # noqa: E402
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+
+from booking.exceptions import SeatsUnavailableException  # noqa: E402
+from booking.models import Booking, CustomUser, Flight  # noqa: E402
+from booking.seat_inventory import open_cabin, seats_left  # noqa: E402
+from booking.seat_shards import enable_sharding, shard_count  # noqa: E402
+from booking.serializers import BookingSerializer  # noqa: E402
+
+
+def use_file_database(directory):
+    # An in-memory SQLite test database is not safely shared between threads
+    settings_dict = connections['default'].settings_dict
+    if settings_dict['ENGINE'].endswith('sqlite3'):
+        settings_dict['TEST']['NAME'] = os.path.join(directory, 'bench_shards.sqlite3')
+        settings_dict.setdefault('OPTIONS', {})['timeout'] = 60
+
+
+def make_users(buyers):
+    CustomUser.objects.bulk_create([
+        CustomUser(username=f"buyer{i}", email=f"buyer{i}@example.com", status='approved')
+        for i in range(buyers)
+    ], batch_size=1000)
+    return list(CustomUser.objects.filter(username__startswith='buyer').order_by('id'))
+
+
+def book(flight, user):
+    serializer = BookingSerializer(data={'flight_id': flight.id})
+    serializer.is_valid(raise_exception=True)
+    started = time.perf_counter()
+    try:
+        serializer.save(user=user)
+        ok = True
+    except SeatsUnavailableException:
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def run(flight, users, threads):
+    barrier = threading.Barrier(threads)
+
+    def worker(chunk):
+        barrier.wait()
+        try:
+            # Each thread re-reads the flight, as each request would
+            own = Flight.objects.get(pk=flight.pk)
+            return [book(own, user) for user in chunk]
+        finally:
+            connection.close()
+
+    chunks = [users[i::threads] for i in range(threads)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = [result for chunk in pool.map(worker, chunks) for result in chunk]
+    return results, time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def report(label, flight, seats, results, elapsed):
+    latencies = [latency for latency, ok in results if ok]
+    sold = Booking.objects.filter(flight=flight).count()
+    left = sum(seats_left(flight.id).values())
+    assert sold == seats - left <= seats, f"{label}: sold {sold}, {left} left of {seats}"
+    print(f"{label:<22} {percentile(latencies, 0.5) * 1000:>8.1f}ms {percentile(latencies, 0.99) * 1000:>8.1f}ms "
+          f"{max(latencies) * 1000:>8.1f}ms {len(results) / elapsed:>9.0f}/s {sold:>6} {left:>5}")
+
+
+def main():
+    buyers = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    shards = int(sys.argv[3]) if len(sys.argv) > 3 else shard_count()
+    seats = buyers  # enough for everyone, so latency is not skewed by sold-out refusals
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as directory:
+        use_file_database(directory)
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            users = make_users(buyers)
+            print("=" * 80)
+            print(f"{buyers} bookings of one cabin, {threads} threads ({connection.vendor})")
+            print("=" * 80)
+            print(f"{'counter':<22} {'p50':>10} {'p99':>10} {'max':>10} {'throughput':>11} {'sold':>6} {'left':>5}")
+            for number, count in (('HOT1', 1), ('HOT2', shards)):
+                flight = Flight.objects.create(
+                    flight_number=number, departure='London', arrival='Paris',
+                    date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+                )
+                open_cabin(flight, 'ECONOMY', seats)
+                if count > 1:
+                    enable_sharding(flight, count)
+                results, elapsed = run(flight, users, threads)
+                label = 'single row' if count == 1 else f"{count} sub-counters"
+                report(label, flight, seats, results, elapsed)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
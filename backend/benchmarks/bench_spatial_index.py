@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark: full haversine scan vs the unit-sphere KD-tree for nearby airports.
+
+Generates synthetic airport sets of 200, 10k and 50k entries (clustered
+around real airports, like real data), then runs the same k-nearest and
+radius queries with the old scan and with AirportSpatialIndex, checking the
+results are identical. Run from the backend directory:
+
+    python benchmarks/bench_spatial_index.py [queries]
+"""
+import os
+import random
+import sys
+import time
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from booking.iata_utils import IATA_INFO, calculate_distance  # noqa: E402
+from booking.spatial_index import AirportSpatialIndex  # noqa: E402
+
+SIZES = (200, 10_000, 50_000)
+
+
+def synthetic_airports(count, rng):
+    seeds = list(IATA_INFO.values())
+    airports = {}
+    for i in range(count):
+        seed = seeds[i % len(seeds)]
+        airports[f"X{i:06d}"] = {
+            'lat': max(min(seed['lat'] + rng.gauss(0, 3), 90), -90),
+            'lon': (seed['lon'] + rng.gauss(0, 3) + 180) % 360 - 180,
+        }
+    return airports
+
+
+def scan(airports, latitude, longitude, limit, max_distance):
+    found = []
+    for code, info in airports.items():
+        distance = calculate_distance(latitude, longitude, info['lat'], info['lon'])
+        if distance <= max_distance:
+            found.append((distance, code))
+    found.sort(key=lambda item: item[0])
+    return [code for _, code in found[:limit]]
+
+
+def timed(fn, queries):
+    started = time.perf_counter()
+    results = [fn(latitude, longitude) for latitude, longitude in queries]
+    return (time.perf_counter() - started) / len(queries), results
+
+
+def main():
+    query_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(42)
+    seeds = list(IATA_INFO.values())
+    queries = [
+        (seed['lat'] + rng.gauss(0, 2), seed['lon'] + rng.gauss(0, 2))
+        for seed in (seeds[rng.randrange(len(seeds))] for _ in range(query_count))
+    ]
+
+    print("=" * 80)
+    print(f"Nearby airport benchmark ({query_count} queries, k=5 within 500 km; radius = all within 100 km)")
+    print("=" * 80)
+    print(f"{'airports':>9} {'build':>10} {'scan k-nn':>12} {'index k-nn':>12} {'speedup':>8} "
+          f"{'scan radius':>12} {'index radius':>13}")
+    for size in SIZES:
+        airports = synthetic_airports(size, rng)
+        started = time.perf_counter()
+        index = AirportSpatialIndex(airports, calculate_distance)
+        build = time.perf_counter() - started
+
+        scan_knn, expected = timed(lambda lat, lon: scan(airports, lat, lon, 5, 500), queries)
+        index_knn, actual = timed(lambda lat, lon: [c for _, c, _ in index.nearest(lat, lon, 5, 500)], queries)
+        assert actual == expected, f"k-nearest mismatch at {size} airports"
+
+        scan_radius, expected = timed(lambda lat, lon: scan(airports, lat, lon, None, 100), queries)
+        index_radius, actual = timed(lambda lat, lon: [c for _, c, _ in index.nearest(lat, lon, None, 100)], queries)
+        assert actual == expected, f"radius mismatch at {size} airports"
+
+        print(f"{size:>9} {build * 1000:>8.1f}ms {scan_knn * 1e6:>10.0f}us {index_knn * 1e6:>10.0f}us "
+              f"{scan_knn / index_knn:>7.1f}x {scan_radius * 1e6:>10.0f}us {index_radius * 1e6:>11.0f}us")
+    print("\nResults were identical to the full scan for every query.")
+
+
+if __name__ == '__main__':
+    main()
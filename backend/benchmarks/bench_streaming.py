@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Benchmark: peak memory of a full admin flight dump, buffered vs streamed.
+
+Fills a throwaway test database (never the project database) and, for
+growing row counts, measures the tracemalloc peak while producing the
+whole JSON body the old way (serialize the list, then render) and through
+the streaming path (iterator + per-chunk serialization). The streamed
+peak should stay flat as the table grows. Run from the backend directory:
+
+    python benchmarks/bench_streaming.py [max_rows]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import django
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+django.setup()
+
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from booking.models import Flight  # noqa: E402
+from booking.serializers import AdminFlightSerializer  # noqa: E402
+from booking.streaming import encode_rows, iter_serialized  # noqa: E402
+
+
+def add_flights(start_index, count):
+    start = datetime(2031, 1, 1, tzinfo=timezone.utc)
+    Flight.objects.bulk_create([
+        Flight(flight_number=f"S{i}", departure='London', arrival='Paris', origin_iata='LHR',
+               destination_iata='CDG', date=start + timedelta(minutes=i), price=100)
+        for i in range(start_index, start_index + count)
+    ], batch_size=5000)
+
+
+def measure(produce):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = produce()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+def buffered():
+    data = AdminFlightSerializer(Flight.objects.order_by('id'), many=True).data
+    return len(JSONRenderer().render(data))
+
+
+def streamed():
+    return sum(len(chunk) for chunk in encode_rows(iter_serialized(Flight.objects.order_by('id'), AdminFlightSerializer)))
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        print("=" * 80)
+        print("Admin flight dump: peak traced memory, buffered list vs streamed chunks")
+        print("=" * 80)
+        print(f"{'rows':>8} {'body':>10} {'buffered peak':>15} {'streamed peak':>15} {'buffered':>10} {'streamed':>10}")
+        loaded, rows = 0, max_rows // 8
+        while rows <= max_rows:
+            add_flights(loaded, rows - loaded)
+            loaded = rows
+            size, buffered_time, buffered_peak = measure(buffered)
+            streamed_size, streamed_time, streamed_peak = measure(streamed)
+            assert streamed_size == size, 'streamed body differs in size'
+            print(f"{rows:>8} {size / 2**20:>8.1f}MB {buffered_peak / 2**20:>13.1f}MB {streamed_peak / 2**20:>13.1f}MB "
+                  f"{buffered_time:>9.2f}s {streamed_time:>9.2f}s")
+            rows *= 2
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
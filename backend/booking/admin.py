@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import CustomUser, Flight, Booking
+from .models import CustomUser, Flight, Booking, SeatHold, SeatInventory
+from .seat_shards import disable_sharding, enable_sharding, shard_count
 
 @admin.register(CustomUser)
 class CustomUserAdmin(admin.ModelAdmin):
@@ -18,16 +19,40 @@ class CustomUserAdmin(admin.ModelAdmin):
             send_approval_email_task.delay(user.id)
     approve_users.short_description = "Approve selected users"
 
+class SeatInventoryInline(admin.TabularInline):
+    model = SeatInventory
+    extra = 0
+
 @admin.register(Flight)
 class FlightAdmin(admin.ModelAdmin):
-    list_display = ('flight_number', 'departure', 'arrival', 'date', 'price', 'availability', 'status')
+    inlines = [SeatInventoryInline]
+    list_display = ('flight_number', 'departure', 'arrival', 'date', 'price', 'availability', 'status', 'seat_shards')
     list_filter = ('status', 'availability', 'date')
     search_fields = ('flight_number', 'departure', 'arrival')
     ordering = ('date',)
+    actions = ['shard_seat_counters', 'use_single_seat_counter']
+
+    def shard_seat_counters(self, request, queryset):
+        for flight in queryset:
+            enable_sharding(flight)
+        self.message_user(request, f"{queryset.count()} flight(s) now use {shard_count()} seat counters per cabin.")
+    shard_seat_counters.short_description = "Shard seat counters (for flights under heavy booking load)"
+
+    def use_single_seat_counter(self, request, queryset):
+        for flight in queryset:
+            disable_sharding(flight)
+        self.message_user(request, f"{queryset.count()} flight(s) now use a single seat counter per cabin.")
+    use_single_seat_counter.short_description = "Use a single seat counter"
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
-    list_display = ('user', 'flight', 'payment_status', 'created_at')
-    list_filter = ('payment_status', 'created_at')
+    list_display = ('user', 'flight', 'cabin', 'payment_status', 'created_at')
+    list_filter = ('payment_status', 'cabin', 'created_at')
     search_fields = ('user__username', 'flight__flight_number')
     ordering = ('-created_at',)
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ('booking', 'flight', 'cabin', 'seats', 'status', 'expires_at')
+    list_filter = ('status', 'cabin')
+    ordering = ('-expires_at',)
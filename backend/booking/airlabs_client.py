@@ -1,13 +1,16 @@
 import requests
 from django.conf import settings
 import logging
+from .provider_http import provider_http
+from .rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 class AirLabsClient:
     def __init__(self):
         self.api_key = getattr(settings, 'AIRLABS_API_KEY', None)
-        self.base_url = 'https://airlabs.co/api/v9'
+        self.base_url = getattr(settings, 'AIRLABS_BASE_URL', 'https://airlabs.co/api/v9')
+        self.rate_limiter = get_rate_limiter('airlabs', self.api_key)
 
         if not self.api_key:
             logger.error("AirLabs API key not configured")
@@ -28,7 +31,7 @@ class AirLabsClient:
         url = f"{self.base_url}/airports"
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = provider_http.get(url, params=params, timeout=10, endpoint='airlabs.airports', rate_limit=self.rate_limiter)
             logger.info(f"AirLabs API request: {url} - Status: {response.status_code}")
 
             if response.status_code == 200:
@@ -65,3 +68,29 @@ class AirLabsClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"AirLabs API request failed: {e}")
             return None
+
+    def list_airports(self, country=None):
+        """Fetch the full AirLabs airport list (optionally one country) as raw records for sync_airports."""
+        params = {
+            'api_key': self.api_key,
+            '_fields': 'iata_code,name,city,country_code,lat,lng'
+        }
+        if country:
+            params['country_code'] = country
+
+        url = f"{self.base_url}/airports"
+
+        try:
+            response = provider_http.get(url, params=params, timeout=60, endpoint='airlabs.airports', rate_limit=self.rate_limiter)
+            logger.info(f"AirLabs API request: {url} - Status: {response.status_code}")
+            if response.status_code != 200:
+                logger.error(f"AirLabs API error: HTTP {response.status_code}")
+                return None
+            data = response.json()
+            if 'error' in data:
+                logger.error(f"AirLabs API error: {data['error']}")
+                return None
+            return data.get('response', [])
+        except requests.exceptions.RequestException as e:
+            logger.error(f"AirLabs API request failed: {e}")
+            return None
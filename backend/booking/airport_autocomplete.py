@@ -0,0 +1,250 @@
+"""
+In-process airport autocomplete.
+
+AirportSearchView used to call AirLabs on every keystroke. This engine
+answers from memory instead, over the shared airport snapshot (airports and
+their city aliases) and airports learned from AirLabs in the background.
+
+Every searchable token (IATA code, city, airport name, aliases) is
+accent-folded and its prefixes are stored in a flattened trie: a dict from
+prefix to the entries it matches, pre-sorted by rank. A single-word query is
+one dict lookup plus a slice; multi-word queries intersect the candidate
+lists. Results are ranked by match quality (exact code, then leading-word
+prefix, then any-word prefix) and then by airport popularity.
+
+When nothing matches locally, the keyword is queued for AirLabs enrichment
+on Celery; results are published through the cache and picked up by every
+worker's engine on its next refresh.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .fuzzy_match import fold
+from .airport_snapshot import get_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Busiest passenger airports, most popular first; used to rank otherwise equal matches
+POPULAR_AIRPORTS = [
+    'ATL', 'DXB', 'DFW', 'LHR', 'HND', 'DEN', 'IST', 'LAX', 'ORD', 'DEL',
+    'CDG', 'JFK', 'LAS', 'AMS', 'MIA', 'MAD', 'CAN', 'PVG', 'PEK', 'SIN',
+    'ICN', 'FRA', 'BKK', 'MCO', 'CLT', 'SEA', 'EWR', 'SFO', 'PHX', 'IAH',
+    'BCN', 'YYZ', 'KUL', 'FCO', 'MUC', 'SYD', 'BOM', 'HKG', 'DOH', 'BOS',
+]
+# Cache keys for airports learned from AirLabs
+ENRICHED_AIRPORTS_KEY = 'airport_autocomplete:enriched'
+ENRICHED_VERSION_KEY = 'airport_autocomplete:version'
+# Default seconds between checks for newly enriched airports
+DEFAULT_REFRESH_INTERVAL = 60
+# Default seconds before the same keyword may be sent to AirLabs again
+DEFAULT_ENRICH_COOLDOWN = 3600
+
+# Match tiers, best first
+TIER_CODE = 0
+TIER_LEADING = 1
+TIER_ANY = 2
+
+
+def default_airports(snapshot=None):
+    """Return airport records built from the airport snapshot and its city aliases."""
+    snapshot = snapshot or get_snapshot()
+    aliases = {}
+    for alias, code in snapshot.city_to_iata.items():
+        aliases.setdefault(code, []).append(alias)
+    return [
+        {
+            'iataCode': code,
+            'name': name,
+            'cityName': city,
+            'countryName': country,
+            'aliases': aliases.get(code, []),
+        }
+        for code, name, city, country in zip(snapshot.codes, snapshot.names, snapshot.cities, snapshot.countries)
+    ]
+
+
+class AirportAutocomplete:
+    """
+    Immutable prefix index over airport records.
+
+    Args:
+        airports (list): Dicts with ``iataCode``, ``name``, ``cityName``,
+            ``countryName`` and optional ``aliases``.
+    """
+
+    def __init__(self, airports):
+        records = []
+        self._by_code = {}
+        for record in airports:
+            code = (record.get('iataCode') or '').upper()
+            if len(code) != 3 or code in self._by_code:
+                continue
+            self._by_code[code] = len(records)
+            records.append({**record, 'iataCode': code})
+        self.entries = [
+            {
+                'iataCode': record['iataCode'],
+                'name': record.get('name') or '',
+                'cityName': record.get('cityName') or '',
+                'countryName': record.get('countryName') or '',
+            }
+            for record in records
+        ]
+        self._country = [fold(entry['countryName']) for entry in self.entries]
+
+        popularity = {code: len(POPULAR_AIRPORTS) - rank for rank, code in enumerate(POPULAR_AIRPORTS)}
+        # Lower sort key = better: popular hubs, then airports with more city aliases, then dataset order
+        self._rank = [
+            (-popularity.get(record['iataCode'], 0), -len(record.get('aliases') or []), position)
+            for position, record in enumerate(records)
+        ]
+
+        leading, anywhere = {}, {}
+        for position, record in enumerate(records):
+            phrases = [record['iataCode'], record.get('cityName'), record.get('name')] + list(record.get('aliases') or [])
+            for phrase in phrases:
+                for index, token in enumerate(fold(phrase).split()):
+                    for end in range(1, len(token) + 1):
+                        prefix = token[:end]
+                        anywhere.setdefault(prefix, set()).add(position)
+                        if index == 0:
+                            leading.setdefault(prefix, set()).add(position)
+        self._leading = {prefix: self._sorted(ids) for prefix, ids in leading.items()}
+        self._anywhere = {prefix: self._sorted(ids) for prefix, ids in anywhere.items()}
+
+    def _sorted(self, ids):
+        return sorted(ids, key=self._rank.__getitem__)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, keyword, limit=10, country=None):
+        """
+        Return up to ``limit`` airport dicts matching ``keyword``, best first.
+
+        Every word of the keyword must prefix-match a word of the airport's
+        code, city, name or aliases.
+        """
+        tokens = fold(keyword).split()
+        if not tokens:
+            return []
+        country = fold(country) if country else None
+
+        tiers = {}
+        exact = self._by_code.get(tokens[0].upper()) if len(tokens) == 1 and len(tokens[0]) == 3 else None
+        if exact is not None:
+            tiers[exact] = TIER_CODE
+
+        if len(tokens) == 1:
+            for tier, candidates in ((TIER_LEADING, self._leading.get(tokens[0], ())),
+                                     (TIER_ANY, self._anywhere.get(tokens[0], ()))):
+                for position in candidates:
+                    # Lists are pre-sorted by rank, so without a country filter the first hits suffice
+                    if country is None and len(tiers) >= limit:
+                        break
+                    tiers.setdefault(position, tier)
+        else:
+            lists = [self._anywhere.get(token) for token in tokens]
+            if not all(lists):
+                return []
+            lists.sort(key=len)
+            others = [set(candidates) for candidates in lists[1:]]
+            first = self._leading.get(tokens[0], ())
+            first_set = set(first)
+            for position in lists[0]:
+                if all(position in other for other in others):
+                    tiers.setdefault(position, TIER_LEADING if position in first_set else TIER_ANY)
+
+        ranked = sorted(tiers, key=lambda position: (tiers[position], self._rank[position]))
+        if country:
+            ranked = [position for position in ranked if self._country[position] == country]
+        return [dict(self.entries[position]) for position in ranked[:limit]]
+
+
+class AutocompleteRegistry:
+    """
+    Process-wide engine that picks up enriched airports from the shared cache.
+    """
+
+    def __init__(self):
+        self._engine = None
+        self._snapshot = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def refresh_interval(self):
+        return getattr(settings, 'AIRPORT_AUTOCOMPLETE_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL)
+
+    def base_airports(self, snapshot=None):
+        """Airport records the engine is built from, before enrichment."""
+        return default_airports(snapshot)
+
+    def _build(self, snapshot, version):
+        enriched = cache.get(ENRICHED_AIRPORTS_KEY) or {}
+        self._engine = AirportAutocomplete(self.base_airports(snapshot) + list(enriched.values()))
+        self._snapshot = snapshot
+        self._version = version
+        logger.info(f"Airport autocomplete index built with {len(self._engine)} airports")
+
+    def get(self):
+        """Return the current engine, rebuilding it if the snapshot changed or enrichment published new airports."""
+        now = time.monotonic()
+        snapshot = get_snapshot()
+        if self._engine is not None and self._snapshot is snapshot and now - self._checked_at < self.refresh_interval:
+            return self._engine
+        with self._lock:
+            if self._engine is None or self._snapshot is not snapshot or now - self._checked_at >= self.refresh_interval:
+                version = cache.get(ENRICHED_VERSION_KEY)
+                if self._engine is None or self._snapshot is not snapshot or version != self._version:
+                    self._build(snapshot, version)
+                self._checked_at = now
+        return self._engine
+
+    def reset(self):
+        with self._lock:
+            self._engine = None
+            self._checked_at = 0.0
+
+
+airport_autocomplete = AutocompleteRegistry()
+
+
+def publish_enriched_airports(airports):
+    """
+    Merge airports learned from a provider into the shared enrichment set.
+
+    Returns:
+        int: Number of airports that were new.
+    """
+    enriched = cache.get(ENRICHED_AIRPORTS_KEY) or {}
+    added = 0
+    for record in airports:
+        code = (record.get('iataCode') or '').upper()
+        if len(code) == 3 and code not in enriched and code not in get_snapshot():
+            enriched[code] = {**record, 'iataCode': code}
+            added += 1
+    if added:
+        cache.set(ENRICHED_AIRPORTS_KEY, enriched, None)
+        cache.set(ENRICHED_VERSION_KEY, time.time(), None)
+    return added
+
+
+def request_enrichment(keyword, country=None):
+    """Queue an AirLabs lookup for a keyword the local index could not answer."""
+    cooldown = getattr(settings, 'AIRPORT_AUTOCOMPLETE_ENRICH_COOLDOWN', DEFAULT_ENRICH_COOLDOWN)
+    if not cache.add(f"airport_autocomplete:enrich:{fold(keyword)}:{fold(country)}", True, cooldown):
+        return False
+    from .tasks import enrich_airports_from_airlabs
+    try:
+        enrich_airports_from_airlabs.delay(keyword, country)
+    except Exception as e:
+        logger.warning(f"Could not queue AirLabs enrichment for '{keyword}': {e}")
+        return False
+    return True
@@ -0,0 +1,251 @@
+"""
+Immutable in-memory snapshot of the airport reference data.
+
+iata_utils, the airport autocomplete, the GPS views and the flight mappers
+all read airports from one AirportSnapshot. It is built from the Airport
+table, falling back to the built-in CITY_TO_IATA / IATA_INFO seed when the
+table is empty or not migrated yet, and stored column-wise: tuples of
+interned strings, float arrays for coordinates and a single code -> row
+dict, instead of one dict per airport.
+
+Derived indexes (KD-tree, NumPy table, fuzzy city index) are built on first
+use, or all at once by preload(). wsgi.py calls preload() at import; with
+``gunicorn --preload`` that runs once in the master, and gc.freeze() keeps
+the collector from touching those objects so forked workers go on sharing
+the pages copy-on-write.
+"""
+
+import gc
+import hashlib
+import logging
+import math
+import sys
+import threading
+from array import array
+from functools import cached_property, lru_cache
+
+from .fuzzy_match import SymSpellIndex, fold
+
+logger = logging.getLogger(__name__)
+
+# Inputs shorter than this are never fuzzy-matched (too many near neighbours)
+FUZZY_MIN_LENGTH = 4
+# Inputs at least this long may be up to two edits away instead of one
+FUZZY_TWO_EDITS_LENGTH = 8
+# Words ignored when fuzzy-matching a city name
+FUZZY_STOPWORDS = {'international', 'intl', 'airport'}
+
+
+def _text(value):
+    return sys.intern(str(value or '').strip())
+
+
+def _coordinate(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class AirportSnapshot:
+    """
+    Read-only, column-oriented airport dataset.
+
+    Args:
+        airports (iterable): Dicts with ``iata_code``, ``name``, ``city``,
+            ``country``, ``lat``, ``lon`` and optional ``aliases``.
+        city_to_iata (dict): Lower-case city names and aliases mapped to codes.
+        source (str): Where the data came from, for logging.
+    """
+
+    def __init__(self, airports, city_to_iata=None, source='builtin'):
+        codes, names, cities, countries = [], [], [], []
+        latitudes, longitudes = array('d'), array('d')
+        rows = {}
+        aliases = dict(city_to_iata or {})
+        for airport in airports:
+            code = _text(airport.get('iata_code')).upper()
+            if len(code) != 3 or code in rows:
+                continue
+            rows[code] = len(codes)
+            codes.append(sys.intern(code))
+            names.append(_text(airport.get('name')))
+            cities.append(_text(airport.get('city')))
+            countries.append(_text(airport.get('country')))
+            latitudes.append(_coordinate(airport.get('lat')))
+            longitudes.append(_coordinate(airport.get('lon')))
+            for alias in airport.get('aliases') or ():
+                aliases.setdefault(_text(alias).lower(), code)
+        self.codes = tuple(codes)
+        self.names = tuple(names)
+        self.cities = tuple(cities)
+        self.countries = tuple(countries)
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.city_to_iata = aliases
+        self.source = source
+        self._rows = rows
+        # Per-snapshot memo, so replacing the snapshot also drops stale fuzzy results
+        self.fuzzy_iata_code = lru_cache(maxsize=2048)(self._fuzzy_iata_code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self._rows
+
+    def info(self, code):
+        """Return ``{'city', 'country', 'name', 'lat', 'lon'}`` for a code, or None."""
+        row = self._rows.get(code)
+        if row is None:
+            return None
+        info = {'city': self.cities[row], 'country': self.countries[row], 'name': self.names[row]}
+        if not math.isnan(self.latitudes[row]) and not math.isnan(self.longitudes[row]):
+            info['lat'] = self.latitudes[row]
+            info['lon'] = self.longitudes[row]
+        return info
+
+    def city_name(self, code):
+        """Return the city served by an airport, or None when unknown."""
+        row = self._rows.get(code)
+        return (self.cities[row] or None) if row is not None else None
+
+    def located(self):
+        """Return ``{code: {'lat', 'lon'}}`` for airports with coordinates, in dataset order."""
+        return {
+            code: {'lat': lat, 'lon': lon}
+            for code, lat, lon in zip(self.codes, self.latitudes, self.longitudes)
+            if not math.isnan(lat) and not math.isnan(lon)
+        }
+
+    @cached_property
+    def fingerprint(self):
+        """Hash of airport codes and coordinates; anything derived from them is stale when it changes."""
+        digest = hashlib.sha1()
+        for code, lat, lon in zip(self.codes, self.latitudes, self.longitudes):
+            digest.update(f"{code}:{lat:.6f}:{lon:.6f};".encode())
+        return digest.hexdigest()
+
+    @cached_property
+    def spatial_index(self):
+        from .iata_utils import calculate_distance
+        from .spatial_index import AirportSpatialIndex
+        return AirportSpatialIndex(self.located(), calculate_distance)
+
+    @cached_property
+    def table(self):
+        from .airport_table import AirportTable
+        return AirportTable(self.located())
+
+    @cached_property
+    def city_index(self):
+        return SymSpellIndex(self._city_vocabulary())
+
+    def _city_vocabulary(self):
+        """
+        City names for fuzzy matching: the city aliases first, then cities
+        served by a single airport. Codes and short aliases are left out.
+        """
+        vocabulary = {name: code for name, code in self.city_to_iata.items() if len(name) >= FUZZY_MIN_LENGTH}
+        airports_by_city = {}
+        for code, city in zip(self.codes, self.cities):
+            airports_by_city.setdefault(fold(city), []).append(code)
+        for city, codes in airports_by_city.items():
+            if len(codes) == 1 and len(city) >= FUZZY_MIN_LENGTH:
+                vocabulary.setdefault(city, codes[0])
+        return vocabulary
+
+    def _fuzzy_iata_code(self, city_name):
+        """Resolve a misspelt or accented city name through the fuzzy city index."""
+        query = ' '.join(word for word in fold(city_name).split() if word not in FUZZY_STOPWORDS)
+        if len(query) < FUZZY_MIN_LENGTH:
+            return None
+        max_distance = 2 if len(query) >= FUZZY_TWO_EDITS_LENGTH else 1
+        match = self.city_index.lookup(query, max_distance)
+        return match[0] if match else None
+
+    def warm(self):
+        """Build every derived index now rather than on first request."""
+        return self.fingerprint, self.spatial_index, self.table, self.city_index
+
+
+def builtin_airports():
+    """Yield the airports hard-coded in iata_utils, with their CITY_TO_IATA aliases."""
+    from .iata_utils import CITY_TO_IATA, IATA_INFO
+    aliases = {}
+    for alias, code in CITY_TO_IATA.items():
+        aliases.setdefault(code, []).append(alias)
+    for code, info in IATA_INFO.items():
+        yield {'iata_code': code, **info, 'aliases': aliases.get(code, [])}
+
+
+def builtin_snapshot():
+    """Snapshot of the airports hard-coded in iata_utils."""
+    from .iata_utils import CITY_TO_IATA
+    return AirportSnapshot(builtin_airports(), CITY_TO_IATA, source='builtin')
+
+
+def load_snapshot():
+    """
+    Build a snapshot from the Airport table.
+
+    The built-in aliases are kept so existing city names keep resolving. Falls
+    back to builtin_snapshot() when the table is empty or cannot be read.
+    """
+    from .iata_utils import CITY_TO_IATA
+    from .models import Airport
+    try:
+        rows = Airport.objects.order_by('iata_code').values_list(
+            'iata_code', 'name', 'city', 'country', 'latitude', 'longitude', 'aliases'
+        )
+        airports = [
+            {'iata_code': code, 'name': name, 'city': city, 'country': country,
+             'lat': latitude, 'lon': longitude, 'aliases': aliases}
+            for code, name, city, country, latitude, longitude, aliases in rows.iterator(chunk_size=2000)
+        ]
+    except Exception as e:
+        logger.warning(f"Airport table unavailable, using built-in airport data: {e}")
+        return builtin_snapshot()
+    if not airports:
+        return builtin_snapshot()
+    return AirportSnapshot(airports, CITY_TO_IATA, source='database')
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def get_snapshot():
+    """Return the process-wide snapshot, loading it on first use."""
+    snapshot = _snapshot
+    if snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                install_snapshot(load_snapshot())
+            snapshot = _snapshot
+    return snapshot
+
+
+def install_snapshot(snapshot):
+    """Replace the process-wide snapshot; readers pick it up on their next call."""
+    global _snapshot
+    _snapshot = snapshot
+    return snapshot
+
+
+def preload():
+    """
+    Load the snapshot and its indexes before the server forks workers.
+
+    Database connections opened while loading are closed so workers do not
+    inherit them, and gc.freeze() moves everything allocated so far out of
+    the collector's reach so forked workers keep sharing the pages.
+    """
+    from django.db import connections
+    snapshot = install_snapshot(load_snapshot())
+    snapshot.warm()
+    connections.close_all()
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Preloaded {len(snapshot)} airports from {snapshot.source}")
+    return snapshot
@@ -0,0 +1,124 @@
+"""
+Bulk loading of airport datasets into the Airport table.
+
+Rows from CSV (OurAirports-style columns), JSON (a list, or an AirLabs
+``{"response": [...]}`` dump) or the built-in seed are normalised and
+upserted in chunks with one INSERT ... ON CONFLICT per chunk, so a full
+dataset of tens of thousands of airports loads in a few statements.
+"""
+
+import csv
+import json
+import logging
+
+from .models import Airport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+UPDATE_FIELDS = ['name', 'city', 'country', 'latitude', 'longitude', 'aliases', 'source', 'updated_at']
+
+# Accepted spellings for each field across the supported datasets
+FIELD_NAMES = {
+    'iata_code': ('iata_code', 'iataCode', 'iata', 'code'),
+    'name': ('name', 'airport_name'),
+    'city': ('city', 'cityName', 'city_name', 'municipality'),
+    'country': ('country', 'countryName', 'country_name', 'country_code', 'iso_country'),
+    'latitude': ('lat', 'latitude', 'latitude_deg'),
+    'longitude': ('lon', 'lng', 'longitude', 'longitude_deg'),
+    'aliases': ('aliases',),
+}
+
+
+def _field(raw, field):
+    for key in FIELD_NAMES[field]:
+        value = raw.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_airport(raw):
+    """
+    Map a dataset row to Airport field values.
+
+    Returns:
+        dict: Field values, or None when the row has no valid IATA code.
+    """
+    code = str(_field(raw, 'iata_code') or '').strip().upper()
+    if len(code) != 3 or not code.isalpha():
+        return None
+    aliases = _field(raw, 'aliases') or []
+    if isinstance(aliases, str):
+        aliases = aliases.split(';')
+    return {
+        'iata_code': code,
+        'name': str(_field(raw, 'name') or '')[:200],
+        'city': str(_field(raw, 'city') or '')[:100],
+        'country': str(_field(raw, 'country') or '')[:100],
+        'latitude': _float(_field(raw, 'latitude')),
+        'longitude': _float(_field(raw, 'longitude')),
+        'aliases': sorted({alias.strip().lower() for alias in aliases if alias and alias.strip()}),
+    }
+
+
+def read_airport_file(path):
+    """Yield raw rows from a CSV or JSON airport dataset."""
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as handle:
+            yield from csv.DictReader(handle)
+        return
+    with open(path, encoding='utf-8') as handle:
+        data = json.load(handle)
+    if isinstance(data, dict):
+        data = data.get('response') or data.get('data') or []
+    yield from data
+
+
+def upsert_airports(rows, source='', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Insert or update airports in chunks.
+
+    Args:
+        rows (iterable): Raw dataset rows, normalised with normalize_airport.
+        source (str): Stored on every row to record where it came from.
+        chunk_size (int): Rows per INSERT ... ON CONFLICT statement.
+
+    Returns:
+        tuple: ``(upserted, skipped)`` row counts.
+    """
+    upserted = skipped = 0
+    chunk = {}
+
+    def flush():
+        Airport.objects.bulk_create(
+            chunk.values(),
+            batch_size=chunk_size,
+            update_conflicts=True,
+            unique_fields=['iata_code'],
+            update_fields=UPDATE_FIELDS,
+        )
+        chunk.clear()
+
+    for raw in rows:
+        fields = normalize_airport(raw)
+        if fields is None:
+            skipped += 1
+            continue
+        # Later rows for the same code win; one statement may not touch a row twice
+        if fields['iata_code'] not in chunk:
+            upserted += 1
+        chunk[fields['iata_code']] = Airport(source=source, **fields)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+    logger.info(f"Upserted {upserted} airports from {source or 'dataset'}, skipped {skipped} rows")
+    return upserted, skipped
@@ -0,0 +1,111 @@
+"""
+Array-backed airport table for vectorized batch nearest-airport queries.
+
+Airport latitudes/longitudes are held in float64 NumPy arrays together with
+their unit vectors. A batch of query points is resolved in one pass: a
+matrix product gives the cosine of the central angle between every query and
+every airport, the k largest per row are picked (argmax, or argpartition for
+large k), and haversine is evaluated only for those picks so reported
+distances match ``iata_utils.calculate_distance``. Queries are processed in
+chunks to bound the size of the distance matrix.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+# Upper bound on query x airport cells evaluated at once (~16 MB of float64)
+MAX_MATRIX_CELLS = 2_000_000
+# Up to this k, repeated argmax beats argpartition on wide rows
+REPEATED_ARGMAX_MAX_K = 16
+
+
+def _unit_vectors(lat_rad, lon_rad):
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack((cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)))
+
+
+def haversine_km(lat1_rad, lon1_rad, lat2_rad, lon2_rad):
+    """Vectorized haversine, same formula as iata_utils.calculate_distance."""
+    a = (np.sin((lat2_rad - lat1_rad) / 2) ** 2
+         + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin((lon2_rad - lon1_rad) / 2) ** 2)
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+class AirportTable:
+    """
+    Immutable columnar airport table.
+
+    Args:
+        airports (dict): Airport info keyed by IATA code (``lat``/``lon`` in degrees).
+    """
+
+    def __init__(self, airports):
+        rows = [(code, info) for code, info in airports.items() if 'lat' in info and 'lon' in info]
+        self.codes = [code for code, _ in rows]
+        self.infos = [info for _, info in rows]
+        self.lat = np.array([info['lat'] for _, info in rows], dtype=np.float64)
+        self.lon = np.array([info['lon'] for _, info in rows], dtype=np.float64)
+        self.lat_rad = np.radians(self.lat)
+        self.lon_rad = np.radians(self.lon)
+        # Transposed once so each chunk is a single (m x 3) @ (3 x N) product
+        self._vectors_t = np.ascontiguousarray(_unit_vectors(self.lat_rad, self.lon_rad).T)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def nearest(self, latitudes, longitudes, k=1, max_distance=None):
+        """
+        Return the k nearest airports for every query point.
+
+        Args:
+            latitudes (array-like): Query latitudes in degrees.
+            longitudes (array-like): Query longitudes in degrees.
+            k (int): Airports per point.
+            max_distance (float): Drop airports further than this many km.
+
+        Returns:
+            tuple: ``(indices, distances)`` arrays of shape (n, k), nearest first.
+            Missing neighbours have index -1 and distance ``inf``.
+        """
+        q_lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+        q_lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+        n = len(q_lat)
+        k = min(k, len(self))
+        indices = np.full((n, k), -1, dtype=np.int64)
+        distances = np.full((n, k), np.inf)
+        if n == 0 or k == 0:
+            return indices, distances
+
+        chunk = max(1, MAX_MATRIX_CELLS // len(self))
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            lat_c, lon_c = q_lat[start:stop], q_lon[start:stop]
+            cosines = _unit_vectors(lat_c, lon_c) @ self._vectors_t
+            # Largest cosine = smallest central angle
+            if k == 1:
+                best = cosines.argmax(axis=1)[:, None]
+            elif k <= REPEATED_ARGMAX_MAX_K:
+                rows = np.arange(len(cosines))
+                picks = []
+                for _ in range(k):
+                    column = cosines.argmax(axis=1)
+                    cosines[rows, column] = -np.inf
+                    picks.append(column)
+                best = np.column_stack(picks)
+            elif k < len(self):
+                best = np.argpartition(cosines, -k, axis=1)[:, -k:]
+            else:
+                best = np.broadcast_to(np.arange(len(self)), cosines.shape)
+            exact = haversine_km(lat_c[:, None], lon_c[:, None], self.lat_rad[best], self.lon_rad[best])
+            if k > 1:
+                # Sort by exact distance, breaking ties by dataset position like a stable scan
+                order = np.lexsort((best, exact), axis=1)
+                best = np.take_along_axis(best, order, axis=1)
+                exact = np.take_along_axis(exact, order, axis=1)
+            if max_distance is not None:
+                too_far = exact > max_distance
+                best = np.where(too_far, -1, best)
+                exact = np.where(too_far, np.inf, exact)
+            indices[start:stop] = best
+            distances[start:stop] = exact
+        return indices, distances
@@ -0,0 +1,196 @@
+"""
+Process-wide Amadeus OAuth2 token manager.
+
+AmadeusClient and AmadeusService both obtain tokens from here. The token is
+kept in memory and published under the ``amadeus_access_token`` cache key so
+every worker shares it. Shortly before expiry one worker refreshes it in the
+background, guarded by a distributed lock, so a fleet of workers never
+stampedes the token endpoint.
+"""
+
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from .exceptions import AmadeusServiceException
+from .provider_http import provider_http
+from .rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Default cache key for the shared Amadeus access token
+AMADEUS_TOKEN_CACHE_KEY = 'amadeus_access_token'
+# Default token lifetime in seconds when Amadeus does not send expires_in
+DEFAULT_TOKEN_EXPIRY = 1800
+# Refresh proactively once the token has less than this many seconds left
+DEFAULT_REFRESH_MARGIN = 300
+# Seconds subtracted from expires_in to absorb clock skew and network latency
+EXPIRY_SAFETY_MARGIN = 60
+# Seconds the refresh lock is held at most
+REFRESH_LOCK_TTL = 30
+# Seconds a worker waits for another worker's refresh when it has no valid token
+REFRESH_WAIT_TIMEOUT = 10
+
+
+class AmadeusTokenManager:
+    """
+    Share one Amadeus access token across threads and workers.
+    """
+
+    def __init__(self, refresh_margin=DEFAULT_REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+        self._entry = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def cache_key(self):
+        return getattr(settings, 'AMADEUS_TOKEN_CACHE_KEY', AMADEUS_TOKEN_CACHE_KEY)
+
+    @property
+    def lock_key(self):
+        return f"{self.cache_key}:refresh_lock"
+
+    def _credentials(self):
+        return settings.AMADEUS_BASE_URL, settings.AMADEUS_API_KEY, settings.AMADEUS_API_SECRET
+
+    def _fingerprint(self):
+        base_url, api_key, _ = self._credentials()
+        return f"{base_url}|{api_key}"
+
+    def _valid_entry(self, entry, now):
+        return (
+            isinstance(entry, dict)
+            and entry.get('fingerprint') == self._fingerprint()
+            and entry.get('expires_at', 0) > now
+        )
+
+    def _current_entry(self, now):
+        """Return a valid token entry from memory or the shared cache."""
+        entry = self._entry
+        if self._valid_entry(entry, now):
+            return entry
+        entry = cache.get(self.cache_key)
+        if self._valid_entry(entry, now):
+            self._entry = entry
+            return entry
+        return None
+
+    def _fetch_and_publish(self):
+        """
+        Fetch a new token from the Amadeus OAuth2 endpoint and share it.
+
+        Raises:
+            AmadeusServiceException: If the token request fails.
+        """
+        base_url, api_key, api_secret = self._credentials()
+        url = f"{base_url}/v1/security/oauth2/token"
+        data = {
+            'grant_type': 'client_credentials',
+            'client_id': api_key,
+            'client_secret': api_secret
+        }
+        try:
+            response = provider_http.post(url, data=data, timeout=10, endpoint='amadeus.token',
+                                         rate_limit=get_rate_limiter('amadeus', api_key))
+        except requests.RequestException as e:
+            logger.error(f"Request error while fetching token: {e}")
+            raise AmadeusServiceException(f"Failed to get access token: {e}", code="AMADEUS_AUTH_FAILED")
+
+        if response.status_code != 200:
+            error_msg = f"Failed to get access token: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            raise AmadeusServiceException(error_msg, code="AMADEUS_AUTH_FAILED")
+
+        token_data = response.json()
+        expires_in = token_data.get('expires_in') or getattr(settings, 'AMADEUS_TOKEN_EXPIRY', DEFAULT_TOKEN_EXPIRY)
+        lifetime = max(int(expires_in) - EXPIRY_SAFETY_MARGIN, 1)
+        entry = {
+            'access_token': token_data['access_token'],
+            'expires_at': time.time() + lifetime,
+            'fingerprint': self._fingerprint(),
+        }
+        cache.set(self.cache_key, entry, lifetime)
+        self._entry = entry
+        logger.info("Amadeus access token refreshed and cached")
+        return entry
+
+    def _refresh_in_background(self):
+        """Refresh the token on a daemon thread if no other worker is doing so."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        if not cache.add(self.lock_key, True, REFRESH_LOCK_TTL):
+            self._refreshing = False
+            return
+
+        def refresh():
+            try:
+                self._fetch_and_publish()
+            except Exception as e:
+                logger.warning(f"Background Amadeus token refresh failed: {e}")
+            finally:
+                cache.delete(self.lock_key)
+                self._refreshing = False
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _refresh_blocking(self):
+        """
+        Obtain a token when none is valid, letting only one worker fetch it.
+        """
+        if cache.add(self.lock_key, True, REFRESH_LOCK_TTL):
+            try:
+                return self._fetch_and_publish()
+            finally:
+                cache.delete(self.lock_key)
+
+        deadline = time.monotonic() + REFRESH_WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = self._current_entry(time.time())
+            if entry:
+                return entry
+            if not cache.get(self.lock_key):
+                break
+        logger.warning("Timed out waiting for shared Amadeus token, fetching directly")
+        return self._fetch_and_publish()
+
+    def get_token(self):
+        """
+        Return a valid access token, refreshing proactively before expiry.
+
+        Returns:
+            str: A valid access token for Amadeus API calls.
+        """
+        now = time.time()
+        entry = self._current_entry(now)
+        if entry:
+            if entry['expires_at'] - now < self.refresh_margin:
+                self._refresh_in_background()
+            return entry['access_token']
+        logger.info("No valid Amadeus token found, fetching new token")
+        return self._refresh_blocking()['access_token']
+
+    def invalidate(self, token=None):
+        """
+        Drop the shared token, e.g. after Amadeus rejected it with a 401.
+
+        If ``token`` is given, only that token is dropped, so a late 401 for an
+        old token does not discard a newer one another worker already fetched.
+        """
+        entry = cache.get(self.cache_key)
+        if token is None or (isinstance(entry, dict) and entry.get('access_token') == token):
+            cache.delete(self.cache_key)
+        if token is None or (self._entry and self._entry.get('access_token') == token):
+            self._entry = None
+        logger.info("Amadeus access token invalidated")
+
+
+# Token manager shared by every Amadeus client in this process
+amadeus_token_manager = AmadeusTokenManager()
@@ -1,6 +1,9 @@
-import requests
 from django.conf import settings
 import logging
+from .amadeus_auth import amadeus_token_manager
+from .provider_http import provider_http
+from .rate_limiter import get_rate_limiter
+from .single_flight import coalesce
 
 logger = logging.getLogger(__name__)
 
@@ -9,26 +12,24 @@ class AmadeusClient:
         self.api_key = settings.AMADEUS_API_KEY
         self.api_secret = settings.AMADEUS_API_SECRET
         self.base_url = settings.AMADEUS_BASE_URL
-        self.access_token = None
+        self.rate_limiter = get_rate_limiter('amadeus', self.api_key)
 
     def get_access_token(self):
-        if not self.access_token:
-            url = f"{self.base_url}/v1/security/oauth2/token"
-            data = {
-                'grant_type': 'client_credentials',
-                'client_id': self.api_key,
-                'client_secret': self.api_secret
-            }
-            response = requests.post(url, data=data, timeout=10)
-            if response.status_code == 200:
-                self.access_token = response.json()['access_token']
-            else:
-                raise Exception(f"Failed to get access token: {response.status_code} - {response.text}")
-        return self.access_token
+        """Return the shared Amadeus token (see amadeus_auth.AmadeusTokenManager)"""
+        return amadeus_token_manager.get_token()
 
-    def search_flights(self, origin, destination, departure_date, return_date=None, adults=1):
+    def _authorized_get(self, url, endpoint, params=None):
+        """GET with the shared token, dropping the token if Amadeus rejects it"""
         token = self.get_access_token()
         headers = {'Authorization': f'Bearer {token}'}
+        response = provider_http.get(url, headers=headers, params=params, timeout=30, endpoint=endpoint,
+                                     rate_limit=self.rate_limiter)
+        if response.status_code == 401:
+            amadeus_token_manager.invalidate(token)
+        return response
+
+    @coalesce('amadeus:client-flight-offers')
+    def search_flights(self, origin, destination, departure_date, return_date=None, adults=1, travel_class=None):
         params = {
             'originLocationCode': origin,
             'destinationLocationCode': destination,
@@ -37,26 +38,25 @@ class AmadeusClient:
         }
         if return_date:
             params['returnDate'] = return_date
+        if travel_class:
+            params['travelClass'] = travel_class
 
         url = f"{self.base_url}/v2/shopping/flight-offers"
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = self._authorized_get(url, 'amadeus.flight_offers', params=params)
         return response.json() if response.status_code == 200 else None
 
     def search_airports(self, keyword):
-        token = self.get_access_token()
-        headers = {'Authorization': f'Bearer {token}'}
         params = {
             'keyword': keyword,
             'subType': 'AIRPORT,CITY'
         }
         url = f"{self.base_url}/v1/reference-data/locations"
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = self._authorized_get(url, 'amadeus.locations', params=params)
         return response.json() if response.status_code == 200 else None
 
+    @coalesce('amadeus:hotel-offers')
     def search_hotels(self, city_code, check_in, check_out, guests=1, room_count=1):
         """Search for hotels by city code using Amadeus Hotel Search API"""
-        token = self.get_access_token()
-        headers = {'Authorization': f'Bearer {token}'}
         params = {
             'cityCode': city_code,
             'checkInDate': check_in,
@@ -68,15 +68,13 @@ class AmadeusClient:
             'hotelSource': 'ALL'
         }
         url = f"{self.base_url}/v2/shopping/hotel-offers"
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = self._authorized_get(url, 'amadeus.hotel_offers', params=params)
         if response.status_code == 200:
             return response.json()
         return None
 
-    def search_hotels_by_geocode(self, latitude, longitude, check_in, check_out, guests=1, room_count=1):
-        """Search for hotels by geolocation (latitude/longitude)"""
-        token = self.get_access_token()
-        headers = {'Authorization': f'Bearer {token}'}
+    def search_hotels_by_geocode(self, latitude, longitude, check_in, check_out, guests=1, room_count=1, radius=50):
+        """Search for hotels by geolocation (latitude/longitude) within ``radius`` km"""
         params = {
             'latitude': latitude,
             'longitude': longitude,
@@ -84,22 +82,20 @@ class AmadeusClient:
             'checkOutDate': check_out,
             'adults': guests,
             'roomQuantity': room_count,
-            'radius': 50,
+            'radius': radius,
             'radiusUnit': 'KM',
             'hotelSource': 'ALL'
         }
         url = f"{self.base_url}/v2/shopping/hotel-offers"
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = self._authorized_get(url, 'amadeus.hotel_offers', params=params)
         if response.status_code == 200:
             return response.json()
         return None
 
     def get_hotel_details(self, hotel_id):
         """Get detailed information about a specific hotel"""
-        token = self.get_access_token()
-        headers = {'Authorization': f'Bearer {token}'}
         url = f"{self.base_url}/v1/shopping/hotel-offers/{hotel_id}"
-        response = requests.get(url, headers=headers, timeout=30)
+        response = self._authorized_get(url, 'amadeus.hotel_details')
         if response.status_code == 200:
             return response.json()
         return None
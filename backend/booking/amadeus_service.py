@@ -2,115 +2,53 @@
 Amadeus Service Layer with token caching via Django's cache framework.
 
 This service provides a centralized way to interact with the Amadeus API,
-with automatic token caching using Django's cache framework.
+with tokens shared across workers by the Amadeus token manager.
 """
 
 import requests
 import logging
 from django.conf import settings
-from django.core.cache import cache
+from .amadeus_auth import amadeus_token_manager
+from .provider_http import provider_http
+from .rate_limiter import get_rate_limiter
+from .single_flight import coalesce
 
 logger = logging.getLogger(__name__)
 
-# Cache key for Amadeus access token
-AMADEUS_TOKEN_CACHE_KEY = 'amadeus_access_token'
-# Default token expiry time in seconds (around 20 minutes for Amadeus)
-DEFAULT_TOKEN_EXPIRY = 1800
-
 
 class AmadeusService:
     """
     Service layer for Amadeus API interactions with token caching.
     
-    Uses Django's cache framework to store and retrieve OAuth2 tokens,
-    avoiding unnecessary API calls for token generation.
+    OAuth2 tokens come from the process-wide token manager, which shares them
+    across workers through Django's cache and refreshes them before expiry.
     """
     
     def __init__(self):
         self.api_key = settings.AMADEUS_API_KEY
         self.api_secret = settings.AMADEUS_API_SECRET
         self.base_url = settings.AMADEUS_BASE_URL
-        
-    def _get_token_from_cache(self):
-        """
-        Retrieve the access token from Django cache.
-        
-        Returns:
-            str or None: The cached access token if available, None otherwise.
-        """
-        return cache.get(AMADEUS_TOKEN_CACHE_KEY)
-    
-    def _set_token_in_cache(self, token, expiry=DEFAULT_TOKEN_EXPIRY):
-        """
-        Store the access token in Django cache.
-        
-        Args:
-            token (str): The access token to cache.
-            expiry (int): Time in seconds until the token expires.
-        """
-        cache.set(AMADEUS_TOKEN_CACHE_KEY, token, expiry)
-        logger.info("Amadeus access token cached successfully")
-    
-    def _fetch_new_token(self):
-        """
-        Fetch a new access token from Amadeus OAuth2 API.
-        
-        Returns:
-            str: The new access token.
-            
-        Raises:
-            Exception: If the token request fails.
-        """
-        url = f"{self.base_url}/v1/security/oauth2/token"
-        data = {
-            'grant_type': 'client_credentials',
-            'client_id': self.api_key,
-            'client_secret': self.api_secret
-        }
-        
-        try:
-            response = requests.post(url, data=data, timeout=10)
-            if response.status_code == 200:
-                token_data = response.json()
-                access_token = token_data['access_token']
-                # Cache the token with a slightly shorter expiry to be safe
-                expires_in = token_data.get('expires_in', DEFAULT_TOKEN_EXPIRY)
-                # Subtract 60 seconds buffer to avoid token expiration issues
-                cache_expiry = max(expires_in - 60, 300)
-                self._set_token_in_cache(access_token, cache_expiry)
-                return access_token
-            else:
-                error_msg = f"Failed to get access token: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-        except requests.RequestException as e:
-            logger.error(f"Request error while fetching token: {e}")
-            raise
+        self.rate_limiter = get_rate_limiter('amadeus', self.api_key)
     
     def get_access_token(self):
         """
-        Get a valid access token, using cache if available.
+        Get a valid access token from the shared token manager.
         
         Returns:
             str: A valid access token for Amadeus API calls.
         """
-        # Try to get token from cache first
-        token = self._get_token_from_cache()
-        if token:
-            logger.debug("Using cached Amadeus access token")
-            return token
-        
-        # If not in cache, fetch a new token
-        logger.info("No cached token found, fetching new token")
-        return self._fetch_new_token()
+        return amadeus_token_manager.get_token()
     
-    def invalidate_token(self):
+    def invalidate_token(self, token=None):
         """
         Invalidate the cached token, forcing a new token fetch on next request.
+        
+        Args:
+            token (str, optional): Only invalidate if this is still the cached token.
         """
-        cache.delete(AMADEUS_TOKEN_CACHE_KEY)
-        logger.info("Amadeus access token invalidated")
+        amadeus_token_manager.invalidate(token)
     
+    @coalesce('amadeus:flight-offers')
     def search_flights(self, origin, destination, departure_date, return_date=None, adults=1):
         """
         Search for flights using the Amadeus Flight Offers Search API.
@@ -143,16 +81,16 @@ class AmadeusService:
         url = f"{self.base_url}/v2/shopping/flight-offers"
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = provider_http.get(url, headers=headers, params=params, timeout=30, endpoint='amadeus.flight_offers', rate_limit=self.rate_limiter)
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 401:
                 # Token might be expired, invalidate and retry
                 logger.warning("Token expired, invalidating and retrying")
-                self.invalidate_token()
+                self.invalidate_token(token)
                 token = self.get_access_token()
                 headers['Authorization'] = f'Bearer {token}'
-                response = requests.get(url, headers=headers, params=params, timeout=30)
+                response = provider_http.get(url, headers=headers, params=params, timeout=30, endpoint='amadeus.flight_offers', rate_limit=self.rate_limiter)
                 if response.status_code == 200:
                     return response.json()
                 else:
@@ -165,6 +103,7 @@ class AmadeusService:
             logger.error(f"Request error during flight search: {e}")
             return None
     
+    @coalesce('amadeus:locations')
     def search_airports(self, keyword, sub_type='AIRPORT,CITY'):
         """
         Search for airports and cities using the Amadeus API.
@@ -189,15 +128,15 @@ class AmadeusService:
         url = f"{self.base_url}/v1/reference-data/locations"
         
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = provider_http.get(url, headers=headers, params=params, timeout=30, endpoint='amadeus.locations', rate_limit=self.rate_limiter)
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 401:
                 logger.warning("Token expired, invalidating and retrying")
-                self.invalidate_token()
+                self.invalidate_token(token)
                 token = self.get_access_token()
                 headers['Authorization'] = f'Bearer {token}'
-                response = requests.get(url, headers=headers, params=params, timeout=30)
+                response = provider_http.get(url, headers=headers, params=params, timeout=30, endpoint='amadeus.locations', rate_limit=self.rate_limiter)
                 if response.status_code == 200:
                     return response.json()
                 else:
@@ -239,15 +178,15 @@ class AmadeusService:
         }
         
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = provider_http.post(url, headers=headers, json=payload, timeout=30, endpoint='amadeus.flight_orders', rate_limit=self.rate_limiter)
             if response.status_code in [200, 201]:
                 return response.json()
             elif response.status_code == 401:
                 logger.warning("Token expired, invalidating and retrying")
-                self.invalidate_token()
+                self.invalidate_token(token)
                 token = self.get_access_token()
                 headers['Authorization'] = f'Bearer {token}'
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
+                response = provider_http.post(url, headers=headers, json=payload, timeout=30, endpoint='amadeus.flight_orders', rate_limit=self.rate_limiter)
                 if response.status_code in [200, 201]:
                     return response.json()
                 else:
@@ -279,15 +218,15 @@ class AmadeusService:
         url = f"{self.base_url}/v1/booking/flight-orders/{order_id}"
         
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = provider_http.get(url, headers=headers, timeout=30, endpoint='amadeus.flight_orders', rate_limit=self.rate_limiter)
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 401:
                 logger.warning("Token expired, invalidating and retrying")
-                self.invalidate_token()
+                self.invalidate_token(token)
                 token = self.get_access_token()
                 headers['Authorization'] = f'Bearer {token}'
-                response = requests.get(url, headers=headers, timeout=30)
+                response = provider_http.get(url, headers=headers, timeout=30, endpoint='amadeus.flight_orders', rate_limit=self.rate_limiter)
                 if response.status_code == 200:
                     return response.json()
                 else:
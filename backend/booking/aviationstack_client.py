@@ -1,13 +1,16 @@
 import requests
 from django.conf import settings
 import logging
+from .provider_http import provider_http
+from .rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 class AviationStackClient:
     def __init__(self):
         self.api_key = getattr(settings, 'AVIATIONSTACK_API_KEY', None)
-        self.base_url = 'http://api.aviationstack.com/v1'
+        self.base_url = getattr(settings, 'AVIATIONSTACK_BASE_URL', 'http://api.aviationstack.com/v1')
+        self.rate_limiter = get_rate_limiter('aviationstack', self.api_key)
 
         if not self.api_key:
             logger.error("Aviation Stack API key not configured")
@@ -37,7 +40,7 @@ class AviationStackClient:
 
             logger.info(f"Aviation Stack API request: {url} with params: {params}")
 
-            response = requests.get(url, params=params, timeout=15)
+            response = provider_http.get(url, params=params, timeout=15, endpoint='aviationstack.flights', rate_limit=self.rate_limiter)
 
             logger.info(f"Aviation Stack API response status: {response.status_code}")
 
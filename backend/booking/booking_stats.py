@@ -0,0 +1,206 @@
+"""
+Admin booking statistics.
+
+``compute_booking_stats`` counts bookings per payment status and sums the
+revenue of paid ones in one conditional aggregate, a single scan of the
+bookings table. The admin endpoint does not run it per request. Booking
+signals append a BookingStatsDelta row for every create, delete and payment
+status change, and the ``fold_booking_stats_deltas`` beat task adds those
+rows into the BookingStats row and deletes them. A read returns the row plus
+the deltas not folded yet in one query, however many bookings there are.
+
+Deltas are inserted in the transaction that writes the booking, so a
+rolled-back booking leaves none behind. Inserting never touches a shared
+row, so concurrent booking writes do not queue on each other; only the fold
+and the recount lock the stats row.
+
+``reconcile_booking_stats`` recounts nightly. It counts the bookings and sums
+the unfolded deltas in a single statement, so both come from the same
+snapshot, and sets the row to the count minus those deltas: every committed
+booking is in the count and its delta cancels out, every uncommitted one is
+in neither. A booking saved outside a transaction writes its delta in a
+statement of its own right after it; a recount landing between the two
+counts that booking twice until the next recount. Changes that bypass
+signals (queryset ``update()``, flight price edits) leave drift that the
+recount removes.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Func, IntegerField, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Booking, BookingStats, BookingStatsDelta
+
+# Counter column for each payment status
+STATUS_FIELDS = {
+    'paid': 'paid_bookings',
+    'pending': 'pending_bookings',
+    'failed': 'failed_bookings',
+}
+STAT_FIELDS = ('total_bookings', *STATUS_FIELDS.values(), 'total_revenue')
+
+# Deltas folded into the stats row per transaction
+FOLD_BATCH_SIZE = 5000
+
+
+def compute_booking_stats():
+    """
+    Count bookings and paid revenue in a single query.
+
+    Returns:
+        dict: ``total_bookings``, ``paid_bookings``, ``pending_bookings``,
+        ``failed_bookings`` and ``total_revenue``.
+    """
+    stats = Booking.objects.aggregate(
+        total_bookings=Count('id'),
+        **{field: Count('id', filter=Q(payment_status=status)) for status, field in STATUS_FIELDS.items()},
+        total_revenue=Sum('flight__price', filter=Q(payment_status='paid')),
+    )
+    stats['total_revenue'] = stats['total_revenue'] or Decimal('0')
+    return stats
+
+
+def _output_field(field):
+    return DecimalField(max_digits=14, decimal_places=2) if field == 'total_revenue' else IntegerField()
+
+
+def _scalar(queryset, function, column, field):
+    # A plain SQL function rather than an aggregate, so the subquery gets no GROUP BY
+    total = Func(F(column), function=function, output_field=_output_field(field))
+    return Coalesce(Subquery(queryset.order_by().values(total=total)), Value(0), output_field=_output_field(field))
+
+
+def _pending_deltas():
+    return {f'pending_{field}': _scalar(BookingStatsDelta.objects.all(), 'SUM', field, field) for field in STAT_FIELDS}
+
+
+def _booking_counts():
+    counts = {'counted_total_bookings': _scalar(Booking.objects.all(), 'COUNT', 'id', 'total_bookings')}
+    for status, field in STATUS_FIELDS.items():
+        counts[f'counted_{field}'] = _scalar(Booking.objects.filter(payment_status=status), 'COUNT', 'id', field)
+    counts['counted_total_revenue'] = _scalar(
+        Booking.objects.filter(payment_status='paid'), 'SUM', 'flight__price', 'total_revenue'
+    )
+    return counts
+
+
+def _stats_row():
+    return BookingStats.objects.filter(pk=BookingStats.SINGLETON_ID)
+
+
+def get_booking_stats():
+    """
+    Return the stats row plus the deltas not folded into it yet, in one query.
+
+    The row is created from a full count on first use.
+    """
+    pending = _pending_deltas()
+    row = _stats_row().annotate(**pending).values(*STAT_FIELDS, *pending).first()
+    if row is None:
+        return reconcile_booking_stats()
+    return {field: row[field] + row[f'pending_{field}'] for field in STAT_FIELDS}
+
+
+def reconcile_booking_stats():
+    """
+    Reset the stats row from a fresh count of the bookings table.
+
+    The bookings and the unfolded deltas are read by one statement, and the
+    row is set to the count minus those deltas, so a booking is never counted
+    both by the recount and by its delta. The row lock keeps a concurrent fold
+    from moving deltas into the row meanwhile.
+
+    Returns:
+        dict: The recounted stats.
+    """
+    with transaction.atomic():
+        BookingStats.objects.get_or_create(pk=BookingStats.SINGLETON_ID)
+        BookingStats.objects.select_for_update().get(pk=BookingStats.SINGLETON_ID)
+        expressions = {**_booking_counts(), **_pending_deltas()}
+        row = _stats_row().annotate(**expressions).values(*expressions).get()
+        stats = {field: row[f'counted_{field}'] for field in STAT_FIELDS}
+        now = timezone.now()
+        _stats_row().update(
+            **{field: stats[field] - row[f'pending_{field}'] for field in STAT_FIELDS},
+            updated_at=now, reconciled_at=now,
+        )
+    return stats
+
+
+def fold_booking_stats_deltas(batch_size=FOLD_BATCH_SIZE):
+    """
+    Add the oldest ``batch_size`` deltas into the stats row and delete them.
+
+    Only the deltas read are deleted, so one committed meanwhile waits for the
+    next fold.
+
+    Returns:
+        int: Number of deltas folded.
+    """
+    with transaction.atomic():
+        BookingStats.objects.get_or_create(pk=BookingStats.SINGLETON_ID)
+        BookingStats.objects.select_for_update().get(pk=BookingStats.SINGLETON_ID)
+        deltas = list(BookingStatsDelta.objects.order_by('id').values('id', *STAT_FIELDS)[:batch_size])
+        if not deltas:
+            return 0
+        merged = _merge({field: delta[field] for field in STAT_FIELDS} for delta in deltas)
+        _stats_row().update(**{field: F(field) + value for field, value in merged.items()}, updated_at=timezone.now())
+        BookingStatsDelta.objects.filter(id__in=[delta['id'] for delta in deltas]).delete()
+    return len(deltas)
+
+
+def _price(booking):
+    # An unsaved or freshly created flight may still carry the price as passed in
+    return Decimal(str(booking.flight.price))
+
+
+def _delta(booking, sign):
+    delta = {'total_bookings': sign}
+    field = STATUS_FIELDS.get(booking.payment_status)
+    if field:
+        delta[field] = sign
+    if booking.payment_status == 'paid':
+        delta['total_revenue'] = _price(booking) * sign
+    return delta
+
+
+def _merge(deltas):
+    merged = {}
+    for delta in deltas:
+        for field, value in delta.items():
+            merged[field] = merged.get(field, 0) + value
+    return {field: value for field, value in merged.items() if value}
+
+
+def _record(delta):
+    # An insert of its own row: concurrent booking writes never wait on each other here
+    if delta:
+        BookingStatsDelta.objects.create(**delta)
+
+
+def record_created(bookings):
+    """Count newly created bookings; call for inserts that skip signals, e.g. bulk_create."""
+    _record(_merge(_delta(booking, 1) for booking in bookings))
+
+
+def record_deleted(bookings):
+    """Stop counting deleted bookings."""
+    _record(_merge(_delta(booking, -1) for booking in bookings))
+
+
+def record_payment_change(booking, previous):
+    """Move a booking from its ``previous`` payment status to its current one."""
+    current = booking.payment_status
+    if previous == current:
+        return
+    delta = {}
+    for status, sign in ((previous, -1), (current, 1)):
+        if status in STATUS_FIELDS:
+            delta[STATUS_FIELDS[status]] = sign
+    if 'paid' in (previous, current):
+        price = _price(booking)
+        delta['total_revenue'] = price if current == 'paid' else -price
+    _record(delta)
@@ -0,0 +1,230 @@
+"""
+Per-endpoint circuit breakers and adaptive timeouts for provider calls.
+
+Every provider endpoint (e.g. ``amadeus.flight_offers``) gets a breaker.
+Request and error counts are kept in time buckets in the shared cache, and
+the open/closed state lives there too, so all workers agree on whether a
+provider is healthy. When the rolling error rate crosses the threshold the
+breaker opens and calls fail fast with ``CircuitOpenError``; after a
+cooldown one worker is allowed through as a half-open probe.
+
+Latency samples are kept per process and used to derive the read timeout
+from the observed p99, so a degraded provider cannot pin a sync worker for
+the full static timeout.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Provider endpoints guarded by breakers, as passed to provider_http
+PROVIDER_ENDPOINTS = (
+    'amadeus.token',
+    'amadeus.flight_offers',
+    'amadeus.locations',
+    'amadeus.hotel_offers',
+    'amadeus.hotel_details',
+    'amadeus.flight_orders',
+    'airlabs.airports',
+    'aviationstack.flights',
+    'opensky.departures',
+    'opensky.states',
+)
+
+# Defaults, overridable in settings
+DEFAULT_FAILURE_RATE = 0.5  # Error ratio that opens the breaker
+DEFAULT_MIN_REQUESTS = 10  # Requests needed in the window before the ratio is trusted
+DEFAULT_WINDOW = 60  # Rolling window in seconds
+DEFAULT_BUCKET = 10  # Bucket width in seconds
+DEFAULT_COOLDOWN = 30  # Seconds an open breaker waits before a half-open probe
+DEFAULT_TIMEOUT_MULTIPLIER = 2.0  # Adaptive timeout = p99 * multiplier
+DEFAULT_TIMEOUT_FLOOR = 1.0  # Adaptive timeouts never go below this many seconds
+DEFAULT_TIMEOUT_MIN_SAMPLES = 20  # Samples needed before timeouts adapt
+LATENCY_SAMPLES = 200  # Latency samples kept per endpoint and process
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Raised instead of calling a provider whose breaker is open.
+
+    Subclasses RequestException so existing client error handling returns
+    None and callers fall back to cached or fallback data.
+    """
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class CircuitBreaker:
+    """
+    Cache-shared circuit breaker for a single provider endpoint.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.failure_rate = getattr(settings, 'CIRCUIT_BREAKER_FAILURE_RATE', DEFAULT_FAILURE_RATE)
+        self.min_requests = getattr(settings, 'CIRCUIT_BREAKER_MIN_REQUESTS', DEFAULT_MIN_REQUESTS)
+        self.window = getattr(settings, 'CIRCUIT_BREAKER_WINDOW', DEFAULT_WINDOW)
+        self.bucket = getattr(settings, 'CIRCUIT_BREAKER_BUCKET', DEFAULT_BUCKET)
+        self.cooldown = getattr(settings, 'CIRCUIT_BREAKER_COOLDOWN', DEFAULT_COOLDOWN)
+        self.timeout_multiplier = getattr(settings, 'ADAPTIVE_TIMEOUT_MULTIPLIER', DEFAULT_TIMEOUT_MULTIPLIER)
+        self.timeout_floor = getattr(settings, 'ADAPTIVE_TIMEOUT_FLOOR', DEFAULT_TIMEOUT_FLOOR)
+        self.timeout_min_samples = getattr(settings, 'ADAPTIVE_TIMEOUT_MIN_SAMPLES', DEFAULT_TIMEOUT_MIN_SAMPLES)
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    @property
+    def state_key(self):
+        return f"circuit:{self.name}:state"
+
+    @property
+    def probe_key(self):
+        return f"circuit:{self.name}:probe"
+
+    def _bucket_keys(self, now):
+        current = int(now // self.bucket)
+        buckets = range(current - self.window // self.bucket + 1, current + 1)
+        return [(f"circuit:{self.name}:{b}:total", f"circuit:{self.name}:{b}:errors") for b in buckets]
+
+    def _incr(self, key):
+        if not cache.add(key, 1, self.window + self.bucket):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, self.window + self.bucket)
+
+    def _counts(self, now):
+        keys = self._bucket_keys(now)
+        values = cache.get_many([key for pair in keys for key in pair])
+        total = sum(values.get(total_key, 0) for total_key, _ in keys)
+        errors = sum(values.get(errors_key, 0) for _, errors_key in keys)
+        return total, errors
+
+    def _reset_window(self, now):
+        cache.delete_many([key for pair in self._bucket_keys(now) for key in pair])
+
+    def state(self, now=None):
+        """Return 'closed', 'open' or 'half_open' as seen by all workers."""
+        now = now or time.time()
+        entry = cache.get(self.state_key)
+        if not entry:
+            return CLOSED
+        if now - entry['opened_at'] >= self.cooldown:
+            return HALF_OPEN
+        return OPEN
+
+    def before_call(self):
+        """
+        Check whether a call may proceed.
+
+        Returns:
+            bool: True if this call is the half-open probe.
+
+        Raises:
+            CircuitOpenError: If the breaker is open (or another worker is probing).
+        """
+        state = self.state()
+        if state == CLOSED:
+            return False
+        if state == HALF_OPEN and cache.add(self.probe_key, True, self.cooldown):
+            logger.info(f"Circuit {self.name} half-open, sending probe")
+            return True
+        raise CircuitOpenError(f"Circuit open for {self.name}")
+
+    def release_probe(self):
+        """Give up the half-open probe slot without a result, e.g. when the call was never sent."""
+        cache.delete(self.probe_key)
+
+    def _open(self, now):
+        cache.set(self.state_key, {'opened_at': now}, None)
+        logger.warning(f"Circuit {self.name} opened")
+
+    def record_success(self, latency, probe=False):
+        now = time.time()
+        with self._lock:
+            self._latencies.append(latency)
+        if probe:
+            cache.delete_many([self.state_key, self.probe_key])
+            self._reset_window(now)
+            logger.info(f"Circuit {self.name} closed after successful probe")
+            return
+        self._incr(self._bucket_keys(now)[-1][0])
+
+    def record_failure(self, latency, probe=False):
+        now = time.time()
+        with self._lock:
+            self._latencies.append(latency)
+        if probe:
+            cache.delete(self.probe_key)
+            self._open(now)
+            return
+        total_key, errors_key = self._bucket_keys(now)[-1]
+        self._incr(total_key)
+        self._incr(errors_key)
+        total, errors = self._counts(now)
+        if total >= self.min_requests and errors / total >= self.failure_rate and self.state(now) == CLOSED:
+            self._open(now)
+
+    def latency_percentiles(self):
+        with self._lock:
+            samples = sorted(self._latencies)
+        return {
+            'p50': _percentile(samples, 0.50),
+            'p95': _percentile(samples, 0.95),
+            'p99': _percentile(samples, 0.99),
+            'samples': len(samples),
+        }
+
+    def timeout(self, default):
+        """
+        Return the read timeout to use, adapted from the observed p99.
+
+        The adaptive value is clamped between the configured floor and the
+        caller's static timeout.
+        """
+        with self._lock:
+            if len(self._latencies) < self.timeout_min_samples:
+                return default
+            samples = sorted(self._latencies)
+        p99 = _percentile(samples, 0.99)
+        return min(default, max(self.timeout_floor, p99 * self.timeout_multiplier))
+
+    def snapshot(self):
+        """Return breaker state, rolling error rate and latency percentiles."""
+        now = time.time()
+        total, errors = self._counts(now)
+        return {
+            'state': self.state(now),
+            'requests': total,
+            'errors': errors,
+            'error_rate': round(errors / total, 4) if total else 0.0,
+            'latency': self.latency_percentiles(),
+        }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Return the process-wide breaker for an endpoint, creating it on first use."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
@@ -5,6 +5,7 @@ This module provides custom exception classes and a custom exception handler
 for consistent error responses across the API.
 """
 
+from rest_framework.exceptions import APIException
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status
@@ -63,6 +64,17 @@ class InvalidFlightDataException(Exception):
         super().__init__(self.message)
 
 
+class SeatsUnavailableException(APIException):
+    """
+    Exception raised when a booking asks for more seats than a cabin has left.
+
+    An APIException, so DRF's default handler answers 409 without the custom handler.
+    """
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "No seats left on this flight"
+    default_code = "seats_unavailable"
+
+
 def custom_exception_handler(exc, context):
     """
     Custom exception handler for DRF that provides consistent error responses.
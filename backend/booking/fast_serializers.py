@@ -0,0 +1,166 @@
+"""
+Read-only fast path for the Flight and Booking list endpoints.
+
+FlightSerializer runs five SerializerMethodFields per row and
+BookingSerializer nests full user and flight serializers, so on list
+endpoints most CPU goes to DRF field dispatch and model instantiation.
+The serializers here read ``.values()`` rows (no model instances) and build
+the same output dicts with accessors resolved once per serializer: the
+column names to read, the timezone for datetimes and the decimal quantum
+for prices.
+
+The output renders to the same JSON as the DRF serializers; the parity is
+covered by test_fast_serializers.
+"""
+
+from decimal import Decimal
+from operator import itemgetter
+
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .iata_utils import get_iata_code
+from .models import Flight
+from .route_matrix import block_time
+
+
+def iso_datetime(value, tz):
+    """DRF's ISO 8601 DateTimeField representation: converted to ``tz``, 'Z' for UTC."""
+    if not value:
+        return None
+    if tz is not None:
+        value = value.astimezone(tz)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def output_timezone():
+    """
+    Timezone datetimes are converted to, or None when that is UTC.
+
+    Aware datetimes read from the database are already in UTC, so with the
+    default TIME_ZONE the per-row conversion is skipped.
+    """
+    tz = timezone.get_current_timezone()
+    return None if str(tz) == 'UTC' else tz
+
+
+class FastFlightSerializer:
+    """
+    FlightSerializer's output from ``.values()`` rows.
+
+    Args:
+        context (dict): Serializer context; shares FlightSerializer's route memo.
+        prefix (str): Column prefix when the flight is read through a relation,
+            e.g. ``'flight__'`` from a Booking queryset.
+    """
+    field_names = ('id', 'flight_number', 'departure', 'arrival', 'date', 'price', 'status',
+                   'origin_iata', 'destination_iata')
+
+    def __init__(self, context=None, prefix=''):
+        self.context = context if context is not None else {}
+        self.routes = self.context.setdefault('_route_codes', {})
+        self.blocks = {}
+        self.tz = output_timezone()
+        self.prices = {}
+        self.quantum = Decimal(1).scaleb(-Flight._meta.get_field('price').decimal_places)
+        self.columns = tuple(prefix + name for name in self.field_names)
+        self.read_row = itemgetter(*self.columns)
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def route_block(self, departure, arrival, origin_iata, destination_iata):
+        """``(timedelta, iso_duration)`` for a route, resolved once per serializer."""
+        key = (departure, arrival)
+        block = self.blocks.get(key)
+        if block is None:
+            codes = self.routes.get(key)
+            if codes is None:
+                codes = self.routes[key] = (origin_iata or get_iata_code(departure), destination_iata or get_iata_code(arrival))
+            block = self.blocks[key] = block_time(*codes)
+        return block
+
+    def price(self, value):
+        if value is None:
+            return None
+        text = self.prices.get(value)
+        if text is None:
+            text = self.prices[value] = '{:f}'.format(value.quantize(self.quantum))
+        return text
+
+    def to_representation(self, row):
+        (pk, flight_number, departure, arrival, date, price, status,
+         origin_iata, destination_iata) = self.read_row(row)
+        block, duration = self.route_block(departure, arrival, origin_iata, destination_iata)
+        return {
+            'id': pk,
+            'flightNumber': flight_number,
+            'from_location': departure,
+            'to': arrival,
+            'departureTime': iso_datetime(date, self.tz),
+            'arrivalTime': date + block,
+            'duration': duration,
+            'stops': 0,
+            'price': self.price(price),
+            'currency': 'USD',
+            'airline': flight_number[:2] if len(flight_number) >= 2 else 'UNK',
+            'status': status,
+        }
+
+    def serialize(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+class FastBookingSerializer:
+    """
+    BookingSerializer's output (nested user and flight) from one joined ``.values()`` query.
+    """
+    user_fields = ('id', 'username', 'email', 'first_name', 'last_name', 'status')
+
+    def __init__(self, context=None):
+        self.flight = FastFlightSerializer(context, prefix='flight__')
+        self.tz = self.flight.tz
+        self.user_columns = tuple('user__' + name for name in self.user_fields)
+        self.columns = ('id', 'payment_status', 'cabin', 'passenger_name', 'group_reference', 'created_at') + self.user_columns + self.flight.columns
+        self.read_user = itemgetter(*self.user_columns)
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'user': dict(zip(self.user_fields, self.read_user(row))),
+            'flight': self.flight.to_representation(row),
+            'payment_status': row['payment_status'],
+            'cabin': row['cabin'],
+            'passenger_name': row['passenger_name'],
+            'group_reference': row['group_reference'],
+            'created_at': iso_datetime(row['created_at'], self.tz),
+        }
+
+    def serialize(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+class FastListMixin:
+    """
+    Serve GET lists through ``fast_serializer_class`` instead of the DRF serializer.
+
+    Pagination works unchanged: KeysetPagination pages the ``.values()``
+    queryset, so the ordering columns must be among the serializer's columns.
+    """
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        fast = self.fast_serializer_class(context=self.get_serializer_context())
+        rows = fast.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(rows))
@@ -0,0 +1,115 @@
+"""
+Mappers from provider payloads to the flight format returned by the search API.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from .airport_snapshot import get_snapshot
+from .route_matrix import get_route_matrix, iso_duration
+
+logger = logging.getLogger(__name__)
+
+
+def city_label(iata_code, snapshot=None):
+    """Return the city name shown for an airport, falling back to the code itself."""
+    snapshot = snapshot or get_snapshot()
+    return snapshot.city_name(iata_code) or iata_code
+
+
+def map_amadeus_flights(amadeus_data):
+    """Map Amadeus API response to our flight format"""
+    # Safely extract flight offers list from Amadeus API response
+    # Amadeus returns {"data": [...], "meta": {...}} or just [...] depending on endpoint
+    if amadeus_data is None:
+        logger.warning("Amadeus data is None")
+        return []
+
+    if isinstance(amadeus_data, dict):
+        # Standard Amadeus response format: {"data": [...], ...}
+        flight_offers = amadeus_data.get('data', [])
+        if not isinstance(flight_offers, list):
+            logger.error(f"Unexpected 'data' field type from Amadeus API: {type(flight_offers)}")
+            return []
+    elif isinstance(amadeus_data, list):
+        # Direct list response (some Amadeus endpoints return list directly)
+        flight_offers = amadeus_data
+    else:
+        logger.error(f"Unexpected Amadeus response type: {type(amadeus_data)}")
+        return []
+
+    snapshot = get_snapshot()
+    flights = []
+    for offer in flight_offers[:10]:  # Limit to 10 results
+        try:
+            itinerary = offer['itineraries'][0]
+            segment = itinerary['segments'][0]
+
+            flight = {
+                'id': offer['id'],
+                'flightNumber': segment['carrierCode'] + segment['number'],
+                'from_location': city_label(segment['departure']['iataCode'], snapshot),
+                'to': city_label(segment['arrival']['iataCode'], snapshot),
+                'departureTime': segment['departure']['at'],
+                'arrivalTime': segment['arrival']['at'],
+                'duration': itinerary['duration'],
+                'stops': len(itinerary['segments']) - 1,
+                'price': float(offer['price']['total']),
+                'currency': offer['price']['currency'],
+                'airline': segment.get('carrierCode', 'Unknown'),
+                'status': 'scheduled'  # Default status for scheduled flights
+            }
+            flights.append(flight)
+        except (KeyError, IndexError, ValueError) as e:
+            logger.error(f"Error mapping Amadeus flight data: {e}")
+            continue
+    return flights
+
+
+def map_tracking_flights(tracking_flights):
+    """
+    Map AviationStack/OpenSky flight dicts to our flight format.
+
+    These providers return tracking data without prices, so the price is
+    kept as 'N/A' and the currency left empty. A missing duration or
+    arrival time is estimated from the route matrix.
+    """
+    flights = []
+    for flight in tracking_flights or []:
+        flight = _fill_block_time(flight)
+        flights.append({
+            'id': flight.get('id', ''),
+            'flightNumber': (flight.get('flightNumber') or 'Unknown').strip(),
+            'from_location': flight.get('from', ''),
+            'to': flight.get('to', ''),
+            'departureTime': flight.get('departureTime', ''),
+            'arrivalTime': flight.get('arrivalTime', ''),
+            'duration': flight.get('duration', 'N/A'),
+            'stops': flight.get('stops', 0),
+            'price': flight.get('price', 'N/A'),
+            'currency': '',
+            'airline': flight.get('airline', 'Unknown'),
+            'status': flight.get('status', 'scheduled')
+        })
+    return flights
+
+
+def _fill_block_time(flight):
+    """Estimate duration/arrivalTime from the route matrix when the provider has none."""
+    missing_duration = flight.get('duration') in (None, '', 'N/A')
+    if not missing_duration and flight.get('arrivalTime'):
+        return flight
+    minutes = get_route_matrix().block_minutes(flight.get('from'), flight.get('to'))
+    if minutes is None:
+        return flight
+    minutes = int(round(minutes))
+    flight = dict(flight)
+    if missing_duration:
+        flight['duration'] = iso_duration(minutes)
+    if not flight.get('arrivalTime') and flight.get('departureTime'):
+        try:
+            departure = datetime.fromisoformat(flight['departureTime'])
+        except (TypeError, ValueError):
+            return flight
+        flight['arrivalTime'] = (departure + timedelta(minutes=minutes)).isoformat()
+    return flight
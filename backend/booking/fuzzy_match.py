@@ -0,0 +1,117 @@
+"""
+Typo-tolerant lookup of short phrases such as city names.
+
+SymSpellIndex is a symmetric-delete index: every vocabulary term is stored
+under each string obtainable by deleting up to ``max_distance`` characters.
+A query generates its own deletes and only the terms sharing one of them are
+compared with an edit distance, so a lookup touches a handful of candidates
+instead of the whole vocabulary, whatever its size.
+
+Distances are optimal string alignment (Levenshtein plus adjacent
+transpositions), so "Frankfrut" is one edit from "frankfurt".
+
+The index is immutable: build it once (at import) and share it.
+"""
+
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def fold(text):
+    """Lower-case, strip accents and punctuation: 'São Paulo–Guarulhos' -> 'sao paulo guarulhos'."""
+    decomposed = unicodedata.normalize('NFKD', str(text or ''))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', stripped.casefold()).strip()
+
+
+def _deletes(word, max_distance):
+    """All strings reachable from ``word`` by deleting up to ``max_distance`` characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {candidate[:i] + candidate[i + 1:] for candidate in frontier for i in range(len(candidate))}
+        found |= frontier
+    return found
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance between ``a`` and ``b``.
+
+    Returns ``limit + 1`` as soon as the distance is known to exceed ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SymSpellIndex:
+    """
+    Symmetric-delete index mapping terms to values.
+
+    Args:
+        terms (dict): Values keyed by term. Terms are folded before indexing;
+            when two terms fold to the same string the first one wins.
+        max_distance (int): Largest edit distance a lookup may use.
+    """
+
+    def __init__(self, terms, max_distance=2):
+        self.max_distance = max_distance
+        self._values = {}
+        for term, value in terms.items():
+            self._values.setdefault(fold(term), value)
+        self._deletes = {}
+        for term in self._values:
+            for variant in _deletes(term, max_distance):
+                self._deletes.setdefault(variant, []).append(term)
+
+    def __len__(self):
+        return len(self._values)
+
+    def lookup(self, query, max_distance=None):
+        """
+        Return ``(value, distance, term)`` for the closest term, or None.
+
+        None is also returned when the closest terms are equally distant but
+        map to different values, rather than guessing between them.
+        """
+        query = fold(query)
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        if query in self._values:
+            return self._values[query], 0, query
+
+        best_distance = limit + 1
+        best = []
+        seen = set()
+        for variant in _deletes(query, limit):
+            for term in self._deletes.get(variant, ()):
+                if term in seen:
+                    continue
+                seen.add(term)
+                distance = edit_distance(query, term, min(limit, best_distance))
+                if distance < best_distance:
+                    best_distance, best = distance, [term]
+                elif distance == best_distance and distance <= limit:
+                    best.append(term)
+        if not best:
+            return None
+        values = {self._values[term] for term in best}
+        if len(values) > 1:
+            return None
+        term = min(best)
+        return self._values[term], best_distance, term
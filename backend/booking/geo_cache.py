@@ -0,0 +1,231 @@
+"""
+Geohash-quantized result cache for coordinate searches.
+
+Nearby-airport and hotel-by-geocode searches from users a few hundred
+metres apart used to be computed (or fetched from Amadeus) separately. Here
+a coordinate is snapped to its geohash cell and results are cached per cell
+and radius in the shared Django cache.
+
+The cached value is fetched once for the cell centre with the radius grown
+by the distance from the centre to the farthest cell corner. By the triangle
+inequality that superset holds everything within the requested radius of
+any point in the cell, so callers refine it for the exact point (recompute
+distances, filter, sort) and get the same answer as an uncached search.
+
+Entries can also be kept in a small per-process LRU in front of the shared
+cache, which avoids unpickling on every hit. Hit/miss counts are batched
+in-process before being added to the shared counters.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .iata_utils import calculate_distance
+from .search_cache import HIT, MISS, CacheStats
+
+logger = logging.getLogger(__name__)
+
+# Default geohash length; 5 characters is a cell of roughly 4.9 x 4.9 km
+DEFAULT_PRECISION = 5
+# Default seconds a cell's result stays cached
+DEFAULT_TTL = 600
+# Lookups counted in-process before being added to the shared counters
+STATS_FLUSH_EVERY = 50
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def geohash_cell(latitude, longitude, precision):
+    """
+    Encode a coordinate as a geohash.
+
+    Returns:
+        tuple: ``(geohash, (lat_min, lat_max, lon_min, lon_max))`` bounds of the cell.
+    """
+    lat_min, lat_max, lon_min, lon_max = -90.0, 90.0, -180.0, 180.0
+    chars = []
+    even = True
+    value = bit_count = 0
+    while len(chars) < precision:
+        if even:
+            middle = (lon_min + lon_max) / 2
+            if longitude >= middle:
+                value = value * 2 + 1
+                lon_min = middle
+            else:
+                value *= 2
+                lon_max = middle
+        else:
+            middle = (lat_min + lat_max) / 2
+            if latitude >= middle:
+                value = value * 2 + 1
+                lat_min = middle
+            else:
+                value *= 2
+                lat_max = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[value])
+            value = bit_count = 0
+    return ''.join(chars), (lat_min, lat_max, lon_min, lon_max)
+
+
+@lru_cache(maxsize=4096)
+def _cell_reach(lat_min, lat_max, lon_span):
+    """Distance from a cell's centre to its farthest corner; depends only on its latitude band and width."""
+    centre_lat = (lat_min + lat_max) / 2
+    return max(
+        calculate_distance(centre_lat, 0.0, corner_lat, corner_lon)
+        for corner_lat in (lat_min, lat_max) for corner_lon in (-lon_span / 2, lon_span / 2)
+    )
+
+
+class GeoResultCache:
+    """
+    Per-geohash-cell cache for radius searches.
+
+    Args:
+        namespace (str): Cache key and stats prefix.
+        ttl (int): Seconds a cell's result stays cached (``GEO_CACHE_TTL``).
+        precision (int): Geohash length (``GEO_CACHE_PRECISION``).
+        local_size (int): Cells also kept in a per-process LRU (0 disables it).
+    """
+
+    def __init__(self, namespace, ttl=None, precision=None, local_size=0):
+        self.namespace = namespace
+        self._ttl = ttl
+        self._precision = precision
+        self.local_size = local_size
+        self.stats = CacheStats(namespace, ['hits', 'misses'])
+        self._local = OrderedDict()
+        self._pending = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else getattr(settings, 'GEO_CACHE_TTL', DEFAULT_TTL)
+
+    @property
+    def precision(self):
+        if self._precision is not None:
+            return self._precision
+        return getattr(settings, 'GEO_CACHE_PRECISION', DEFAULT_PRECISION)
+
+    def cell(self, latitude, longitude):
+        """
+        Return ``(geohash, centre_lat, centre_lon, reach_km)`` for a coordinate.
+
+        ``reach_km`` is the distance from the cell centre to its farthest corner.
+        """
+        geohash, (lat_min, lat_max, lon_min, lon_max) = geohash_cell(latitude, longitude, self.precision)
+        centre_lat, centre_lon = (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+        return geohash, centre_lat, centre_lon, _cell_reach(lat_min, lat_max, lon_max - lon_min)
+
+    def get_or_fetch(self, latitude, longitude, radius_km, fetch, *key_parts):
+        """
+        Return the cached superset for the cell containing a coordinate.
+
+        Args:
+            latitude (float): Query latitude in degrees.
+            longitude (float): Query longitude in degrees.
+            radius_km (float): Radius the caller will refine to.
+            fetch (callable): ``fetch(centre_lat, centre_lon, search_radius_km)``;
+                a falsy result is returned but not cached.
+            *key_parts: Other parameters the result depends on (dates, guests...).
+
+        Returns:
+            tuple: ``(value, state)`` where state is 'hit' or 'miss'.
+        """
+        geohash, centre_lat, centre_lon, reach = self.cell(latitude, longitude)
+        key = ':'.join([self.namespace, geohash, str(radius_km)] + [str(part) for part in key_parts])
+        value = self._local_get(key)
+        if value is None:
+            value = cache.get(key)
+            if value is not None:
+                self._local_set(key, value)
+        if value is not None:
+            self._count('hits')
+            return value, HIT
+        self._count('misses')
+        value = fetch(centre_lat, centre_lon, radius_km + reach)
+        if value:
+            cache.set(key, value, self.ttl)
+            self._local_set(key, value)
+        return value, MISS
+
+    def _local_get(self, key):
+        if not self.local_size:
+            return None
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry[1]
+
+    def _local_set(self, key, value):
+        if not self.local_size:
+            return
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _count(self, name):
+        with self._lock:
+            self._pending[name] += 1
+            if sum(self._pending.values()) < STATS_FLUSH_EVERY:
+                return
+            pending, self._pending = self._pending, {'hits': 0, 'misses': 0}
+        self._flush(pending)
+
+    def _flush(self, pending):
+        for name, count in pending.items():
+            if count:
+                self.stats.incr(name, count)
+
+    def flush_stats(self):
+        """Add this process's buffered hit/miss counts to the shared counters."""
+        with self._lock:
+            pending, self._pending = self._pending, {'hits': 0, 'misses': 0}
+        self._flush(pending)
+
+    def clear_local(self):
+        """Drop this process's LRU entries and buffered counts."""
+        with self._lock:
+            self._local.clear()
+            self._pending = {'hits': 0, 'misses': 0}
+
+    def report(self):
+        """Return counters, hit ratio and precision for the admin stats endpoint."""
+        self.flush_stats()
+        counters = self.stats.snapshot()
+        lookups = counters['hits'] + counters['misses']
+        return {
+            'counters': counters,
+            'hit_ratio': round(counters['hits'] / lookups, 4) if lookups else None,
+            'precision': self.precision,
+            'ttl': self.ttl,
+        }
+
+
+def is_cacheable(latitude, longitude):
+    """Only well-formed coordinates are quantized; anything else bypasses the cache."""
+    return -90 <= latitude <= 90 and -180 <= longitude <= 180
+
+
+# Shared caches for the GPS airport and hotel geocode searches; airport cells are
+# pure functions of the snapshot, so they are also kept per process
+nearby_airports_cache = GeoResultCache('geo_nearby_airports', local_size=4096)
+hotel_geocode_cache = GeoResultCache('geo_hotels')
@@ -3,10 +3,16 @@ Comprehensive IATA Airport Code Mapping Utility
 
 This module provides comprehensive city-to-IATA and IATA-to-city mappings
 for flight search functionality. It covers major airports worldwide.
+
+Lookups read the shared AirportSnapshot, which is loaded from the Airport
+table (see the sync_airports command). CITY_TO_IATA and IATA_INFO below are
+the built-in seed used when that table is empty.
 """
 
 import math
 
+from .airport_snapshot import get_snapshot
+
 # Comprehensive city to IATA code mapping
 CITY_TO_IATA = {
     # United States - Major Cities
@@ -112,6 +118,10 @@ CITY_TO_IATA = {
 def get_iata_code(city_name):
     """
     Convert city name to IATA code.
+
+    Exact matches only (codes, city names and aliases), so the result is safe
+    to store or to filter on. Typed search input that should forgive typos
+    goes through get_iata_code_fuzzy instead.
     """
     if not city_name:
         return None
@@ -121,18 +131,34 @@ def get_iata_code(city_name):
         return normalized
     
     normalized_lower = str(city_name).strip().lower()
+    snapshot = get_snapshot()
+    city_to_iata = snapshot.city_to_iata
     
-    if normalized_lower in CITY_TO_IATA:
-        return CITY_TO_IATA[normalized_lower]
+    if normalized_lower in city_to_iata:
+        return city_to_iata[normalized_lower]
     
     if 'international' in normalized_lower:
         city_without_intl = normalized_lower.replace(' international', '').strip()
-        if city_without_intl in CITY_TO_IATA:
-            return CITY_TO_IATA[city_without_intl]
+        if city_without_intl in city_to_iata:
+            return city_to_iata[city_without_intl]
     
     return None
 
 
+def get_iata_code_fuzzy(city_name):
+    """
+    Convert a typed city name to IATA code, forgiving typos and missing accents.
+
+    Falls back to the snapshot's fuzzy city index when get_iata_code finds no
+    exact match. The answer is a guess: use it to query providers, never to
+    store on a model or to narrow a database filter.
+    """
+    code = get_iata_code(city_name)
+    if code or not city_name:
+        return code
+    return get_snapshot().fuzzy_iata_code(str(city_name).strip().lower())
+
+
 def get_city_from_iata(iata_code):
     """
     Convert IATA code to city name.
@@ -140,11 +166,8 @@ def get_city_from_iata(iata_code):
     if not iata_code:
         return None
     
-    if not hasattr(get_city_from_iata, '_reverse_map'):
-        get_city_from_iata._reverse_map = {v: k.title() for k, v in CITY_TO_IATA.items()}
-    
     normalized = str(iata_code).strip().upper()
-    return get_city_from_iata._reverse_map.get(normalized)
+    return get_snapshot().city_name(normalized)
 
 
 def is_valid_iata(iata_code):
@@ -386,7 +409,7 @@ def get_airport_info(iata_code):
         return None
     
     normalized = str(iata_code).strip().upper()
-    return IATA_INFO.get(normalized)
+    return get_snapshot().info(normalized)
 
 
 def calculate_distance(lat1, lon1, lat2, lon2):
@@ -414,29 +437,21 @@ def find_nearby_airports(latitude, longitude, limit=5, max_distance=500):
     """
     if not latitude or not longitude:
         return []
-    
-    airports_with_distance = []
-    
-    for iata_code, airport_info in IATA_INFO.items():
-        if 'lat' in airport_info and 'lon' in airport_info:
-            distance = calculate_distance(
-                latitude, longitude,
-                airport_info['lat'], airport_info['lon']
-            )
-            
-            if distance <= max_distance:
-                airports_with_distance.append({
-                    'iataCode': iata_code,
-                    'name': airport_info.get('name', ''),
-                    'city': airport_info.get('city', ''),
-                    'country': airport_info.get('country', ''),
-                    'distance': round(distance, 1),
-                    'lat': airport_info['lat'],
-                    'lon': airport_info['lon']
-                })
-    
-    airports_with_distance.sort(key=lambda x: x['distance'])
-    return airports_with_distance[:limit]
+
+    snapshot = get_snapshot()
+    nearby = []
+    for distance, iata_code, location in snapshot.spatial_index.nearest(latitude, longitude, limit, max_distance):
+        airport_info = snapshot.info(iata_code)
+        nearby.append({
+            'iataCode': iata_code,
+            'name': airport_info['name'],
+            'city': airport_info['city'],
+            'country': airport_info['country'],
+            'distance': round(distance, 1),
+            'lat': location['lat'],
+            'lon': location['lon']
+        })
+    return nearby
 
 
 def get_nearest_airport(latitude, longitude):
@@ -0,0 +1,37 @@
+"""
+Rebuild the precomputed airport-pair distance matrix.
+
+Examples::
+
+    python manage.py build_route_matrix
+    python manage.py build_route_matrix --force
+
+The matrix is skipped when the airport codes and coordinates have not
+changed since the last build (a matrix in the older two-plane layout is
+always rebuilt). Running web and Celery workers map the new
+file after a restart.
+"""
+
+from django.core.management.base import BaseCommand
+
+from booking.airport_snapshot import load_snapshot
+from booking.route_matrix import build_matrix_file, matrix_dir, read_fingerprint, snapshot_fingerprint
+
+
+class Command(BaseCommand):
+    help = 'Precompute great-circle distances between every pair of airports'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild even if the airports are unchanged')
+        parser.add_argument('--output-dir', help='Directory to write to (defaults to ROUTE_MATRIX_DIR)')
+
+    def handle(self, *args, **options):
+        directory = options['output_dir'] or matrix_dir()
+        snapshot = load_snapshot()
+        if not options['force'] and read_fingerprint(directory) == snapshot_fingerprint(snapshot):
+            self.stdout.write(f"Route matrix for {len(snapshot)} airports is up to date")
+            return
+        path = build_matrix_file(snapshot, directory)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote route matrix for {len(snapshot)} airports ({snapshot.source}) to {path}"
+        ))
@@ -0,0 +1,47 @@
+"""
+Run the local provider simulator for load tests.
+
+Point the clients at it with the base URLs it prints, e.g.::
+
+    AMADEUS_BASE_URL=http://127.0.0.1:8099 python manage.py runserver
+"""
+
+from django.core.management.base import BaseCommand
+
+from booking.provider_simulator import ProviderSimulator, SimulatorProfile
+
+
+class Command(BaseCommand):
+    help = 'Serve simulated Amadeus, AirLabs, AviationStack and OpenSky endpoints locally'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8099)
+        parser.add_argument('--seed', type=int, default=42, help='Seed for payloads and the latency/error sequence')
+        parser.add_argument('--latency-ms', type=float, default=80, help='Median response latency')
+        parser.add_argument('--latency-sigma', type=float, default=0.4, help='Log-normal latency spread (0 = fixed)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of HTTP 500 responses')
+        parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of HTTP 429 responses')
+        parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds on 429 responses')
+        parser.add_argument('--results', type=int, default=10, help='Offers/records per response')
+
+    def handle(self, *args, **options):
+        profile = SimulatorProfile(
+            latency_ms=options['latency_ms'],
+            latency_sigma=options['latency_sigma'],
+            error_rate=options['error_rate'],
+            rate_limit_rate=options['rate_limit_rate'],
+            retry_after=options['retry_after'],
+            result_count=options['results'],
+        )
+        simulator = ProviderSimulator(profile, seed=options['seed'], host=options['host'], port=options['port'])
+        base_url = f"http://{options['host']}:{options['port']}"
+        self.stdout.write(self.style.SUCCESS(f"Provider simulator listening on {base_url}"))
+        self.stdout.write(f"  AMADEUS_BASE_URL={base_url}")
+        self.stdout.write(f"  AIRLABS_BASE_URL={base_url}/airlabs")
+        self.stdout.write(f"  AVIATIONSTACK_BASE_URL={base_url}/aviationstack")
+        self.stdout.write(f"  OPENSKY_BASE_URL={base_url}/opensky")
+        try:
+            simulator.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping provider simulator')
@@ -0,0 +1,62 @@
+"""
+Load airport reference data into the Airport table.
+
+Examples::
+
+    python manage.py sync_airports --builtin
+    python manage.py sync_airports airports.csv
+    python manage.py sync_airports --airlabs --country US
+
+The route matrix is rebuilt afterwards (see build_route_matrix). Running
+web and Celery workers keep their snapshot until restarted.
+"""
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from booking.airport_snapshot import builtin_airports, load_snapshot
+from booking.airport_sync import DEFAULT_CHUNK_SIZE, read_airport_file, upsert_airports
+
+
+class Command(BaseCommand):
+    help = 'Bulk upsert airports from a CSV/JSON dataset, an AirLabs dump or the built-in seed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='CSV or JSON airport dataset')
+        parser.add_argument('--airlabs', action='store_true', help='Download the airport list from AirLabs')
+        parser.add_argument('--country', help='Limit the AirLabs download to one ISO country code')
+        parser.add_argument('--builtin', action='store_true', help='Load the airports hard-coded in iata_utils')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per upsert statement')
+        parser.add_argument('--skip-route-matrix', action='store_true', help='Do not rebuild the route matrix')
+
+    def handle(self, *args, **options):
+        sources = [bool(options['path']), options['airlabs'], options['builtin']]
+        if sum(sources) != 1:
+            raise CommandError('Give exactly one of a dataset path, --airlabs or --builtin')
+
+        if options['path']:
+            rows, source = read_airport_file(options['path']), 'file'
+        elif options['airlabs']:
+            from booking.airlabs_client import AirLabsClient
+            try:
+                rows = AirLabsClient().list_airports(options['country'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            if rows is None:
+                raise CommandError('AirLabs airport download failed')
+            source = 'airlabs'
+        else:
+            rows, source = builtin_airports(), 'builtin'
+
+        try:
+            upserted, skipped = upsert_airports(rows, source=source, chunk_size=options['chunk_size'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not load airports: {e}")
+        snapshot = load_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f"Upserted {upserted} airports ({skipped} rows without an IATA code skipped); "
+            f"snapshot now holds {len(snapshot)} airports"
+        ))
+        if not options['skip_route_matrix']:
+            call_command('build_route_matrix', stdout=self.stdout)
+        self.stdout.write('Restart web and Celery workers to pick up the new snapshot')
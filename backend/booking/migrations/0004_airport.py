@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0003_vendor_customuser_is_vendor_vendorproduct_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Airport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('iata_code', models.CharField(help_text='IATA airport code.', max_length=3, unique=True)),
+                ('name', models.CharField(blank=True, help_text='Airport name.', max_length=200)),
+                ('city', models.CharField(blank=True, help_text='City served by the airport.', max_length=100)),
+                ('country', models.CharField(blank=True, help_text='Country name or code.', max_length=100)),
+                ('latitude', models.FloatField(blank=True, help_text='Latitude in degrees.', null=True)),
+                ('longitude', models.FloatField(blank=True, help_text='Longitude in degrees.', null=True)),
+                ('aliases', models.JSONField(blank=True, default=list, help_text='Extra city names that resolve to this airport.')),
+                ('source', models.CharField(blank=True, help_text='Dataset the row was last synced from.', max_length=50)),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Timestamp of the last sync.')),
+            ],
+            options={
+                'ordering': ['iata_code'],
+            },
+        ),
+    ]
@@ -0,0 +1,160 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:28
+
+from django.db import migrations, models
+
+# City aliases as shipped when these columns were added, frozen so the backfill
+# does not change with booking.iata_utils
+CITY_TO_IATA = {
+    'new york': 'JFK', 'nyc': 'JFK', 'ny': 'JFK',
+    'los angeles': 'LAX', 'la': 'LAX', 'lax': 'LAX',
+    'chicago': 'ORD', 'chi': 'ORD',
+    'miami': 'MIA', 'mia': 'MIA',
+    'san francisco': 'SFO', 'sf': 'SFO', 'sfo': 'SFO',
+    'dallas': 'DFW', 'dfw': 'DFW',
+    'atlanta': 'ATL', 'atl': 'ATL',
+    'denver': 'DEN', 'den': 'DEN',
+    'seattle': 'SEA', 'sea': 'SEA',
+    'boston': 'BOS', 'bos': 'BOS',
+    'las vegas': 'LAS', 'las': 'LAS',
+    'phoenix': 'PHX', 'phx': 'PHX',
+    'houston': 'IAH', 'iah': 'IAH',
+    'washington': 'DCA', 'dc': 'DCA', 'dca': 'DCA',
+    'orlando': 'MCO', 'mco': 'MCO',
+    'charlotte': 'CLT', 'clt': 'CLT',
+    'salt lake city': 'SLC', 'slc': 'SLC',
+    'detroit': 'DTW', 'dtw': 'DTW',
+    'minneapolis': 'MSP', 'msp': 'MSP',
+    'tampa': 'TPA', 'tpa': 'TPA',
+    'philadelphia': 'PHL', 'phl': 'PHL',
+    'newark': 'EWR', 'ewr': 'EWR',
+    'portland': 'PDX', 'pdx': 'PDX',
+    'san diego': 'SAN', 'san': 'SAN',
+    'austin': 'AUS', 'aus': 'AUS',
+    'nashville': 'BNA', 'bna': 'BNA',
+    'baltimore': 'BWI', 'bwi': 'BWI',
+    'fort lauderdale': 'FLL', 'fll': 'FLL',
+    'oakland': 'OAK', 'oak': 'OAK',
+    'pittsburgh': 'PIT', 'pit': 'PIT',
+    'raleigh': 'RDU', 'rdu': 'RDU',
+    'indianapolis': 'IND', 'ind': 'IND',
+    'cincinnati': 'CVG', 'cvg': 'CVG',
+    'columbus': 'CMH', 'cmh': 'CMH',
+    'cleveland': 'CLE', 'cle': 'CLE',
+    'milwaukee': 'MKE', 'mke': 'MKE',
+    'kansas city': 'MCI', 'mci': 'MCI',
+    'omaha': 'OMA', 'oma': 'OMA',
+    'wichita': 'ICT', 'ict': 'ICT',
+    'tulsa': 'TUL', 'tul': 'TUL',
+    'oklahoma city': 'OKC', 'okc': 'OKC',
+    'albuquerque': 'ABQ', 'abq': 'ABQ',
+    'reno': 'RNO', 'rno': 'RNO',
+    'boise': 'BOI', 'boi': 'BOI',
+    'spokane': 'GEG', 'geg': 'GEG',
+    'anchorage': 'ANC', 'anc': 'ANC',
+    'honolulu': 'HNL', 'hnl': 'HNL',
+    'london': 'LHR', 'london heathrow': 'LHR', 'lhr': 'LHR',
+    'london gatwick': 'LGW', 'lgw': 'LGW',
+    'manchester': 'MAN', 'man': 'MAN',
+    'paris': 'CDG', 'paris charles de gaulle': 'CDG', 'cdg': 'CDG',
+    'berlin': 'BER', 'ber': 'BER',
+    'frankfurt': 'FRA', 'fra': 'FRA',
+    'munich': 'MUC', 'muc': 'MUC',
+    'rome': 'FCO', 'fco': 'FCO',
+    'milan': 'MXP', 'milan malpensa': 'MXP', 'mxp': 'MXP',
+    'madrid': 'MAD', 'mad': 'MAD',
+    'barcelona': 'BCN', 'bcn': 'BCN',
+    'amsterdam': 'AMS', 'ams': 'AMS',
+    'zurich': 'ZRH', 'zrh': 'ZRH',
+    'vienna': 'VIE', 'vie': 'VIE',
+    'brussels': 'BRU', 'bru': 'BRU',
+    'copenhagen': 'CPH', 'cph': 'CPH',
+    'stockholm': 'ARN', 'arn': 'ARN',
+    'oslo': 'OSL', 'osl': 'OSL',
+    'helsinki': 'HEL', 'hel': 'HEL',
+    'warsaw': 'WAW', 'waw': 'WAW',
+    'prague': 'PRG', 'prg': 'PRG',
+    'budapest': 'BUD', 'bud': 'BUD',
+    'athens': 'ATH', 'ath': 'ATH',
+    'istanbul': 'IST', 'ist': 'IST',
+    'tokyo': 'NRT', 'tokyo narita': 'NRT', 'nrt': 'NRT',
+    'tokyo haneda': 'HND', 'hnd': 'HND',
+    'osaka': 'KIX', 'kix': 'KIX',
+    'beijing': 'PEK', 'pek': 'PEK',
+    'shanghai': 'PVG', 'pvg': 'PVG',
+    'hong kong': 'HKG', 'hkg': 'HKG',
+    'singapore': 'SIN', 'sin': 'SIN',
+    'bangkok': 'BKK', 'bkk': 'BKK',
+    'dubai': 'DXB', 'dxb': 'DXB',
+    'delhi': 'DEL', 'del': 'DEL',
+    'mumbai': 'BOM', 'bom': 'BOM',
+    'bangalore': 'BLR', 'blr': 'BLR',
+    'sydney': 'SYD', 'syd': 'SYD',
+    'melbourne': 'MEL', 'mel': 'MEL',
+    'brisbane': 'BNE', 'bne': 'BNE',
+    'perth': 'PER', 'per': 'PER',
+    'auckland': 'AKL', 'akl': 'AKL',
+    'toronto': 'YYZ', 'yyz': 'YYZ',
+    'montreal': 'YUL', 'yul': 'YUL',
+    'vancouver': 'YVR', 'yvr': 'YVR',
+    'calgary': 'YYC', 'yyc': 'YYC',
+    'mexico city': 'MEX', 'mex': 'MEX',
+    'cancun': 'CUN', 'cun': 'CUN',
+    'lisbon': 'LIS', 'lis': 'LIS',
+    'dublin': 'DUB', 'dub': 'DUB',
+}
+
+
+def exact_iata_code(location, city_to_iata):
+    """Exact-match lookup: a 3-letter code, a known alias, or an alias plus ' international'."""
+    if not location:
+        return ''
+    code = location.strip().upper()
+    if len(code) == 3 and code.isalpha():
+        return code
+    name = location.strip().lower()
+    if name in city_to_iata:
+        return city_to_iata[name]
+    if 'international' in name:
+        return city_to_iata.get(name.replace(' international', '').strip(), '')
+    return ''
+
+
+def backfill_route_codes(apps, schema_editor):
+    """Resolve each distinct departure/arrival pair once and update its rows in one statement."""
+    Airport = apps.get_model('booking', 'Airport')
+    Flight = apps.get_model('booking', 'Flight')
+    city_to_iata = dict(CITY_TO_IATA)
+    for code, aliases in Airport.objects.order_by('iata_code').values_list('iata_code', 'aliases').iterator():
+        for alias in aliases or ():
+            city_to_iata.setdefault(str(alias).strip().lower(), code.upper())
+    pairs = Flight.objects.values_list('departure', 'arrival').distinct().order_by()
+    for departure, arrival in list(pairs):
+        Flight.objects.filter(departure=departure, arrival=arrival).update(
+            origin_iata=exact_iata_code(departure, city_to_iata),
+            destination_iata=exact_iata_code(arrival, city_to_iata),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0004_airport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='destination_iata',
+            field=models.CharField(blank=True, default='', editable=False, help_text='IATA code resolved from the arrival location.', max_length=3),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='origin_iata',
+            field=models.CharField(blank=True, default='', editable=False, help_text='IATA code resolved from the departure location.', max_length=3),
+        ),
+        migrations.RunPython(backfill_route_codes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['origin_iata', 'destination_iata', 'date'], name='flight_route_date_idx'),
+        ),
+    ]
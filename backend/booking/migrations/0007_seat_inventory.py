@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0006_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='cabin',
+            field=models.CharField(choices=[('ECONOMY', 'Economy'), ('PREMIUM_ECONOMY', 'Premium economy'), ('BUSINESS', 'Business'), ('FIRST', 'First')], default='ECONOMY', help_text='Cabin class the seat was reserved in.', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='SeatInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cabin', models.CharField(choices=[('ECONOMY', 'Economy'), ('PREMIUM_ECONOMY', 'Premium economy'), ('BUSINESS', 'Business'), ('FIRST', 'First')], default='ECONOMY', help_text='Cabin class.', max_length=20)),
+                ('seats_total', models.PositiveIntegerField(help_text='Seats offered in the cabin.')),
+                ('seats_left', models.PositiveIntegerField(help_text='Seats not yet booked.')),
+                ('flight', models.ForeignKey(help_text='Flight the seats belong to.', on_delete=django.db.models.deletion.CASCADE, related_name='seat_inventory', to='booking.flight')),
+            ],
+            options={
+                'verbose_name_plural': 'seat inventory',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='seatinventory',
+            constraint=models.UniqueConstraint(fields=('flight', 'cabin'), name='seat_inventory_flight_cabin_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='seatinventory',
+            constraint=models.CheckConstraint(check=models.Q(('seats_left__lte', models.F('seats_total'))), name='seat_inventory_left_lte_total'),
+        ),
+    ]
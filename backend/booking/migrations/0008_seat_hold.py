@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0007_seat_inventory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeatHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cabin', models.CharField(choices=[('ECONOMY', 'Economy'), ('PREMIUM_ECONOMY', 'Premium economy'), ('BUSINESS', 'Business'), ('FIRST', 'First')], default='ECONOMY', help_text='Cabin the seat is held in.', max_length=20)),
+                ('seats', models.PositiveSmallIntegerField(default=1, help_text='Number of seats held.')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('released', 'Released'), ('converted', 'Converted')], default='active', help_text='Hold status.', max_length=20)),
+                ('expires_at', models.DateTimeField(help_text='When an unpaid hold gives its seats back.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the hold was placed.')),
+                ('released_at', models.DateTimeField(blank=True, help_text='Timestamp when the sweeper released the hold.', null=True)),
+                ('booking', models.OneToOneField(help_text='Pending booking holding the seat.', on_delete=django.db.models.deletion.CASCADE, related_name='seat_hold', to='booking.booking')),
+                ('flight', models.ForeignKey(help_text='Flight the seat is held on.', on_delete=django.db.models.deletion.CASCADE, related_name='seat_holds', to='booking.flight')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'active')), fields=['expires_at'], name='seat_hold_active_expiry_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0008_seat_hold'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='seat_shards',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, help_text='Seat sub-counters per cabin; above 1 spreads bookings over several rows. Changed with the admin actions.'),
+        ),
+        migrations.CreateModel(
+            name='SeatShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cabin', models.CharField(choices=[('ECONOMY', 'Economy'), ('PREMIUM_ECONOMY', 'Premium economy'), ('BUSINESS', 'Business'), ('FIRST', 'First')], default='ECONOMY', help_text='Cabin class.', max_length=20)),
+                ('index', models.PositiveSmallIntegerField(help_text='Sub-counter number, from 1.')),
+                ('seats_left', models.PositiveIntegerField(default=0, help_text='Unsold seats held by this sub-counter.')),
+                ('flight', models.ForeignKey(help_text='Flight the seats belong to.', on_delete=django.db.models.deletion.CASCADE, related_name='seat_sub_counters', to='booking.flight')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='seatshard',
+            constraint=models.UniqueConstraint(fields=('flight', 'cabin', 'index'), name='seat_shard_flight_cabin_index_uniq'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0009_seat_shards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='group_reference',
+            field=models.CharField(blank=True, default='', help_text='Reference shared by bookings made together through the bulk endpoint.', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='passenger_name',
+            field=models.CharField(blank=True, default='', help_text="Traveller's name when booked for a group; empty means the user.", max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('group_reference', ''), _negated=True), fields=['group_reference'], name='booking_group_ref_idx'),
+        ),
+    ]
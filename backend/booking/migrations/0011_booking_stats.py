@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0010_booking_groups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_bookings', models.IntegerField(default=0, help_text='Number of bookings.')),
+                ('paid_bookings', models.IntegerField(default=0, help_text='Bookings with payment status paid.')),
+                ('pending_bookings', models.IntegerField(default=0, help_text='Bookings with payment status pending.')),
+                ('failed_bookings', models.IntegerField(default=0, help_text='Bookings with payment status failed.')),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, help_text='Sum of flight prices over paid bookings.', max_digits=14)),
+                ('updated_at', models.DateTimeField(blank=True, help_text='Timestamp of the last incremental update.', null=True)),
+                ('reconciled_at', models.DateTimeField(blank=True, help_text='Timestamp of the last full recount.', null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'booking stats',
+            },
+        ),
+    ]
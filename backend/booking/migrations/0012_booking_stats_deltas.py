@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0011_booking_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingStatsDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_bookings', models.IntegerField(default=0, help_text='Change in the number of bookings.')),
+                ('paid_bookings', models.IntegerField(default=0, help_text='Change in bookings with payment status paid.')),
+                ('pending_bookings', models.IntegerField(default=0, help_text='Change in bookings with payment status pending.')),
+                ('failed_bookings', models.IntegerField(default=0, help_text='Change in bookings with payment status failed.')),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, help_text='Change in the revenue of paid bookings.', max_digits=14)),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the change was recorded.')),
+            ],
+        ),
+    ]
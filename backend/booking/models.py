@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 
+from .iata_utils import get_iata_code
+
 class CustomUser(AbstractUser):
     """
     Custom user model extending Django's AbstractUser with an approval status.
@@ -13,6 +15,11 @@ class CustomUser(AbstractUser):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', help_text="User approval status.")
     is_vendor = models.BooleanField(default=False, help_text="Designates whether the user is a vendor.")
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['status', 'date_joined', 'id'], name='user_status_joined_idx'),
+        ]
+
     def __str__(self):
         return self.username
 
@@ -33,6 +40,11 @@ class Vendor(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_approved', 'created_at', 'id'], name='vendor_approved_created_idx'),
+        ]
+
     def __str__(self):
         return self.business_name
 
@@ -62,6 +74,11 @@ class VendorProduct(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='product_created_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.vendor.business_name}"
 
@@ -80,10 +97,73 @@ class Flight(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2, help_text="Flight price.")
     availability = models.BooleanField(default=True, help_text="Indicates if the flight is available for booking.")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='on-time', help_text="Flight status.")
+    origin_iata = models.CharField(max_length=3, blank=True, default='', editable=False, help_text="IATA code resolved from the departure location.")
+    destination_iata = models.CharField(max_length=3, blank=True, default='', editable=False, help_text="IATA code resolved from the arrival location.")
+    seat_shards = models.PositiveSmallIntegerField(default=1, editable=False, help_text="Seat sub-counters per cabin; above 1 spreads bookings over several rows. Changed with the admin actions.")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['origin_iata', 'destination_iata', 'date'], name='flight_route_date_idx'),
+            models.Index(fields=['date', 'id'], name='flight_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.flight_number} - {self.departure} to {self.arrival}"
 
+    def resolve_route(self):
+        """Fill origin_iata/destination_iata from the free-text locations (bulk_create skips save())."""
+        self.origin_iata = get_iata_code(self.departure) or ''
+        self.destination_iata = get_iata_code(self.arrival) or ''
+
+    def save(self, *args, **kwargs):
+        self.resolve_route()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'departure', 'arrival'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'origin_iata', 'destination_iata'}
+        super().save(*args, **kwargs)
+
+class SeatInventory(models.Model):
+    """
+    Seat counter for one cabin of a flight, decremented by booking.seat_inventory.
+    """
+    CABIN_CHOICES = [
+        ('ECONOMY', 'Economy'),
+        ('PREMIUM_ECONOMY', 'Premium economy'),
+        ('BUSINESS', 'Business'),
+        ('FIRST', 'First'),
+    ]
+    flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name='seat_inventory', help_text="Flight the seats belong to.")
+    cabin = models.CharField(max_length=20, choices=CABIN_CHOICES, default='ECONOMY', help_text="Cabin class.")
+    seats_total = models.PositiveIntegerField(help_text="Seats offered in the cabin.")
+    seats_left = models.PositiveIntegerField(help_text="Seats not yet booked.")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['flight', 'cabin'], name='seat_inventory_flight_cabin_uniq'),
+            models.CheckConstraint(check=models.Q(seats_left__lte=models.F('seats_total')), name='seat_inventory_left_lte_total'),
+        ]
+        verbose_name_plural = 'seat inventory'
+
+    def __str__(self):
+        return f"{self.flight.flight_number} {self.cabin}: {self.seats_left}/{self.seats_total}"
+
+class SeatShard(models.Model):
+    """
+    Extra sub-counter of a sharded cabin; the SeatInventory row is sub-counter 0.
+    """
+    flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name='seat_sub_counters', help_text="Flight the seats belong to.")
+    cabin = models.CharField(max_length=20, choices=SeatInventory.CABIN_CHOICES, default='ECONOMY', help_text="Cabin class.")
+    index = models.PositiveSmallIntegerField(help_text="Sub-counter number, from 1.")
+    seats_left = models.PositiveIntegerField(default=0, help_text="Unsold seats held by this sub-counter.")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['flight', 'cabin', 'index'], name='seat_shard_flight_cabin_index_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.flight.flight_number} {self.cabin} #{self.index}: {self.seats_left}"
+
 class Booking(models.Model):
     """
     Booking model with relationships to user and flight, including payment status and booking status.
@@ -96,6 +176,9 @@ class Booking(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='bookings', help_text="User who made the booking.")
     flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name='bookings', help_text="Flight being booked.")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', help_text="Booking status.")
+    cabin = models.CharField(max_length=20, choices=SeatInventory.CABIN_CHOICES, default='ECONOMY', help_text="Cabin class the seat was reserved in.")
+    passenger_name = models.CharField(max_length=200, blank=True, default='', help_text="Traveller's name when booked for a group; empty means the user.")
+    group_reference = models.CharField(max_length=12, blank=True, default='', help_text="Reference shared by bookings made together through the bulk endpoint.")
     payment_status = models.CharField(
         max_length=20,
         choices=[
@@ -108,5 +191,102 @@ class Booking(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True, help_text="Timestamp when the booking was created.")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='booking_user_created_idx'),
+            models.Index(fields=['group_reference'], name='booking_group_ref_idx', condition=~models.Q(group_reference='')),
+        ]
+
     def __str__(self):
         return f"Booking by {self.user.username} for {self.flight.flight_number}"
+
+
+class SeatHold(models.Model):
+    """
+    Time-limited claim on a pending booking's seat, released by the expiry sweeper
+    unless payment converts it first.
+    """
+    ACTIVE = 'active'
+    RELEASED = 'released'
+    CONVERTED = 'converted'
+    STATUS_CHOICES = [
+        (ACTIVE, 'Active'),
+        (RELEASED, 'Released'),
+        (CONVERTED, 'Converted'),
+    ]
+    booking = models.OneToOneField(Booking, on_delete=models.CASCADE, related_name='seat_hold', help_text="Pending booking holding the seat.")
+    flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name='seat_holds', help_text="Flight the seat is held on.")
+    cabin = models.CharField(max_length=20, choices=SeatInventory.CABIN_CHOICES, default='ECONOMY', help_text="Cabin the seat is held in.")
+    seats = models.PositiveSmallIntegerField(default=1, help_text="Number of seats held.")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=ACTIVE, help_text="Hold status.")
+    expires_at = models.DateTimeField(help_text="When an unpaid hold gives its seats back.")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="Timestamp when the hold was placed.")
+    released_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp when the sweeper released the hold.")
+
+    class Meta:
+        indexes = [
+            # Partial index: only active holds are ever swept, so it stays small
+            models.Index(fields=['expires_at'], name='seat_hold_active_expiry_idx', condition=models.Q(status='active')),
+        ]
+
+    def __str__(self):
+        return f"Hold on booking {self.booking_id} ({self.status}) until {self.expires_at}"
+
+
+class BookingStats(models.Model):
+    """
+    Materialized booking counters for the admin dashboard: a single row that
+    BookingStatsDelta rows are folded into, rebuilt nightly from the bookings table.
+    """
+    SINGLETON_ID = 1
+
+    total_bookings = models.IntegerField(default=0, help_text="Number of bookings.")
+    paid_bookings = models.IntegerField(default=0, help_text="Bookings with payment status paid.")
+    pending_bookings = models.IntegerField(default=0, help_text="Bookings with payment status pending.")
+    failed_bookings = models.IntegerField(default=0, help_text="Bookings with payment status failed.")
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Sum of flight prices over paid bookings.")
+    updated_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp of the last incremental update.")
+    reconciled_at = models.DateTimeField(null=True, blank=True, help_text="Timestamp of the last full recount.")
+
+    class Meta:
+        verbose_name_plural = 'booking stats'
+
+    def __str__(self):
+        return f"{self.total_bookings} bookings, {self.total_revenue} revenue"
+
+
+class BookingStatsDelta(models.Model):
+    """
+    Change to the booking stats written by one booking write. Rows are only
+    ever inserted by bookings, so they never contend on a shared row.
+    """
+    total_bookings = models.IntegerField(default=0, help_text="Change in the number of bookings.")
+    paid_bookings = models.IntegerField(default=0, help_text="Change in bookings with payment status paid.")
+    pending_bookings = models.IntegerField(default=0, help_text="Change in bookings with payment status pending.")
+    failed_bookings = models.IntegerField(default=0, help_text="Change in bookings with payment status failed.")
+    total_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="Change in the revenue of paid bookings.")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="Timestamp when the change was recorded.")
+
+    def __str__(self):
+        return f"{self.total_bookings:+} bookings, {self.total_revenue:+} revenue"
+
+
+class Airport(models.Model):
+    """
+    Airport reference data, bulk-loaded by the sync_airports management command.
+    """
+    iata_code = models.CharField(max_length=3, unique=True, help_text="IATA airport code.")
+    name = models.CharField(max_length=200, blank=True, help_text="Airport name.")
+    city = models.CharField(max_length=100, blank=True, help_text="City served by the airport.")
+    country = models.CharField(max_length=100, blank=True, help_text="Country name or code.")
+    latitude = models.FloatField(null=True, blank=True, help_text="Latitude in degrees.")
+    longitude = models.FloatField(null=True, blank=True, help_text="Longitude in degrees.")
+    aliases = models.JSONField(default=list, blank=True, help_text="Extra city names that resolve to this airport.")
+    source = models.CharField(max_length=50, blank=True, help_text="Dataset the row was last synced from.")
+    updated_at = models.DateTimeField(auto_now=True, help_text="Timestamp of the last sync.")
+
+    class Meta:
+        ordering = ['iata_code']
+
+    def __str__(self):
+        return f"{self.iata_code} - {self.name}"
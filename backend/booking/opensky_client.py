@@ -1,12 +1,16 @@
 import requests
+from django.conf import settings
 from datetime import datetime, timedelta
 import logging
+from .provider_http import provider_http
+from .rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 class OpenSkyClient:
     def __init__(self):
-        self.base_url = 'https://opensky-network.org/api'
+        self.base_url = getattr(settings, 'OPENSKY_BASE_URL', 'https://opensky-network.org/api')
+        self.rate_limiter = get_rate_limiter('opensky')
         # OpenSky Network is free and doesn't require API keys
         # But we'll add proper validation and error handling
 
@@ -50,7 +54,7 @@ class OpenSkyClient:
             logger.info(f"OpenSky API request: {url} with params: {params}")
 
             # Add timeout and proper error handling
-            response = requests.get(url, params=params, timeout=15)
+            response = provider_http.get(url, params=params, timeout=15, endpoint='opensky.departures', rate_limit=self.rate_limiter)
 
             logger.info(f"OpenSky API response status: {response.status_code}")
 
@@ -150,7 +154,7 @@ class OpenSkyClient:
 
             logger.info(f"OpenSky states request: {url} with params: {params}")
 
-            response = requests.get(url, params=params, timeout=10)
+            response = provider_http.get(url, params=params, timeout=10, endpoint='opensky.states', rate_limit=self.rate_limiter)
 
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,155 @@
+"""
+Keyset (seek) pagination for list endpoints.
+
+Pages are selected with a ``WHERE (key) < (cursor)`` predicate on an
+indexed ordering that ends in the primary key, e.g. ``('-created_at',
+'-id')``, instead of OFFSET, and no ``COUNT(*)`` is issued. Each page costs
+one index range scan of ``page_size + 1`` rows however deep the client has
+paged. Cursors are opaque base64 tokens holding the boundary row's key and
+the direction; the response shape matches DRF's CursorPagination
+(``next``, ``previous``, ``results``).
+
+Views choose their ordering with a ``keyset_ordering`` attribute.
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a composite ``(column..., id)`` key.
+
+    Attributes:
+        page_size (int): Rows per page (``PAGE_SIZE``) unless the client asks for fewer/more.
+        max_page_size (int): Upper bound for ``?page_size=``.
+        ordering (tuple): Default key when the view sets no ``keyset_ordering``.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 200
+    ordering = ('-pk',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = tuple(getattr(view, 'keyset_ordering', None) or self.ordering)
+        self.fields = [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+
+        reverse = bool(cursor and cursor['reverse'])
+        if cursor:
+            queryset = queryset.filter(self._seek(cursor['position'], reverse))
+        order_by = [self._order_expression(name, descending != reverse) for name, descending in self.fields]
+        rows = list(queryset.order_by(*order_by)[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else cursor is not None
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(requested, 1), self.max_page_size)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            raw_position, reverse = payload['p'], bool(payload['r'])
+            if len(raw_position) != len(self.fields):
+                raise ValueError
+            position = [
+                self._model_field(model, name).to_python(value)
+                for (name, _), value in zip(self.fields, raw_position)
+            ]
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return {'position': position, 'reverse': reverse}
+
+    def _seek(self, position, reverse):
+        """Rows strictly after ``position`` in the (possibly reversed) key order."""
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self.fields, position):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def _position(self, row):
+        # Rows are model instances, or dicts when a view pages a .values() queryset
+        if isinstance(row, dict):
+            return [self._serialize(row[name]) for name, _ in self.fields]
+        return [self._serialize(getattr(row, name)) for name, _ in self.fields]
+
+    @staticmethod
+    def _order_expression(name, descending):
+        return f"-{name}" if descending else name
+
+    @staticmethod
+    def _model_field(model, name):
+        return model._meta.pk if name == 'pk' else model._meta.get_field(name)
+
+    @staticmethod
+    def _serialize(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
@@ -0,0 +1,165 @@
+"""
+Shared HTTP layer for external provider clients.
+
+All provider clients go through one ``requests.Session`` per process with
+per-host keep-alive connection pools, so repeated calls to Amadeus, AirLabs,
+AviationStack and OpenSky reuse TCP+TLS connections instead of paying a new
+handshake every time. The session keeps no cookies and urllib3 pools are
+thread-safe, so the session can be shared by every thread in a worker.
+"""
+
+import logging
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from .circuit_breaker import get_breaker
+from .rate_limiter import DEFAULT_MAX_WAIT as DEFAULT_RATE_LIMIT_WAIT, QuotaExhausted, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+# Default number of per-host connection pools kept alive
+DEFAULT_POOL_CONNECTIONS = 10
+# Default number of keep-alive connections per host
+DEFAULT_POOL_MAXSIZE = 20
+# Default connect timeout in seconds (slightly above a TCP retransmission window)
+DEFAULT_CONNECT_TIMEOUT = 3.05
+# Default read timeout in seconds
+DEFAULT_READ_TIMEOUT = 30
+
+
+class ProviderHTTPClient:
+    """
+    Process-wide pooled HTTP client exposing a ``requests``-like API.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def connect_timeout(self):
+        return getattr(settings, 'PROVIDER_HTTP_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT)
+
+    @property
+    def read_timeout(self):
+        return getattr(settings, 'PROVIDER_HTTP_READ_TIMEOUT', DEFAULT_READ_TIMEOUT)
+
+    def _build_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=getattr(settings, 'PROVIDER_HTTP_POOL_CONNECTIONS', DEFAULT_POOL_CONNECTIONS),
+            pool_maxsize=getattr(settings, 'PROVIDER_HTTP_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE),
+            max_retries=0
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        # Provider APIs are stateless; refusing cookies keeps the shared session thread-safe
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    @property
+    def session(self):
+        """
+        Return the shared session, rebuilding it after a fork.
+
+        Sockets inherited from a pre-fork parent (gunicorn --preload) must not
+        be shared between workers, so each process gets its own pools.
+        """
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._lock:
+                if self._session is None or self._session_pid != pid:
+                    self._session = self._build_session()
+                    self._session_pid = pid
+        return self._session
+
+    def _timeout(self, timeout):
+        """
+        Normalize a timeout into a (connect, read) tuple.
+
+        Callers pass a single number meaning the read budget, as they did with
+        ``requests.get``; the connect timeout is always bounded separately.
+        """
+        if timeout is None:
+            return (self.connect_timeout, self.read_timeout)
+        if isinstance(timeout, tuple):
+            return timeout
+        return (min(self.connect_timeout, timeout), timeout)
+
+    def request(self, method, url, timeout=None, endpoint=None, rate_limit=None, rate_limit_wait=None, **kwargs):
+        """
+        Send a request through the shared pooled session.
+
+        If ``endpoint`` names a provider endpoint (e.g. ``amadeus.flight_offers``)
+        the call goes through that endpoint's circuit breaker: it fails fast
+        with CircuitOpenError while the breaker is open, its read timeout adapts
+        to the observed p99, and network errors and 5xx responses count as
+        failures.
+
+        If ``rate_limit`` is a TokenBucket, a token is taken before sending,
+        waiting at most ``rate_limit_wait`` seconds (QuotaExhausted otherwise),
+        and a 429 response drains the bucket for the provider's Retry-After.
+        """
+        timeout = self._timeout(timeout)
+        breaker = get_breaker(endpoint) if endpoint else None
+        probe = breaker.before_call() if breaker else False
+        if rate_limit is not None:
+            if rate_limit_wait is None:
+                rate_limit_wait = getattr(settings, 'PROVIDER_RATE_LIMIT_MAX_WAIT', DEFAULT_RATE_LIMIT_WAIT)
+            try:
+                rate_limit.acquire(wait=rate_limit_wait)
+            except QuotaExhausted:
+                if probe:
+                    breaker.release_probe()
+                raise
+        if breaker is None:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+        else:
+            response = self._guarded_request(breaker, probe, method, url, timeout, **kwargs)
+        if rate_limit is not None and response.status_code == 429:
+            rate_limit.drain(retry_after_seconds(response))
+        return response
+
+    def _guarded_request(self, breaker, probe, method, url, timeout, **kwargs):
+        connect_timeout, read_timeout = timeout
+        timeout = (connect_timeout, breaker.timeout(read_timeout))
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            breaker.record_failure(time.monotonic() - started, probe=probe)
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure(time.monotonic() - started, probe=probe)
+        else:
+            breaker.record_success(time.monotonic() - started, probe=probe)
+        return response
+
+    def get(self, url, params=None, **kwargs):
+        return self.request('GET', url, params=params, **kwargs)
+
+    def post(self, url, data=None, json=None, **kwargs):
+        return self.request('POST', url, data=data, json=json, **kwargs)
+
+    def close(self):
+        """Close pooled connections held by this process."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._session_pid = None
+
+
+# Shared client used by every provider module
+provider_http = ProviderHTTPClient()
@@ -0,0 +1,566 @@
+"""
+Local stand-in for the Amadeus, AirLabs, AviationStack and OpenSky APIs.
+
+The simulator is a threaded HTTP server that answers the endpoints our
+clients call, so search, hotel and order flows can be load-tested without
+spending real provider quota. Payloads are generated deterministically from
+a seed and the request parameters: the same query always returns the same
+offers, which makes responses cacheable and benchmarks repeatable.
+
+Latency (log-normal), error rate, 429 rate and result counts are set with a
+``SimulatorProfile``, globally or per route. Route names match the provider
+endpoint names used by provider_http (``amadeus.flight_offers``, ...).
+
+Amadeus is served at the root; the other providers under a prefix::
+
+    simulator = ProviderSimulator(SimulatorProfile(latency_ms=120, error_rate=0.02))
+    simulator.start()
+    with override_settings(**simulator.settings_overrides()):
+        ...
+    simulator.stop()
+
+or from the command line with ``python manage.py run_provider_simulator``.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from .iata_utils import IATA_INFO, calculate_distance
+
+logger = logging.getLogger(__name__)
+
+CARRIERS = [
+    ('AA', 'American Airlines'), ('BA', 'British Airways'), ('LH', 'Lufthansa'),
+    ('AF', 'Air France'), ('DL', 'Delta Air Lines'), ('UA', 'United Airlines'),
+    ('EK', 'Emirates'), ('QR', 'Qatar Airways'), ('KL', 'KLM'), ('TK', 'Turkish Airlines'),
+]
+CABIN_MULTIPLIERS = {'ECONOMY': 1.0, 'PREMIUM_ECONOMY': 1.6, 'BUSINESS': 3.2, 'FIRST': 5.5}
+HOTEL_CHAINS = ['Grand', 'Plaza', 'Harbour', 'Central', 'Royal', 'Park', 'Garden', 'Skyline']
+HOTEL_SUFFIXES = ['Hotel', 'Suites', 'Inn', 'Resort', 'Residences']
+AMENITIES = ['WIFI', 'PARKING', 'FITNESS_CENTER', 'RESTAURANT', 'SPA', 'POOL', 'BAR', 'AIR_CONDITIONING']
+ROOM_TYPES = ['Standard Room', 'Deluxe Room', 'Superior King', 'Twin Room', 'Junior Suite']
+
+
+class SimulatorProfile:
+    """
+    Behaviour of a simulated endpoint.
+
+    Args:
+        latency_ms (float): Median response latency in milliseconds.
+        latency_sigma (float): Log-normal spread of latency (0 for a fixed delay).
+        error_rate (float): Fraction of requests answered with HTTP 500.
+        rate_limit_rate (float): Fraction of requests answered with HTTP 429.
+        retry_after (int): Retry-After seconds sent with 429 responses.
+        result_count (int): Number of offers/records per response.
+    """
+
+    def __init__(self, latency_ms=80, latency_sigma=0.4, error_rate=0.0, rate_limit_rate=0.0,
+                 retry_after=1, result_count=10):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.result_count = result_count
+
+    def sample_latency(self, rng):
+        """Return a latency in seconds drawn from the log-normal distribution."""
+        if self.latency_ms <= 0:
+            return 0.0
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return rng.lognormvariate(math.log(self.latency_ms / 1000), self.latency_sigma)
+
+
+def _payload_rng(seed, route, params):
+    """Return a Random seeded by the simulator seed, route and canonical parameters."""
+    canonical = '&'.join(f"{k}={v}" for k, v in sorted((k, str(v).upper()) for k, v in params.items()))
+    return random.Random(f"{seed}|{route}|{canonical}")
+
+
+def _iso_duration(minutes):
+    return f"PT{minutes // 60}H{minutes % 60}M"
+
+
+def _airport(code):
+    info = IATA_INFO.get((code or '').upper())
+    if info:
+        return info
+    return {'city': code, 'country': '', 'name': f"{code} Airport", 'lat': 0.0, 'lon': 0.0}
+
+
+def _route_distance(origin, destination, rng):
+    a, b = _airport(origin), _airport(destination)
+    if a['lat'] or a['lon']:
+        if b['lat'] or b['lon']:
+            return max(calculate_distance(a['lat'], a['lon'], b['lat'], b['lon']), 150)
+    return rng.uniform(400, 9000)
+
+
+def _departure_date(value):
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return date.today() + timedelta(days=30)
+
+
+def flight_offers(rng, params, profile, match=None, body=None):
+    """Amadeus /v2/shopping/flight-offers"""
+    origin = params.get('originLocationCode', 'JFK').upper()
+    destination = params.get('destinationLocationCode', 'LAX').upper()
+    day = _departure_date(params.get('departureDate'))
+    adults = int(params.get('adults', 1) or 1)
+    cabin = params.get('travelClass', 'ECONOMY').upper()
+    count = min(profile.result_count, int(params.get('max', profile.result_count)))
+    distance = _route_distance(origin, destination, rng)
+
+    offers = []
+    for index in range(count):
+        carrier, _ = CARRIERS[rng.randrange(len(CARRIERS))]
+        stops = 0 if distance < 1500 or rng.random() < 0.6 else 1
+        flight_minutes = int(distance / 780 * 60) + 30
+        departure = datetime.combine(day, datetime.min.time()) + timedelta(minutes=rng.randrange(5 * 60, 23 * 60, 5))
+        segments = []
+        leg_start = departure
+        hubs = [code for code in IATA_INFO if code not in (origin, destination)]
+        stop_codes = [hubs[rng.randrange(len(hubs))]] if stops else []
+        points = [origin] + stop_codes + [destination]
+        for leg, (dep_code, arr_code) in enumerate(zip(points, points[1:])):
+            leg_minutes = flight_minutes // len(points[1:]) + 15
+            arrival = leg_start + timedelta(minutes=leg_minutes)
+            segments.append({
+                'departure': {'iataCode': dep_code, 'at': leg_start.strftime('%Y-%m-%dT%H:%M:%S')},
+                'arrival': {'iataCode': arr_code, 'at': arrival.strftime('%Y-%m-%dT%H:%M:%S')},
+                'carrierCode': carrier,
+                'number': str(rng.randrange(10, 9999)),
+                'aircraft': {'code': rng.choice(['320', '321', '738', '789', '77W', '359'])},
+                'duration': _iso_duration(leg_minutes),
+                'id': str(leg + 1),
+                'numberOfStops': 0,
+            })
+            leg_start = arrival + timedelta(minutes=rng.randrange(45, 180, 5))
+        total_minutes = int((datetime.fromisoformat(segments[-1]['arrival']['at']) - departure).total_seconds() // 60)
+        fare = (40 + distance * rng.uniform(0.06, 0.12)) * CABIN_MULTIPLIERS.get(cabin, 1.0)
+        total = round(fare * adults, 2)
+        offers.append({
+            'type': 'flight-offer',
+            'id': str(index + 1),
+            'source': 'GDS',
+            'instantTicketingRequired': False,
+            'oneWay': False,
+            'lastTicketingDate': (day - timedelta(days=1)).isoformat(),
+            'numberOfBookableSeats': rng.randrange(1, 10),
+            'itineraries': [{'duration': _iso_duration(total_minutes), 'segments': segments}],
+            'price': {
+                'currency': 'EUR',
+                'total': f"{total:.2f}",
+                'base': f"{total * 0.82:.2f}",
+                'grandTotal': f"{total:.2f}",
+            },
+            'validatingAirlineCodes': [carrier],
+            'travelerPricings': [
+                {
+                    'travelerId': str(traveler + 1),
+                    'fareOption': 'STANDARD',
+                    'travelerType': 'ADULT',
+                    'price': {'currency': 'EUR', 'total': f"{fare:.2f}"},
+                    'fareDetailsBySegment': [
+                        {'segmentId': segment['id'], 'cabin': cabin} for segment in segments
+                    ],
+                }
+                for traveler in range(adults)
+            ],
+        })
+    return 200, {'meta': {'count': len(offers)}, 'data': offers}
+
+
+def locations(rng, params, profile, match=None, body=None):
+    """Amadeus /v1/reference-data/locations"""
+    keyword = params.get('keyword', '').lower()
+    matches = [
+        (code, info) for code, info in IATA_INFO.items()
+        if keyword and (keyword in code.lower() or keyword in info['city'].lower() or keyword in info['name'].lower())
+    ][:profile.result_count]
+    return 200, {
+        'meta': {'count': len(matches)},
+        'data': [
+            {
+                'type': 'location',
+                'subType': 'AIRPORT',
+                'name': info['name'].upper(),
+                'iataCode': code,
+                'address': {'cityName': info['city'].upper(), 'countryName': info['country'].upper()},
+                'geoCode': {'latitude': info['lat'], 'longitude': info['lon']},
+            }
+            for code, info in matches
+        ],
+    }
+
+
+def _hotel(rng, city_code, index):
+    info = _airport(city_code)
+    hotel_id = f"SIM{city_code[:3].upper()}{index:04d}"
+    return {
+        'type': 'hotel',
+        'hotelId': hotel_id,
+        'chainCode': 'SM',
+        'name': f"{rng.choice(HOTEL_CHAINS)} {info['city']} {rng.choice(HOTEL_SUFFIXES)}",
+        'rating': str(rng.randrange(2, 6)),
+        'cityCode': city_code.upper(),
+        'latitude': info['lat'] + rng.uniform(-0.05, 0.05),
+        'longitude': info['lon'] + rng.uniform(-0.05, 0.05),
+        'address': {'city': info['city'], 'countryCode': info['country'], 'postalCode': str(rng.randrange(10000, 99999))},
+        'contact': {'phone': f"+1-555-{rng.randrange(1000, 9999)}", 'email': f"stay@{hotel_id.lower()}.example"},
+    }
+
+
+def _hotel_offer(rng, hotel_id, check_in, check_out, adults):
+    nights = max((_departure_date(check_out) - _departure_date(check_in)).days, 1)
+    nightly = rng.uniform(60, 420)
+    return {
+        'id': f"{hotel_id}-{rng.randrange(10 ** 6):06d}",
+        'checkInDate': check_in,
+        'checkOutDate': check_out,
+        'room': {'type': rng.choice(ROOM_TYPES), 'description': f"{rng.choice(ROOM_TYPES)} for {adults} guest(s)"},
+        'guests': {'adults': adults},
+        'price': {'currency': 'EUR', 'total': f"{nightly * nights:.2f}"},
+        'amenities': rng.sample(AMENITIES, 4),
+    }
+
+
+def hotel_offers(rng, params, profile, match=None, body=None):
+    """Amadeus /v2/shopping/hotel-offers (by city code or geocode)"""
+    city_code = params.get('cityCode')
+    if not city_code:
+        city_code = 'JFK'
+    check_in = params.get('checkInDate', date.today().isoformat())
+    check_out = params.get('checkOutDate', (date.today() + timedelta(days=1)).isoformat())
+    adults = int(params.get('adults', 1) or 1)
+    data = []
+    for index in range(profile.result_count):
+        hotel = _hotel(rng, city_code, index)
+        data.append({
+            'type': 'hotel-offers',
+            'available': True,
+            'hotel': hotel,
+            'offers': [_hotel_offer(rng, hotel['hotelId'], check_in, check_out, adults)],
+        })
+    return 200, {'data': data}
+
+
+def hotel_details(rng, params, profile, match=None, body=None):
+    """Amadeus /v1/shopping/hotel-offers/<offer id>"""
+    offer_id = match.group('offer_id')
+    hotel_id = offer_id.split('-')[0]
+    # Simulated hotel ids look like SIM<city code><index>, e.g. SIMJFK0003
+    city_code, index = hotel_id[3:6] or 'JFK', hotel_id[6:]
+    hotel = _hotel(rng, city_code, int(index) if index.isdigit() else 0)
+    check_in = (date.today() + timedelta(days=30)).isoformat()
+    check_out = (date.today() + timedelta(days=31)).isoformat()
+    return 200, {'data': {'type': 'hotel-offers', 'hotel': hotel, 'offers': [_hotel_offer(rng, hotel_id, check_in, check_out, 1)]}}
+
+
+def create_order(rng, params, profile, match=None, body=None):
+    """Amadeus POST /v1/booking/flight-orders"""
+    data = (body or {}).get('data', {})
+    order_id = 'SIM' + hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:12].upper()
+    return 201, {
+        'data': {
+            'type': 'flight-order',
+            'id': order_id,
+            'associatedRecords': [{'reference': order_id[3:9], 'originSystemCode': 'GDS'}],
+            'flightOffers': data.get('flightOffers', []),
+            'travelers': data.get('travelers', []),
+        }
+    }
+
+
+def get_order(rng, params, profile, match=None, body=None):
+    """Amadeus GET /v1/booking/flight-orders/<order id>"""
+    order_id = match.group('order_id')
+    return 200, {
+        'data': {
+            'type': 'flight-order',
+            'id': order_id,
+            'associatedRecords': [{'reference': order_id[3:9].upper(), 'originSystemCode': 'GDS'}],
+        }
+    }
+
+
+def airlabs_airports(rng, params, profile, match=None, body=None):
+    """AirLabs /airports"""
+    keyword = params.get('search', '').lower()
+    matches = [
+        (code, info) for code, info in IATA_INFO.items()
+        if keyword and (keyword in code.lower() or keyword in info['city'].lower() or keyword in info['name'].lower())
+    ][:profile.result_count]
+    return 200, {
+        'request': {'params': params},
+        'response': [
+            {
+                'name': info['name'],
+                'iata_code': code,
+                'icao_code': f"K{code}" if info['country'] == 'USA' else '',
+                'lat': info['lat'],
+                'lng': info['lon'],
+                'city': info['city'],
+                'country_name': info['country'],
+            }
+            for code, info in matches
+        ],
+    }
+
+
+def aviationstack_flights(rng, params, profile, match=None, body=None):
+    """AviationStack /flights"""
+    origin = params.get('dep_iata', 'JFK').upper()
+    destination = params.get('arr_iata', 'LAX').upper()
+    day = _departure_date(params.get('flight_date'))
+    distance = _route_distance(origin, destination, rng)
+    data = []
+    for _ in range(min(profile.result_count, int(params.get('limit', profile.result_count)))):
+        carrier, airline = CARRIERS[rng.randrange(len(CARRIERS))]
+        departure = datetime.combine(day, datetime.min.time()) + timedelta(minutes=rng.randrange(5 * 60, 23 * 60, 5))
+        arrival = departure + timedelta(minutes=int(distance / 780 * 60) + 30)
+        number = str(rng.randrange(10, 9999))
+        data.append({
+            'flight_date': day.isoformat(),
+            'flight_status': rng.choice(['scheduled', 'scheduled', 'active', 'landed']),
+            'departure': {'iata': origin, 'airport': _airport(origin)['name'], 'scheduled': departure.strftime('%Y-%m-%dT%H:%M:%S+00:00')},
+            'arrival': {'iata': destination, 'airport': _airport(destination)['name'], 'scheduled': arrival.strftime('%Y-%m-%dT%H:%M:%S+00:00')},
+            'airline': {'name': airline, 'iata': carrier},
+            'flight': {'number': number, 'iata': f"{carrier}{number}"},
+        })
+    return 200, {'pagination': {'limit': len(data), 'offset': 0, 'count': len(data), 'total': len(data)}, 'data': data}
+
+
+def opensky_departures(rng, params, profile, match=None, body=None):
+    """OpenSky /flights/departure"""
+    airport = params.get('airport', 'KJFK').upper()
+    begin = int(params.get('begin', 0) or 0)
+    end = int(params.get('end', begin + 86400) or begin + 86400)
+    flights = []
+    for _ in range(profile.result_count):
+        carrier, _ = CARRIERS[rng.randrange(len(CARRIERS))]
+        first_seen = rng.randrange(begin, max(end, begin + 1))
+        flights.append({
+            'icao24': f"{rng.randrange(16 ** 6):06x}",
+            'firstSeen': first_seen,
+            'estDepartureAirport': airport,
+            'lastSeen': first_seen + rng.randrange(45 * 60, 12 * 3600),
+            'estArrivalAirport': None,
+            'callsign': f"{carrier}{rng.randrange(10, 9999)}".ljust(8),
+        })
+    return 200, flights
+
+
+def opensky_states(rng, params, profile, match=None, body=None):
+    """OpenSky /states/all"""
+    now = int(params.get('time', 0) or 0) or 1700000000
+    states = []
+    for _ in range(profile.result_count):
+        carrier, _ = CARRIERS[rng.randrange(len(CARRIERS))]
+        states.append([
+            params.get('icao24') or f"{rng.randrange(16 ** 6):06x}",
+            f"{carrier}{rng.randrange(10, 9999)}".ljust(8),
+            'Simulated', now, now, rng.uniform(-180, 180), rng.uniform(-60, 70),
+            rng.uniform(3000, 12000), False, rng.uniform(150, 280), rng.uniform(0, 360),
+            0.0, None, rng.uniform(3000, 12000), None, False, 0,
+        ])
+    return 200, {'time': now, 'states': states}
+
+
+def token(rng, params, profile, match=None, body=None):
+    """Amadeus /v1/security/oauth2/token"""
+    return 200, {
+        'type': 'amadeusOAuth2Token',
+        'username': 'simulator@example.com',
+        'application_name': 'provider-simulator',
+        'client_id': params.get('client_id', ''),
+        'token_type': 'Bearer',
+        'access_token': f"sim-{rng.randrange(16 ** 16):016x}",
+        'expires_in': 1799,
+        'state': 'approved',
+        'scope': '',
+    }
+
+
+# (method, path pattern, route name, payload generator)
+ROUTES = [
+    ('POST', r'/v1/security/oauth2/token', 'amadeus.token', token),
+    ('GET', r'/v2/shopping/flight-offers', 'amadeus.flight_offers', flight_offers),
+    ('GET', r'/v1/reference-data/locations', 'amadeus.locations', locations),
+    ('GET', r'/v2/shopping/hotel-offers', 'amadeus.hotel_offers', hotel_offers),
+    ('GET', r'/v1/shopping/hotel-offers/(?P<offer_id>[\w-]+)', 'amadeus.hotel_details', hotel_details),
+    ('POST', r'/v1/booking/flight-orders', 'amadeus.flight_orders', create_order),
+    ('GET', r'/v1/booking/flight-orders/(?P<order_id>[\w-]+)', 'amadeus.flight_orders', get_order),
+    ('GET', r'/airlabs/airports', 'airlabs.airports', airlabs_airports),
+    ('GET', r'/aviationstack/flights', 'aviationstack.flights', aviationstack_flights),
+    ('GET', r'/opensky/flights/departure', 'opensky.departures', opensky_departures),
+    ('GET', r'/opensky/states/all', 'opensky.states', opensky_states),
+]
+COMPILED_ROUTES = [(method, re.compile(f"^{pattern}$"), name, handler) for method, pattern, name, handler in ROUTES]
+
+
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, status_code, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        if not raw:
+            return {}, {}
+        if 'json' in (self.headers.get('Content-Type') or ''):
+            try:
+                return {}, json.loads(raw)
+            except ValueError:
+                return {}, {}
+        return dict(parse_qsl(raw.decode('utf-8'))), {}
+
+    def _dispatch(self, method):
+        simulator = self.server.simulator
+        parts = urlsplit(self.path)
+        params = dict(parse_qsl(parts.query))
+        form, body = self._read_body() if method == 'POST' else ({}, {})
+        params.update(form)
+
+        for route_method, pattern, name, handler in COMPILED_ROUTES:
+            match = pattern.match(parts.path)
+            if route_method != method or not match:
+                continue
+            profile = simulator.profile_for(name)
+            latency, outcome = simulator.draw(profile)
+            simulator.record(name, outcome)
+            if latency:
+                time.sleep(latency)
+            if outcome == 'rate_limited':
+                return self._send_json(429, {'errors': [{'status': 429, 'title': 'Too many requests'}]},
+                                       {'Retry-After': str(profile.retry_after)})
+            if outcome == 'error':
+                return self._send_json(500, {'errors': [{'status': 500, 'title': 'Internal error'}]})
+            rng = _payload_rng(simulator.seed, name, {**params, **match.groupdict()})
+            status_code, payload = handler(rng, params, profile, match, body=body)
+            return self._send_json(status_code, payload)
+
+        self._send_json(404, {'errors': [{'status': 404, 'title': 'Not found', 'detail': parts.path}]})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+
+class ProviderSimulator:
+    """
+    Threaded HTTP server simulating every external provider.
+
+    Args:
+        profile (SimulatorProfile): Default behaviour for all routes.
+        overrides (dict): Per-route profiles keyed by route name.
+        seed (int): Seed for payloads and for the latency/error sequence.
+        host (str): Interface to bind.
+        port (int): Port to bind (0 picks a free port).
+    """
+
+    def __init__(self, profile=None, overrides=None, seed=42, host='127.0.0.1', port=0):
+        self.profile = profile or SimulatorProfile()
+        self.overrides = dict(overrides or {})
+        self.seed = seed
+        self.host = host
+        self.port = port
+        self.counts = {}
+        self._chaos = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def profile_for(self, route):
+        return self.overrides.get(route, self.profile)
+
+    def draw(self, profile):
+        """Draw latency and outcome ('ok', 'error' or 'rate_limited') for one request."""
+        with self._lock:
+            latency = profile.sample_latency(self._chaos)
+            roll = self._chaos.random()
+        if roll < profile.rate_limit_rate:
+            return latency, 'rate_limited'
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            return latency, 'error'
+        return latency, 'ok'
+
+    def record(self, route, outcome):
+        with self._lock:
+            route_counts = self.counts.setdefault(route, {})
+            route_counts[outcome] = route_counts.get(outcome, 0) + 1
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def settings_overrides(self):
+        """Return settings pointing every provider client at this simulator."""
+        return {
+            'AMADEUS_BASE_URL': self.base_url,
+            'AIRLABS_BASE_URL': f"{self.base_url}/airlabs",
+            'AVIATIONSTACK_BASE_URL': f"{self.base_url}/aviationstack",
+            'OPENSKY_BASE_URL': f"{self.base_url}/opensky",
+        }
+
+    def _bind(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), SimulatorRequestHandler)
+        self._server.daemon_threads = True
+        self._server.simulator = self
+
+    def start(self):
+        """Start serving on a daemon thread and return the base URL."""
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Provider simulator listening on {self.base_url}")
+        return self.base_url
+
+    def serve_forever(self):
+        """Serve in the calling thread (used by the management command)."""
+        self._bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
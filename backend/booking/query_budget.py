@@ -0,0 +1,50 @@
+"""
+Test-time query budget checks.
+
+An endpoint whose query count grows with the number of rows it returns has
+an N+1 somewhere. QueryBudgetMixin calls an endpoint at several fixture
+sizes and fails if the counts differ, or exceed an absolute budget, and
+prints the captured SQL so the offending per-row query is easy to spot.
+"""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    Mixin for TestCase classes asserting that endpoints run a constant number of queries.
+    """
+
+    def assertConstantQueries(self, request, add_rows, sizes=(1, 3, 6), budget=None):
+        """
+        Fail if the queries made by ``request()`` grow with the row count.
+
+        Args:
+            request (callable): Performs the request and returns the response.
+            add_rows (callable): ``add_rows(count)`` adds ``count`` more rows to the fixture.
+            sizes (tuple): Increasing total row counts to measure at.
+            budget (int): Optional upper bound on queries per request.
+
+        Returns:
+            int: The (constant) number of queries.
+        """
+        counts, present = [], 0
+        for size in sizes:
+            add_rows(size - present)
+            present = size
+            with CaptureQueriesContext(connection) as captured:
+                response = request()
+            self.assertLess(response.status_code, 400, f"request failed at {size} rows")
+            counts.append((size, len(captured), [query['sql'] for query in captured]))
+
+        baseline = counts[0][1]
+        for size, count, queries in counts[1:]:
+            if count != baseline:
+                self.fail(
+                    f"Query count grows with rows: {baseline} at {sizes[0]} rows, {count} at {size} rows\n"
+                    + '\n'.join(queries)
+                )
+        if budget is not None and baseline > budget:
+            self.fail(f"{baseline} queries exceed the budget of {budget}\n" + '\n'.join(counts[0][2]))
+        return baseline
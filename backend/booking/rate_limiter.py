@@ -0,0 +1,206 @@
+"""
+Client-side token bucket rate limiting for external providers.
+
+Each provider and API key pair gets a token bucket. With the Redis cache
+backend the bucket lives in Redis and is updated atomically by a Lua script,
+so web and Celery workers draw from the same quota. With the local-memory
+cache (development, tests) each process keeps its own bucket.
+
+A 429 from the provider drains the bucket until its Retry-After has passed,
+so workers stop calling a provider that already told us to back off.
+Callers either wait briefly for a token or get ``QuotaExhausted`` right
+away and fall back to cached data or another provider.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+# Default bucket when a provider has no entry in PROVIDER_RATE_LIMITS
+DEFAULT_RATE = 1.0  # Tokens added per second
+DEFAULT_BURST = 10  # Bucket capacity
+# Default seconds a caller may queue for a token
+DEFAULT_MAX_WAIT = 0.5
+# Seconds to back off after a 429 without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 10
+
+# KEYS[1]: bucket hash. ARGV: rate, capacity, requested tokens, backoff seconds.
+# requested = 0 only reads the bucket; backoff > 0 drains it after a 429.
+# Returns {allowed, seconds until enough tokens, tokens left}.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local backoff = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'blocked_until')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+local blocked_until = tonumber(state[3]) or 0
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+if backoff > 0 then
+    tokens = 0
+    blocked_until = math.max(blocked_until, now + backoff)
+end
+local allowed = 0
+local wait = 0
+if now < blocked_until then
+    wait = blocked_until - now
+    tokens = 0
+elseif tokens >= requested then
+    tokens = tokens - requested
+    allowed = 1
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HMSET', KEYS[1], 'tokens', tokens, 'ts', now, 'blocked_until', blocked_until)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate + math.max(0, blocked_until - now)) + 60)
+return {allowed, tostring(wait), tostring(tokens)}
+"""
+
+
+class QuotaExhausted(requests.RequestException):
+    """
+    Raised when a provider's quota has no token left for this call.
+
+    Subclasses RequestException so existing client error handling returns
+    None and callers fall back to cached data or another provider.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _redis_client():
+    """Return the raw Redis client behind the default cache, or None."""
+    backend = caches['default']
+    if not isinstance(backend, RedisCache):
+        return None
+    return backend._cache.get_client(None, write=True)
+
+
+class TokenBucket:
+    """
+    Token bucket for one provider and API key, shared through Redis when available.
+    """
+
+    def __init__(self, provider, api_key=None, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.provider = provider
+        self.rate = float(rate)
+        self.burst = float(burst)
+        key_id = hashlib.sha1((api_key or 'anonymous').encode('utf-8')).hexdigest()[:12]
+        self.key = f"ratelimit:{provider}:{key_id}"
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._script = None
+
+    def _local(self, requested, backoff):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if backoff > 0:
+                self._tokens = 0.0
+                self._blocked_until = max(self._blocked_until, now + backoff)
+            if now < self._blocked_until:
+                self._tokens = 0.0
+                return False, self._blocked_until - now, 0.0
+            if self._tokens >= requested:
+                self._tokens -= requested
+                return True, 0.0, self._tokens
+            return False, (requested - self._tokens) / self.rate, self._tokens
+
+    def _eval(self, requested, backoff=0):
+        """Run one atomic bucket update, returning (allowed, wait, tokens left)."""
+        client = _redis_client()
+        if client is None:
+            return self._local(requested, backoff)
+        if self._script is None:
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        allowed, wait, tokens = self._script(
+            keys=[cache.make_key(self.key)], args=[self.rate, self.burst, requested, backoff], client=client
+        )
+        return bool(int(allowed)), float(wait), float(tokens)
+
+    def acquire(self, tokens=1, wait=0):
+        """
+        Take tokens from the bucket, queueing for at most ``wait`` seconds.
+
+        Raises:
+            QuotaExhausted: If no token becomes available in time.
+        """
+        deadline = time.monotonic() + wait
+        while True:
+            allowed, retry_after, _ = self._eval(tokens)
+            if allowed:
+                return
+            remaining = deadline - time.monotonic()
+            if retry_after > remaining:
+                raise QuotaExhausted(
+                    f"Rate limit quota exhausted for {self.provider}", retry_after=round(retry_after, 3)
+                )
+            time.sleep(retry_after)
+
+    def drain(self, retry_after=None):
+        """Empty the bucket after a 429 and block it for ``retry_after`` seconds."""
+        backoff = retry_after if retry_after and retry_after > 0 else DEFAULT_RETRY_AFTER
+        self._eval(0, backoff)
+        logger.warning(f"{self.provider} returned 429, pausing calls for {backoff}s")
+
+    def remaining(self):
+        """Return the tokens currently available, without taking any."""
+        _, retry_after, tokens = self._eval(0)
+        return {
+            'tokens': round(tokens, 2),
+            'capacity': self.burst,
+            'rate_per_second': self.rate,
+            'blocked_for': round(retry_after, 3),
+        }
+
+
+def retry_after_seconds(response):
+    """Parse a numeric Retry-After header, returning None if absent or invalid."""
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return max(float(value), 0) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(provider, api_key=None):
+    """Return the process-wide bucket for a provider and API key."""
+    config = getattr(settings, 'PROVIDER_RATE_LIMITS', {}).get(provider, {})
+    rate = config.get('rate', DEFAULT_RATE)
+    burst = config.get('burst', DEFAULT_BURST)
+    identity = (provider, api_key, rate, burst)
+    bucket = _buckets.get(identity)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.setdefault(identity, TokenBucket(provider, api_key, rate=rate, burst=burst))
+    return bucket
+
+
+def provider_api_keys():
+    """Return the configured (provider, API key) pairs used for quota gauges."""
+    return [
+        ('amadeus', getattr(settings, 'AMADEUS_API_KEY', None)),
+        ('airlabs', getattr(settings, 'AIRLABS_API_KEY', None)),
+        ('aviationstack', getattr(settings, 'AVIATIONSTACK_API_KEY', None)),
+        ('opensky', None),
+    ]
@@ -0,0 +1,235 @@
+"""
+Precomputed airport-pair distance matrix.
+
+FlightSerializer and the search mappers need a flight's duration and
+arrival time; computing haversine per row is wasteful for large lists, so
+the great-circle kilometres of every airport pair are precomputed into a
+float32 array of shape ``(n, n)``, indexed by the airport's position in the
+snapshot. Block minutes are a linear function of the distance and are
+derived on read rather than stored, which would double the file.
+
+``build_route_matrix`` writes it to ``ROUTE_MATRIX_DIR`` as an ``.npy``
+file plus a JSON sidecar with the airport codes and a fingerprint of their
+coordinates. Processes memory-map it read-only on first use, so forked
+workers share the pages. If the file is missing or was built for different
+airports, small tables are computed in memory and large ones fall back to
+per-pair haversine from the snapshot.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+
+from .airport_snapshot import get_snapshot
+from .airport_table import haversine_km
+
+logger = logging.getLogger(__name__)
+
+MATRIX_FILE = 'route_matrix.npy'
+CODES_FILE = 'route_matrix_codes.json'
+# Block time model: fixed taxi/climb/descent allowance plus cruise at average block speed
+BLOCK_OVERHEAD_MINUTES = 30
+BLOCK_SPEED_KMH = 800
+# Duration reported when the route is unknown (the previous hard-coded value)
+DEFAULT_BLOCK_MINUTES = 480
+# Above this many airports the matrix is never computed in memory (n^2 * 4 bytes)
+MAX_IN_MEMORY_AIRPORTS = 2000
+# Rows computed per step when writing the matrix
+BUILD_CHUNK_ROWS = 256
+
+
+def block_minutes(distance_km):
+    """Estimated gate-to-gate minutes for a great-circle distance."""
+    return BLOCK_OVERHEAD_MINUTES + distance_km / BLOCK_SPEED_KMH * 60
+
+
+def iso_duration(minutes):
+    """Format minutes as an ISO 8601 duration: 'PT7H5M', or 'PT8H' on the hour."""
+    hours, minutes = divmod(int(round(minutes)), 60)
+    return f"PT{hours}H{minutes}M" if minutes else f"PT{hours}H"
+
+
+def matrix_dir():
+    return str(getattr(settings, 'ROUTE_MATRIX_DIR', os.path.join(settings.BASE_DIR, 'data')))
+
+
+def snapshot_fingerprint(snapshot):
+    """Hash of airport codes and coordinates; the matrix is stale when it changes."""
+    return snapshot.fingerprint
+
+
+def _fill_rows(target, lat_rad, lon_rad, start, stop):
+    distances = haversine_km(lat_rad[start:stop, None], lon_rad[start:stop, None], lat_rad[None, :], lon_rad[None, :])
+    # Airports without coordinates are NaN; store them as unknown (-1)
+    target[start:stop] = np.where(np.isnan(distances), -1, distances)
+
+
+def compute_matrix(snapshot, out=None):
+    """
+    Compute the ``(n, n)`` float32 distance matrix for a snapshot, row chunk by row chunk.
+
+    Args:
+        snapshot (AirportSnapshot): Airports to index.
+        out (ndarray): Optional preallocated target, e.g. an ``open_memmap``.
+    """
+    n = len(snapshot)
+    out = out if out is not None else np.empty((n, n), dtype=np.float32)
+    lat_rad = np.radians(np.frombuffer(snapshot.latitudes, dtype=np.float64)) if n else np.empty(0)
+    lon_rad = np.radians(np.frombuffer(snapshot.longitudes, dtype=np.float64)) if n else np.empty(0)
+    for start in range(0, n, BUILD_CHUNK_ROWS):
+        _fill_rows(out, lat_rad, lon_rad, start, min(start + BUILD_CHUNK_ROWS, n))
+    return out
+
+
+def build_matrix_file(snapshot, directory=None):
+    """
+    Write the matrix and its sidecar for a snapshot, replacing any previous files.
+
+    Returns:
+        str: Path of the written matrix.
+    """
+    directory = directory or matrix_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, MATRIX_FILE)
+    n = len(snapshot)
+    tmp_path = f"{path}.tmp.npy"
+    matrix = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(n, n))
+    compute_matrix(snapshot, out=matrix)
+    matrix.flush()
+    del matrix
+    tmp_codes = os.path.join(directory, f"{CODES_FILE}.tmp")
+    with open(tmp_codes, 'w') as handle:
+        json.dump({'fingerprint': snapshot_fingerprint(snapshot), 'codes': list(snapshot.codes)}, handle)
+    os.replace(tmp_path, path)
+    os.replace(tmp_codes, os.path.join(directory, CODES_FILE))
+    return path
+
+
+def read_fingerprint(directory=None):
+    """Fingerprint recorded next to the matrix on disk, or None if there is no current-layout matrix."""
+    directory = directory or matrix_dir()
+    try:
+        with open(os.path.join(directory, CODES_FILE)) as handle:
+            sidecar = json.load(handle)
+        shape = np.load(os.path.join(directory, MATRIX_FILE), mmap_mode='r').shape
+    except (OSError, ValueError):
+        return None
+    n = len(sidecar.get('codes', []))
+    return sidecar.get('fingerprint') if shape == (n, n) else None
+
+
+class RouteMatrix:
+    """
+    O(1) distance and block-time lookups between airports.
+
+    Args:
+        codes (sequence): IATA codes in matrix order.
+        matrix (ndarray): ``(n, n)`` float32 distance array (in memory or memory-mapped),
+            or None to compute each pair from ``snapshot`` on demand.
+        snapshot (AirportSnapshot): Coordinates for on-demand lookups.
+    """
+
+    def __init__(self, codes, matrix=None, snapshot=None, source='memory'):
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.matrix = matrix
+        self.snapshot = snapshot
+        self.source = source
+
+    def route(self, origin, destination):
+        """
+        Return ``(distance_km, block_minutes)`` between two IATA codes, or None.
+        """
+        i = self.index.get(origin)
+        j = self.index.get(destination)
+        if i is None or j is None or i == j:
+            return None
+        if self.matrix is not None:
+            # ndarray.item returns a Python float without creating a numpy scalar
+            distance = self.matrix.item(i, j)
+            if distance < 0:
+                return None
+            return distance, block_minutes(distance)
+        snapshot = self.snapshot
+        coordinates = (snapshot.latitudes[i], snapshot.longitudes[i], snapshot.latitudes[j], snapshot.longitudes[j])
+        if any(math.isnan(value) for value in coordinates):
+            return None
+        lat1, lon1, lat2, lon2 = map(math.radians, coordinates)
+        distance = float(haversine_km(lat1, lon1, lat2, lon2))
+        return distance, block_minutes(distance)
+
+    def block_minutes(self, origin, destination):
+        route = self.route(origin, destination)
+        return route[1] if route else None
+
+
+def load_route_matrix(snapshot=None):
+    """
+    Memory-map the matrix from disk when it matches the snapshot, else build a fallback.
+    """
+    snapshot = snapshot or get_snapshot()
+    directory = matrix_dir()
+    path = os.path.join(directory, MATRIX_FILE)
+    if os.path.exists(path):
+        try:
+            with open(os.path.join(directory, CODES_FILE)) as handle:
+                sidecar = json.load(handle)
+            if sidecar.get('fingerprint') == snapshot_fingerprint(snapshot):
+                matrix = np.load(path, mmap_mode='r')
+                n = len(sidecar['codes'])
+                # Files from before block minutes were derived on read hold two (n, n) planes
+                if matrix.shape == (n, n):
+                    return RouteMatrix(sidecar['codes'], matrix, snapshot, source='file')
+            logger.warning("Route matrix on disk is stale; run `manage.py build_route_matrix`")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load route matrix from {path}: {e}")
+    if len(snapshot) <= MAX_IN_MEMORY_AIRPORTS:
+        return RouteMatrix(snapshot.codes, compute_matrix(snapshot), snapshot, source='memory')
+    return RouteMatrix(snapshot.codes, None, snapshot, source='haversine')
+
+
+_route_matrix = None
+_lock = threading.Lock()
+
+
+def get_route_matrix():
+    """Return the process-wide matrix for the current snapshot, loading it lazily."""
+    matrix = _route_matrix
+    if matrix is None or matrix.snapshot is not get_snapshot():
+        with _lock:
+            if _route_matrix is None or _route_matrix.snapshot is not get_snapshot():
+                reset_route_matrix(load_route_matrix())
+            matrix = _route_matrix
+    return matrix
+
+
+def reset_route_matrix(matrix=None):
+    """Replace (or with None, drop) the process-wide matrix."""
+    global _route_matrix
+    _route_matrix = matrix
+
+
+def block_time(origin, destination):
+    """
+    Return ``(timedelta, iso_duration)`` of the block time between two IATA codes.
+
+    Unknown routes use DEFAULT_BLOCK_MINUTES.
+    """
+    minutes = get_route_matrix().block_minutes(origin, destination)
+    if minutes is None:
+        minutes = DEFAULT_BLOCK_MINUTES
+    minutes = int(round(minutes))
+    return timedelta(minutes=minutes), iso_duration(minutes)
+
+
+def estimate_arrival(origin, destination, departure):
+    """
+    Return ``(arrival_datetime, iso_duration)`` for a flight between two IATA codes.
+    """
+    block, duration = block_time(origin, destination)
+    return departure + block, duration
@@ -0,0 +1,162 @@
+"""
+Shared search result cache with stale-while-revalidate semantics.
+
+Results are stored in the configured Django cache (LocMemCache locally,
+Redis when CACHE_MODE='redis'), so every worker shares the same entries.
+Each entry carries a freshness deadline; once it passes, the stale value
+is still served while a single background refresh repopulates it, and it
+is also served when the provider errors.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Default number of seconds a cached search is considered fresh
+DEFAULT_FRESH_TTL = 300
+# Default number of seconds a stale search may still be served after expiry
+DEFAULT_STALE_TTL = 1800
+# Default number of seconds a background refresh holds the refresh lock
+DEFAULT_REFRESH_LOCK_TTL = 60
+
+HIT = 'hit'
+MISS = 'miss'
+STALE = 'stale'
+
+
+class CacheStats:
+    """
+    Cache-backed hit/miss counters shared by every worker.
+
+    Counters live under ``<namespace>:stats:<name>`` and are incremented
+    atomically with ``cache.incr`` so they can be read from any process.
+    """
+
+    def __init__(self, namespace, counters):
+        self.namespace = namespace
+        self.counters = tuple(counters)
+
+    def _key(self, name):
+        return f"{self.namespace}:stats:{name}"
+
+    def incr(self, name, delta=1):
+        """Increment a counter, creating it if it does not exist yet."""
+        key = self._key(name)
+        if cache.add(key, delta, timeout=None):
+            return
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # Key evicted between add() and incr()
+            cache.set(key, delta, timeout=None)
+
+    def snapshot(self):
+        """
+        Return the current counter values.
+
+        Returns:
+            dict: Counter values keyed by name.
+        """
+        values = cache.get_many([self._key(name) for name in self.counters])
+        return {name: values.get(self._key(name), 0) for name in self.counters}
+
+    def reset(self):
+        """Reset every counter to zero."""
+        cache.delete_many([self._key(name) for name in self.counters])
+
+
+class SearchResultCache:
+    """
+    TTL-bounded cache for provider search results.
+
+    Uses ``get_or_fetch`` to look up a canonicalized key and either return
+    the cached value, revalidate it in the background, or call the provider.
+    """
+
+    def __init__(self, namespace, fresh_ttl=None, stale_ttl=None, refresh_lock_ttl=None):
+        self.namespace = namespace
+        self.fresh_ttl = fresh_ttl if fresh_ttl is not None else getattr(
+            settings, 'SEARCH_CACHE_FRESH_TTL', DEFAULT_FRESH_TTL)
+        self.stale_ttl = stale_ttl if stale_ttl is not None else getattr(
+            settings, 'SEARCH_CACHE_STALE_TTL', DEFAULT_STALE_TTL)
+        self.refresh_lock_ttl = refresh_lock_ttl or DEFAULT_REFRESH_LOCK_TTL
+        self.stats = CacheStats(namespace, ['hits', 'misses', 'stale', 'errors', 'refreshes'])
+
+    def make_key(self, *parts):
+        """
+        Build a cache key from canonicalized search parameters.
+
+        Parts are stripped and upper-cased so that ``jfk``/``JFK `` map to
+        the same entry, then hashed to stay within memcached/Redis key limits.
+        """
+        canonical = '|'.join('' if part is None else str(part).strip().upper() for part in parts)
+        digest = hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+    def _store(self, key, value):
+        entry = {'value': value, 'fresh_until': time.time() + self.fresh_ttl}
+        cache.set(key, entry, self.fresh_ttl + self.stale_ttl)
+
+    def _refresh_in_background(self, key, fetch):
+        """Refresh a stale entry on a daemon thread, at most once per key."""
+        lock_key = f"{key}:refreshing"
+        if not cache.add(lock_key, True, self.refresh_lock_ttl):
+            return
+
+        def refresh():
+            try:
+                value = fetch()
+                if value:
+                    self._store(key, value)
+                    self.stats.incr('refreshes')
+            except Exception as e:
+                self.stats.incr('errors')
+                logger.warning(f"Background refresh failed for {key}: {e}")
+            finally:
+                cache.delete(lock_key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Return a cached value for ``key`` or populate it by calling ``fetch``.
+
+        Args:
+            key (str): Key returned by ``make_key``.
+            fetch (callable): Zero-argument callable hitting the provider.
+                A falsy return value is treated as "no result" and is not cached.
+
+        Returns:
+            tuple: ``(value, state)`` where state is one of 'hit', 'stale' or 'miss'.
+
+        Raises:
+            Exception: Whatever ``fetch`` raised, if no stale value is available.
+        """
+        entry = cache.get(key)
+        if entry is not None:
+            if entry['fresh_until'] > time.time():
+                self.stats.incr('hits')
+                return entry['value'], HIT
+            self.stats.incr('stale')
+            self._refresh_in_background(key, fetch)
+            return entry['value'], STALE
+
+        self.stats.incr('misses')
+        try:
+            value = fetch()
+        except Exception:
+            self.stats.incr('errors')
+            raise
+        if value:
+            self._store(key, value)
+        return value, MISS
+
+
+# Shared cache instance for flight search results
+flight_search_cache = SearchResultCache('flight_search')
@@ -0,0 +1,275 @@
+"""
+Concurrent multi-provider flight search.
+
+The orchestrator fans a search out to every configured provider on a shared
+thread pool, waits until a global deadline, and merges whatever arrived in
+time. Once a fare provider returns priced offers, the others only get a short
+grace period, so response time tracks the fastest healthy fare provider
+rather than the slowest one. Tracking-only providers (AviationStack, OpenSky)
+never start the grace period while a fare provider is still pending, since
+their unpriced schedules would otherwise cut the offers off.
+
+Calls that miss the deadline are cancelled if they have not started yet;
+running ones cannot be interrupted and finish in the background with their
+results discarded. Each provider may only have a few calls in flight on the
+shared pool, so one hanging provider cannot take every worker.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+from .amadeus_client import AmadeusClient
+from .amadeus_service import AmadeusService
+from .aviationstack_client import AviationStackClient
+from .circuit_breaker import CircuitOpenError
+from .opensky_client import OpenSkyClient
+from .flight_mappers import map_amadeus_flights, map_tracking_flights
+from .rate_limiter import QuotaExhausted
+
+logger = logging.getLogger(__name__)
+
+# Default global deadline for a fan-out search, in seconds
+DEFAULT_DEADLINE = 2.5
+# Default time to keep waiting for other providers after the first results arrive
+DEFAULT_GRACE_PERIOD = 0.25
+# Default size of the shared provider thread pool
+DEFAULT_MAX_WORKERS = 16
+# Default number of calls one provider may have on the pool at once
+DEFAULT_MAX_IN_FLIGHT = 4
+# Providers queried when FLIGHT_SEARCH_PROVIDERS is not configured
+DEFAULT_PROVIDERS = ['amadeus', 'aviationstack', 'opensky']
+
+
+def _search_amadeus(origin, destination, departure_date, adults, travel_class):
+    data = AmadeusClient().search_flights(
+        origin=origin,
+        destination=destination,
+        departure_date=departure_date,
+        adults=adults,
+        travel_class=travel_class
+    )
+    return map_amadeus_flights(data) if data else None
+
+
+def _search_amadeus_service(origin, destination, departure_date, adults, travel_class):
+    data = AmadeusService().search_flights(
+        origin=origin,
+        destination=destination,
+        departure_date=departure_date,
+        adults=adults
+    )
+    return map_amadeus_flights(data) if data else None
+
+
+def _search_aviationstack(origin, destination, departure_date, adults, travel_class):
+    return map_tracking_flights(AviationStackClient().search_flights(origin, destination, departure_date))
+
+
+def _search_opensky(origin, destination, departure_date, adults, travel_class):
+    return map_tracking_flights(OpenSkyClient().search_flights(origin, destination, departure_date))
+
+
+# Registry of provider name -> search callable returning mapped flights or None
+PROVIDERS = {
+    'amadeus': _search_amadeus,
+    'amadeus_service': _search_amadeus_service,
+    'aviationstack': _search_aviationstack,
+    'opensky': _search_opensky,
+}
+
+# Providers returning schedule/tracking data without fares
+TRACKING_PROVIDERS = {'aviationstack', 'opensky'}
+
+
+def offer_identity(flight):
+    """
+    Return the de-duplication key for a flight offer.
+
+    Offers are the same flight when carrier + flight number and the
+    departure time (to the minute, ignoring timezone suffixes) match.
+    """
+    flight_number = re.sub(r'\s+', '', str(flight.get('flightNumber', ''))).upper()
+    departure = str(flight.get('departureTime', '')).replace(' ', 'T')[:16]
+    return flight_number, departure
+
+
+def _has_price(flight):
+    return isinstance(flight.get('price'), (int, float))
+
+
+def merge_offers(results_by_provider, provider_order):
+    """
+    Merge provider results, de-duplicating identical flights.
+
+    Priced offers win over unpriced tracking data for the same flight;
+    otherwise the provider listed first in ``provider_order`` wins.
+    The merged list is sorted by price with unpriced flights last.
+    """
+    merged = {}
+    for name in provider_order:
+        for flight in results_by_provider.get(name) or []:
+            identity = offer_identity(flight)
+            existing = merged.get(identity)
+            if existing is None or (_has_price(flight) and not _has_price(existing)):
+                merged[identity] = dict(flight, provider=name)
+    return sorted(
+        merged.values(),
+        key=lambda flight: (not _has_price(flight), flight['price'] if _has_price(flight) else 0)
+    )
+
+
+class FlightSearchOrchestrator:
+    """
+    Fan out a flight search to all configured providers with a deadline.
+    """
+
+    _executor = None
+    _executor_pid = None
+    _executor_lock = threading.Lock()
+    # Calls per provider submitted to the pool and not yet finished or cancelled
+    _in_flight = Counter()
+    _in_flight_lock = threading.Lock()
+
+    def __init__(self, providers=None, deadline=None, grace_period=None, max_in_flight=None):
+        names = providers or getattr(settings, 'FLIGHT_SEARCH_PROVIDERS', DEFAULT_PROVIDERS)
+        self.providers = [name for name in names if name in PROVIDERS]
+        self.deadline = deadline if deadline is not None else getattr(
+            settings, 'FLIGHT_SEARCH_DEADLINE', DEFAULT_DEADLINE)
+        self.grace_period = grace_period if grace_period is not None else getattr(
+            settings, 'FLIGHT_SEARCH_GRACE_PERIOD', DEFAULT_GRACE_PERIOD)
+        self.max_in_flight = max_in_flight or getattr(settings, 'FLIGHT_SEARCH_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT)
+
+    @classmethod
+    def get_executor(cls):
+        """
+        Return the process-wide provider thread pool.
+
+        The pool is recreated after a fork (e.g. gunicorn --preload), since
+        worker threads do not survive into the child process.
+        """
+        with cls._executor_lock:
+            if cls._executor is None or cls._executor_pid != os.getpid():
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'FLIGHT_SEARCH_MAX_WORKERS', DEFAULT_MAX_WORKERS),
+                    thread_name_prefix='flight-search'
+                )
+                cls._executor_pid = os.getpid()
+                with cls._in_flight_lock:
+                    cls._in_flight.clear()
+            return cls._executor
+
+    @classmethod
+    def _finished(cls, name):
+        with cls._in_flight_lock:
+            cls._in_flight[name] -= 1
+
+    def _submit(self, executor, name, *args):
+        """Queue a provider call, or return None if the provider already has too many in flight."""
+        with self._in_flight_lock:
+            if self._in_flight[name] >= self.max_in_flight:
+                return None
+            self._in_flight[name] += 1
+        try:
+            return executor.submit(self._timed_call, name, *args)
+        except Exception:
+            self._finished(name)
+            raise
+
+    def _timed_call(self, name, *args):
+        started = time.monotonic()
+        try:
+            flights = PROVIDERS[name](*args)
+            status = 'ok' if flights else 'empty'
+            return flights or [], status, time.monotonic() - started
+        except CircuitOpenError as e:
+            logger.info(f"Flight search provider {name} skipped: {e}")
+            return [], 'circuit_open', time.monotonic() - started
+        except QuotaExhausted as e:
+            logger.info(f"Flight search provider {name} skipped: {e}")
+            return [], 'quota_exhausted', time.monotonic() - started
+        except Exception as e:
+            logger.warning(f"Flight search provider {name} failed: {e}")
+            return [], 'error', time.monotonic() - started
+        finally:
+            self._finished(name)
+
+    def search(self, origin, destination, departure_date, adults=1, travel_class='ECONOMY'):
+        """
+        Search all providers concurrently and merge the results.
+
+        Args:
+            origin (str): IATA code of origin airport.
+            destination (str): IATA code of destination airport.
+            departure_date (str): Departure date in ISO format (YYYY-MM-DD).
+            adults (int): Number of adult passengers.
+            travel_class (str): Amadeus travel class.
+
+        Returns:
+            dict: ``{'flights': [...], 'providers': {name: {'status', 'latency_ms', 'count'}}}``
+        """
+        started = time.monotonic()
+        hard_deadline = started + self.deadline
+        executor = self.get_executor()
+        futures = {}
+        results_by_provider = {}
+        providers_meta = {}
+        for name in self.providers:
+            future = self._submit(executor, name, origin, destination, departure_date, adults, travel_class)
+            if future is None:
+                logger.info(f"Flight search provider {name} skipped: {self.max_in_flight} calls already in flight")
+                providers_meta[name] = {'status': 'saturated', 'latency_ms': 0.0, 'count': 0}
+            else:
+                futures[future] = name
+
+        pending = set(futures)
+        wait_until = hard_deadline
+        while pending:
+            remaining = wait_until - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                flights, status, latency = future.result()
+                results_by_provider[name] = flights
+                providers_meta[name] = {
+                    'status': status,
+                    'latency_ms': round(latency * 1000, 1),
+                    'count': len(flights),
+                }
+            offers_pending = any(futures[future] not in TRACKING_PROVIDERS for future in pending)
+            priced = any(_has_price(flight) for flights in results_by_provider.values() for flight in flights)
+            if priced or (not offers_pending and any(results_by_provider.values())):
+                # Fares are in, or no fare provider is left to wait for: give the rest a short grace period
+                wait_until = min(wait_until, time.monotonic() + self.grace_period)
+
+        for future in pending:
+            name = futures[future]
+            if future.cancel():
+                # Never started: free its in-flight slot now
+                self._finished(name)
+            providers_meta[name] = {
+                'status': 'timeout',
+                'latency_ms': round((time.monotonic() - started) * 1000, 1),
+                'count': 0,
+            }
+
+        return {
+            'flights': merge_offers(results_by_provider, self.providers),
+            'providers': providers_meta,
+        }
+
+
+def server_timing_header(providers_meta):
+    """Format per-provider latency as a Server-Timing header value."""
+    return ', '.join(
+        f'{name};dur={meta["latency_ms"]};desc="{meta["status"]}"'
+        for name, meta in providers_meta.items()
+    )
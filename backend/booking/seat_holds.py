@@ -0,0 +1,210 @@
+"""
+Time-limited seat holds for unpaid bookings.
+
+Creating a booking on a tracked flight takes its seat from the cabin
+counter at once (see booking.seat_inventory); while the booking waits for
+payment that seat is covered by a SeatHold with an expiry. Payment converts
+the hold; otherwise the ``release_expired_seat_holds`` beat task hands the
+seat back and cancels the booking.
+
+The sweeper is set-based. Each chunk of expired holds costs a fixed number
+of statements whatever its size:
+
+1. claim the chunk with one conditional UPDATE (``status='active'`` ->
+   ``'released'``), so a hold converted by a concurrent payment is skipped
+   rather than released;
+2. read back the holds this sweep actually claimed;
+3. add the seats back with one UPDATE over the affected counters, a CASE
+   per (flight, cabin) and capped at ``seats_total``;
+4. cancel the bookings with one UPDATE.
+
+All four run in one transaction, so counters and holds never disagree.
+Created, released and converted holds are counted per minute in the shared
+cache for the admin stats endpoint.
+"""
+
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from .exceptions import SeatsUnavailableException
+from .models import Booking, SeatHold, SeatInventory
+from .seat_inventory import reserve_seats
+
+logger = logging.getLogger(__name__)
+
+# Default number of seconds an unpaid booking keeps its seat
+DEFAULT_HOLD_TTL = 900
+# Default number of expired holds released per chunk
+DEFAULT_SWEEP_BATCH_SIZE = 500
+# Minutes of per-minute counters kept in the cache
+METRICS_RETENTION_MINUTES = 120
+
+
+def hold_ttl():
+    return getattr(settings, 'SEAT_HOLD_TTL', DEFAULT_HOLD_TTL)
+
+
+def sweep_batch_size():
+    return getattr(settings, 'SEAT_HOLD_SWEEP_BATCH_SIZE', DEFAULT_SWEEP_BATCH_SIZE)
+
+
+class HoldMetrics:
+    """
+    Per-minute counters of holds created, released and converted.
+
+    Each minute has its own cache key, ``<namespace>:<name>:<epoch minute>``,
+    incremented atomically like CacheStats and expiring after the retention window.
+    """
+    counters = ('created', 'released', 'converted')
+
+    def __init__(self, namespace='seat_holds', retention_minutes=METRICS_RETENTION_MINUTES):
+        self.namespace = namespace
+        self.retention = retention_minutes * 60
+
+    def _key(self, name, minute):
+        return f"{self.namespace}:{name}:{minute}"
+
+    @staticmethod
+    def _minute(now=None):
+        return int((now if now is not None else time.time()) // 60)
+
+    def incr(self, name, delta=1, now=None):
+        """Add ``delta`` to this minute's counter."""
+        if not delta:
+            return
+        key = self._key(name, self._minute(now))
+        if cache.add(key, delta, timeout=self.retention):
+            return
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # Key evicted between add() and incr()
+            cache.set(key, delta, timeout=self.retention)
+
+    def per_minute(self, minutes=15, now=None):
+        """
+        Return the last ``minutes`` minutes of counters, oldest first.
+
+        Returns:
+            list: ``{'minute': ISO timestamp, 'created': n, 'released': n, 'converted': n}`` dicts.
+        """
+        current = self._minute(now)
+        window = range(current - minutes + 1, current + 1)
+        values = cache.get_many([self._key(name, minute) for minute in window for name in self.counters])
+        return [
+            {
+                'minute': datetime.fromtimestamp(minute * 60, tz=dt_timezone.utc).isoformat(),
+                **{name: values.get(self._key(name, minute), 0) for name in self.counters},
+            }
+            for minute in window
+        ]
+
+
+hold_metrics = HoldMetrics()
+
+
+def place_hold(booking, seats=1, now=None):
+    """Cover a pending booking's reserved seat with a hold expiring after SEAT_HOLD_TTL."""
+    now = now or timezone.now()
+    hold = SeatHold.objects.create(
+        booking=booking, flight_id=booking.flight_id, cabin=booking.cabin, seats=seats,
+        expires_at=now + timedelta(seconds=hold_ttl()),
+    )
+    hold_metrics.incr('created', seats)
+    return hold
+
+
+def place_holds(bookings, now=None):
+    """Hold the seats of several pending bookings with one INSERT."""
+    now = now or timezone.now()
+    expires_at = now + timedelta(seconds=hold_ttl())
+    holds = SeatHold.objects.bulk_create([
+        SeatHold(booking=booking, flight_id=booking.flight_id, cabin=booking.cabin, expires_at=expires_at)
+        for booking in bookings
+    ])
+    hold_metrics.incr('created', len(holds))
+    return holds
+
+
+def convert_hold(booking):
+    """
+    Make a paid booking's seat permanent.
+
+    If the sweeper released the hold before payment arrived, the seat is
+    taken again; a sold-out cabin is logged for manual handling, since the
+    payment has already gone through.
+
+    Returns:
+        bool: True if the booking holds its seat.
+    """
+    if SeatHold.objects.filter(booking_id=booking.id, status=SeatHold.ACTIVE).update(status=SeatHold.CONVERTED):
+        hold_metrics.incr('converted')
+        return True
+    if not SeatHold.objects.filter(booking_id=booking.id, status=SeatHold.RELEASED).exists():
+        return True  # No hold: untracked flight, or already converted
+    try:
+        with transaction.atomic():
+            reserve_seats(booking.flight_id, booking.cabin)
+            SeatHold.objects.filter(booking_id=booking.id).update(status=SeatHold.CONVERTED, released_at=None)
+    except SeatsUnavailableException:
+        logger.error(f"Booking {booking.id} was paid after its seat hold expired and the cabin is sold out")
+        return False
+    hold_metrics.incr('converted')
+    return True
+
+
+def release_expired_holds(now=None, batch_size=None):
+    """
+    Release every hold that expired at or before ``now``, one chunk at a time.
+
+    Returns:
+        int: Number of holds released.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or sweep_batch_size()
+    expired = SeatHold.objects.filter(status=SeatHold.ACTIVE, expires_at__lte=now).order_by('expires_at')
+    released = 0
+    while True:
+        ids = list(expired.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        released += _release_chunk(ids, now)
+        if len(ids) < batch_size:
+            break
+    if released:
+        hold_metrics.incr('released', released)
+    return released
+
+
+def _release_chunk(ids, now):
+    with transaction.atomic():
+        claimed = SeatHold.objects.filter(id__in=ids, status=SeatHold.ACTIVE).update(
+            status=SeatHold.RELEASED, released_at=now
+        )
+        if not claimed:
+            return 0
+        holds = list(SeatHold.objects.filter(id__in=ids, status=SeatHold.RELEASED, released_at=now).values_list(
+            'booking_id', 'flight_id', 'cabin', 'seats'
+        ))
+        seats = Counter()
+        for _, flight_id, cabin, count in holds:
+            seats[flight_id, cabin] += count
+        returned = Case(
+            *[When(flight_id=flight_id, cabin=cabin, then=Value(count)) for (flight_id, cabin), count in seats.items()],
+            default=Value(0), output_field=IntegerField(),
+        )
+        counters = reduce(or_, (Q(flight_id=flight_id, cabin=cabin) for flight_id, cabin in seats))
+        SeatInventory.objects.filter(counters).update(seats_left=Least(F('seats_left') + returned, F('seats_total')))
+        Booking.objects.filter(id__in=[hold[0] for hold in holds], status='pending').update(status='cancelled')
+    return len(holds)
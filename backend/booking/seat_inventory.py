@@ -0,0 +1,97 @@
+"""
+Per-cabin seat counters with lock-free reservation.
+
+A reservation is a single conditional UPDATE:
+
+    UPDATE booking_seatinventory SET seats_left = seats_left - n
+    WHERE flight_id = ? AND cabin = ? AND seats_left >= n
+
+The database applies it atomically against the row's current value, so
+concurrent bookings cannot oversell and none of them waits on a
+``SELECT ... FOR UPDATE`` held across the rest of the request; a request
+that loses the race for the last seat matches zero rows and is refused.
+Releases are the mirror image, guarded by ``seats_total``.
+
+Flights without any SeatInventory rows are untracked: booking them is
+unlimited, as before counters existed, and ``Flight.availability`` remains
+their only flag. Hot flights can spread a cabin's counter over several rows
+(``Flight.seat_shards``, see booking.seat_shards); the functions here take
+the flight's shard count and fall back to the other sub-counters when the
+preferred one runs dry.
+"""
+
+from django.db.models import F, Sum
+
+from .exceptions import SeatsUnavailableException
+from .models import SeatInventory, SeatShard
+from .seat_shards import give_to_shards, take_from_shards, take_spread
+
+DEFAULT_CABIN = 'ECONOMY'
+
+
+def open_cabin(flight, cabin=DEFAULT_CABIN, seats=0):
+    """
+    Create (or reset) the counter for a cabin with ``seats`` unsold seats.
+    """
+    inventory, _ = SeatInventory.objects.update_or_create(
+        flight=flight, cabin=cabin, defaults={'seats_total': seats, 'seats_left': seats}
+    )
+    return inventory
+
+
+def reserve_seats(flight_id, cabin=DEFAULT_CABIN, seats=1, shards=1):
+    """
+    Take ``seats`` from a cabin's counter.
+
+    Call inside the transaction that creates the booking, so a failed insert
+    gives the seats back on rollback. Pass the flight's ``seat_shards`` when
+    it is at hand; with the default of 1 a sharded flight is still booked
+    correctly, only from its first sub-counter.
+
+    Returns:
+        bool: True if seats were taken, False if the flight is untracked.
+
+    Raises:
+        SeatsUnavailableException: The cabin is sold out or not offered on a tracked flight.
+    """
+    if shards > 1:
+        taken = take_from_shards(flight_id, cabin, seats, shards)
+    else:
+        taken = SeatInventory.objects.filter(
+            flight_id=flight_id, cabin=cabin, seats_left__gte=seats
+        ).update(seats_left=F('seats_left') - seats)
+    if taken:
+        return True
+    # Only the refused path pays for further queries
+    if not SeatInventory.objects.filter(flight_id=flight_id).exists():
+        return False
+    if take_spread(flight_id, cabin, seats):
+        return True
+    raise SeatsUnavailableException(f"Not enough seats left in {cabin} on this flight.")
+
+
+def release_seats(flight_id, cabin=DEFAULT_CABIN, seats=1, shards=1):
+    """
+    Return ``seats`` to a cabin's counter, never above ``seats_total``.
+
+    On a sharded flight the seats go to a random sub-counter and only the
+    reconciler enforces ``seats_total``.
+
+    Returns:
+        bool: True if the counter was incremented.
+    """
+    if shards > 1:
+        give_to_shards(flight_id, cabin, seats, shards)
+        return True
+    return bool(SeatInventory.objects.filter(
+        flight_id=flight_id, cabin=cabin, seats_left__lte=F('seats_total') - seats
+    ).update(seats_left=F('seats_left') + seats))
+
+
+def seats_left(flight_id):
+    """Unsold seats per cabin, e.g. ``{'ECONOMY': 12}``; empty for untracked flights."""
+    totals = dict(SeatInventory.objects.filter(flight_id=flight_id).values_list('cabin', 'seats_left'))
+    shards = SeatShard.objects.filter(flight_id=flight_id).values('cabin').annotate(left=Sum('seats_left'))
+    for cabin, left in shards.values_list('cabin', 'left'):
+        totals[cabin] = totals.get(cabin, 0) + left
+    return totals
@@ -0,0 +1,241 @@
+"""
+Sharded seat counters for flights under heavy booking contention.
+
+Every booking of a cabin decrements the same SeatInventory row. The UPDATE
+is atomic, but on PostgreSQL each one holds that row's lock until its
+transaction commits, so bookings on one hot flight queue behind each other.
+With ``Flight.seat_shards = N`` a cabin's unsold seats are split over N
+sub-counters: the SeatInventory row is sub-counter 0 and SeatShard rows
+are 1..N-1. A booking starts at a random sub-counter and takes its seats
+from the first one that has enough, so concurrent bookings mostly lock
+different rows. Reads sum the sub-counters.
+
+The SeatInventory row stays a valid sub-counter, so callers that do not
+know a flight is sharded (or hold a stale ``seat_shards``) still book and
+release correctly. They just use row 0.
+
+Two beat tasks maintain sharded flights:
+
+- ``rebalance_seat_shards`` moves seats from full sub-counters to drained
+  ones, so random picks keep succeeding as the flight sells down. Seats are
+  moved with guarded relative UPDATEs inside one transaction, so none are
+  created or lost.
+- ``reconcile_seat_counters`` compares the cabin's remaining seats with
+  ``seats_total`` minus its live (not cancelled) bookings in a single
+  statement and corrects any drift, e.g. from bookings deleted through the
+  Django admin.
+
+Admins switch a flight over with the "Shard seat counters" admin action
+(SEAT_COUNTER_SHARDS sub-counters) and back with "Use a single seat counter".
+"""
+
+import logging
+import random
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Booking, Flight, SeatInventory, SeatShard
+
+logger = logging.getLogger(__name__)
+
+# Default number of sub-counters per cabin when an admin shards a flight
+DEFAULT_SHARDS = 8
+
+
+def shard_count():
+    return getattr(settings, 'SEAT_COUNTER_SHARDS', DEFAULT_SHARDS)
+
+
+def _counter(flight_id, cabin, index):
+    if index == 0:
+        return SeatInventory.objects.filter(flight_id=flight_id, cabin=cabin)
+    return SeatShard.objects.filter(flight_id=flight_id, cabin=cabin, index=index)
+
+
+def _take(flight_id, cabin, index, seats):
+    return _counter(flight_id, cabin, index).filter(seats_left__gte=seats).update(seats_left=F('seats_left') - seats)
+
+
+def _give(flight_id, cabin, index, seats):
+    # A sub-counter removed by disable_sharding hands its seats to row 0
+    if index and _counter(flight_id, cabin, index).update(seats_left=F('seats_left') + seats):
+        return
+    _counter(flight_id, cabin, 0).update(seats_left=F('seats_left') + seats)
+
+
+def counters(flight_id, cabin):
+    """Unsold seats per sub-counter, e.g. ``{0: 12, 1: 11}``; empty if the cabin is untracked."""
+    base = _counter(flight_id, cabin, 0).values_list('seats_left', flat=True).first()
+    if base is None:
+        return {}
+    result = {0: base}
+    result.update(SeatShard.objects.filter(flight_id=flight_id, cabin=cabin).values_list('index', 'seats_left'))
+    return result
+
+
+def take_from_shards(flight_id, cabin, seats, shards):
+    """
+    Take ``seats`` from one sub-counter, starting at a random one.
+
+    Returns:
+        bool: False if no single sub-counter had enough seats.
+    """
+    start = random.randrange(shards)
+    for offset in range(shards):
+        if _take(flight_id, cabin, (start + offset) % shards, seats):
+            return True
+    return False
+
+
+class _Short(Exception):
+    """Concurrent bookings took the seats take_spread counted on; roll its takes back."""
+
+
+def take_spread(flight_id, cabin, seats):
+    """
+    Take ``seats`` from however many sub-counters it needs, all or nothing.
+
+    Fallback when the preferred counter(s) had too few seats: row 0 ran out
+    while sub-counters still hold seats, or a multi-seat booking is larger
+    than any one sub-counter.
+
+    Returns:
+        bool: False if the cabin as a whole has fewer than ``seats`` left.
+    """
+    available = counters(flight_id, cabin)
+    if sum(available.values()) < seats:
+        return False
+    try:
+        with transaction.atomic():
+            needed = seats
+            for index, left in sorted(available.items(), key=lambda item: -item[1]):
+                take = min(needed, left)
+                if take and _take(flight_id, cabin, index, take):
+                    needed -= take
+                if not needed:
+                    return True
+            raise _Short()
+    except _Short:
+        return False
+
+
+def give_to_shards(flight_id, cabin, seats, shards):
+    """Return ``seats`` to a random sub-counter."""
+    _give(flight_id, cabin, random.randrange(shards), seats)
+
+
+def enable_sharding(flight, shards=None):
+    """
+    Split each of a flight's cabin counters into ``shards`` sub-counters.
+    """
+    shards = shards or shard_count()
+    with transaction.atomic():
+        cabins = list(SeatInventory.objects.filter(flight=flight).values_list('cabin', flat=True))
+        SeatShard.objects.bulk_create([
+            SeatShard(flight=flight, cabin=cabin, index=index)
+            for cabin in cabins for index in range(1, shards)
+        ], ignore_conflicts=True)
+        Flight.objects.filter(pk=flight.pk).update(seat_shards=shards)
+        flight.seat_shards = shards
+        for cabin in cabins:
+            rebalance_cabin(flight.pk, cabin, force=True)
+
+
+def disable_sharding(flight):
+    """
+    Fold a flight's sub-counters back into its SeatInventory rows.
+    """
+    Flight.objects.filter(pk=flight.pk).update(seat_shards=1)
+    flight.seat_shards = 1
+    for shard in SeatShard.objects.filter(flight=flight):
+        with transaction.atomic():
+            # Take whatever the sub-counter holds now; bookings may still be drawing on it
+            while True:
+                left = SeatShard.objects.filter(pk=shard.pk).values_list('seats_left', flat=True).first()
+                if not left or SeatShard.objects.filter(pk=shard.pk, seats_left=left).update(seats_left=0):
+                    break
+            if left:
+                _give(flight.pk, shard.cabin, 0, left)
+            SeatShard.objects.filter(pk=shard.pk, seats_left=0).delete()
+
+
+def rebalance_cabin(flight_id, cabin, force=False):
+    """
+    Even out a cabin's sub-counters when one has dropped below half its share.
+
+    Returns:
+        int: Number of seats moved.
+    """
+    available = counters(flight_id, cabin)
+    if len(available) < 2:
+        return 0
+    total = sum(available.values())
+    share, extra = divmod(total, len(available))
+    if not force and min(available.values()) * 2 >= share:
+        return 0
+    targets = {index: share + (1 if position < extra else 0) for position, index in enumerate(sorted(available))}
+    with transaction.atomic():
+        pool = 0
+        for index, left in available.items():
+            surplus = left - targets[index]
+            # Guarded: if bookings took seats since the read, leave this sub-counter alone
+            if surplus > 0 and _take(flight_id, cabin, index, surplus):
+                pool += surplus
+        moved = pool
+        for index, left in available.items():
+            deficit = min(targets[index] - left, pool)
+            if deficit > 0:
+                _give(flight_id, cabin, index, deficit)
+                pool -= deficit
+        if pool:
+            _give(flight_id, cabin, 0, pool)
+    return moved
+
+
+def reconcile_cabin(flight_id, cabin):
+    """
+    Correct a cabin whose sub-counters disagree with ``seats_total`` minus its live bookings.
+
+    Counters and bookings are read in one statement so both come from the
+    same snapshot; the correction is applied as a relative update.
+
+    Returns:
+        int: Seats added (positive) or removed (negative).
+    """
+    shard_left = SeatShard.objects.filter(flight_id=OuterRef('flight_id'), cabin=OuterRef('cabin')).values('cabin').annotate(
+        total=Sum('seats_left')
+    ).values('total')
+    booked = Booking.objects.filter(flight_id=OuterRef('flight_id'), cabin=OuterRef('cabin')).exclude(status='cancelled').values(
+        'cabin'
+    ).annotate(total=Count('id')).values('total')
+    row = SeatInventory.objects.filter(flight_id=flight_id, cabin=cabin).annotate(
+        shard_left=Coalesce(Subquery(shard_left), 0), booked=Coalesce(Subquery(booked), 0)
+    ).values_list('seats_total', 'seats_left', 'shard_left', 'booked').first()
+    if row is None:
+        return 0
+    seats_total, base_left, shard_left, booked = row
+    drift = max(seats_total - booked, 0) - (base_left + shard_left)
+    if drift > 0:
+        _give(flight_id, cabin, 0, drift)
+    elif drift < 0 and not take_spread(flight_id, cabin, -drift):
+        return 0  # Bookings moved the counters meanwhile; the next run recomputes
+    if drift:
+        logger.warning(f"Seat counters for flight {flight_id} {cabin} were {abs(drift)} seat(s) {'short' if drift > 0 else 'over'}; corrected")
+    return drift
+
+
+def sharded_cabins():
+    return SeatInventory.objects.filter(flight__seat_shards__gt=1).values_list('flight_id', 'cabin')
+
+
+def rebalance_sharded_flights():
+    """Rebalance every sharded cabin; returns the number of seats moved."""
+    return sum(rebalance_cabin(flight_id, cabin) for flight_id, cabin in sharded_cabins())
+
+
+def reconcile_sharded_flights():
+    """Reconcile every sharded cabin; returns the number of cabins corrected."""
+    return sum(1 for flight_id, cabin in sharded_cabins() if reconcile_cabin(flight_id, cabin))
@@ -1,8 +1,15 @@
+import uuid
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.models import User
-from .models import CustomUser, Flight, Booking, Vendor, VendorProduct
+from django.db import transaction
+from .models import CustomUser, Flight, Booking, SeatHold, SeatInventory, Vendor, VendorProduct
+from .booking_stats import record_created
+from .iata_utils import get_iata_code
+from .route_matrix import estimate_arrival
+from .seat_holds import place_hold, place_holds
+from .seat_inventory import DEFAULT_CABIN, release_seats, reserve_seats
 
 class CustomUserSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(
@@ -44,12 +51,20 @@ class FlightSerializer(serializers.ModelSerializer):
         model = Flight
         fields = ['id', 'flightNumber', 'from_location', 'to', 'departureTime', 'arrivalTime', 'duration', 'stops', 'price', 'currency', 'airline', 'status']
 
+    def _estimate(self, obj):
+        # Block time from the precomputed route matrix; unknown routes keep the 8 hour default.
+        # Only the route codes are memoised, so the memo stays small when a list is streamed.
+        routes = self.context.setdefault('_route_codes', {})
+        key = (obj.departure, obj.arrival)
+        if key not in routes:
+            routes[key] = (obj.origin_iata or get_iata_code(obj.departure), obj.destination_iata or get_iata_code(obj.arrival))
+        return estimate_arrival(*routes[key], obj.date)
+
     def get_arrivalTime(self, obj):
-        # For simplicity, assume flights are 8 hours long
-        return obj.date.replace(hour=(obj.date.hour + 8) % 24)
+        return self._estimate(obj)[0]
 
     def get_duration(self, obj):
-        return "PT8H"  # ISO 8601 duration format for 8 hours
+        return self._estimate(obj)[1]  # ISO 8601 duration, e.g. PT7H5M
 
     def get_stops(self, obj):
         return 0  # Assume direct flights for sample data
@@ -69,7 +84,8 @@ class BookingSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Booking
-        fields = ['id', 'user', 'flight', 'payment_status', 'created_at', 'user_id', 'flight_id']
+        fields = ['id', 'user', 'flight', 'payment_status', 'cabin', 'passenger_name', 'group_reference', 'created_at', 'user_id', 'flight_id']
+        read_only_fields = ['group_reference']
 
     def create(self, validated_data):
         # Get flight_id from validated data (required)
@@ -90,15 +106,114 @@ class BookingSerializer(serializers.ModelSerializer):
         # Get payment_status from initial_data (not in validated_data since it's a write-only field)
         payment_status = self.initial_data.get('payment_status', 'pending')
         
-        # Create booking
-        booking = Booking.objects.create(
-            user=user, 
-            flight=flight, 
-            payment_status=payment_status,
-            **validated_data
-        )
+        # Take the seat and create the booking together; if the insert fails the seat is given back
+        with transaction.atomic():
+            tracked = reserve_seats(flight.id, validated_data.get('cabin', DEFAULT_CABIN), shards=flight.seat_shards)
+            booking = Booking.objects.create(
+                user=user, 
+                flight=flight, 
+                payment_status=payment_status,
+                **validated_data
+            )
+            # Unpaid bookings only keep the seat until their hold expires
+            if tracked and booking.payment_status == 'pending':
+                place_hold(booking)
         return booking
 
+    def update(self, instance, validated_data):
+        # Moving a booking to another flight or cabin takes the new seat before giving back the old one
+        flight_id = validated_data.get('flight_id', instance.flight_id)
+        cabin = validated_data.get('cabin', instance.cabin)
+        # Cancelled bookings (e.g. expired holds) no longer have a seat to move
+        with transaction.atomic():
+            tracked = False
+            if (flight_id, cabin) != (instance.flight_id, instance.cabin) and instance.status != 'cancelled':
+                tracked = reserve_seats(flight_id, cabin, shards=instance.flight.seat_shards if flight_id == instance.flight_id else 1)
+                release_seats(instance.flight_id, instance.cabin, shards=instance.flight.seat_shards)
+                holds = SeatHold.objects.filter(booking=instance, status=SeatHold.ACTIVE)
+                if tracked:
+                    holds.update(flight_id=flight_id, cabin=cabin)
+                else:
+                    # No counter on the new flight for the sweeper to give the seat back to
+                    holds.delete()
+            booking = super().update(instance, validated_data)
+            # A pending booking moved onto a tracked flight is held like a new one
+            if tracked and booking.payment_status == 'pending' and not SeatHold.objects.filter(booking=booking).exists():
+                place_hold(booking)
+            return booking
+
+class PassengerSerializer(serializers.Serializer):
+    """
+    One traveller in a group booking.
+    """
+    first_name = serializers.CharField(required=True, max_length=100)
+    last_name = serializers.CharField(required=True, max_length=100)
+
+    def validate(self, data):
+        data['first_name'] = data['first_name'].strip()
+        data['last_name'] = data['last_name'].strip()
+        if not data['first_name'] or not data['last_name']:
+            raise serializers.ValidationError("First and last name are required.")
+        return data
+
+
+class BulkBookingSerializer(serializers.Serializer):
+    """
+    Book one seat per passenger on a flight, all or nothing.
+    """
+    flight_id = serializers.IntegerField(required=True)
+    cabin = serializers.ChoiceField(
+        required=False,
+        choices=SeatInventory.CABIN_CHOICES,
+        default=DEFAULT_CABIN,
+        help_text="Cabin for every passenger"
+    )
+    passengers = PassengerSerializer(
+        many=True,
+        min_length=1,
+        max_length=9,  # Same limit as adults in FlightSearchSerializer
+        help_text="Travellers to book, one seat each"
+    )
+
+    def validate_flight_id(self, value):
+        if not Flight.objects.filter(id=value).exists():
+            raise serializers.ValidationError("Flight not found.")
+        return value
+
+    def validate_passengers(self, value):
+        names = [(p['first_name'].lower(), p['last_name'].lower()) for p in value]
+        if len(set(names)) != len(names):
+            raise serializers.ValidationError("Each passenger can only be booked once.")
+        return value
+
+    def create(self, validated_data):
+        """
+        Reserve every seat with one counter update and insert the bookings
+        (and their seat holds) with bulk_create, in a single transaction.
+        A sold-out cabin raises SeatsUnavailableException and nothing is booked.
+        """
+        from .tasks import send_group_booking_hold_email
+
+        flight = Flight.objects.get(id=validated_data['flight_id'])
+        cabin = validated_data['cabin']
+        passengers = validated_data['passengers']
+        reference = uuid.uuid4().hex[:12].upper()
+        with transaction.atomic():
+            tracked = reserve_seats(flight.id, cabin, seats=len(passengers), shards=flight.seat_shards)
+            bookings = Booking.objects.bulk_create([
+                Booking(
+                    user=validated_data['user'], flight=flight, cabin=cabin, group_reference=reference,
+                    passenger_name=f"{passenger['first_name']} {passenger['last_name']}",
+                )
+                for passenger in passengers
+            ])
+            record_created(bookings)  # bulk_create sends no post_save
+            if tracked:
+                place_holds(bookings)
+            booking_ids = [booking.id for booking in bookings]
+            transaction.on_commit(lambda: send_group_booking_hold_email.delay(booking_ids))
+        return bookings
+
 # Admin Serializers
 class AdminUserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -304,7 +419,7 @@ class VendorProductSerializer(serializers.ModelSerializer):
         data = super().to_representation(instance)
         # Add vendor info to each product
         data['vendor_name'] = instance.vendor.business_name
-        data['vendor_id'] = instance.vendor.id
+        data['vendor_id'] = instance.vendor_id
         return data
 
 
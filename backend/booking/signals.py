@@ -0,0 +1,34 @@
+"""
+Model signal handlers for the booking app.
+"""
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .booking_stats import record_created, record_deleted, record_payment_change
+from .models import Booking
+
+
+@receiver(post_init, sender=Booking)
+def remember_payment_status(sender, instance, **kwargs):
+    """Keep the payment status as loaded, so a save can tell whether it changed."""
+    # Read __dict__ directly: a deferred field must not cost a query per instance
+    instance._loaded_payment_status = instance.__dict__.get('payment_status')
+
+
+@receiver(post_save, sender=Booking)
+def update_booking_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    """Count new bookings and payment status changes in the admin booking stats."""
+    if raw:
+        return
+    if created:
+        record_created([instance])
+    elif instance._loaded_payment_status is not None:
+        record_payment_change(instance, instance._loaded_payment_status)
+    instance._loaded_payment_status = instance.payment_status
+
+
+@receiver(post_delete, sender=Booking)
+def update_booking_stats_on_delete(sender, instance, **kwargs):
+    """Stop counting deleted bookings in the admin booking stats."""
+    record_deleted([instance])
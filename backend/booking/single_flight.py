@@ -0,0 +1,157 @@
+"""
+Cross-worker request coalescing ("single-flight") for provider calls.
+
+When many workers issue the same provider query at once, only the first one
+acquires a lock in the shared cache and calls upstream; the others poll a
+result key until the leader publishes its answer or gives up the lock.
+With CACHE_MODE='redis' the lock is a Redis SET NX, so coalescing spans
+every gunicorn and Celery worker.
+
+The lock lives as long as the slowest provider call can take (connect plus
+read timeout and a small margin), and followers wait for as long as the lock
+lives, so a slow provider never sends them upstream on their own. If the
+leader's call raises, the exception is published and re-raised by every
+follower instead of each of them retrying the failing provider.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .provider_http import provider_http
+
+logger = logging.getLogger(__name__)
+
+# Seconds added to the provider timeouts for token fetches and rate-limit queuing
+DEFAULT_TIMEOUT_MARGIN = 2
+# Default number of seconds a published result stays available to late followers
+DEFAULT_RESULT_TTL = 5
+# Seconds between follower polls of the result key
+DEFAULT_POLL_INTERVAL = 0.05
+
+
+def provider_call_timeout():
+    """
+    Longest a coalesced provider call can take: connect plus read timeout plus a margin.
+    """
+    return provider_http.connect_timeout + provider_http.read_timeout + DEFAULT_TIMEOUT_MARGIN
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls into a single upstream request.
+    """
+
+    def __init__(self, lock_ttl=None, wait_timeout=None, result_ttl=None, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.lock_ttl = lock_ttl or getattr(settings, 'SINGLE_FLIGHT_LOCK_TTL', None) or provider_call_timeout()
+        # Followers stop early once the leader releases the lock, so waiting out its TTL is the bound
+        self.wait_timeout = wait_timeout or self.lock_ttl
+        self.result_ttl = result_ttl or getattr(settings, 'SINGLE_FLIGHT_RESULT_TTL', DEFAULT_RESULT_TTL)
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def make_key(namespace, arguments):
+        """
+        Build a coalescing key from a namespace and a dict of call arguments.
+        """
+        canonical = '|'.join(f"{name}={value!r}" for name, value in sorted(arguments.items()))
+        digest = hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+        return f"single_flight:{namespace}:{digest}"
+
+    def _release(self, lock_key, token):
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+    def _publish_error(self, result_key, exc):
+        try:
+            cache.set(result_key, {'error': exc}, self.result_ttl)
+        except Exception:
+            # Not picklable (e.g. holds a socket); keep the type and message
+            cache.set(result_key, {'error': RuntimeError(f"{type(exc).__name__}: {exc}")}, self.result_ttl)
+
+    @staticmethod
+    def _unwrap(published):
+        if 'error' in published:
+            raise published['error']
+        return published['value']
+
+    def do(self, key, fn):
+        """
+        Run ``fn`` once across all workers for ``key`` and share its result.
+
+        Args:
+            key (str): Key returned by ``make_key``.
+            fn (callable): Zero-argument callable performing the upstream request.
+
+        Returns:
+            The value returned by the leader's ``fn``.
+
+        Raises:
+            Exception: Whatever the leader's ``fn`` raised, in the leader and every follower.
+        """
+        result_key = f"{key}:result"
+        lock_key = f"{key}:lock"
+
+        published = cache.get(result_key)
+        if published is not None:
+            return self._unwrap(published)
+
+        token = uuid.uuid4().hex
+        if cache.add(lock_key, token, self.lock_ttl):
+            try:
+                value = fn()
+            except Exception as exc:
+                self._publish_error(result_key, exc)
+                raise
+            else:
+                cache.set(result_key, {'value': value}, self.result_ttl)
+                return value
+            finally:
+                self._release(lock_key, token)
+
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            published = cache.get(result_key)
+            if published is not None:
+                return self._unwrap(published)
+            if cache.get(lock_key) is None:
+                # The leader may have published and released between the two reads
+                published = cache.get(result_key)
+                if published is not None:
+                    return self._unwrap(published)
+                # Leader went away without publishing; stop waiting
+                break
+
+        logger.warning(f"Single-flight wait for {key} timed out, calling provider directly")
+        return fn()
+
+
+single_flight = SingleFlight()
+
+
+def coalesce(namespace):
+    """
+    Decorator coalescing identical concurrent calls to a client method.
+
+    The coalescing key is built from the bound call arguments (excluding
+    ``self``), so positional and keyword spellings of the same call share it.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = {name: value for name, value in bound.arguments.items() if name != 'self'}
+            key = single_flight.make_key(namespace, arguments)
+            return single_flight.do(key, lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,148 @@
+"""
+Spatial index for nearest-airport lookups.
+
+Airports are mapped to points on the unit sphere and stored in a KD-tree.
+Straight-line (chord) distance between unit vectors grows monotonically with
+great-circle distance, so k-nearest and radius queries on the tree return
+exactly the airports a full haversine scan would, in sub-linear time.
+Reported distances are still computed with the caller's haversine so results
+match the previous scan to the decimal.
+
+The index is immutable: build it once (at startup) and share it.
+"""
+
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371
+# Leaf size: below this many points a linear scan is faster than descending further
+LEAF_SIZE = 16
+# Slack added to the chord radius so float rounding never drops a boundary airport
+CHORD_EPSILON = 1e-9
+
+
+def to_unit_vector(latitude, longitude):
+    """Convert degrees latitude/longitude to a point on the unit sphere."""
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+def km_to_chord(distance_km):
+    """Convert a great-circle distance to the equivalent unit-sphere chord length."""
+    angle = min(distance_km / EARTH_RADIUS_KM, math.pi)
+    return 2 * math.sin(angle / 2)
+
+
+class SphereKDTree:
+    """
+    KD-tree over unit-sphere points supporting k-nearest and radius queries.
+
+    Args:
+        points (list): ``(x, y, z)`` unit vectors; query results are indices into this list.
+    """
+
+    def __init__(self, points):
+        self.points = list(points)
+        self._root = self._build(list(range(len(self.points)))) if self.points else None
+
+    def _build(self, indices):
+        if len(indices) <= LEAF_SIZE:
+            return indices
+        points = self.points
+        spreads = []
+        for axis in range(3):
+            values = [points[i][axis] for i in indices]
+            spreads.append(max(values) - min(values))
+        axis = spreads.index(max(spreads))
+        indices.sort(key=lambda i: points[i][axis])
+        middle = len(indices) // 2
+        split = points[indices[middle]][axis]
+        return (axis, split, self._build(indices[:middle]), self._build(indices[middle:]))
+
+    def query(self, point, k=None, max_chord=None):
+        """
+        Return ``[(chord_distance, index), ...]`` nearest first.
+
+        Args:
+            point (tuple): Query unit vector.
+            k (int): Maximum number of results (None for all within ``max_chord``).
+            max_chord (float): Only return points within this chord distance.
+        """
+        if self._root is None or k == 0:
+            return []
+        qx, qy, qz = point
+        points = self.points
+        bound = float('inf') if max_chord is None else (max_chord + CHORD_EPSILON) ** 2
+        # Max-heap of the best candidates as (-squared distance, -index)
+        best = []
+
+        def visit(node):
+            nonlocal bound
+            if isinstance(node, list):
+                for i in node:
+                    x, y, z = points[i]
+                    d2 = (x - qx) ** 2 + (y - qy) ** 2 + (z - qz) ** 2
+                    if d2 > bound:
+                        continue
+                    if k is None or len(best) < k:
+                        heapq.heappush(best, (-d2, -i))
+                    elif (-d2, -i) > best[0]:
+                        heapq.heapreplace(best, (-d2, -i))
+                    else:
+                        continue
+                    if k is not None and len(best) == k:
+                        bound = min(bound, -best[0][0])
+                return
+            axis, split, left, right = node
+            diff = point[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if diff * diff <= bound:
+                visit(far)
+
+        visit(self._root)
+        return sorted((math.sqrt(-d2), -i) for d2, i in best)
+
+
+class AirportSpatialIndex:
+    """
+    Immutable nearest-airport index over ``{iata: {'lat', 'lon', ...}}`` data.
+
+    Args:
+        airports (dict): Airport info keyed by IATA code.
+        distance (callable): ``distance(lat1, lon1, lat2, lon2)`` in km used for reported distances.
+    """
+
+    def __init__(self, airports, distance):
+        self.distance = distance
+        self.codes = []
+        self.infos = []
+        points = []
+        for code, info in airports.items():
+            if 'lat' in info and 'lon' in info:
+                self.codes.append(code)
+                self.infos.append(info)
+                points.append(to_unit_vector(info['lat'], info['lon']))
+        self.tree = SphereKDTree(points)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def nearest(self, latitude, longitude, limit=5, max_distance=None):
+        """
+        Return ``[(distance_km, iata, info), ...]`` for the closest airports.
+
+        Ties are ordered by dataset position, matching a stable sort of a full scan.
+        """
+        max_chord = km_to_chord(max_distance) if max_distance is not None else None
+        matches = self.tree.query(to_unit_vector(latitude, longitude), k=limit, max_chord=max_chord)
+        results = []
+        for _, i in matches:
+            info = self.infos[i]
+            distance = self.distance(latitude, longitude, info['lat'], info['lon'])
+            if max_distance is None or distance <= max_distance:
+                results.append((distance, i))
+        results.sort()
+        return [(distance, self.codes[i], self.infos[i]) for distance, i in results]
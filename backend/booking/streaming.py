@@ -0,0 +1,100 @@
+"""
+Streaming JSON / NDJSON responses for large admin lists and exports.
+
+A paginated page is small, but admin pulls of every flight or booking used
+to build the whole serialized list before rendering. Here the queryset is
+read with ``.iterator(chunk_size=...)`` (a server-side cursor on
+PostgreSQL), serialized row by row and written out through a
+``StreamingHttpResponse``, so a worker holds at most one fetched chunk of
+model instances whatever the size of the result.
+
+Two formats are produced: a JSON array (``application/json``) and
+newline-delimited JSON (``application/x-ndjson``), one object per line.
+"""
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+
+# Rows fetched and serialized per step
+DEFAULT_CHUNK_SIZE = 2000
+
+STREAM_FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def chunk_size():
+    return getattr(settings, 'STREAMING_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def iter_serialized(queryset, serializer_class, context=None, size=None):
+    """
+    Yield serialized rows, fetching ``size`` instances per database round trip.
+
+    One serializer instance is reused for every row: a ``many=True``
+    serializer per chunk would keep each chunk alive in a reference cycle
+    until the garbage collector runs, and peak memory would grow with the
+    result size.
+    """
+    serializer = serializer_class(context=context)
+    for instance in queryset.iterator(chunk_size=size or chunk_size()):
+        yield serializer.to_representation(instance)
+
+
+def encode_rows(rows, stream_format='json'):
+    """
+    Encode rows as a JSON array or NDJSON, yielding one bytes chunk per row.
+    """
+    encode = JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    if stream_format == 'ndjson':
+        for row in rows:
+            yield (encode(row) + '\n').encode()
+        return
+    separator = '['
+    for row in rows:
+        yield (separator + encode(row)).encode()
+        separator = ','
+    yield b'[]' if separator == '[' else b']'
+
+
+def streaming_response(queryset, serializer_class, stream_format='json', context=None, filename=None):
+    """
+    Return a StreamingHttpResponse serializing ``queryset`` chunk by chunk.
+
+    Args:
+        queryset (QuerySet): Rows to stream; add select_related() for nested serializers.
+        serializer_class (type): DRF serializer applied to each chunk.
+        stream_format (str): 'json' for an array, 'ndjson' for one object per line.
+        context (dict): Serializer context, e.g. the request.
+        filename (str): If given, sent as an attachment with this name.
+    """
+    if stream_format not in STREAM_FORMATS:
+        raise ValidationError({'stream': f"Choose one of: {', '.join(STREAM_FORMATS)}"})
+    rows = iter_serialized(queryset, serializer_class, context=context)
+    response = StreamingHttpResponse(encode_rows(rows, stream_format), content_type=STREAM_FORMATS[stream_format])
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{stream_format}"'
+    return response
+
+
+class StreamingListMixin:
+    """
+    Serve ``?stream=json|ndjson`` requests as a streamed dump of the whole list.
+
+    Requests without ``stream`` fall through to the normal (paginated) list.
+    """
+    stream_query_param = 'stream'
+
+    def list(self, request, *args, **kwargs):
+        stream_format = request.query_params.get(self.stream_query_param)
+        if not stream_format:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        if getattr(self, 'keyset_ordering', None):
+            queryset = queryset.order_by(*self.keyset_ordering)
+        return streaming_response(
+            queryset, self.get_serializer_class(), stream_format, context=self.get_serializer_context()
+        )
@@ -6,12 +6,14 @@ This module provides Stripe payment functionality for the flight booking applica
 
 import stripe
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from .models import Booking, Flight
-from .tasks import send_booking_confirmation_email
+from .seat_holds import convert_hold
+from .tasks import send_booking_confirmation_email, send_group_booking_confirmation_email
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,6 +21,29 @@ logger = logging.getLogger(__name__)
 # Configure Stripe with the secret key from settings
 stripe.api_key = getattr(settings, 'STRIPE_SECRET_KEY', None)
 
+# How long to remember that a group's confirmation email was sent
+GROUP_CONFIRMATION_SENT_TTL = 7 * 24 * 60 * 60
+
+
+def send_payment_confirmation(booking):
+    """
+    Email the user that a paid booking is confirmed.
+
+    A booking from a group booking gets no email of its own: one confirmation
+    covering the whole group is sent once no booking of the group is left
+    unpaid (cancelled ones aside). The cache key stops the confirm view and
+    the webhook, or two last payments, from sending it twice.
+    """
+    reference = booking.group_reference
+    if not reference:
+        send_booking_confirmation_email.delay(booking.id)
+        return
+    unpaid = Booking.objects.filter(group_reference=reference).exclude(status='cancelled').exclude(payment_status='paid')
+    if unpaid.exists():
+        return
+    if cache.add(f"group_confirmation_sent:{reference}", True, timeout=GROUP_CONFIRMATION_SENT_TTL):
+        send_group_booking_confirmation_email.delay(reference)
+
 
 class CreatePaymentIntentView(APIView):
     """
@@ -121,9 +146,10 @@ class PaymentIntentConfirmView(APIView):
                     booking.payment_status = 'paid'
                     booking.status = 'confirmed'
                     booking.save()
+                    convert_hold(booking)
 
                     # Send confirmation email asynchronously
-                    send_booking_confirmation_email.delay(booking.id)
+                    send_payment_confirmation(booking)
 
                     return Response({
                         'message': 'Payment successful',
@@ -192,9 +218,10 @@ class StripeWebhookView(APIView):
                         booking.payment_status = 'paid'
                         booking.status = 'confirmed'
                         booking.save()
+                        convert_hold(booking)
                         
                         # Send confirmation email
-                        send_booking_confirmation_email.delay(booking.id)
+                        send_payment_confirmation(booking)
                         
                         logger.info(f"Booking {booking_id} payment confirmed via webhook")
                     except Booking.DoesNotExist:
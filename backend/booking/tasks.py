@@ -159,6 +159,128 @@ The Flight Booking Team
         raise self.retry(exc=exc, countdown=60)
 
 
+@shared_task(bind=True, max_retries=3)
+def send_group_booking_hold_email(self, booking_ids):
+    """
+    Send one email telling the user the seats of a new group booking are reserved pending payment.
+    """
+    try:
+        bookings = list(Booking.objects.select_related('user', 'flight').filter(id__in=booking_ids).order_by('id'))
+        if not bookings:
+            logger.error(f"Bookings {booking_ids} not found for group hold email")
+            return False
+        user = bookings[0].user
+        flight = bookings[0].flight
+        reference = bookings[0].group_reference
+
+        subject = f'Seats Reserved - {flight.flight_number} ({len(bookings)} passengers)'
+
+        passengers = '\n'.join(
+            f"- {booking.passenger_name or user.username} (Booking ID: #{booking.id})" for booking in bookings
+        )
+        message = f'''Hi {user.username},
+
+Your group booking {reference} has been created and its seats are reserved while payment is pending.
+This is not a confirmation: we will email you once every passenger has been paid for.
+
+Flight Number: {flight.flight_number}
+From: {flight.departure}
+To: {flight.arrival}
+Date: {flight.date.strftime('%Y-%m-%d %H:%M')}
+Cabin: {bookings[0].get_cabin_display()}
+Price per passenger: ${flight.price}
+Total due: ${flight.price * len(bookings)}
+
+Passengers:
+{passengers}
+
+Important Information:
+- Seats are only held for a limited time; unpaid bookings are released automatically
+- Complete payment for each passenger at: http://localhost:3000/bookings
+
+Best regards,
+The Flight Booking Team
+'''
+        from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@flightbooking.com')
+
+        send_mail(
+            subject,
+            message,
+            from_email,
+            [user.email],
+            fail_silently=False
+        )
+        logger.info(f"Group booking hold email sent for {reference} ({len(bookings)} bookings)")
+        return True
+    except Exception as exc:
+        logger.error(f"Error sending group booking hold email for {booking_ids}: {exc}")
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3)
+def send_group_booking_confirmation_email(self, group_reference):
+    """
+    Send one confirmation email once every booking of a group booking is paid.
+    """
+    try:
+        bookings = list(
+            Booking.objects.select_related('user', 'flight')
+            .filter(group_reference=group_reference, payment_status='paid')
+            .order_by('id')
+        )
+        if not bookings:
+            logger.error(f"No paid bookings found for group confirmation email {group_reference}")
+            return False
+        user = bookings[0].user
+        flight = bookings[0].flight
+
+        subject = f'Booking Confirmed - {flight.flight_number} ({len(bookings)} passengers)'
+
+        passengers = '\n'.join(
+            f"- {booking.passenger_name or user.username} (Booking ID: #{booking.id})" for booking in bookings
+        )
+        message = f'''Hi {user.username},
+
+Thank you for your booking!
+
+Payment for your group booking {group_reference} is complete. Here are the details:
+
+Flight Number: {flight.flight_number}
+From: {flight.departure}
+To: {flight.arrival}
+Date: {flight.date.strftime('%Y-%m-%d %H:%M')}
+Cabin: {bookings[0].get_cabin_display()}
+Price per passenger: ${flight.price}
+Total paid: ${flight.price * len(bookings)}
+
+Passengers:
+{passengers}
+
+Important Information:
+- Please arrive at the airport at least 2 hours before domestic flights
+- Every passenger needs a valid photo ID and the booking confirmation
+
+Manage your bookings at: http://localhost:3000/bookings
+
+Best regards,
+The Flight Booking Team
+'''
+        from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@flightbooking.com')
+
+        send_mail(
+            subject,
+            message,
+            from_email,
+            [user.email],
+            fail_silently=False
+        )
+        logger.info(f"Group booking confirmation email sent for {group_reference} ({len(bookings)} bookings)")
+        return True
+    except Exception as exc:
+        logger.error(f"Error sending group booking confirmation email for {group_reference}: {exc}")
+        raise self.retry(exc=exc, countdown=60)
+
+
 @shared_task(bind=True, max_retries=3)
 def send_booking_cancellation_email(self, booking_id):
     """
@@ -263,3 +385,85 @@ The Flight Booking Team
     except Exception as exc:
         logger.error(f"Error sending registration email to user {user_id}: {exc}")
         raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task
+def release_expired_seat_holds():
+    """
+    Give back the seats of unpaid bookings whose hold has expired (run by Celery beat).
+    """
+    from .seat_holds import release_expired_holds
+
+    released = release_expired_holds()
+    if released:
+        logger.info(f"Released {released} expired seat holds")
+    return released
+
+
+@shared_task
+def rebalance_seat_shards():
+    """
+    Move seats from full to drained sub-counters of sharded flights (run by Celery beat).
+    """
+    from .seat_shards import rebalance_sharded_flights
+
+    return rebalance_sharded_flights()
+
+
+@shared_task
+def reconcile_seat_counters():
+    """
+    Correct sharded seat counters that drifted from their bookings (run by Celery beat).
+    """
+    from .seat_shards import reconcile_sharded_flights
+
+    corrected = reconcile_sharded_flights()
+    if corrected:
+        logger.warning(f"Corrected seat counters of {corrected} sharded cabins")
+    return corrected
+
+
+@shared_task
+def reconcile_booking_stats():
+    """
+    Recount the materialized admin booking stats from the bookings table (run nightly by Celery beat).
+    """
+    from .booking_stats import get_booking_stats, reconcile_booking_stats as recount
+
+    before = get_booking_stats()
+    after = recount()
+    drift = {field: after[field] - before[field] for field in after if after[field] != before[field]}
+    if drift:
+        logger.warning(f"Corrected drift in admin booking stats: {drift}")
+    return len(drift)
+
+
+@shared_task
+def fold_booking_stats_deltas():
+    """
+    Fold pending booking stats deltas into the admin booking stats row (run by Celery beat).
+    """
+    from .booking_stats import fold_booking_stats_deltas as fold
+
+    return fold()
+
+
+@shared_task
+def enrich_airports_from_airlabs(keyword, country=None):
+    """
+    Look up a keyword the local autocomplete index missed on AirLabs and
+    publish any new airports to every worker's index.
+    """
+    from .airlabs_client import AirLabsClient
+    from .airport_autocomplete import publish_enriched_airports
+
+    try:
+        airports = AirLabsClient().search_airports(keyword, country)
+    except ValueError as exc:
+        logger.warning(f"Skipping AirLabs enrichment for '{keyword}': {exc}")
+        return 0
+    if not airports:
+        return 0
+    added = publish_enriched_airports(airports.get('data', []))
+    logger.info(f"AirLabs enrichment for '{keyword}' added {added} airports")
+    return added
@@ -0,0 +1,94 @@
+"""
+Unit tests for the in-process airport autocomplete
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from booking.airport_autocomplete import (
+    AirportAutocomplete, airport_autocomplete, default_airports, fold, publish_enriched_airports
+)
+
+CustomUser = get_user_model()
+
+
+class AirportAutocompleteTest(SimpleTestCase):
+    """Test cases for AirportAutocomplete"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.engine = AirportAutocomplete(default_airports())
+
+    def codes(self, keyword, **kwargs):
+        return [airport['iataCode'] for airport in self.engine.search(keyword, **kwargs)]
+
+    def test_fold_strips_accents_and_punctuation(self):
+        """Test accent-insensitive normalisation"""
+        self.assertEqual(fold('Montréal-Pierre Elliott Trudeau'), 'montreal pierre elliott trudeau')
+        self.assertEqual(fold('ZÜRICH'), 'zurich')
+
+    def test_exact_code_ranks_first(self):
+        """Test that typing an IATA code returns that airport first"""
+        self.assertEqual(self.codes('cdg')[0], 'CDG')
+        self.assertEqual(self.codes('LGW')[0], 'LGW')
+
+    def test_prefix_ranked_by_popularity(self):
+        """Test that busier airports come first for a shared city prefix"""
+        codes = self.codes('lond')
+        self.assertEqual(codes[0], 'LHR')
+        self.assertTrue({'LGW', 'STN', 'LCY'} <= set(codes))
+
+    def test_accent_insensitive_and_multi_word(self):
+        """Test matching across accents and several words"""
+        self.assertIn('YUL', self.codes('montréal'))
+        self.assertIn('YUL', self.codes('pierre trud'))
+        self.assertEqual(self.codes('new yo')[0], 'JFK')
+
+    def test_country_filter_and_limit(self):
+        """Test the country filter and result limit"""
+        results = self.engine.search('l', country='uk', limit=50)
+        self.assertIn('LHR', [airport['iataCode'] for airport in results])
+        self.assertEqual({airport['countryName'] for airport in results}, {'UK'})
+        self.assertEqual(len(self.codes('s', limit=3)), 3)
+        self.assertEqual(self.codes('zzzz'), [])
+
+
+class AirportSearchViewTest(TestCase):
+    """Test cases for AirportSearchView backed by the autocomplete index"""
+
+    def setUp(self):
+        cache.clear()
+        airport_autocomplete.reset()
+        self.addCleanup(airport_autocomplete.reset)
+        self.client = APIClient()
+        user = CustomUser.objects.create_user(username='searcher', password='pass12345', status='approved')
+        self.client.force_authenticate(user)
+
+    def test_search_answers_locally(self):
+        """Test that search does not call AirLabs when the index has matches"""
+        with mock.patch('booking.airlabs_client.provider_http.get') as get:
+            response = self.client.get('/api/airports/search/', {'keyword': 'Zurich'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'][0]['iataCode'], 'ZRH')
+        get.assert_not_called()
+
+    def test_miss_queues_enrichment_once(self):
+        """Test that unknown keywords are enriched asynchronously, once per cooldown"""
+        with mock.patch('booking.tasks.enrich_airports_from_airlabs.delay') as delay:
+            self.assertEqual(self.client.get('/api/airports/search/', {'keyword': 'Timbuktu'}).status_code, 404)
+            self.client.get('/api/airports/search/', {'keyword': 'timbuktu'})
+        delay.assert_called_once_with('Timbuktu', None)
+
+    def test_enriched_airports_are_picked_up(self):
+        """Test that airports published by the enrichment task become searchable"""
+        self.assertEqual(self.client.get('/api/airports/search/', {'keyword': 'Timbuktu'}).status_code, 404)
+        publish_enriched_airports([
+            {'iataCode': 'TOM', 'name': 'Timbuktu Airport', 'cityName': 'Timbuktu', 'countryName': 'Mali'}
+        ])
+        with self.settings(AIRPORT_AUTOCOMPLETE_REFRESH_INTERVAL=0):
+            response = self.client.get('/api/airports/search/', {'keyword': 'timbu'})
+        self.assertEqual(response.data['data'][0]['iataCode'], 'TOM')
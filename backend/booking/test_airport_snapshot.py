@@ -0,0 +1,102 @@
+"""
+Unit tests for the Airport table sync and the in-memory airport snapshot
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from booking.airport_snapshot import get_snapshot, install_snapshot, load_snapshot
+from booking.airport_sync import normalize_airport, upsert_airports
+from booking.flight_mappers import city_label
+from booking.iata_utils import IATA_INFO, find_nearby_airports, get_airport_info, get_iata_code
+from booking.models import Airport
+
+
+class AirportSnapshotTest(TestCase):
+    """Test cases for upsert_airports and load_snapshot"""
+
+    def setUp(self):
+        self.addCleanup(install_snapshot, get_snapshot())
+
+    def test_builtin_fallback(self):
+        """Test that an empty Airport table falls back to the built-in data"""
+        snapshot = load_snapshot()
+        self.assertEqual(snapshot.source, 'builtin')
+        self.assertEqual(len(snapshot), len(IATA_INFO))
+        self.assertEqual(snapshot.info('LHR')['lat'], IATA_INFO['LHR']['lat'])
+        self.assertEqual(city_label('JFK', snapshot), 'New York')
+        self.assertEqual(city_label('LOZ', snapshot), 'LOZ')
+
+    def test_chunked_upsert(self):
+        """Test that rows are inserted, updated in place and invalid codes skipped"""
+        rows = [
+            {'iata_code': 'gtm', 'name': 'Gotham Intl', 'municipality': 'Gotham', 'iso_country': 'US',
+             'latitude_deg': '40.1', 'longitude_deg': '-74.2', 'aliases': 'gotham city;Old Gotham'},
+            {'iataCode': 'MTR', 'name': 'Metropolis', 'cityName': 'Metropolis', 'lat': 39.0, 'lng': -75.0},
+            {'iata_code': '', 'name': 'Heliport'},
+            {'iata_code': 'SMV', 'name': 'Smallville Field', 'city': 'Smallville'},
+        ]
+        self.assertEqual(upsert_airports(rows, source='test', chunk_size=2), (3, 1))
+        upsert_airports([{'iata_code': 'MTR', 'name': 'Metropolis Central', 'city': 'Metropolis'}], source='test')
+
+        self.assertEqual(Airport.objects.count(), 3)
+        self.assertEqual(Airport.objects.get(iata_code='MTR').name, 'Metropolis Central')
+        self.assertEqual(Airport.objects.get(iata_code='GTM').aliases, ['gotham city', 'old gotham'])
+
+    def test_iata_utils_read_the_snapshot(self):
+        """Test that iata_utils helpers answer from the database-backed snapshot"""
+        upsert_airports([
+            {'iata_code': 'GTM', 'name': 'Gotham Intl', 'city': 'Gotham', 'country': 'US',
+             'lat': 40.1, 'lon': -74.2, 'aliases': ['gotham city']},
+        ], source='test')
+        snapshot = install_snapshot(load_snapshot())
+
+        self.assertEqual(snapshot.source, 'database')
+        self.assertEqual(get_iata_code('Gotham City'), 'GTM')
+        self.assertEqual(get_iata_code('London'), 'LHR')
+        self.assertEqual(get_airport_info('gtm')['name'], 'Gotham Intl')
+        self.assertEqual(find_nearby_airports(40.0, -74.0, limit=1)[0]['iataCode'], 'GTM')
+        self.assertIsNone(get_airport_info('LHR'))
+
+    def test_normalize_rejects_bad_codes(self):
+        """Test that rows without a three-letter IATA code are dropped"""
+        self.assertIsNone(normalize_airport({'iata_code': 'K1'}))
+        self.assertIsNone(normalize_airport({'iata_code': '12A'}))
+        self.assertEqual(normalize_airport({'code': ' jfk '})['iata_code'], 'JFK')
+
+
+class SyncAirportsCommandTest(TestCase):
+    """Test cases for the sync_airports management command"""
+
+    def setUp(self):
+        # sync_airports rebuilds the route matrix; keep it out of the project tree
+        matrix_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(matrix_dir.cleanup)
+        settings_override = self.settings(ROUTE_MATRIX_DIR=matrix_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_sync_airlabs_dump_file(self):
+        """Test loading an AirLabs-format JSON dump"""
+        dump = {'response': [
+            {'iata_code': 'GTM', 'name': 'Gotham Intl', 'city': 'Gotham', 'country_code': 'US', 'lat': 40.1, 'lng': -74.2},
+            {'iata_code': None, 'name': 'Private strip'},
+        ]}
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as handle:
+            json.dump(dump, handle)
+        self.addCleanup(os.unlink, handle.name)
+
+        out = StringIO()
+        call_command('sync_airports', handle.name, stdout=out)
+        self.assertIn('Upserted 1 airports', out.getvalue())
+        self.assertEqual(Airport.objects.get(iata_code='GTM').source, 'file')
+
+    def test_sync_builtin(self):
+        """Test seeding the table from the built-in airport data"""
+        call_command('sync_airports', '--builtin', stdout=StringIO())
+        self.assertEqual(Airport.objects.count(), len(IATA_INFO))
+        self.assertIn('new york', Airport.objects.get(iata_code='JFK').aliases)
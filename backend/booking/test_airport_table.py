@@ -0,0 +1,72 @@
+"""
+Unit tests for the vectorized airport table and batch nearest-airport endpoint
+"""
+import random
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from booking.airport_table import AirportTable
+from booking.iata_utils import IATA_INFO, calculate_distance, get_nearest_airport
+from booking.spatial_index import AirportSpatialIndex
+
+
+class AirportTableTest(SimpleTestCase):
+    """Test cases for AirportTable"""
+
+    def test_matches_kd_tree(self):
+        """Test that batch results equal per-point KD-tree lookups"""
+        rng = random.Random(3)
+        airports = {f"A{i:04d}": {'lat': rng.uniform(-90, 90), 'lon': rng.uniform(-180, 180)} for i in range(2000)}
+        table = AirportTable(airports)
+        index = AirportSpatialIndex(airports, calculate_distance)
+        latitudes = [rng.uniform(-90, 90) for _ in range(300)]
+        longitudes = [rng.uniform(-180, 180) for _ in range(300)]
+
+        indices, distances = table.nearest(latitudes, longitudes, k=3, max_distance=600)
+        for row, (latitude, longitude) in enumerate(zip(latitudes, longitudes)):
+            expected = index.nearest(latitude, longitude, limit=3, max_distance=600)
+            actual = [(table.codes[i], d) for i, d in zip(indices[row], distances[row]) if i >= 0]
+            self.assertEqual([code for code, _ in actual], [code for _, code, _ in expected])
+            for (_, got), (want, _, _) in zip(actual, expected):
+                self.assertAlmostEqual(got, want, places=6)
+
+    def test_missing_neighbours_are_padded(self):
+        """Test that points without airports in range get index -1"""
+        table = AirportTable(IATA_INFO)
+        indices, distances = table.nearest([10.0], [-30.0], k=2, max_distance=500)
+        self.assertEqual(indices.tolist(), [[-1, -1]])
+
+
+class NearestAirportBatchViewTest(SimpleTestCase):
+    """Test cases for NearestAirportBatchView"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('nearest-airport-batch')
+
+    def test_batch_matches_single_lookups(self):
+        """Test that the batch endpoint agrees with get_nearest_airport"""
+        points = [[51.47, -0.45], {'latitude': 40.64, 'longitude': -73.78}, [10.0, -30.0]]
+        response = self.client.post(self.url, {'points': points}, format='json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data[0]['airports'][0]['iataCode'], get_nearest_airport(51.47, -0.45)['iataCode'])
+        self.assertEqual(data[1]['airports'][0]['distance'], get_nearest_airport(40.64, -73.78)['distance'])
+        self.assertEqual(data[2]['airports'], [])
+
+    def test_k_and_unlimited_distance(self):
+        """Test returning several airports per point without a distance cap"""
+        response = self.client.post(self.url, {'points': [[0, 0]], 'k': 3, 'max_distance': None}, format='json')
+        airports = response.json()['data'][0]['airports']
+        self.assertEqual(len(airports), 3)
+        self.assertEqual(airports, sorted(airports, key=lambda a: a['distance']))
+
+    def test_invalid_input(self):
+        """Test validation of points and k"""
+        for body in ({}, {'points': []}, {'points': [[91, 0]]}, {'points': [['x', 0]]}, {'points': [[0, 0]], 'k': 50}):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, 400, body)
@@ -0,0 +1,83 @@
+"""
+Unit tests for the shared Amadeus token manager
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from booking.amadeus_auth import AmadeusTokenManager
+from booking.amadeus_client import AmadeusClient
+from booking.amadeus_service import AmadeusService
+
+
+def token_response(token='token-1', expires_in=1799, delay=0):
+    def post(*args, **kwargs):
+        time.sleep(delay)
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {'access_token': token, 'expires_in': expires_in}
+        return response
+    return post
+
+
+class AmadeusTokenManagerTest(SimpleTestCase):
+    """Test cases for AmadeusTokenManager"""
+
+    def setUp(self):
+        cache.clear()
+        self.manager = AmadeusTokenManager()
+
+    def test_token_shared_between_clients(self):
+        """Test that AmadeusClient and AmadeusService share one token fetch"""
+        with mock.patch('booking.amadeus_auth.provider_http.post', side_effect=token_response()) as post, \
+                mock.patch('booking.amadeus_client.amadeus_token_manager', self.manager), \
+                mock.patch('booking.amadeus_service.amadeus_token_manager', self.manager):
+            self.assertEqual(AmadeusClient().get_access_token(), 'token-1')
+            self.assertEqual(AmadeusClient().get_access_token(), 'token-1')
+            self.assertEqual(AmadeusService().get_access_token(), 'token-1')
+        self.assertEqual(post.call_count, 1)
+
+    def test_token_shared_through_cache(self):
+        """Test that a second manager (another worker) reuses the cached token"""
+        with mock.patch('booking.amadeus_auth.provider_http.post', side_effect=token_response()) as post:
+            self.manager.get_token()
+            self.assertEqual(AmadeusTokenManager().get_token(), 'token-1')
+        self.assertEqual(post.call_count, 1)
+
+    def test_concurrent_cold_start_fetches_once(self):
+        """Test that parallel callers without a token do not stampede the endpoint"""
+        barrier = threading.Barrier(10)
+
+        def worker():
+            barrier.wait()
+            return AmadeusTokenManager().get_token()
+
+        with mock.patch('booking.amadeus_auth.provider_http.post', side_effect=token_response(delay=0.2)) as post:
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                tokens = list(executor.map(lambda _: worker(), range(10)))
+        self.assertEqual(set(tokens), {'token-1'})
+        self.assertEqual(post.call_count, 1)
+
+    def test_proactive_refresh_before_expiry(self):
+        """Test that a token close to expiry is refreshed in the background"""
+        with mock.patch('booking.amadeus_auth.provider_http.post', side_effect=token_response(expires_in=200)):
+            self.assertEqual(self.manager.get_token(), 'token-1')
+
+        with mock.patch('booking.amadeus_auth.provider_http.post', side_effect=token_response('token-2')), \
+                mock.patch('booking.amadeus_auth.threading.Thread') as thread:
+            # Still valid, so the old token is returned while the refresh runs
+            self.assertEqual(self.manager.get_token(), 'token-1')
+            thread.call_args.kwargs['target']()
+            self.assertEqual(self.manager.get_token(), 'token-2')
+
+    def test_invalidate_ignores_stale_token(self):
+        """Test that a 401 for an old token keeps the newer token"""
+        with mock.patch('booking.amadeus_auth.provider_http.post', side_effect=token_response('token-2')):
+            self.manager.get_token()
+        self.manager.invalidate('token-1')
+        self.assertEqual(cache.get(self.manager.cache_key)['access_token'], 'token-2')
+        self.manager.invalidate('token-2')
+        self.assertIsNone(cache.get(self.manager.cache_key))
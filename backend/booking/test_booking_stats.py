@@ -0,0 +1,192 @@
+"""
+Unit tests for the materialized admin booking statistics
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import transaction
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from booking.booking_stats import (
+    compute_booking_stats, fold_booking_stats_deltas, get_booking_stats, reconcile_booking_stats,
+)
+from booking.models import Booking, BookingStats, BookingStatsDelta, CustomUser, Flight
+from booking.tasks import reconcile_booking_stats as reconcile_task
+
+
+class BookingStatsTest(TestCase):
+    """Test cases for the booking stats row and its incremental updates"""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='statsuser', password='testpass123', status='approved')
+        self.flight = Flight.objects.create(
+            flight_number='ST100', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=Decimal('120.00'),
+        )
+        self.other = Flight.objects.create(
+            flight_number='ST200', departure='London', arrival='Rome',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=Decimal('80.00'),
+        )
+
+    def book(self, flight=None, payment_status='pending'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(user=self.user, flight=flight or self.flight, payment_status=payment_status)
+
+    def assertStatsMatchBookings(self):
+        self.assertEqual(get_booking_stats(), compute_booking_stats())
+
+    def test_single_query_aggregate(self):
+        """Test that every counter and the revenue come from one query"""
+        Booking.objects.create(user=self.user, flight=self.flight, payment_status='paid')
+        Booking.objects.create(user=self.user, flight=self.other, payment_status='paid')
+        Booking.objects.create(user=self.user, flight=self.flight, payment_status='failed')
+        Booking.objects.create(user=self.user, flight=self.flight)
+        with self.assertNumQueries(1):
+            stats = compute_booking_stats()
+        self.assertEqual(stats, {
+            'total_bookings': 4, 'paid_bookings': 2, 'pending_bookings': 1,
+            'failed_bookings': 1, 'total_revenue': Decimal('200.00'),
+        })
+
+    def test_row_created_on_first_read(self):
+        """Test that the first read counts existing bookings into the row"""
+        Booking.objects.create(user=self.user, flight=self.flight, payment_status='paid')
+        self.assertFalse(BookingStats.objects.exists())
+        self.assertEqual(get_booking_stats()['paid_bookings'], 1)
+        with self.assertNumQueries(1):
+            get_booking_stats()
+
+    def test_incremental_create_and_payment_change(self):
+        """Test that creates and payment status changes keep the row exact"""
+        get_booking_stats()
+        booking = self.book()
+        self.book(self.other, payment_status='paid')
+        self.assertStatsMatchBookings()
+        booking.payment_status = 'paid'
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+        self.assertEqual(get_booking_stats()['total_revenue'], Decimal('200.00'))
+        booking.payment_status = 'failed'
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+        self.assertStatsMatchBookings()
+        self.assertEqual(get_booking_stats()['failed_bookings'], 1)
+
+    def test_unchanged_save_skips_update(self):
+        """Test that saving a booking without a payment change leaves the row alone"""
+        booking = self.book()
+        get_booking_stats()
+        booking = Booking.objects.get(pk=booking.pk)
+        booking.status = 'confirmed'
+        with self.assertNumQueries(1):
+            booking.save()
+
+    def test_delete(self):
+        """Test that deleting a paid booking takes it out of the counts and revenue"""
+        get_booking_stats()
+        booking = self.book(payment_status='paid')
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+        self.assertStatsMatchBookings()
+        self.assertEqual(get_booking_stats()['total_revenue'], Decimal('0'))
+
+    def test_rollback_not_counted(self):
+        """Test that a booking rolled back with its transaction is never counted"""
+        get_booking_stats()
+        try:
+            with transaction.atomic():
+                Booking.objects.create(user=self.user, flight=self.flight)
+                self.assertEqual(get_booking_stats()['total_bookings'], 1)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(get_booking_stats()['total_bookings'], 0)
+
+    def test_reconcile_before_commit_not_double_counted(self):
+        """Test that a recount taken before a booking transaction commits does not count it twice"""
+        get_booking_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            Booking.objects.create(user=self.user, flight=self.flight, payment_status='paid')
+            reconcile_booking_stats()
+        self.assertStatsMatchBookings()
+        self.assertEqual(get_booking_stats()['total_bookings'], 1)
+
+    def test_booking_write_leaves_stats_row_alone(self):
+        """Test that booking writes only append deltas and never lock the shared stats row"""
+        get_booking_stats()
+        with CaptureQueriesContext(connection) as queries:
+            booking = self.book()
+            booking.payment_status = 'paid'
+            booking.save()
+            booking.delete()
+        self.assertFalse([query for query in queries if 'booking_bookingstats"' in query['sql']])
+        self.assertEqual(BookingStatsDelta.objects.count(), 3)
+        self.assertStatsMatchBookings()
+
+    def test_fold_deltas(self):
+        """Test that folding moves deltas into the row without changing the totals"""
+        get_booking_stats()
+        self.book(payment_status='paid')
+        self.book(self.other)
+        before = get_booking_stats()
+        self.assertEqual(fold_booking_stats_deltas(batch_size=1), 1)
+        self.assertEqual(fold_booking_stats_deltas(), 1)
+        self.assertEqual(fold_booking_stats_deltas(), 0)
+        self.assertFalse(BookingStatsDelta.objects.exists())
+        self.assertEqual(BookingStats.objects.get().total_bookings, 2)
+        self.assertEqual(get_booking_stats(), before)
+
+    def test_reconcile_keeps_pending_deltas(self):
+        """Test that a recount leaves unfolded deltas to be folded without double counting"""
+        get_booking_stats()
+        self.book(payment_status='paid')
+        reconcile_booking_stats()
+        self.assertEqual(BookingStatsDelta.objects.count(), 1)
+        fold_booking_stats_deltas()
+        self.assertEqual(get_booking_stats()['total_bookings'], 1)
+        self.assertEqual(BookingStats.objects.get().total_revenue, Decimal('120.00'))
+
+    def test_reconcile_corrects_drift(self):
+        """Test that the nightly task recounts changes made behind the signals"""
+        booking = self.book()
+        get_booking_stats()
+        Booking.objects.filter(pk=booking.pk).update(payment_status='paid')
+        self.assertEqual(get_booking_stats()['paid_bookings'], 0)
+        self.assertEqual(reconcile_task(), 3)
+        self.assertStatsMatchBookings()
+        self.assertIsNotNone(BookingStats.objects.get().reconciled_at)
+        self.assertEqual(reconcile_booking_stats()['paid_bookings'], 1)
+
+
+class AdminBookingStatsViewTest(TestCase):
+    """Test cases for GET /api/admin/booking-stats/"""
+
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user(
+            username='statsadmin', password='testpass123', status='approved', is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        flight = Flight.objects.create(
+            flight_number='ST300', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=Decimal('150.00'),
+        )
+        Booking.objects.create(user=self.admin, flight=flight, payment_status='paid')
+        Booking.objects.create(user=self.admin, flight=flight)
+
+    def test_constant_queries(self):
+        """Test that the endpoint reads the stats row instead of scanning bookings"""
+        self.assertEqual(self.client.get('/api/admin/booking-stats/').status_code, 200)
+        with patch('booking.booking_stats.compute_booking_stats') as compute:
+            response = self.client.get('/api/admin/booking-stats/')
+        compute.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_bookings'], 2)
+        self.assertEqual(response.data['paid_bookings'], 1)
+        self.assertEqual(response.data['pending_bookings'], 1)
+        self.assertEqual(response.data['failed_bookings'], 0)
+        self.assertEqual(response.data['total_revenue'], Decimal('150.00'))
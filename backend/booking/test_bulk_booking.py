@@ -0,0 +1,171 @@
+"""
+Unit tests for the group (bulk) booking endpoint
+"""
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from booking.models import Booking, CustomUser, Flight, SeatHold
+from booking.seat_inventory import open_cabin, seats_left
+from booking.stripe_payment import send_payment_confirmation
+from booking.tasks import send_group_booking_confirmation_email, send_group_booking_hold_email
+
+
+def passengers(count):
+    return [{'first_name': f"Traveller{i}", 'last_name': 'Smith'} for i in range(count)]
+
+
+class BulkBookingTest(TestCase):
+    """Test cases for POST /api/bookings/bulk/"""
+
+    url = '/api/bookings/bulk/'
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username='leader', email='leader@example.com', password='testpass123', status='approved'
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = Flight.objects.create(
+            flight_number='BB100', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+        open_cabin(self.flight, 'ECONOMY', 10)
+
+    def post(self, count):
+        return self.client.post(self.url, {'flight_id': self.flight.id, 'passengers': passengers(count)}, format='json')
+
+    def test_books_every_passenger(self):
+        """Test that one request books, holds and reserves a seat per passenger"""
+        with patch('booking.tasks.send_group_booking_hold_email.delay'):
+            response = self.post(3)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['bookings']), 3)
+        bookings = Booking.objects.filter(group_reference=response.data['group_reference'])
+        self.assertEqual(sorted(bookings.values_list('passenger_name', flat=True)),
+                         ['Traveller0 Smith', 'Traveller1 Smith', 'Traveller2 Smith'])
+        self.assertEqual(SeatHold.objects.filter(booking__in=bookings).count(), 3)
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 7})
+
+    def test_constant_queries(self):
+        """Test that nine passengers cost the same queries as two"""
+        open_cabin(self.flight, 'ECONOMY', 20)
+        counts = []
+        with patch('booking.tasks.send_group_booking_hold_email.delay'):
+            for size in (2, 9):
+                with CaptureQueriesContext(connection) as queries:
+                    self.assertEqual(self.post(size).status_code, 201)
+                counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_all_or_nothing(self):
+        """Test that a group larger than the seats left books nobody"""
+        open_cabin(self.flight, 'ECONOMY', 2)
+        response = self.post(3)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Booking.objects.exists())
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 2})
+
+    def test_single_email_on_commit(self):
+        """Test that one consolidated email task is enqueued after the transaction commits"""
+        with patch('booking.tasks.send_group_booking_hold_email.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.post(4)
+        delay.assert_called_once_with([booking['id'] for booking in response.data['bookings']])
+
+    def test_invalid_requests(self):
+        """Test that passenger lists are validated before anything is booked"""
+        self.assertEqual(self.post(0).status_code, 400)
+        self.assertEqual(self.post(10).status_code, 400)
+        duplicate = [{'first_name': 'Ann', 'last_name': 'Lee'}, {'first_name': 'ann', 'last_name': 'LEE'}]
+        response = self.client.post(self.url, {'flight_id': self.flight.id, 'passengers': duplicate}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(self.url, {'flight_id': 0, 'passengers': passengers(1)}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Booking.objects.exists())
+
+    def test_pending_user_forbidden(self):
+        """Test that users awaiting approval cannot bulk book"""
+        self.user.status = 'pending'
+        self.user.save()
+        self.assertEqual(self.post(2).status_code, 403)
+
+    def test_group_email_content(self):
+        """Test that the consolidated email is a hold notice listing every passenger"""
+        with patch('booking.tasks.send_group_booking_hold_email.delay'):
+            response = self.post(2)
+        send_group_booking_hold_email([booking['id'] for booking in response.data['bookings']])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertTrue(mail.outbox[0].subject.startswith('Seats Reserved'))
+        self.assertNotIn('Confirmed', mail.outbox[0].subject)
+        self.assertIn('Traveller0 Smith', mail.outbox[0].body)
+        self.assertIn('Traveller1 Smith', mail.outbox[0].body)
+        self.assertIn(response.data['group_reference'], mail.outbox[0].body)
+
+
+class GroupPaymentConfirmationTest(TestCase):
+    """Test cases for the confirmation email of a paid group booking"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username='payer', email='payer@example.com', password='testpass123', status='approved'
+        )
+        flight = Flight.objects.create(
+            flight_number='BB200', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+        self.bookings = [
+            Booking.objects.create(user=self.user, flight=flight, group_reference='GROUP0000001',
+                                   passenger_name=f"Traveller{i} Smith")
+            for i in range(3)
+        ]
+
+    def pay(self, booking):
+        booking.payment_status = 'paid'
+        booking.status = 'confirmed'
+        booking.save()
+        send_payment_confirmation(booking)
+
+    def test_single_email_when_group_paid(self):
+        """Test that only the last payment of a group sends one confirmation, and only once"""
+        with patch('booking.tasks.send_group_booking_confirmation_email.delay') as group, \
+                patch('booking.tasks.send_booking_confirmation_email.delay') as single:
+            for booking in self.bookings:
+                self.pay(booking)
+            send_payment_confirmation(self.bookings[-1])  # webhook after the confirm view
+        single.assert_not_called()
+        group.assert_called_once_with('GROUP0000001')
+
+    def test_cancelled_booking_does_not_block_confirmation(self):
+        """Test that a released booking of the group does not hold back the confirmation"""
+        self.bookings[0].status = 'cancelled'
+        self.bookings[0].save()
+        with patch('booking.tasks.send_group_booking_confirmation_email.delay') as group:
+            for booking in self.bookings[1:]:
+                self.pay(booking)
+        group.assert_called_once_with('GROUP0000001')
+
+    def test_confirmation_content(self):
+        """Test that the group confirmation lists every paid passenger"""
+        for booking in self.bookings:
+            booking.payment_status = 'paid'
+            booking.save()
+        send_group_booking_confirmation_email('GROUP0000001')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertTrue(mail.outbox[0].subject.startswith('Booking Confirmed'))
+        self.assertIn('(3 passengers)', mail.outbox[0].subject)
+        self.assertIn('Traveller2 Smith', mail.outbox[0].body)
+
+    def test_single_booking_keeps_own_email(self):
+        """Test that a booking outside any group still gets its own confirmation"""
+        booking = Booking.objects.create(user=self.user, flight=self.bookings[0].flight)
+        with patch('booking.tasks.send_booking_confirmation_email.delay') as single:
+            self.pay(booking)
+        single.assert_called_once_with(booking.id)
@@ -0,0 +1,121 @@
+"""
+Unit tests for provider circuit breakers and adaptive timeouts
+"""
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from booking.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from booking.provider_http import provider_http
+
+
+BREAKER_SETTINGS = {
+    'CIRCUIT_BREAKER_FAILURE_RATE': 0.5,
+    'CIRCUIT_BREAKER_MIN_REQUESTS': 4,
+    'CIRCUIT_BREAKER_COOLDOWN': 30,
+    'ADAPTIVE_TIMEOUT_MIN_SAMPLES': 5,
+    'ADAPTIVE_TIMEOUT_MULTIPLIER': 2.0,
+    'ADAPTIVE_TIMEOUT_FLOOR': 0.5,
+}
+
+
+@override_settings(**BREAKER_SETTINGS)
+class CircuitBreakerTest(SimpleTestCase):
+    """Test cases for CircuitBreaker"""
+
+    def setUp(self):
+        cache.clear()
+        self.breaker = CircuitBreaker('test.endpoint')
+
+    def _trip(self, breaker):
+        for _ in range(4):
+            breaker.record_failure(0.1)
+
+    def test_opens_on_error_rate(self):
+        """Test that the breaker opens once the rolling error rate is too high"""
+        self.breaker.record_success(0.1)
+        self.breaker.record_failure(0.1)
+        self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state(), CLOSED)  # Below the minimum request count
+        self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state(), OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_state_shared_between_workers(self):
+        """Test that another worker's breaker sees the open state"""
+        self._trip(self.breaker)
+        self.assertEqual(CircuitBreaker('test.endpoint').state(), OPEN)
+
+    def test_half_open_probe_closes_breaker(self):
+        """Test that one probe is let through after the cooldown and closes the breaker"""
+        self._trip(self.breaker)
+        later = cache.get(self.breaker.state_key)['opened_at'] + 31
+        with mock.patch('booking.circuit_breaker.time.time', return_value=later):
+            self.assertEqual(self.breaker.state(), HALF_OPEN)
+            self.assertTrue(self.breaker.before_call())
+            with self.assertRaises(CircuitOpenError):
+                CircuitBreaker('test.endpoint').before_call()  # Only one probe at a time
+            self.breaker.record_success(0.1, probe=True)
+            self.assertEqual(self.breaker.state(), CLOSED)
+            self.assertFalse(self.breaker.before_call())
+
+    def test_failed_probe_reopens_breaker(self):
+        """Test that a failed probe restarts the cooldown"""
+        self._trip(self.breaker)
+        later = cache.get(self.breaker.state_key)['opened_at'] + 31
+        with mock.patch('booking.circuit_breaker.time.time', return_value=later):
+            probe = self.breaker.before_call()
+            self.breaker.record_failure(0.1, probe=probe)
+            self.assertEqual(self.breaker.state(), OPEN)
+
+    def test_timeout_adapts_to_p99(self):
+        """Test that the read timeout follows observed latency within bounds"""
+        self.assertEqual(self.breaker.timeout(30), 30)  # Not enough samples yet
+        for latency in (0.2, 0.3, 0.4, 0.5, 0.6):
+            self.breaker.record_success(latency)
+        self.assertAlmostEqual(self.breaker.timeout(30), 1.2)
+        self.assertEqual(self.breaker.timeout(1), 1)  # Never above the static timeout
+        for _ in range(200):
+            self.breaker.record_success(0.01)
+        self.assertEqual(self.breaker.timeout(30), 0.5)  # Never below the floor
+
+
+@override_settings(**BREAKER_SETTINGS)
+class ProviderHTTPBreakerTest(SimpleTestCase):
+    """Test cases for circuit breaking in the shared provider HTTP client"""
+
+    def setUp(self):
+        cache.clear()
+        self.session = mock.Mock()
+        patcher = mock.patch.object(type(provider_http), 'session', new_callable=mock.PropertyMock,
+                                    return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_server_errors_open_breaker_and_fail_fast(self):
+        """Test that 5xx responses open the breaker and later calls skip the provider"""
+        self.session.request.return_value = mock.Mock(status_code=503)
+        for _ in range(4):
+            provider_http.get('http://provider/x', endpoint='test.server_errors')
+        with self.assertRaises(requests.RequestException):
+            provider_http.get('http://provider/x', endpoint='test.server_errors')
+        self.assertEqual(self.session.request.call_count, 4)
+
+    def test_network_errors_count_as_failures(self):
+        """Test that timeouts and connection errors trip the breaker"""
+        self.session.request.side_effect = requests.Timeout('slow')
+        for _ in range(4):
+            with self.assertRaises(requests.Timeout):
+                provider_http.get('http://provider/x', endpoint='test.network_errors')
+        with self.assertRaises(CircuitOpenError):
+            provider_http.get('http://provider/x', endpoint='test.network_errors')
+
+    def test_client_errors_do_not_open_breaker(self):
+        """Test that 4xx responses are not treated as provider failures"""
+        self.session.request.return_value = mock.Mock(status_code=400)
+        for _ in range(6):
+            provider_http.get('http://provider/x', endpoint='test.client_errors')
+        self.assertEqual(self.session.request.call_count, 6)
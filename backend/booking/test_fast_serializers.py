@@ -0,0 +1,63 @@
+"""
+Unit tests for the .values() fast-path list serializers
+"""
+from datetime import datetime, timezone
+
+from django.test import TestCase
+from django.utils.timezone import override as timezone_override
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from booking.fast_serializers import FastBookingSerializer, FastFlightSerializer
+from booking.models import Booking, CustomUser, Flight
+from booking.serializers import BookingSerializer, FlightSerializer
+
+
+class FastSerializerParityTest(TestCase):
+    """Test cases comparing the fast serializers with the DRF serializers"""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username='fast', password='testpass123', status='approved', email='fast@example.com', first_name='Fa'
+        )
+        flights = [
+            Flight.objects.create(flight_number='BA117', departure='London', arrival='New York',
+                                  date=datetime(2031, 5, 1, 22, 5, 30, 123456, tzinfo=timezone.utc), price='612.5'),
+            Flight.objects.create(flight_number='X', departure='Qwxz Field', arrival='Paris',
+                                  date=datetime(2031, 5, 2, 8, 0, tzinfo=timezone.utc), price=99, status='delayed'),
+            Flight.objects.create(flight_number='LH400', departure='FRA', arrival='JFK',
+                                  date=datetime(2031, 5, 3, 0, 0, tzinfo=timezone.utc), price='1499.99'),
+        ]
+        for flight in flights:
+            Booking.objects.create(user=self.user, flight=flight, payment_status='paid')
+
+    def assertSameJSON(self, fast_data, drf_data):
+        self.assertEqual(JSONRenderer().render(fast_data), JSONRenderer().render(drf_data))
+
+    def test_flight_parity(self):
+        """Test that FastFlightSerializer renders exactly like FlightSerializer"""
+        queryset = Flight.objects.order_by('id')
+        fast = FastFlightSerializer()
+        self.assertSameJSON(fast.serialize(fast.values(queryset)), FlightSerializer(queryset, many=True).data)
+
+    def test_flight_parity_in_local_timezone(self):
+        """Test that datetimes are converted to the active timezone like DRF does"""
+        queryset = Flight.objects.order_by('id')
+        with timezone_override('Asia/Tokyo'):
+            fast = FastFlightSerializer()
+            self.assertSameJSON(fast.serialize(fast.values(queryset)), FlightSerializer(queryset, many=True).data)
+
+    def test_booking_parity(self):
+        """Test that FastBookingSerializer renders exactly like BookingSerializer"""
+        queryset = Booking.objects.order_by('id')
+        fast = FastBookingSerializer()
+        self.assertSameJSON(fast.serialize(fast.values(queryset)), BookingSerializer(queryset, many=True).data)
+
+    def test_list_endpoints_use_one_query(self):
+        """Test that the booking list is one joined query plus no per-row lookups"""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(1):
+            response = client.get('/api/bookings/')
+        queryset = Booking.objects.order_by('-created_at', '-id')
+        self.assertSameJSON(response.data['results'], BookingSerializer(queryset, many=True).data)
@@ -0,0 +1,96 @@
+"""
+Unit tests for the indexed route columns used by the local flight search
+"""
+import importlib
+from datetime import datetime, timedelta, timezone
+
+from django.apps import apps
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from booking.models import Airport, Flight
+
+
+class FlightRouteSearchTest(TestCase):
+    """Test cases for Flight.origin_iata/destination_iata and FlightSearchView.get_queryset"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.day = datetime(2031, 3, 14, tzinfo=timezone.utc)
+        self.flight = Flight.objects.create(
+            flight_number='AA100', departure='New York', arrival='Los Angeles',
+            date=self.day.replace(hour=23, minute=59), price=300,
+        )
+        Flight.objects.create(
+            flight_number='AA101', departure='New York', arrival='Los Angeles',
+            date=self.day + timedelta(days=1), price=300,
+        )
+        Flight.objects.create(
+            flight_number='GT1', departure='Gotham Heliport', arrival='Los Angeles', date=self.day, price=90,
+        )
+
+    def search(self, **params):
+        return [flight['flightNumber'] for flight in self.client.get('/api/flights/search/', params).data]
+
+    def test_codes_resolved_on_save(self):
+        """Test that saving a flight stores the resolved IATA codes"""
+        self.assertEqual((self.flight.origin_iata, self.flight.destination_iata), ('JFK', 'LAX'))
+        self.flight.departure = 'Paris'
+        self.flight.save(update_fields=['departure'])
+        self.assertEqual(Flight.objects.get(pk=self.flight.pk).origin_iata, 'CDG')
+
+    def test_search_matches_resolved_codes(self):
+        """Test that city aliases and codes find the same flights"""
+        self.assertEqual(sorted(self.search(departure='new york', arrival='LAX')), ['AA100', 'AA101'])
+        self.assertEqual(sorted(self.search(departure='JFK')), ['AA100', 'AA101'])
+
+    def test_unresolved_location_falls_back_to_substring(self):
+        """Test that locations without an IATA code still match by substring"""
+        self.assertEqual(self.search(departure='Gotham'), ['GT1'])
+
+    def test_misspelt_location_is_not_guessed(self):
+        """Test that a typo is neither stored as a code nor searched as another airport"""
+        typo = Flight.objects.create(
+            flight_number='FR1', departure='Frankfrut', arrival='Los Angeles', date=self.day, price=90,
+        )
+        self.assertEqual(typo.origin_iata, '')
+        self.assertEqual(self.search(departure='Frankfrut'), ['FR1'])
+
+    def test_three_letter_partial_city_name(self):
+        """Test that a three-letter start of a city name still matches by substring"""
+        Flight.objects.create(flight_number='SF1', departure='San Francisco', arrival='Los Angeles', date=self.day, price=90)
+        Flight.objects.create(flight_number='SD1', departure='San Diego', arrival='Los Angeles', date=self.day, price=90)
+        Flight.objects.create(flight_number='RO1', departure='Rome', arrival='Los Angeles', date=self.day, price=90)
+        self.assertEqual(sorted(self.search(departure='San')), ['SD1', 'SF1'])
+        self.assertEqual(self.search(departure='Rom'), ['RO1'])
+        self.assertEqual(sorted(self.search(departure='New')), ['AA100', 'AA101'])
+
+    def test_unresolved_rows_match_city_name(self):
+        """Test that rows saved without a code are still found by a resolvable city name"""
+        Flight.objects.filter(flight_number='AA100').update(origin_iata='')
+        self.assertEqual(sorted(self.search(departure='New York')), ['AA100', 'AA101'])
+
+    def test_date_is_a_half_open_day_range(self):
+        """Test that the date filter covers exactly one calendar day"""
+        self.assertEqual(self.search(departure='New York', date='2031-03-14'), ['AA100'])
+        self.assertEqual(self.search(departure='New York', date='2031-03-15'), ['AA101'])
+
+    def test_backfill_migration(self):
+        """Test that the data migration fills rows saved before the columns existed"""
+        Flight.objects.update(origin_iata='', destination_iata='')
+        migration = importlib.import_module('booking.migrations.0005_flight_route_columns')
+        migration.backfill_route_codes(apps, None)
+        self.assertEqual(
+            set(Flight.objects.values_list('origin_iata', 'destination_iata')), {('JFK', 'LAX'), ('', 'LAX')}
+        )
+
+    def test_backfill_migration_is_exact(self):
+        """Test that the backfill uses its frozen aliases and table aliases, never a fuzzy guess"""
+        Airport.objects.create(iata_code='GTM', city='Gotham', aliases=['gotham heliport'])
+        Flight.objects.create(flight_number='TY1', departure='Los Angelse', arrival='New York', date=self.day, price=90)
+        Flight.objects.update(origin_iata='', destination_iata='')
+        migration = importlib.import_module('booking.migrations.0005_flight_route_columns')
+        migration.backfill_route_codes(apps, None)
+        codes = dict(Flight.objects.values_list('flight_number', 'origin_iata'))
+        self.assertEqual(codes['GT1'], 'GTM')
+        self.assertEqual(codes['TY1'], '')
@@ -0,0 +1,76 @@
+"""
+Unit tests for the symmetric-delete fuzzy index and typo-tolerant get_iata_code_fuzzy
+"""
+import random
+
+from django.test import SimpleTestCase
+
+from booking.airport_snapshot import get_snapshot
+from booking.fuzzy_match import SymSpellIndex, edit_distance
+from booking.iata_utils import get_iata_code, get_iata_code_fuzzy
+
+
+class SymSpellIndexTest(SimpleTestCase):
+    """Test cases for SymSpellIndex"""
+
+    def test_edit_distance(self):
+        """Test optimal string alignment distances and the early cut-off"""
+        self.assertEqual(edit_distance('frankfrut', 'frankfurt', 2), 1)
+        self.assertEqual(edit_distance('kitten', 'sitting', 3), 3)
+        self.assertEqual(edit_distance('kitten', 'sitting', 1), 2)
+        self.assertEqual(edit_distance('', 'abc', 5), 3)
+
+    def test_lookup_matches_brute_force(self):
+        """Test that lookups find the same closest terms as a full scan"""
+        rng = random.Random(12)
+        alphabet = 'abcdefgh'
+        terms = {''.join(rng.choice(alphabet) for _ in range(rng.randint(4, 9))): i for i in range(300)}
+        index = SymSpellIndex(terms, max_distance=2)
+        for _ in range(200):
+            query = ''.join(rng.choice(alphabet) for _ in range(rng.randint(4, 9)))
+            distances = {term: edit_distance(query, term, 2) for term in terms}
+            best = min(distances.values())
+            match = index.lookup(query)
+            if best > 2:
+                self.assertIsNone(match)
+                continue
+            values = {terms[term] for term, distance in distances.items() if distance == best}
+            if len(values) == 1:
+                self.assertEqual(match[:2], (values.pop(), best))
+            else:
+                self.assertIsNone(match)
+
+    def test_ambiguous_ties_are_rejected(self):
+        """Test that equally close terms with different values return None"""
+        index = SymSpellIndex({'paris': 'CDG', 'parks': 'XXX'})
+        self.assertIsNone(index.lookup('parhs'))
+        self.assertEqual(index.lookup('Pariss')[0], 'CDG')
+
+
+class GetIataCodeFuzzyTest(SimpleTestCase):
+    """Test cases for typo-tolerant get_iata_code_fuzzy"""
+
+    def test_exact_behaviour_unchanged(self):
+        """Test that exact names, codes and the international suffix still resolve"""
+        self.assertEqual(get_iata_code_fuzzy('London'), 'LHR')
+        self.assertEqual(get_iata_code_fuzzy('xyz'), 'XYZ')
+        self.assertEqual(get_iata_code_fuzzy('Dublin International'), 'DUB')
+        self.assertIsNone(get_iata_code_fuzzy(''))
+
+    def test_typos_and_accents(self):
+        """Test that misspelt and unaccented city names resolve"""
+        self.assertEqual(get_iata_code_fuzzy('Frankfrut'), 'FRA')
+        self.assertEqual(get_iata_code_fuzzy('Sao Paulo'), 'GRU')
+        self.assertEqual(get_iata_code_fuzzy('Amsterdm'), 'AMS')
+        self.assertEqual(get_iata_code_fuzzy('Barcelna International'), 'BCN')
+
+    def test_unrelated_and_short_inputs(self):
+        """Test that short or distant inputs do not produce a guess"""
+        self.assertIsNone(get_iata_code_fuzzy('zzzz'))
+        self.assertIsNone(get_iata_code_fuzzy('Atlantis City'))
+        self.assertIsNone(get_snapshot().city_index.lookup('xq', max_distance=2))
+
+    def test_get_iata_code_stays_exact(self):
+        """Test that the storing and filtering lookup never guesses"""
+        self.assertIsNone(get_iata_code('Frankfrut'))
+        self.assertIsNone(get_iata_code('Amsterdm'))
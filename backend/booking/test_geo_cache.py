@@ -0,0 +1,171 @@
+"""
+Unit tests for the geohash-quantized coordinate search cache
+"""
+import random
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from booking.airport_snapshot import AirportSnapshot, builtin_airports, get_snapshot, install_snapshot
+from booking.geo_cache import GeoResultCache, geohash_cell, hotel_geocode_cache, nearby_airports_cache
+from booking.iata_utils import IATA_INFO, find_nearby_airports
+from booking.views_gps import cached_nearby_airports
+
+
+def hotel_offer(hotel_id, latitude, longitude):
+    return {
+        'id': hotel_id,
+        'hotel': {
+            'hotelId': hotel_id, 'name': hotel_id, 'latitude': latitude, 'longitude': longitude,
+            'address': {'city': 'Paris', 'countryCode': 'FR'},
+        },
+        'offers': [{'price': {'total': '100.00', 'currency': 'USD'}}],
+    }
+
+
+class GeohashTest(SimpleTestCase):
+    """Test cases for geohash_cell and GeoResultCache.cell"""
+
+    def test_known_geohash(self):
+        """Test encoding against the reference example"""
+        geohash, (lat_min, lat_max, lon_min, lon_max) = geohash_cell(57.64911, 10.40744, 11)
+        self.assertEqual(geohash, 'u4pruydqqvj')
+        self.assertTrue(lat_min <= 57.64911 <= lat_max and lon_min <= 10.40744 <= lon_max)
+
+    def test_cell_reach_covers_cell(self):
+        """Test that every point of a cell lies within reach of its centre"""
+        geo = GeoResultCache('test_geo', precision=5)
+        geohash, centre_lat, centre_lon, reach = geo.cell(51.47, -0.45)
+        self.assertEqual(geohash, geohash_cell(51.47, -0.45, 5)[0])
+        self.assertGreater(reach, 2)
+        self.assertLess(reach, 4)
+
+
+class CachedNearbyAirportsTest(SimpleTestCase):
+    """Test cases for cached_nearby_airports"""
+
+    def setUp(self):
+        cache.clear()
+        nearby_airports_cache.clear_local()
+
+    def test_matches_uncached_search(self):
+        """Test that refined cell results equal a direct search for the exact point"""
+        rng = random.Random(14)
+        seeds = list(IATA_INFO.values())
+        for _ in range(300):
+            seed = rng.choice(seeds)
+            latitude, longitude = seed['lat'] + rng.gauss(0, 0.5), seed['lon'] + rng.gauss(0, 0.5)
+            limit, max_distance = rng.choice([(1, 500), (5, 500), (5, 50), (10, 200), (20, 900)])
+            self.assertEqual(
+                cached_nearby_airports(latitude, longitude, limit, max_distance),
+                find_nearby_airports(latitude, longitude, limit=limit, max_distance=max_distance),
+            )
+
+    def test_nearby_points_share_a_cell(self):
+        """Test that points metres apart hit the same cache entry"""
+        cached_nearby_airports(51.4700, -0.4543, 5, 500)
+        cached_nearby_airports(51.4702, -0.4540, 1, 500)
+        self.assertEqual(nearby_airports_cache.report()['counters'], {'hits': 1, 'misses': 1})
+
+    def test_radii_share_a_step(self):
+        """Test that radii rounded up to the same cell radius share one entry"""
+        cached_nearby_airports(51.47, -0.45, 5, 120)
+        cached_nearby_airports(51.47, -0.45, 5, 250)
+        cached_nearby_airports(51.47, -0.45, 5, 260)
+        self.assertEqual(nearby_airports_cache.report()['counters'], {'hits': 1, 'misses': 2})
+
+    def test_entry_is_compact(self):
+        """Test that a cell stores codes and centre distances, not airport dicts"""
+        cells = []
+        get_or_fetch = nearby_airports_cache.get_or_fetch
+
+        def capture(*args):
+            cell, state = get_or_fetch(*args)
+            cells.append(cell)
+            return cell, state
+
+        with mock.patch.object(nearby_airports_cache, 'get_or_fetch', side_effect=capture):
+            cached_nearby_airports(51.47, -0.45, 5, 500)
+        cell = cells[0]
+        self.assertTrue(all(isinstance(code, str) for code in cell['codes']))
+        self.assertEqual(len(cell['codes']), len(cell['distances']))
+
+    @override_settings(NEARBY_AIRPORTS_CACHE_MAX_AIRPORTS=3)
+    def test_truncated_cell_matches_uncached_search(self):
+        """Test that a cell cut short still answers exactly, falling back when it cannot"""
+        for limit, max_distance in [(1, 500), (5, 500), (10, 1000)]:
+            self.assertEqual(
+                cached_nearby_airports(51.47, -0.45, limit, max_distance),
+                find_nearby_airports(51.47, -0.45, limit=limit, max_distance=max_distance),
+            )
+
+    def test_airport_resync_changes_key(self):
+        """Test that a new airport snapshot is never answered from cells of the old one"""
+        previous = get_snapshot()
+        cached_nearby_airports(51.47, -0.45, 5, 500)
+        airports = [airport for airport in builtin_airports() if airport['iata_code'] != 'LHR']
+        install_snapshot(AirportSnapshot(airports, source='test'))
+        try:
+            result = cached_nearby_airports(51.47, -0.45, 5, 500)
+        finally:
+            install_snapshot(previous)
+        self.assertNotIn('LHR', [airport['iataCode'] for airport in result])
+        self.assertEqual(nearby_airports_cache.report()['counters'], {'hits': 0, 'misses': 2})
+
+    def test_wide_radius_bypasses_cache(self):
+        """Test that continent-sized searches are not cached per cell"""
+        cached_nearby_airports(51.47, -0.45, 5, 20000)
+        self.assertEqual(nearby_airports_cache.report()['counters'], {'hits': 0, 'misses': 0})
+
+    def test_zero_coordinates_use_cache(self):
+        """Test that the equator and prime meridian are valid cacheable coordinates"""
+        cached_nearby_airports(0.0, 0.0, 5, 500)
+        cached_nearby_airports(0.0001, 0.0001, 5, 500)
+        self.assertEqual(nearby_airports_cache.report()['counters'], {'hits': 1, 'misses': 1})
+
+    def test_view_clamps_parameters(self):
+        """Test that the endpoint clamps limit and radius and rejects non-integers"""
+        client = APIClient()
+        response = client.get('/api/airports/nearby/', {
+            'latitude': 51.47, 'longitude': -0.45, 'limit': 1000, 'max_distance': 20000,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 50)
+        self.assertEqual(nearby_airports_cache.report()['counters'], {'hits': 0, 'misses': 0})
+        response = client.get('/api/airports/nearby/', {'latitude': 51.47, 'longitude': -0.45, 'limit': 'all'})
+        self.assertEqual(response.status_code, 400)
+
+
+class HotelGeocodeCacheTest(SimpleTestCase):
+    """Test cases for HotelSearchView geocode searches through the cell cache"""
+
+    def setUp(self):
+        cache.clear()
+        hotel_geocode_cache.clear_local()
+        self.client = APIClient()
+        self.url = reverse('hotel-search')
+
+    def search(self, latitude, longitude):
+        return self.client.get(self.url, {
+            'latitude': latitude, 'longitude': longitude, 'check_in': '2030-05-01', 'check_out': '2030-05-03'
+        })
+
+    @mock.patch('booking.views.AmadeusClient.search_hotels_by_geocode')
+    def test_provider_called_once_per_cell(self, search_hotels):
+        """Test that clustered searches reuse the cell result, filtered to the exact point"""
+        search_hotels.return_value = {'data': [
+            hotel_offer('NEAR', 48.857, 2.352),
+            hotel_offer('EDGE', 49.2945, 2.3522),  # 48.7 km from the first query, 50.3 km from the second
+        ]}
+
+        first = self.search(48.8566, 2.3522)
+        second = self.search(48.8420, 2.3522)
+
+        search_hotels.assert_called_once()
+        self.assertGreater(search_hotels.call_args.kwargs['radius'], 50)
+        self.assertEqual([hotel['id'] for hotel in first.data['data']], ['NEAR', 'EDGE'])
+        self.assertEqual([hotel['id'] for hotel in second.data['data']], ['NEAR'])
+        self.assertEqual(hotel_geocode_cache.report()['counters'], {'hits': 1, 'misses': 1})
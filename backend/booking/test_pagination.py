@@ -0,0 +1,81 @@
+"""
+Unit tests for keyset pagination on the list endpoints
+"""
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from booking.models import CustomUser, Flight
+from booking.pagination import KeysetPagination
+
+
+class KeysetPaginationTest(TestCase):
+    """Test cases for KeysetPagination"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='pager', password='testpass123', status='approved')
+        self.client.force_authenticate(self.user)
+        # Pairs of flights share a departure time so the id tie-breaker is exercised
+        start = datetime(2031, 1, 1, tzinfo=timezone.utc)
+        Flight.objects.bulk_create([
+            Flight(flight_number=f"PG{i}", departure='London', arrival='Paris',
+                   date=start + timedelta(hours=i // 2), price=100)
+            for i in range(25)
+        ])
+        self.expected = list(Flight.objects.order_by('-date', '-id').values_list('flight_number', flat=True))
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_walks_forward_and_back_without_gaps(self):
+        """Test that following next then previous links visits every row exactly once"""
+        pages, url = [], '/api/flights/'
+        while url:
+            page = self.get(url, page_size=10) if not pages else self.get(url)
+            pages.append([flight['flightNumber'] for flight in page['results']])
+            url = page['next']
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), self.expected)
+
+        last = self.get('/api/flights/', page_size=10)
+        second = self.get(last['next'])
+        back = self.get(second['previous'])
+        self.assertEqual([flight['flightNumber'] for flight in back['results']], pages[0])
+        self.assertIsNone(back['previous'])
+
+    def test_no_count_query(self):
+        """Test that a page is served without COUNT(*) or OFFSET"""
+        first = self.get('/api/flights/', page_size=5)
+        with CaptureQueriesContext(connection) as queries:
+            self.get(first['next'])
+        flight_queries = [query['sql'] for query in queries if 'booking_flight' in query['sql']]
+        self.assertEqual(len(flight_queries), 1)
+        self.assertNotIn('COUNT(', flight_queries[0].upper())
+        self.assertNotIn('OFFSET', flight_queries[0].upper())
+
+    def test_page_size_is_capped(self):
+        """Test that page_size is clamped to max_page_size"""
+        with mock.patch.object(KeysetPagination, 'max_page_size', 7):
+            page = self.get('/api/flights/', page_size=100000)
+        self.assertEqual(len(page['results']), 7)
+        self.assertEqual(len(self.get('/api/flights/', page_size=0)['results']), 1)
+
+    def test_invalid_cursor(self):
+        """Test that a tampered cursor is rejected with 404"""
+        self.assertEqual(self.client.get('/api/flights/', {'cursor': 'not-a-cursor'}).status_code, 404)
+        cursor = parse_qs(urlparse(self.get('/api/flights/', page_size=5)['next']).query)['cursor'][0]
+        self.assertEqual(self.client.get('/api/flights/', {'cursor': cursor[:-4]}).status_code, 404)
+
+    def test_bookings_are_paginated(self):
+        """Test that the booking list uses the same envelope"""
+        data = self.get('/api/bookings/')
+        self.assertEqual(data['results'], [])
+        self.assertIsNone(data['next'])
@@ -0,0 +1,82 @@
+"""
+Unit tests for the local provider simulator
+"""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from booking.airlabs_client import AirLabsClient
+from booking.amadeus_client import AmadeusClient
+from booking.amadeus_service import AmadeusService
+from booking.flight_mappers import map_amadeus_flights
+from booking.opensky_client import OpenSkyClient
+from booking.provider_http import provider_http
+from booking.provider_simulator import ProviderSimulator, SimulatorProfile
+
+
+class ProviderSimulatorTest(SimpleTestCase):
+    """Test cases for ProviderSimulator driven through the real clients"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.simulator = ProviderSimulator(
+            SimulatorProfile(latency_ms=0, result_count=8),
+            overrides={
+                'aviationstack.flights': SimulatorProfile(latency_ms=0, error_rate=1.0),
+                'opensky.states': SimulatorProfile(latency_ms=0, rate_limit_rate=1.0, retry_after=7),
+            },
+        )
+        cls.simulator.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.simulator.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.departure_date = (date.today() + timedelta(days=10)).isoformat()
+        settings_override = override_settings(AIRLABS_API_KEY='sim-key', **self.simulator.settings_overrides())
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_flight_offers_are_deterministic(self):
+        """Test that the same query returns identical offers that our mapper understands"""
+        first = AmadeusClient().search_flights('JFK', 'LHR', self.departure_date, adults=2, travel_class='BUSINESS')
+        second = AmadeusClient().search_flights('JFK', 'LHR', self.departure_date, adults=2, travel_class='BUSINESS')
+        self.assertEqual(first, second)
+        flights = map_amadeus_flights(first)
+        self.assertEqual(len(flights), 8)
+        self.assertTrue(all(flight['price'] > 0 for flight in flights))
+        other = AmadeusClient().search_flights('JFK', 'CDG', self.departure_date)
+        self.assertNotEqual(first, other)
+
+    def test_hotel_and_order_flows(self):
+        """Test hotel offers and the flight order round trip"""
+        hotels = AmadeusClient().search_hotels('PAR', self.departure_date, self.departure_date)
+        self.assertEqual(len(hotels['data']), 8)
+        offer_id = hotels['data'][0]['offers'][0]['id']
+        self.assertIsNotNone(AmadeusClient().get_hotel_details(offer_id))
+
+        service = AmadeusService()
+        offer = service.search_flights('JFK', 'LAX', self.departure_date)['data'][0]
+        order = service.create_order(offer, {'id': '1', 'name': {'firstName': 'Ada', 'lastName': 'Lovelace'}})
+        self.assertEqual(service.get_order(order['data']['id'])['data']['id'], order['data']['id'])
+
+    def test_airlabs_and_opensky_endpoints(self):
+        """Test the AirLabs and OpenSky routes through their clients"""
+        airports = AirLabsClient().search_airports('London')
+        self.assertIn('LHR', [airport['iataCode'] for airport in airports['data']])
+        departures = OpenSkyClient().search_flights('KJFK', 'KLAX', self.departure_date)
+        self.assertEqual(len(departures), 8)
+
+    def test_configured_errors_and_rate_limits(self):
+        """Test per-route error and 429 injection"""
+        response = provider_http.get(f"{self.simulator.base_url}/aviationstack/flights", params={'dep_iata': 'JFK'})
+        self.assertEqual(response.status_code, 500)
+        response = provider_http.get(f"{self.simulator.base_url}/opensky/states/all")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '7')
+        self.assertEqual(self.simulator.counts['opensky.states'], {'rate_limited': 1})
@@ -0,0 +1,75 @@
+"""
+Unit tests enforcing constant query counts on the list endpoints
+"""
+from datetime import datetime, timedelta, timezone
+from itertools import count
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from booking.models import Booking, CustomUser, Flight, Vendor, VendorProduct
+from booking.query_budget import QueryBudgetMixin
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Test cases for N+1 queries on booking and vendor endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='budget', password='testpass123', status='approved')
+        self.client.force_authenticate(self.user)
+        self.vendor = Vendor.objects.create(user=self.user, business_name='Own Tours', is_approved=True)
+        self.sequence = count()
+
+    def add_bookings(self, rows):
+        for _ in range(rows):
+            n = next(self.sequence)
+            flight = Flight.objects.create(
+                flight_number=f"QB{n}", departure='London', arrival='Paris',
+                date=datetime(2031, 1, 1, tzinfo=timezone.utc) + timedelta(hours=n), price=100,
+            )
+            Booking.objects.create(user=self.user, flight=flight)
+
+    def add_products(self, rows, vendor=None):
+        VendorProduct.objects.bulk_create([
+            VendorProduct(vendor=vendor or self.vendor, name=f"Product {next(self.sequence)}", category='tourism')
+            for _ in range(rows)
+        ])
+
+    def add_vendors(self, rows):
+        for _ in range(rows):
+            n = next(self.sequence)
+            owner = CustomUser.objects.create_user(username=f"owner{n}", password='testpass123')
+            self.add_products(2, Vendor.objects.create(user=owner, business_name=f"Vendor {n}", is_approved=True))
+
+    def test_booking_list(self):
+        """Test that the booking list does not query per booking"""
+        self.assertConstantQueries(lambda: self.client.get('/api/bookings/'), self.add_bookings, budget=1)
+
+    def test_booking_detail(self):
+        """Test that a booking's nested user and flight come with it"""
+        self.add_bookings(1)
+        booking = Booking.objects.get()
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/bookings/{booking.pk}/')
+
+    def test_vendor_products(self):
+        """Test that a vendor's own product list does not fetch the vendor per product"""
+        self.assertConstantQueries(lambda: self.client.get('/api/vendors/products/'), self.add_products)
+
+    def test_public_products(self):
+        """Test that public products are listed with their vendors in one query"""
+        self.assertConstantQueries(
+            lambda: self.client.get('/api/vendors/products/public/'), self.add_products, budget=1
+        )
+
+    def test_public_vendors(self):
+        """Test that vendors, owners and nested products are loaded in a fixed number of queries"""
+        self.assertConstantQueries(lambda: self.client.get('/api/vendors/'), self.add_vendors, budget=2)
+        self.assertConstantQueries(
+            lambda: self.client.get('/api/vendors/', {'category': 'tourism'}), self.add_vendors, sizes=(7, 9)
+        )
+
+    def test_vendor_profile(self):
+        """Test that the vendor profile's nested products do not query per product"""
+        self.assertConstantQueries(lambda: self.client.get('/api/vendors/profile/'), self.add_products)
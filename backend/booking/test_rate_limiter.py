@@ -0,0 +1,80 @@
+"""
+Unit tests for the provider token bucket rate limiter
+"""
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from booking.provider_http import provider_http
+from booking.rate_limiter import QuotaExhausted, TokenBucket, get_rate_limiter
+
+
+class TokenBucketTest(SimpleTestCase):
+    """Test cases for TokenBucket"""
+
+    def test_burst_then_exhausted(self):
+        """Test that the burst is allowed and the next call fails fast"""
+        bucket = TokenBucket('test', 'key', rate=1, burst=3)
+        for _ in range(3):
+            bucket.acquire()
+        with self.assertRaises(QuotaExhausted) as ctx:
+            bucket.acquire()
+        self.assertGreater(ctx.exception.retry_after, 0)
+
+    def test_caller_can_queue_briefly(self):
+        """Test that a caller willing to wait gets the next token"""
+        bucket = TokenBucket('test', 'key', rate=20, burst=1)
+        bucket.acquire()
+        started = time.monotonic()
+        bucket.acquire(wait=0.5)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_drain_blocks_until_retry_after(self):
+        """Test that a 429 empties the bucket for the Retry-After period"""
+        bucket = TokenBucket('test', 'key', rate=100, burst=10)
+        bucket.drain(retry_after=0.2)
+        with self.assertRaises(QuotaExhausted):
+            bucket.acquire(wait=0.05)
+        self.assertGreater(bucket.remaining()['blocked_for'], 0)
+        bucket.acquire(wait=0.5)
+
+    def test_buckets_are_per_provider_and_key(self):
+        """Test that each provider and API key has its own bucket"""
+        self.assertIs(get_rate_limiter('airlabs', 'a'), get_rate_limiter('airlabs', 'a'))
+        self.assertIsNot(get_rate_limiter('airlabs', 'a'), get_rate_limiter('airlabs', 'b'))
+        self.assertNotEqual(get_rate_limiter('airlabs', 'a').key, get_rate_limiter('opensky', 'a').key)
+
+
+class ProviderHTTPRateLimitTest(SimpleTestCase):
+    """Test cases for rate limiting in the shared provider HTTP client"""
+
+    def setUp(self):
+        cache.clear()
+        self.session = mock.Mock()
+        patcher = mock.patch.object(type(provider_http), 'session', new_callable=mock.PropertyMock,
+                                    return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_429_stops_further_calls(self):
+        """Test that after a 429 workers stop calling the provider"""
+        bucket = TokenBucket('test', 'key', rate=1, burst=10)
+        self.session.request.return_value = mock.Mock(status_code=429, headers={'Retry-After': '30'})
+        provider_http.get('http://provider/x', rate_limit=bucket)
+        with self.assertRaises(QuotaExhausted):
+            provider_http.get('http://provider/x', rate_limit=bucket, rate_limit_wait=0)
+        self.assertEqual(self.session.request.call_count, 1)
+        self.assertAlmostEqual(bucket.remaining()['blocked_for'], 30, delta=1)
+
+    @override_settings(AIRLABS_API_KEY='test-key', PROVIDER_RATE_LIMITS={'airlabs': {'rate': 0.01, 'burst': 1}})
+    def test_client_returns_none_when_quota_exhausted(self):
+        """Test that an exhausted quota routes AirLabs callers to their fallback"""
+        from booking.airlabs_client import AirLabsClient
+
+        self.session.request.return_value = mock.Mock(status_code=200, json=lambda: {'response': []})
+        client = AirLabsClient()
+        self.assertEqual(client.search_airports('London'), {'data': []})
+        self.assertIsNone(client.search_airports('Paris'))
+        self.assertEqual(self.session.request.call_count, 1)
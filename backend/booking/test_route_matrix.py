@@ -0,0 +1,106 @@
+"""
+Unit tests for the precomputed airport-pair route matrix
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta
+from io import StringIO
+
+import numpy as np
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from booking.airport_snapshot import get_snapshot
+from booking.flight_mappers import map_tracking_flights
+from booking.iata_utils import calculate_distance, get_airport_info
+from booking.models import Flight
+from booking.route_matrix import (
+    MATRIX_FILE, block_minutes, get_route_matrix, iso_duration, load_route_matrix, reset_route_matrix,
+)
+from booking.serializers import FlightSerializer
+
+
+class RouteMatrixTest(SimpleTestCase):
+    """Test cases for RouteMatrix lookups and the build_route_matrix command"""
+
+    def setUp(self):
+        matrix_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(matrix_dir.cleanup)
+        self.matrix_dir = matrix_dir.name
+        settings_override = override_settings(ROUTE_MATRIX_DIR=self.matrix_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        reset_route_matrix()
+        self.addCleanup(reset_route_matrix)
+
+    def test_distances_match_haversine(self):
+        """Test that matrix distances agree with calculate_distance"""
+        matrix = load_route_matrix()
+        lhr, jfk = get_airport_info('LHR'), get_airport_info('JFK')
+        distance, minutes = matrix.route('LHR', 'JFK')
+        self.assertAlmostEqual(distance, calculate_distance(lhr['lat'], lhr['lon'], jfk['lat'], jfk['lon']), delta=0.5)
+        self.assertAlmostEqual(minutes, block_minutes(distance), delta=0.01)
+        self.assertEqual(matrix.route('JFK', 'LHR')[0], distance)
+        self.assertIsNone(matrix.route('LHR', 'LHR'))
+        self.assertIsNone(matrix.route('LHR', 'XXX'))
+
+    def test_build_command_writes_memory_mapped_file(self):
+        """Test that the command writes a file that is memory-mapped and skipped when unchanged"""
+        out = StringIO()
+        call_command('build_route_matrix', stdout=out)
+        self.assertTrue(os.path.exists(os.path.join(self.matrix_dir, MATRIX_FILE)))
+        self.assertIn('Wrote route matrix', out.getvalue())
+
+        matrix = get_route_matrix()
+        self.assertEqual(matrix.source, 'file')
+        self.assertEqual(matrix.route('CDG', 'NRT'), load_route_matrix().route('CDG', 'NRT'))
+        self.assertEqual(len(matrix.index), len(get_snapshot()))
+
+        out = StringIO()
+        call_command('build_route_matrix', stdout=out)
+        self.assertIn('up to date', out.getvalue())
+
+    def test_file_stores_distances_only(self):
+        """Test that the file holds one (n, n) distance plane and an old two-plane file is rebuilt"""
+        call_command('build_route_matrix', stdout=StringIO())
+        path = os.path.join(self.matrix_dir, MATRIX_FILE)
+        n = len(get_snapshot())
+        self.assertEqual(np.load(path, mmap_mode='r').shape, (n, n))
+
+        np.save(path, np.zeros((2, n, n), dtype=np.float32))
+        reset_route_matrix()
+        self.assertNotEqual(get_route_matrix().source, 'file')
+        out = StringIO()
+        call_command('build_route_matrix', stdout=out)
+        self.assertIn('Wrote route matrix', out.getvalue())
+
+    def test_iso_duration(self):
+        """Test ISO 8601 formatting of block minutes"""
+        self.assertEqual(iso_duration(480), 'PT8H')
+        self.assertEqual(iso_duration(425.4), 'PT7H5M')
+
+    def test_serializer_uses_route_block_time(self):
+        """Test that FlightSerializer derives duration and arrival from the route"""
+        departure = datetime(2030, 5, 1, 22, 0)
+        london = Flight(flight_number='BA117', departure='London', arrival='New York', date=departure, price=500)
+        unknown = Flight(flight_number='XX1', departure='Qwxz Field', arrival='New York', date=departure, price=500)
+        minutes = int(round(get_route_matrix().block_minutes('LHR', 'JFK')))
+
+        data = FlightSerializer([london, unknown], many=True).data
+        self.assertEqual(data[0]['duration'], iso_duration(minutes))
+        self.assertEqual(data[0]['arrivalTime'], departure + timedelta(minutes=minutes))
+        self.assertEqual(data[1]['duration'], 'PT8H')
+
+    def test_tracking_flights_get_estimated_duration(self):
+        """Test that tracking results without a duration are filled from the matrix"""
+        flights = map_tracking_flights([
+            {'from': 'LHR', 'to': 'CDG', 'departureTime': '2030-05-01T10:00:00+00:00', 'duration': 'N/A'},
+            {'from': 'LHR', 'to': 'CDG', 'duration': '1h 5m', 'arrivalTime': '2030-05-01T11:05:00+00:00'},
+        ])
+        minutes = int(round(get_route_matrix().block_minutes('LHR', 'CDG')))
+        self.assertEqual(flights[0]['duration'], iso_duration(minutes))
+        self.assertEqual(
+            datetime.fromisoformat(flights[0]['arrivalTime']),
+            datetime.fromisoformat('2030-05-01T10:00:00+00:00') + timedelta(minutes=minutes),
+        )
+        self.assertEqual(flights[1]['duration'], '1h 5m')
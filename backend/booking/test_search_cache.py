@@ -0,0 +1,83 @@
+"""
+Unit tests for the shared flight search cache
+"""
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from booking.search_cache import SearchResultCache, HIT, MISS, STALE
+
+
+class SearchResultCacheTest(TestCase):
+    """Test cases for SearchResultCache"""
+
+    def setUp(self):
+        """Set up a fresh cache for each test"""
+        cache.clear()
+        self.search_cache = SearchResultCache('test_search', fresh_ttl=60, stale_ttl=600)
+        self.key = self.search_cache.make_key('JFK', 'LAX', '2030-01-01', 1, 'ECONOMY')
+
+    def test_key_is_canonical(self):
+        """Test that equivalent parameters produce the same key"""
+        other = self.search_cache.make_key(' jfk', 'lax ', '2030-01-01', '1', 'economy')
+        self.assertEqual(self.key, other)
+
+    def test_miss_then_hit(self):
+        """Test that a fetched value is served from cache on the next lookup"""
+        fetch = mock.Mock(return_value=[{'id': '1'}])
+        self.assertEqual(self.search_cache.get_or_fetch(self.key, fetch), ([{'id': '1'}], MISS))
+        self.assertEqual(self.search_cache.get_or_fetch(self.key, fetch), ([{'id': '1'}], HIT))
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(self.search_cache.stats.snapshot()['hits'], 1)
+        self.assertEqual(self.search_cache.stats.snapshot()['misses'], 1)
+
+    def test_empty_results_are_not_cached(self):
+        """Test that falsy provider results are not stored"""
+        fetch = mock.Mock(return_value=None)
+        self.search_cache.get_or_fetch(self.key, fetch)
+        self.search_cache.get_or_fetch(self.key, fetch)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_stale_entry_served_while_refreshing(self):
+        """Test that a stale entry is returned and refreshed in the background"""
+        self.search_cache.get_or_fetch(self.key, lambda: ['old'])
+        entry = cache.get(self.key)
+        entry['fresh_until'] = time.time() - 1
+        cache.set(self.key, entry)
+
+        with mock.patch('booking.search_cache.threading.Thread') as thread:
+            value, state = self.search_cache.get_or_fetch(self.key, lambda: ['new'])
+            self.assertEqual((value, state), (['old'], STALE))
+            refresh = thread.call_args.kwargs['target']
+
+            # A second stale lookup must not start another refresh
+            self.search_cache.get_or_fetch(self.key, lambda: ['new'])
+            self.assertEqual(thread.call_count, 1)
+
+        refresh()
+        self.assertEqual(self.search_cache.get_or_fetch(self.key, lambda: ['unused']), (['new'], HIT))
+
+    def test_stale_entry_survives_provider_error(self):
+        """Test that a failed background refresh keeps serving the stale entry"""
+        self.search_cache.get_or_fetch(self.key, lambda: ['old'])
+        entry = cache.get(self.key)
+        entry['fresh_until'] = time.time() - 1
+        cache.set(self.key, entry)
+
+        def failing_fetch():
+            raise RuntimeError('provider down')
+
+        with mock.patch('booking.search_cache.threading.Thread') as thread:
+            self.search_cache.get_or_fetch(self.key, failing_fetch)
+            thread.call_args.kwargs['target']()
+            self.assertEqual(self.search_cache.stats.snapshot()['errors'], 1)
+
+            value, state = self.search_cache.get_or_fetch(self.key, failing_fetch)
+            self.assertEqual((value, state), (['old'], STALE))
+
+    def test_miss_propagates_provider_error(self):
+        """Test that provider errors propagate when nothing is cached"""
+        with self.assertRaises(RuntimeError):
+            self.search_cache.get_or_fetch(self.key, mock.Mock(side_effect=RuntimeError('down')))
@@ -0,0 +1,117 @@
+"""
+Unit tests for the concurrent multi-provider flight search
+"""
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from booking.search_orchestrator import FlightSearchOrchestrator, merge_offers, offer_identity
+
+
+def make_flight(number, departure, price='N/A'):
+    return {'flightNumber': number, 'departureTime': departure, 'price': price}
+
+
+class MergeOffersTest(SimpleTestCase):
+    """Test cases for offer merging and de-duplication"""
+
+    def test_identity_ignores_timezone_and_spacing(self):
+        """Test that the same flight from different providers has one identity"""
+        self.assertEqual(
+            offer_identity(make_flight('AA 100', '2030-01-01T08:00:00')),
+            offer_identity(make_flight('aa100', '2030-01-01T08:00:00+00:00'))
+        )
+
+    def test_priced_offer_wins_over_tracking_data(self):
+        """Test that a priced offer replaces an unpriced duplicate"""
+        merged = merge_offers({
+            'aviationstack': [make_flight('AA100', '2030-01-01T08:00:00+00:00')],
+            'amadeus': [make_flight('AA100', '2030-01-01T08:00:00', 250.0)],
+        }, ['aviationstack', 'amadeus'])
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(merged[0]['provider'], 'amadeus')
+
+    def test_sorted_by_price_with_unpriced_last(self):
+        """Test the merged ordering"""
+        merged = merge_offers({
+            'a': [make_flight('XX1', '2030-01-01T08:00'), make_flight('XX2', '2030-01-01T09:00', 300.0)],
+            'b': [make_flight('XX3', '2030-01-01T10:00', 120.0)],
+        }, ['a', 'b'])
+        self.assertEqual([f['flightNumber'] for f in merged], ['XX3', 'XX2', 'XX1'])
+
+
+class FlightSearchOrchestratorTest(SimpleTestCase):
+    """Test cases for the fan-out search deadline behaviour"""
+
+    def _providers(self, **delays):
+        def make(name, delay):
+            def search(*args):
+                time.sleep(delay)
+                return [make_flight(f'{name[:2].upper()}1', '2030-01-01T08:00', 100.0)]
+            return search
+        return {name: make(name, delay) for name, delay in delays.items()}
+
+    def test_slow_provider_is_cut_off_by_grace_period(self):
+        """Test that response time follows the fastest healthy provider"""
+        providers = self._providers(fast=0.01, slow=2.0)
+        with mock.patch.dict('booking.search_orchestrator.PROVIDERS', providers):
+            orchestrator = FlightSearchOrchestrator(providers=['fast', 'slow'], deadline=1.5, grace_period=0.1)
+            started = time.monotonic()
+            result = orchestrator.search('JFK', 'LAX', '2030-01-01')
+            elapsed = time.monotonic() - started
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(result['providers']['fast']['status'], 'ok')
+        self.assertEqual(result['providers']['slow']['status'], 'timeout')
+        self.assertEqual(len(result['flights']), 1)
+
+    def test_failing_provider_does_not_block_results(self):
+        """Test that provider errors are reported in metadata"""
+        def failing(*args):
+            raise RuntimeError('provider down')
+
+        providers = {'ok': self._providers(ok=0.01)['ok'], 'broken': failing}
+        with mock.patch.dict('booking.search_orchestrator.PROVIDERS', providers):
+            result = FlightSearchOrchestrator(providers=['ok', 'broken'], deadline=1.0).search('JFK', 'LAX', '2030-01-01')
+        self.assertEqual(result['providers']['broken']['status'], 'error')
+        self.assertEqual(len(result['flights']), 1)
+
+    def test_deadline_bounds_search_without_results(self):
+        """Test that the global deadline applies when no provider answers"""
+        providers = self._providers(slow=1.0)
+        with mock.patch.dict('booking.search_orchestrator.PROVIDERS', providers):
+            started = time.monotonic()
+            result = FlightSearchOrchestrator(providers=['slow'], deadline=0.2).search('JFK', 'LAX', '2030-01-01')
+        self.assertLess(time.monotonic() - started, 0.8)
+        self.assertEqual(result['flights'], [])
+        self.assertEqual(result['providers']['slow']['status'], 'timeout')
+
+    def test_tracking_results_do_not_cut_off_offers(self):
+        """Test that unpriced tracking data arriving first does not start the grace period"""
+        def tracking(*args):
+            return [make_flight('TR1', '2030-01-01T07:00')]
+
+        providers = {'opensky': tracking, 'offers': self._providers(offers=0.3)['offers']}
+        with mock.patch.dict('booking.search_orchestrator.PROVIDERS', providers):
+            orchestrator = FlightSearchOrchestrator(providers=['opensky', 'offers'], deadline=1.5, grace_period=0.05)
+            result = orchestrator.search('JFK', 'LAX', '2030-01-01')
+        self.assertEqual(result['providers']['offers']['status'], 'ok')
+        self.assertEqual(result['flights'][0]['price'], 100.0)
+
+    def test_hanging_provider_is_capped(self):
+        """Test that a provider with too many calls in flight is skipped instead of taking more workers"""
+        release = threading.Event()
+
+        def hanging(*args):
+            release.wait(5)
+            return []
+
+        with mock.patch.dict('booking.search_orchestrator.PROVIDERS', {'hanging': hanging}):
+            orchestrator = FlightSearchOrchestrator(providers=['hanging'], deadline=0.05, max_in_flight=2)
+            try:
+                statuses = [orchestrator.search('JFK', 'LAX', '2030-01-01')['providers']['hanging']['status']
+                            for _ in range(3)]
+            finally:
+                release.set()
+        self.assertEqual(statuses, ['timeout', 'timeout', 'saturated'])
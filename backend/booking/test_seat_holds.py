@@ -0,0 +1,152 @@
+"""
+Unit tests for seat holds and the expiry sweeper
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from booking.models import Booking, CustomUser, Flight, SeatHold
+from booking.seat_holds import convert_hold, hold_metrics, place_hold, release_expired_holds
+from booking.seat_inventory import open_cabin, reserve_seats, seats_left
+from booking.tasks import release_expired_seat_holds
+
+
+class SeatHoldTest(TestCase):
+    """Test cases for placing, converting and sweeping seat holds"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username='holder', password='testpass123', status='approved')
+        self.flight = Flight.objects.create(
+            flight_number='SH100', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+        open_cabin(self.flight, 'ECONOMY', 10)
+        open_cabin(self.flight, 'BUSINESS', 10)
+        self.now = datetime(2030, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+    def hold(self, cabin='ECONOMY', now=None):
+        reserve_seats(self.flight.id, cabin)
+        booking = Booking.objects.create(user=self.user, flight=self.flight, cabin=cabin)
+        return place_hold(booking, now=now or self.now)
+
+    @override_settings(SEAT_HOLD_TTL=600)
+    def test_hold_expiry(self):
+        """Test that a hold expires SEAT_HOLD_TTL seconds after it is placed"""
+        hold = self.hold()
+        self.assertEqual(hold.expires_at, self.now + timedelta(seconds=600))
+
+    def test_release_expired(self):
+        """Test that expired holds return their seats and cancel their bookings"""
+        for cabin in ('ECONOMY', 'ECONOMY', 'BUSINESS'):
+            self.hold(cabin)
+        fresh = self.hold(now=self.now + timedelta(hours=1))
+        released = release_expired_holds(now=self.now + timedelta(minutes=20))
+        self.assertEqual(released, 3)
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 9, 'BUSINESS': 10})
+        self.assertEqual(Booking.objects.filter(status='cancelled').count(), 3)
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, SeatHold.ACTIVE)
+
+    def test_release_in_chunks(self):
+        """Test that each chunk is released with a fixed number of statements"""
+        for _ in range(5):
+            self.hold()
+        later = self.now + timedelta(hours=1)
+        # Per chunk: select ids, claim, read back, counters, bookings, plus a savepoint pair
+        with self.assertNumQueries(3 * 7):
+            self.assertEqual(release_expired_holds(now=later, batch_size=2), 5)
+        self.assertEqual(seats_left(self.flight.id)['ECONOMY'], 10)
+
+    def test_converted_hold_is_kept(self):
+        """Test that a paid booking's seat is not released by the sweeper"""
+        hold = self.hold()
+        self.assertTrue(convert_hold(hold.booking))
+        self.assertEqual(release_expired_holds(now=self.now + timedelta(hours=1)), 0)
+        self.assertEqual(seats_left(self.flight.id)['ECONOMY'], 9)
+
+    def test_payment_after_expiry_retakes_seat(self):
+        """Test that converting a released hold takes the seat again"""
+        hold = self.hold()
+        release_expired_holds(now=self.now + timedelta(hours=1))
+        self.assertTrue(convert_hold(hold.booking))
+        hold.refresh_from_db()
+        self.assertEqual(hold.status, SeatHold.CONVERTED)
+        self.assertEqual(seats_left(self.flight.id)['ECONOMY'], 9)
+
+    def test_metrics_per_minute(self):
+        """Test that created, released and converted holds are counted per minute"""
+        for _ in range(3):
+            self.hold()
+        convert_hold(Booking.objects.first())
+        release_expired_holds(now=self.now + timedelta(hours=1))
+        totals = {name: sum(row[name] for row in hold_metrics.per_minute(5)) for name in hold_metrics.counters}
+        self.assertEqual(totals, {'created': 3, 'released': 2, 'converted': 1})
+
+    def test_beat_task(self):
+        """Test that the beat task runs the sweeper"""
+        with patch('booking.seat_holds.release_expired_holds', return_value=4) as sweep:
+            self.assertEqual(release_expired_seat_holds(), 4)
+        sweep.assert_called_once_with()
+
+
+class SeatHoldViewTest(TestCase):
+    """Test cases for seat holds through the booking endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='payer', password='testpass123', status='approved')
+        self.client.force_authenticate(self.user)
+        self.flight = Flight.objects.create(
+            flight_number='SH200', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+        open_cabin(self.flight, 'ECONOMY', 1)
+
+    def test_pending_booking_is_held(self):
+        """Test that an unpaid booking on a tracked flight gets a hold"""
+        response = self.client.post('/api/bookings/', {'flight_id': self.flight.id}, format='json')
+        self.assertTrue(SeatHold.objects.filter(booking_id=response.data['id'], status=SeatHold.ACTIVE).exists())
+
+    def test_delete_after_expiry(self):
+        """Test that deleting a booking whose hold expired does not return the seat twice"""
+        response = self.client.post('/api/bookings/', {'flight_id': self.flight.id}, format='json')
+        release_expired_holds(now=datetime.now(timezone.utc) + timedelta(days=1))
+        other = CustomUser.objects.create_user(username='second', password='testpass123', status='approved')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.post('/api/bookings/', {'flight_id': self.flight.id}, format='json').status_code, 201)
+        self.client.force_authenticate(self.user)
+        self.client.delete(f"/api/bookings/{response.data['id']}/")
+        self.assertEqual(seats_left(self.flight.id)['ECONOMY'], 0)
+
+    def test_move_to_tracked_flight_places_hold(self):
+        """Test that moving a pending booking from an untracked flight to a tracked one holds the new seat"""
+        untracked = Flight.objects.create(
+            flight_number='SH300', departure='London', arrival='Rome',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+        response = self.client.post('/api/bookings/', {'flight_id': untracked.id}, format='json')
+        self.assertFalse(SeatHold.objects.exists())
+        response = self.client.patch(f"/api/bookings/{response.data['id']}/", {'flight_id': self.flight.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+        hold = SeatHold.objects.get(booking_id=response.data['id'])
+        self.assertEqual((hold.flight_id, hold.status), (self.flight.id, SeatHold.ACTIVE))
+        self.assertEqual(seats_left(self.flight.id)['ECONOMY'], 0)
+        release_expired_holds(now=datetime.now(timezone.utc) + timedelta(days=1))
+        self.assertEqual(seats_left(self.flight.id)['ECONOMY'], 1)
+
+    def test_move_to_untracked_flight_drops_hold(self):
+        """Test that moving a held booking to an untracked flight gives the seat back and drops the hold"""
+        untracked = Flight.objects.create(
+            flight_number='SH400', departure='London', arrival='Rome',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+        response = self.client.post('/api/bookings/', {'flight_id': self.flight.id}, format='json')
+        response = self.client.patch(f"/api/bookings/{response.data['id']}/", {'flight_id': untracked.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(seats_left(self.flight.id)['ECONOMY'], 1)
+        self.assertFalse(SeatHold.objects.filter(booking_id=response.data['id']).exists())
@@ -0,0 +1,99 @@
+"""
+Unit tests for seat inventory counters and booking reservations
+"""
+from datetime import datetime, timezone
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from booking.exceptions import SeatsUnavailableException
+from booking.models import Booking, CustomUser, Flight, SeatInventory
+from booking.seat_inventory import open_cabin, release_seats, reserve_seats, seats_left
+
+
+class SeatInventoryTest(TestCase):
+    """Test cases for the conditional seat counter updates"""
+
+    def setUp(self):
+        self.flight = Flight.objects.create(
+            flight_number='SI100', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+
+    def test_reserve_until_sold_out(self):
+        """Test that reservations stop at zero instead of overselling"""
+        open_cabin(self.flight, 'ECONOMY', 2)
+        self.assertTrue(reserve_seats(self.flight.id, 'ECONOMY'))
+        self.assertTrue(reserve_seats(self.flight.id, 'ECONOMY'))
+        with self.assertRaises(SeatsUnavailableException):
+            reserve_seats(self.flight.id, 'ECONOMY')
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 0})
+
+    def test_reserve_more_than_left(self):
+        """Test that a multi-seat reservation is all or nothing"""
+        open_cabin(self.flight, 'BUSINESS', 3)
+        with self.assertRaises(SeatsUnavailableException):
+            reserve_seats(self.flight.id, 'BUSINESS', seats=4)
+        self.assertEqual(seats_left(self.flight.id), {'BUSINESS': 3})
+
+    def test_cabin_not_offered(self):
+        """Test that a tracked flight refuses cabins it has no counter for"""
+        open_cabin(self.flight, 'ECONOMY', 10)
+        with self.assertRaises(SeatsUnavailableException):
+            reserve_seats(self.flight.id, 'FIRST')
+
+    def test_untracked_flight(self):
+        """Test that flights without inventory are not limited"""
+        self.assertFalse(reserve_seats(self.flight.id, 'ECONOMY'))
+        self.assertFalse(SeatInventory.objects.exists())
+
+    def test_release_capped_at_total(self):
+        """Test that releasing never raises seats_left above seats_total"""
+        open_cabin(self.flight, 'ECONOMY', 1)
+        reserve_seats(self.flight.id, 'ECONOMY')
+        self.assertTrue(release_seats(self.flight.id, 'ECONOMY'))
+        self.assertFalse(release_seats(self.flight.id, 'ECONOMY'))
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 1})
+
+
+class SeatReservationViewTest(TestCase):
+    """Test cases for seat reservation through the booking endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='seater', password='testpass123', status='approved')
+        self.client.force_authenticate(self.user)
+        self.flight = Flight.objects.create(
+            flight_number='SI200', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+        open_cabin(self.flight, 'ECONOMY', 1)
+        open_cabin(self.flight, 'BUSINESS', 1)
+
+    def test_booking_takes_seat(self):
+        """Test that creating a booking decrements the cabin's counter"""
+        response = self.client.post('/api/bookings/', {'flight_id': self.flight.id, 'cabin': 'BUSINESS'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['cabin'], 'BUSINESS')
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 1, 'BUSINESS': 0})
+
+    def test_sold_out_returns_conflict(self):
+        """Test that booking a sold-out cabin returns 409 and creates nothing"""
+        self.client.post('/api/bookings/', {'flight_id': self.flight.id}, format='json')
+        response = self.client.post('/api/bookings/', {'flight_id': self.flight.id}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['detail'].code, 'seats_unavailable')
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_delete_releases_seat(self):
+        """Test that deleting a booking gives its seat back"""
+        response = self.client.post('/api/bookings/', {'flight_id': self.flight.id}, format='json')
+        self.client.delete(f"/api/bookings/{response.data['id']}/")
+        self.assertEqual(seats_left(self.flight.id)['ECONOMY'], 1)
+
+    def test_change_cabin_moves_seat(self):
+        """Test that changing cabin takes the new seat and releases the old one"""
+        response = self.client.post('/api/bookings/', {'flight_id': self.flight.id}, format='json')
+        response = self.client.patch(f"/api/bookings/{response.data['id']}/", {'cabin': 'BUSINESS'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 1, 'BUSINESS': 0})
@@ -0,0 +1,126 @@
+"""
+Unit tests for sharded seat counters, the rebalancer and the reconciler
+"""
+from datetime import datetime, timezone
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from booking.exceptions import SeatsUnavailableException
+from booking.models import Booking, CustomUser, Flight, SeatInventory, SeatShard
+from booking.seat_inventory import open_cabin, release_seats, reserve_seats, seats_left
+from booking.seat_shards import (
+    counters, disable_sharding, enable_sharding, rebalance_cabin, reconcile_cabin, reconcile_sharded_flights,
+)
+
+
+class SeatShardTest(TestCase):
+    """Test cases for sharded seat counters"""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='sharder', password='testpass123', status='approved')
+        self.flight = Flight.objects.create(
+            flight_number='SS100', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+        open_cabin(self.flight, 'ECONOMY', 20)
+
+    def book(self, seats=1):
+        reserve_seats(self.flight.id, 'ECONOMY', seats, shards=self.flight.seat_shards)
+        return Booking.objects.create(user=self.user, flight=self.flight)
+
+    def test_enable_splits_seats(self):
+        """Test that sharding spreads the unsold seats evenly and keeps the total"""
+        enable_sharding(self.flight, shards=4)
+        self.assertEqual(self.flight.seat_shards, 4)
+        self.assertEqual(counters(self.flight.id, 'ECONOMY'), {0: 5, 1: 5, 2: 5, 3: 5})
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 20})
+
+    def test_sell_out_without_oversell(self):
+        """Test that every seat can be sold across sub-counters and no more"""
+        enable_sharding(self.flight, shards=4)
+        for _ in range(20):
+            self.book()
+        with self.assertRaises(SeatsUnavailableException):
+            self.book()
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 0})
+
+    def test_multi_seat_spans_sub_counters(self):
+        """Test that a booking larger than any sub-counter takes seats from several"""
+        enable_sharding(self.flight, shards=4)
+        self.book(seats=7)
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 13})
+
+    def test_unsharded_caller(self):
+        """Test that a caller unaware of sharding still books from the other sub-counters"""
+        enable_sharding(self.flight, shards=4)
+        for _ in range(6):
+            reserve_seats(self.flight.id, 'ECONOMY')
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 14})
+
+    def test_release_returns_seat(self):
+        """Test that releasing on a sharded flight returns the seat to some sub-counter"""
+        enable_sharding(self.flight, shards=4)
+        self.book()
+        release_seats(self.flight.id, 'ECONOMY', shards=4)
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 20})
+
+    def test_rebalance_refills_drained(self):
+        """Test that the rebalancer evens out sub-counters without changing the total"""
+        enable_sharding(self.flight, shards=4)
+        SeatShard.objects.filter(flight=self.flight, index=1).update(seats_left=0)
+        SeatInventory.objects.filter(flight=self.flight).update(seats_left=10)
+        moved = rebalance_cabin(self.flight.id, 'ECONOMY')
+        self.assertGreater(moved, 0)
+        self.assertEqual(counters(self.flight.id, 'ECONOMY'), {0: 5, 1: 5, 2: 5, 3: 5})
+
+    def test_rebalance_skips_balanced(self):
+        """Test that balanced sub-counters are not rewritten"""
+        enable_sharding(self.flight, shards=4)
+        with self.assertNumQueries(2):
+            self.assertEqual(rebalance_cabin(self.flight.id, 'ECONOMY'), 0)
+
+    def test_reconcile_restores_deleted_booking(self):
+        """Test that the reconciler returns seats of bookings deleted without a release"""
+        enable_sharding(self.flight, shards=4)
+        for _ in range(3):
+            self.book()
+        Booking.objects.first().delete()
+        self.assertEqual(reconcile_sharded_flights(), 1)
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 18})
+        self.assertEqual(reconcile_cabin(self.flight.id, 'ECONOMY'), 0)
+
+    def test_reconcile_removes_surplus(self):
+        """Test that the reconciler takes back seats released twice"""
+        enable_sharding(self.flight, shards=4)
+        self.book()
+        release_seats(self.flight.id, 'ECONOMY', shards=4)
+        self.assertEqual(reconcile_cabin(self.flight.id, 'ECONOMY'), -1)
+        self.assertEqual(seats_left(self.flight.id), {'ECONOMY': 19})
+
+    def test_disable_merges(self):
+        """Test that going back to one counter folds the sub-counters into it"""
+        enable_sharding(self.flight, shards=4)
+        self.book()
+        disable_sharding(self.flight)
+        self.assertFalse(SeatShard.objects.exists())
+        self.assertEqual(SeatInventory.objects.get(flight=self.flight).seats_left, 19)
+
+
+class ShardedBookingViewTest(TestCase):
+    """Test cases for booking a sharded flight through the API"""
+
+    def test_booking_sharded_flight(self):
+        """Test that the booking endpoint uses the flight's sub-counters"""
+        user = CustomUser.objects.create_user(username='sharded', password='testpass123', status='approved')
+        flight = Flight.objects.create(
+            flight_number='SS200', departure='London', arrival='Paris',
+            date=datetime(2031, 1, 1, tzinfo=timezone.utc), price=100,
+        )
+        open_cabin(flight, 'ECONOMY', 2)
+        enable_sharding(flight, shards=2)
+        client = APIClient()
+        client.force_authenticate(user)
+        statuses = [client.post('/api/bookings/', {'flight_id': flight.id}, format='json').status_code for _ in range(3)]
+        self.assertEqual(statuses, [201, 201, 409])
+        self.assertEqual(seats_left(flight.id), {'ECONOMY': 0})
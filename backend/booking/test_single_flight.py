@@ -0,0 +1,187 @@
+"""
+Concurrency tests for single-flight coalescing of provider requests
+"""
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import urlparse
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from booking.amadeus_client import AmadeusClient
+from booking.amadeus_service import AmadeusService
+from booking.single_flight import SingleFlight
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """Minimal Amadeus stand-in that counts requests per path"""
+
+    calls = Counter()
+    lock = threading.Lock()
+    delay = 0.3
+
+    def _respond(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        with self.lock:
+            self.calls[path] += 1
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self._respond({'access_token': 'stub-token', 'expires_in': 1799})
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        with self.lock:
+            self.calls[path] += 1
+        time.sleep(self.delay)
+        self._respond({'data': [{'id': '1', 'path': path}]})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SingleFlightConcurrencyTest(SimpleTestCase):
+    """Test that N parallel identical requests cause exactly one upstream call"""
+
+    parallel_requests = 20
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubProviderHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        StubProviderHandler.calls.clear()
+
+    def _run_in_parallel(self, call):
+        barrier = threading.Barrier(self.parallel_requests)
+
+        def worker():
+            barrier.wait()
+            return call()
+
+        with ThreadPoolExecutor(max_workers=self.parallel_requests) as executor:
+            futures = [executor.submit(worker) for _ in range(self.parallel_requests)]
+            return [future.result() for future in futures]
+
+    def test_parallel_flight_searches_call_upstream_once(self):
+        """Test that identical flight searches are coalesced"""
+        with override_settings(AMADEUS_BASE_URL=self.base_url):
+            results = self._run_in_parallel(
+                lambda: AmadeusService().search_flights('JFK', 'LAX', '2030-01-01')
+            )
+        self.assertEqual(StubProviderHandler.calls['/v2/shopping/flight-offers'], 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertIsNotNone(results[0])
+
+    def test_parallel_client_flight_searches_call_upstream_once(self):
+        """Test that identical flight searches through the client used by the search view are coalesced"""
+        with override_settings(AMADEUS_BASE_URL=self.base_url):
+            results = self._run_in_parallel(
+                lambda: AmadeusClient().search_flights('JFK', 'LAX', '2030-01-01', travel_class='ECONOMY')
+            )
+        self.assertEqual(StubProviderHandler.calls['/v2/shopping/flight-offers'], 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertIsNotNone(results[0])
+
+    def test_parallel_airport_searches_call_upstream_once(self):
+        """Test that identical airport searches are coalesced"""
+        with override_settings(AMADEUS_BASE_URL=self.base_url):
+            results = self._run_in_parallel(lambda: AmadeusService().search_airports('LON'))
+        self.assertEqual(StubProviderHandler.calls['/v1/reference-data/locations'], 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_parallel_hotel_searches_call_upstream_once(self):
+        """Test that identical hotel searches are coalesced"""
+        with override_settings(AMADEUS_BASE_URL=self.base_url):
+            results = self._run_in_parallel(
+                lambda: AmadeusClient().search_hotels('PAR', '2030-01-01', '2030-01-03')
+            )
+        self.assertEqual(StubProviderHandler.calls['/v2/shopping/hotel-offers'], 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_different_queries_are_not_coalesced(self):
+        """Test that distinct searches each reach the provider"""
+        with override_settings(AMADEUS_BASE_URL=self.base_url):
+            service = AmadeusService()
+            service.search_flights('JFK', 'LAX', '2030-01-01')
+            service.search_flights('JFK', 'SFO', '2030-01-01')
+        self.assertEqual(StubProviderHandler.calls['/v2/shopping/flight-offers'], 2)
+
+
+class SingleFlightLeaderTest(SimpleTestCase):
+    """Test cases for how followers wait on and share the leader's outcome"""
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(PROVIDER_HTTP_CONNECT_TIMEOUT=3, PROVIDER_HTTP_READ_TIMEOUT=30)
+    def test_wait_covers_provider_timeout(self):
+        """Test that followers wait as long as the slowest provider call can take"""
+        flight = SingleFlight()
+        self.assertEqual(flight.lock_ttl, 35)
+        self.assertEqual(flight.wait_timeout, flight.lock_ttl)
+
+    def test_followers_receive_leader_exception(self):
+        """Test that a failing leader's exception is re-raised by every follower without further calls"""
+        flight = SingleFlight(poll_interval=0.01)
+        calls = Counter()
+        barrier = threading.Barrier(5)
+
+        def failing():
+            calls['upstream'] += 1
+            time.sleep(0.2)
+            raise ValueError('provider down')
+
+        def worker():
+            barrier.wait()
+            try:
+                flight.do('single_flight:test:error', failing)
+            except ValueError as exc:
+                return str(exc)
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(lambda _: worker(), range(5)))
+        self.assertEqual(calls['upstream'], 1)
+        self.assertEqual(results, ['provider down'] * 5)
+
+    def test_follower_rereads_result_after_leader_releases(self):
+        """Test that a follower seeing the lock gone takes the result published just before, not the provider"""
+        flight = SingleFlight(poll_interval=0.01)
+        key = 'single_flight:test:release'
+        cache.add(f"{key}:lock", 'leader', 30)
+        real_get = cache.get
+
+        def get(name, *args, **kwargs):
+            if name == f"{key}:lock":
+                # The leader publishes and releases between the follower's result and lock reads
+                cache.set(f"{key}:result", {'value': 'shared'}, 5)
+                cache.delete(name)
+            return real_get(name, *args, **kwargs)
+
+        upstream = mock.Mock(return_value='duplicate')
+        with mock.patch('booking.single_flight.cache.get', side_effect=get):
+            self.assertEqual(flight.do(key, upstream), 'shared')
+        upstream.assert_not_called()
@@ -0,0 +1,61 @@
+"""
+Unit tests for the unit-sphere KD-tree airport index
+"""
+import random
+
+from django.test import SimpleTestCase
+
+from booking.iata_utils import IATA_INFO, calculate_distance, find_nearby_airports, get_nearest_airport
+from booking.spatial_index import AirportSpatialIndex
+
+
+def scan_nearby(airports, latitude, longitude, limit, max_distance):
+    """Reference implementation: full haversine scan as find_nearby_airports used to do."""
+    found = []
+    for code, info in airports.items():
+        distance = calculate_distance(latitude, longitude, info['lat'], info['lon'])
+        if max_distance is None or distance <= max_distance:
+            found.append((distance, code))
+    found.sort(key=lambda item: item[0])
+    return found[:limit] if limit is not None else found
+
+
+class AirportSpatialIndexTest(SimpleTestCase):
+    """Test cases for AirportSpatialIndex"""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.airports = {
+            f"A{i:05d}": {'lat': rng.uniform(-90, 90), 'lon': rng.uniform(-180, 180)} for i in range(3000)
+        }
+        self.index = AirportSpatialIndex(self.airports, calculate_distance)
+        self.queries = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(50)]
+        # Poles and the antimeridian are where planar indexes usually go wrong
+        self.queries += [(89.9, 0), (-89.9, 45), (0.5, 179.99), (-12, -179.99)]
+
+    def _codes(self, results):
+        return [(round(distance, 6), code) for distance, code, *_ in results]
+
+    def test_k_nearest_matches_scan(self):
+        """Test that k-nearest queries return exactly what a full scan returns"""
+        for latitude, longitude in self.queries:
+            expected = scan_nearby(self.airports, latitude, longitude, 5, None)
+            actual = self.index.nearest(latitude, longitude, limit=5)
+            self.assertEqual(self._codes(actual), self._codes(expected))
+
+    def test_radius_query_matches_scan(self):
+        """Test that radius queries return every airport within the distance"""
+        for latitude, longitude in self.queries:
+            expected = scan_nearby(self.airports, latitude, longitude, None, 800)
+            actual = self.index.nearest(latitude, longitude, limit=None, max_distance=800)
+            self.assertEqual(self._codes(actual), self._codes(expected))
+
+    def test_find_nearby_airports_unchanged(self):
+        """Test that the IATA_INFO helpers give the same answers as before"""
+        for latitude, longitude in [(51.5, -0.12), (40.7, -74.0), (35.6, 139.7), (-33.9, 151.2), (10.0, -30.0)]:
+            expected = scan_nearby(IATA_INFO, latitude, longitude, 5, 500)
+            actual = find_nearby_airports(latitude, longitude)
+            self.assertEqual([a['iataCode'] for a in actual], [code for _, code in expected])
+            self.assertEqual([a['distance'] for a in actual], [round(d, 1) for d, _ in expected])
+        self.assertEqual(get_nearest_airport(51.47, -0.45)['iataCode'], 'LHR')
+        self.assertIsNone(get_nearest_airport(10.0, -30.0))
@@ -0,0 +1,81 @@
+"""
+Unit tests for streamed admin list and export responses
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from booking.models import Booking, CustomUser, Flight
+from booking.serializers import AdminFlightSerializer
+from booking.streaming import encode_rows, iter_serialized
+
+
+class StreamingResponseTest(TestCase):
+    """Test cases for StreamingListMixin and AdminBookingExportView"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = CustomUser.objects.create_user(
+            username='admin', password='testpass123', status='approved', is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        start = datetime(2031, 1, 1, tzinfo=timezone.utc)
+        Flight.objects.bulk_create([
+            Flight(flight_number=f"ST{i}", departure='London', arrival='Paris',
+                   date=start + timedelta(hours=i), price='100.50')
+            for i in range(7)
+        ])
+        flights = list(Flight.objects.order_by('id'))
+        Booking.objects.bulk_create([
+            Booking(user=self.admin, flight=flight, payment_status='paid' if i % 2 else 'pending')
+            for i, flight in enumerate(flights)
+        ])
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    @override_settings(STREAMING_CHUNK_SIZE=3)
+    def test_admin_flights_json_array(self):
+        """Test that a streamed array holds every flight, matching the paginated rows"""
+        response = self.client.get('/api/admin/flights/', {'stream': 'json'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        streamed = json.loads(self.read(response))
+        paginated = json.loads(json.dumps(self.client.get('/api/admin/flights/').data['results']))
+        self.assertEqual(streamed, paginated)
+
+    def test_admin_flights_ndjson(self):
+        """Test that NDJSON output has one object per line"""
+        response = self.client.get('/api/admin/flights/', {'stream': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = self.read(response).splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertEqual(json.loads(lines[0])['flight_number'], 'ST6')
+
+    def test_unknown_format_rejected(self):
+        """Test that an unsupported stream format is a 400"""
+        self.assertEqual(self.client.get('/api/admin/flights/', {'stream': 'xml'}).status_code, 400)
+
+    def test_booking_export(self):
+        """Test the bookings export, filtered by payment status"""
+        response = self.client.get('/api/admin/bookings/export/', {'payment_status': 'paid'})
+        self.assertIn('attachment; filename="bookings.json"', response['Content-Disposition'])
+        exported = json.loads(self.read(response))
+        self.assertEqual(len(exported), 3)
+        self.assertEqual({row['payment_status'] for row in exported}, {'paid'})
+        self.assertEqual(exported[0]['flight']['flightNumber'], 'ST1')
+
+    def test_booking_export_requires_admin(self):
+        """Test that regular users cannot export bookings"""
+        user = CustomUser.objects.create_user(username='regular', password='testpass123', status='approved')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get('/api/admin/bookings/export/').status_code, 403)
+
+    def test_serializes_lazily(self):
+        """Test that rows are serialized as they are read and empty results are a valid array"""
+        rows = iter_serialized(Flight.objects.order_by('id'), AdminFlightSerializer, size=2)
+        self.assertEqual(next(rows)['flight_number'], 'ST0')
+        self.assertEqual(len(list(rows)), 6)
+        self.assertEqual(b''.join(encode_rows(iter([]))), b'[]')
@@ -25,6 +25,7 @@ urlpatterns = [
     path('flights/', views.FlightListView.as_view(), name='flight-list'),
     path('flights/<int:pk>/', views.FlightDetailView.as_view(), name='flight-detail'),
     path('bookings/', views.BookingListView.as_view(), name='booking-list'),
+    path('bookings/bulk/', views.BookingBulkCreateView.as_view(), name='booking-bulk-create'),
     path('bookings/<int:pk>/', views.BookingDetailView.as_view(), name='booking-detail'),
     # Admin URLs
     path('admin/users/pending/', views.AdminUserListView.as_view(), name='admin-user-pending'),
@@ -35,6 +36,11 @@ urlpatterns = [
     path('admin/flights/<int:pk>/status/', views.AdminFlightStatusUpdateView.as_view(), name='admin-flight-status'),
     path('admin/flights/<int:pk>/', views.AdminFlightDetailView.as_view(), name='admin-flight-detail'),
     path('admin/booking-stats/', views.AdminBookingStatsView.as_view(), name='admin-booking-stats'),
+    path('admin/bookings/export/', views.AdminBookingExportView.as_view(), name='admin-booking-export'),
+    path('admin/search-cache/stats/', views.AdminSearchCacheStatsView.as_view(), name='admin-search-cache-stats'),
+    path('admin/seat-holds/stats/', views.AdminSeatHoldStatsView.as_view(), name='admin-seat-hold-stats'),
+    path('admin/providers/health/', views.AdminProviderHealthView.as_view(), name='admin-provider-health'),
+    path('admin/providers/quota/', views.AdminProviderQuotaView.as_view(), name='admin-provider-quota'),
     # Stripe Payment URLs
     path('payments/create-intent/', CreatePaymentIntentView.as_view(), name='create-payment-intent'),
     path('payments/confirm/', PaymentIntentConfirmView.as_view(), name='confirm-payment'),
@@ -58,5 +64,6 @@ urlpatterns = [
     # GPS-based Airport Search endpoints
     path('airports/nearby/', views_gps.NearbyAirportsView.as_view(), name='nearby-airports'),
     path('airports/nearest/', views_gps.NearestAirportView.as_view(), name='nearest-airport'),
+    path('airports/nearest/batch/', views_gps.NearestAirportBatchView.as_view(), name='nearest-airport-batch'),
 ]
 
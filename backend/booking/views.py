@@ -7,28 +7,47 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 from django.contrib.auth import authenticate
-from django.db import models
-from django.db.models import Q
-from datetime import date
-from .models import CustomUser, Flight, Booking
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+from datetime import date, datetime, time, timedelta
+from .models import CustomUser, Flight, Booking, SeatHold
 from .serializers import (
-    CustomUserSerializer, FlightSerializer, BookingSerializer, 
+    CustomUserSerializer, FlightSerializer, BookingSerializer, BulkBookingSerializer,
     AdminUserSerializer, AdminFlightSerializer,
     FlightSearchSerializer, CreateOrderSerializer, GetOrderSerializer
 )
 from .aviationstack_client import AviationStackClient
-from .airlabs_client import AirLabsClient
 from .amadeus_client import AmadeusClient
 from .amadeus_service import AmadeusService
 from .permissions import (
     IsApprovedUser, IsAdminOrApprovedUser, IPAddressPermission, BookingRateLimitPermission,
     FlightSearchThrottle, BookingThrottle, AdminThrottle
 )
-from .iata_utils import get_iata_code, get_city_from_iata, is_valid_iata, get_airport_info, find_nearby_airports, get_nearest_airport
+from .airport_snapshot import get_snapshot
+from .iata_utils import get_iata_code, get_iata_code_fuzzy, get_city_from_iata, is_valid_iata, get_airport_info, find_nearby_airports, get_nearest_airport, calculate_distance
+from .geo_cache import hotel_geocode_cache, is_cacheable, nearby_airports_cache
+from .search_cache import flight_search_cache, MISS
+from .search_orchestrator import FlightSearchOrchestrator, server_timing_header
+from .flight_mappers import map_amadeus_flights
+from .circuit_breaker import PROVIDER_ENDPOINTS, get_breaker
+from .rate_limiter import get_rate_limiter, provider_api_keys
+from .airport_autocomplete import airport_autocomplete, request_enrichment
+from .route_matrix import get_route_matrix
+from .streaming import StreamingListMixin, streaming_response
+from .fast_serializers import FastBookingSerializer, FastFlightSerializer, FastListMixin
+from .booking_stats import get_booking_stats
+from .seat_holds import hold_metrics
+from .seat_inventory import release_seats
 import logging
+import math
 
 logger = logging.getLogger(__name__)
 
+TRAVEL_CLASSES = ('ECONOMY', 'PREMIUM_ECONOMY', 'BUSINESS', 'FIRST')
+# Radius of hotel searches by coordinates, in km
+HOTEL_SEARCH_RADIUS_KM = 50
+
 class HomeView(APIView):
     permission_classes = [AllowAny]
 
@@ -94,41 +113,70 @@ class LogoutView(APIView):
         except Exception as e:
             return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
 
-class FlightListView(generics.ListCreateAPIView):
+class FlightListView(FastListMixin, generics.ListCreateAPIView):
     queryset = Flight.objects.all()
     serializer_class = FlightSerializer
+    fast_serializer_class = FastFlightSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-date', '-id')
 
 class FlightDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Flight.objects.all()
     serializer_class = FlightSerializer
     permission_classes = [IsAuthenticated]
 
-class BookingListView(generics.ListCreateAPIView):
+class BookingListView(FastListMixin, generics.ListCreateAPIView):
     serializer_class = BookingSerializer
+    fast_serializer_class = FastBookingSerializer
     permission_classes = [IsAuthenticated, IsApprovedUser, BookingRateLimitPermission]
     throttle_classes = [BookingThrottle]
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
-        return Booking.objects.filter(user=self.request.user)
+        return Booking.objects.filter(user=self.request.user).select_related('user', 'flight')
 
     def perform_create(self, serializer):
         if self.request.user.status != 'approved':
             raise PermissionDenied('Account is pending approval. You cannot make bookings until approved.')
         serializer.save(user=self.request.user)
 
+class BookingBulkCreateView(generics.GenericAPIView):
+    """Book up to nine passengers on one flight in a single request and transaction."""
+    serializer_class = BulkBookingSerializer
+    permission_classes = [IsAuthenticated, IsApprovedUser, BookingRateLimitPermission]
+    throttle_classes = [BookingThrottle]
+
+    def post(self, request):
+        if request.user.status != 'approved':
+            raise PermissionDenied('Account is pending approval. You cannot make bookings until approved.')
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        bookings = serializer.save(user=request.user)
+        return Response({
+            'group_reference': bookings[0].group_reference,
+            'bookings': BookingSerializer(bookings, many=True, context=self.get_serializer_context()).data,
+        }, status=status.HTTP_201_CREATED)
+
 class BookingDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Booking.objects.filter(user=self.request.user)
+        return Booking.objects.filter(user=self.request.user).select_related('user', 'flight')
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # A cancelled booking's seat was already given back when its hold expired
+            if instance.status != 'cancelled':
+                release_seats(instance.flight_id, instance.cabin, shards=instance.flight.seat_shards)
+            instance.delete()
 
 # Admin Views
 class AdminUserListView(generics.ListAPIView):
     queryset = CustomUser.objects.filter(status='pending')
     serializer_class = AdminUserSerializer
     permission_classes = [IsAdminUser]
+    keyset_ordering = ('-date_joined', '-id')
 
     def get_queryset(self):
         queryset = CustomUser.objects.filter(status='pending')
@@ -142,10 +190,26 @@ class AdminUserDetailView(generics.RetrieveUpdateAPIView):
     serializer_class = AdminUserSerializer
     permission_classes = [IsAdminUser]
 
-class AdminFlightListView(generics.ListCreateAPIView):
+class AdminFlightListView(StreamingListMixin, generics.ListCreateAPIView):
     queryset = Flight.objects.all()
     serializer_class = AdminFlightSerializer
     permission_classes = [IsAdminUser]
+    keyset_ordering = ('-date', '-id')
+
+class AdminBookingExportView(APIView):
+    """Stream every booking as a JSON array (default) or NDJSON (?stream=ndjson)."""
+    permission_classes = [IsAdminUser]
+    throttle_classes = [AdminThrottle]
+
+    def get(self, request):
+        queryset = Booking.objects.select_related('user', 'flight').order_by('id')
+        payment_status = request.query_params.get('payment_status')
+        if payment_status:
+            queryset = queryset.filter(payment_status=payment_status)
+        return streaming_response(
+            queryset, BookingSerializer, request.query_params.get('stream', 'json'),
+            context={'request': request}, filename='bookings',
+        )
 
 class AdminFlightDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Flight.objects.all()
@@ -157,31 +221,103 @@ class AdminBookingStatsView(APIView):
     throttle_classes = [AdminThrottle]
 
     def get(self, request):
-        total_bookings = Booking.objects.count()
-        paid_bookings = Booking.objects.filter(payment_status='paid').count()
-        pending_bookings = Booking.objects.filter(payment_status='pending').count()
-        failed_bookings = Booking.objects.filter(payment_status='failed').count()
-        total_revenue = Booking.objects.filter(payment_status='paid').aggregate(
-            total=models.Sum('flight__price')
-        )['total'] or 0
-
-        stats = {
-            'total_bookings': total_bookings,
-            'paid_bookings': paid_bookings,
-            'pending_bookings': pending_bookings,
-            'failed_bookings': failed_bookings,
-            'total_revenue': total_revenue,
-        }
-        return Response(stats)
+        # One primary-key read of the materialized row, whatever the booking volume
+        return Response(get_booking_stats())
+
+class AdminSearchCacheStatsView(APIView):
+    """Expose flight search and geohash cache hit/miss counters for TTL and precision sizing."""
+    permission_classes = [IsAdminUser]
+    throttle_classes = [AdminThrottle]
+
+    def get(self, request):
+        counters = flight_search_cache.stats.snapshot()
+        lookups = counters['hits'] + counters['stale'] + counters['misses']
+        return Response({
+            'counters': counters,
+            'hit_ratio': round((counters['hits'] + counters['stale']) / lookups, 4) if lookups else None,
+            'fresh_ttl': flight_search_cache.fresh_ttl,
+            'stale_ttl': flight_search_cache.stale_ttl,
+            'geo': {
+                'nearby_airports': nearby_airports_cache.report(),
+                'hotels': hotel_geocode_cache.report(),
+            },
+        })
+
+    def delete(self, request):
+        flight_search_cache.stats.reset()
+        nearby_airports_cache.stats.reset()
+        hotel_geocode_cache.stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class AdminSeatHoldStatsView(APIView):
+    """Expose active seat holds and holds created, released and converted per minute."""
+    permission_classes = [IsAdminUser]
+    throttle_classes = [AdminThrottle]
+
+    def get(self, request):
+        try:
+            minutes = min(max(int(request.query_params.get('minutes', 15)), 1), 120)
+        except ValueError:
+            minutes = 15
+        active = SeatHold.objects.filter(status=SeatHold.ACTIVE)
+        series = hold_metrics.per_minute(minutes)
+        return Response({
+            'active': active.count(),
+            'expired_unreleased': active.filter(expires_at__lte=timezone.now()).count(),
+            'per_minute': series,
+            'totals': {name: sum(row[name] for row in series) for name in hold_metrics.counters},
+        })
+
+class AdminProviderHealthView(APIView):
+    """Expose circuit breaker state, error rate and latency per provider endpoint."""
+    permission_classes = [IsAdminUser]
+    throttle_classes = [AdminThrottle]
+
+    def get(self, request):
+        return Response({endpoint: get_breaker(endpoint).snapshot() for endpoint in PROVIDER_ENDPOINTS})
+
+class AdminProviderQuotaView(APIView):
+    """Expose remaining client-side rate limit tokens per provider for capacity planning."""
+    permission_classes = [IsAdminUser]
+    throttle_classes = [AdminThrottle]
+
+    def get(self, request):
+        return Response({
+            provider: get_rate_limiter(provider, api_key).remaining()
+            for provider, api_key in provider_api_keys()
+        })
 
 # Additional Views for API Specifications
 class TokenRefreshView(TokenRefreshView):
     permission_classes = [IsAuthenticated]
 
+def location_filter(code_field, text_field, location):
+    """
+    Build the filter for a typed search location.
+
+    A known city name or alias uses the indexed code column; rows whose text
+    did not resolve when saved have no code and are still matched by
+    substring. A three-letter input may be a code or the start of a city name
+    ('SAN' or 'San Francisco'), so a known code matches either way and an
+    unknown one ('Rom', 'New') only by substring, as does anything unresolved.
+    """
+    substring = Q(**{f'{text_field}__icontains': location})
+    code = get_iata_code(location)
+    if code is None:
+        return substring
+    if is_valid_iata(location):
+        if code not in get_snapshot():
+            return substring
+        return Q(**{code_field: code}) | substring
+    return Q(**{code_field: code}) | (Q(**{code_field: ''}) & substring)
+
+
 class FlightSearchView(generics.ListAPIView):
     serializer_class = FlightSerializer
     permission_classes = [AllowAny]
     throttle_classes = [AnonRateThrottle, FlightSearchThrottle]
+    # Provider results are plain lists, so the database fallback returns one too
+    pagination_class = None
 
     def get_queryset(self):
         queryset = Flight.objects.all()
@@ -189,16 +325,21 @@ class FlightSearchView(generics.ListAPIView):
         arrival = self.request.query_params.get('arrival')
         date_param = self.request.query_params.get('date')
 
+        # Resolved locations use the (origin_iata, destination_iata, date) index
+        # wherever that cannot miss rows the substring match used to find
         if departure:
-            queryset = queryset.filter(departure__icontains=departure)
+            queryset = queryset.filter(location_filter('origin_iata', 'departure', departure))
         if arrival:
-            queryset = queryset.filter(arrival__icontains=arrival)
+            queryset = queryset.filter(location_filter('destination_iata', 'arrival', arrival))
         if date_param:
             try:
                 search_date = date.fromisoformat(date_param)
-                queryset = queryset.filter(date__date=search_date)
             except ValueError:
                 pass  # Invalid date format, skip filtering
+            else:
+                # Half-open range instead of date__date so the index's date column is usable
+                day_start = timezone.make_aware(datetime.combine(search_date, time.min))
+                queryset = queryset.filter(date__gte=day_start, date__lt=day_start + timedelta(days=1))
 
         return queryset
 
@@ -224,18 +365,24 @@ class FlightSearchView(generics.ListAPIView):
             mock_flights = self._generate_mock_flights(departure, arrival, date_param)
             return Response(mock_flights)
         
-        # Try to get real flight data from Amadeus API
+        # Query all flight providers concurrently (served from the shared search cache when possible)
         if departure and arrival and date_param:
+            adults = self._get_adults(request)
+            travel_class = self._get_travel_class(request)
             try:
-                flights = self._search_amadeus_flights(departure, arrival, date_param)
-                if flights:
-                    return Response(flights)
-                # If API fails, fall back to mock data
-                logger.warning("Amadeus API returned no results, falling back to mock data")
+                result, cache_state = self._search_cached_flights(departure, arrival, date_param, adults, travel_class)
+                if result:
+                    response = Response(result['flights'])
+                    response['X-Search-Cache'] = cache_state
+                    if cache_state == MISS:
+                        response['Server-Timing'] = server_timing_header(result['providers'])
+                    return response
+                # If all providers fail, fall back to mock data
+                logger.warning("Flight providers returned no results, falling back to mock data")
                 mock_flights = self._generate_mock_flights(departure, arrival, date_param)
                 return Response(mock_flights)
             except Exception as e:
-                logger.error(f"Error calling Amadeus API: {e}")
+                logger.error(f"Error calling flight providers: {e}")
                 # Fall back to mock data on error
                 mock_flights = self._generate_mock_flights(departure, arrival, date_param)
                 return Response(mock_flights)
@@ -244,29 +391,53 @@ class FlightSearchView(generics.ListAPIView):
             return super().list(request, *args, **kwargs)
 
     def _get_iata_code(self, city_name):
-        """Convert city name to IATA code using the comprehensive IATA utility"""
-        return get_iata_code(city_name)
+        """Convert typed city name to IATA code for the provider search, forgiving typos"""
+        return get_iata_code_fuzzy(city_name)
 
-    def _search_amadeus_flights(self, departure, arrival, date_param):
-        """Search for flights using the Amadeus API"""
+    def _get_adults(self, request):
+        """Read the passenger count, clamped to the range accepted by Amadeus"""
         try:
-            origin_iata = self._get_iata_code(departure)
-            dest_iata = self._get_iata_code(arrival)
-            if not origin_iata or not dest_iata:
-                logger.warning(f"Could not convert to IATA: {departure} -> {origin_iata}, {arrival} -> {dest_iata}")
-                return None
-            amadeus_client = AmadeusClient()
-            flights = amadeus_client.search_flights(
-                origin=origin_iata,
-                destination=dest_iata,
-                departure_date=date_param
-            )
-            if flights:
-                return self._map_amadeus_flights(flights)
-            return None
-        except Exception as e:
-            logger.error(f"Amadeus API error: {e}")
-            raise
+            adults = int(request.query_params.get('passengers', 1))
+        except (TypeError, ValueError):
+            return 1
+        return min(max(adults, 1), 9)
+
+    def _get_travel_class(self, request):
+        """Read the travel class, defaulting to economy for unknown values"""
+        travel_class = request.query_params.get('class', 'ECONOMY').strip().upper()
+        if travel_class not in TRAVEL_CLASSES:
+            return 'ECONOMY'
+        return travel_class
+
+    def _search_cached_flights(self, departure, arrival, date_param, adults=1, travel_class='ECONOMY'):
+        """
+        Search all flight providers through the shared search cache.
+
+        The cache key is the canonical (origin IATA, destination IATA, date, adults, class)
+        tuple, so "New York" and "nyc" share one entry. Returns a (result, cache_state) tuple
+        where result is the orchestrator's {'flights', 'providers'} dict or None.
+        """
+        origin_iata = self._get_iata_code(departure)
+        dest_iata = self._get_iata_code(arrival)
+        if not origin_iata or not dest_iata:
+            logger.warning(f"Could not convert to IATA: {departure} -> {origin_iata}, {arrival} -> {dest_iata}")
+            return None, None
+        cache_key = flight_search_cache.make_key(origin_iata, dest_iata, date_param, adults, travel_class)
+        return flight_search_cache.get_or_fetch(
+            cache_key,
+            lambda: self._search_providers(origin_iata, dest_iata, date_param, adults, travel_class)
+        )
+
+    def _search_providers(self, origin_iata, dest_iata, date_param, adults=1, travel_class='ECONOMY'):
+        """Fan the search out to every configured provider, returning None when nothing was found"""
+        result = FlightSearchOrchestrator().search(
+            origin=origin_iata,
+            destination=dest_iata,
+            departure_date=date_param,
+            adults=adults,
+            travel_class=travel_class
+        )
+        return result if result['flights'] else None
 
     def _generate_mock_flights(self, departure, arrival, date_param):
         """Generate mock flight data for testing purposes"""
@@ -293,6 +464,11 @@ class FlightSearchView(generics.ListAPIView):
             ('SQ', 'Singapore Airlines')
         ]
 
+        # Route block time, if both cities resolve to airports with coordinates
+        route_minutes = get_route_matrix().block_minutes(self._get_iata_code(departure), self._get_iata_code(arrival))
+        if route_minutes is not None:
+            route_minutes = int(round(route_minutes))
+
         # Generate 5-10 mock flights
         num_flights = random.randint(5, 10)
         flights = []
@@ -306,17 +482,20 @@ class FlightSearchView(generics.ListAPIView):
             dep_minute = random.choice([0, 15, 30, 45])
             departure_time = search_date.replace(hour=dep_hour, minute=dep_minute)
 
-            # Random flight duration between 2 and 12 hours
-            duration_hours = random.randint(2, 12)
-            duration_minutes = random.randint(0, 59)
+            # Random number of stops (0-2)
+            stops = random.randint(0, 2)
+
+            # Block time for the route plus an hour per stop; random 2-12 hours if unknown
+            if route_minutes is not None:
+                total_minutes = route_minutes + 60 * stops
+            else:
+                total_minutes = random.randint(120, 779)
+            duration_hours, duration_minutes = divmod(total_minutes, 60)
             arrival_time = departure_time + timedelta(hours=duration_hours, minutes=duration_minutes)
 
             # Random price between $100 and $1500
             price = round(random.uniform(100, 1500), 2)
 
-            # Random number of stops (0-2)
-            stops = random.randint(0, 2)
-
             flight = {
                 'id': f"mock_{i+1}",
                 'flightNumber': flight_number,
@@ -347,231 +526,7 @@ class FlightSearchView(generics.ListAPIView):
 
     def _map_amadeus_flights(self, amadeus_data):
         """Map Amadeus API response to our flight format"""
-        # Create reverse mapping for IATA to city
-        city_to_iata = {
-            'new york': 'JFK',
-            'nyc': 'JFK',
-            'london': 'LHR',
-            'paris': 'CDG',
-            'tokyo': 'NRT',
-            'los angeles': 'LAX',
-            'la': 'LAX',
-            'chicago': 'ORD',
-            'miami': 'MIA',
-            'san francisco': 'SFO',
-            'sf': 'SFO',
-            'dallas': 'DFW',
-            'atlanta': 'ATL',
-            'denver': 'DEN',
-            'seattle': 'SEA',
-            'boston': 'BOS',
-            'las vegas': 'LAS',
-            'phoenix': 'PHX',
-            'houston': 'IAH',
-            'washington': 'DCA',
-            'dc': 'DCA',
-            'orlando': 'MCO',
-            'charlotte': 'CLT',
-            'salt lake city': 'SLC',
-            'detroit': 'DTW',
-            'minneapolis': 'MSP',
-            'tampa': 'TPA',
-            'philadelphia': 'PHL',
-            'newark': 'EWR',
-            'fort lauderdale': 'FLL',
-            'portland': 'PDX',
-            'oakland': 'OAK',
-            'san diego': 'SAN',
-            'pittsburgh': 'PIT',
-            'raleigh': 'RDU',
-            'austin': 'AUS',
-            'nashville': 'BNA',
-            'indianapolis': 'IND',
-            'cincinnati': 'CVG',
-            'columbus': 'CMH',
-            'cleveland': 'CLE',
-            'milwaukee': 'MKE',
-            'kansas city': 'MCI',
-            'omaha': 'OMA',
-            'wichita': 'ICT',
-            'tulsa': 'TUL',
-            'oklahoma city': 'OKC',
-            'albuquerque': 'ABQ',
-            'reno': 'RNO',
-            'boise': 'BOI',
-            'spokane': 'GEG',
-            'anchorage': 'ANC',
-            'honolulu': 'HNL',
-            'kailua': 'HNL',
-            'lihue': 'LIH',
-            'kahului': 'OGG',
-            'kona': 'KOA',
-            'london heathrow': 'LHR',
-            'london gatwick': 'LGW',
-            'london stansted': 'STN',
-            'london luton': 'LTN',
-            'london city': 'LCY',
-            'paris charles de gaulle': 'CDG',
-            'paris orly': 'ORY',
-            'tokyo haneda': 'HND',
-            'tokyo narita': 'NRT',
-            'berlin': 'BER',
-            'frankfurt': 'FRA',
-            'munich': 'MUC',
-            'rome': 'FCO',
-            'milan': 'MXP',
-            'madrid': 'MAD',
-            'barcelona': 'BCN',
-            'amsterdam': 'AMS',
-            'zurich': 'ZRH',
-            'vienna': 'VIE',
-            'brussels': 'BRU',
-            'copenhagen': 'CPH',
-            'stockholm': 'ARN',
-            'oslo': 'OSL',
-            'helsinki': 'HEL',
-            'warsaw': 'WAW',
-            'prague': 'PRG',
-            'budapest': 'BUD',
-            'bucharest': 'OTP',
-            'sofia': 'SOF',
-            'athens': 'ATH',
-            'istanbul': 'IST',
-            'moscow': 'SVO',
-            'saint petersburg': 'LED',
-            'beijing': 'PEK',
-            'shanghai': 'PVG',
-            'hong kong': 'HKG',
-            'singapore': 'SIN',
-            'bangkok': 'BKK',
-            'kuala lumpur': 'KUL',
-            'jakarta': 'CGK',
-            'manila': 'MNL',
-            'seoul': 'ICN',
-            'taipei': 'TPE',
-            'delhi': 'DEL',
-            'mumbai': 'BOM',
-            'dubai': 'DXB',
-            'abu dhabi': 'AUH',
-            'doha': 'DOH',
-            'kuwait': 'KWI',
-            'riyadh': 'RUH',
-            'jeddah': 'JED',
-            'cairo': 'CAI',
-            'johannesburg': 'JNB',
-            'cape town': 'CPT',
-            'lagos': 'LOS',
-            'nairobi': 'NBO',
-            'addis ababa': 'ADD',
-            'sydney': 'SYD',
-            'melbourne': 'MEL',
-            'brisbane': 'BNE',
-            'perth': 'PER',
-            'auckland': 'AKL',
-            'wellington': 'WLG',
-            'rio de janeiro': 'GIG',
-            'sao paulo': 'GRU',
-            'buenos aires': 'EZE',
-            'lima': 'LIM',
-            'santiago': 'SCL',
-            'bogota': 'BOG',
-            'mexico city': 'MEX',
-            'cancun': 'CUN',
-            'toronto': 'YYZ',
-            'montreal': 'YUL',
-            'vancouver': 'YVR',
-            'calgary': 'YYC',
-            'edmonton': 'YEG',
-            'ottawa': 'YOW',
-            'winnipeg': 'YWG',
-            'quebec city': 'YQB',
-            'halifax': 'YHZ',
-            'victoria': 'YYJ',
-            'regina': 'YQR',
-            'saskatoon': 'YXE',
-            'thunder bay': 'YQT',
-            'sudbury': 'YSB',
-            'london ontario': 'YXU',
-            'hamilton': 'YHM',
-            'kitchener': 'YKF',
-            'london kentucky': 'LOZ',
-            'london arkansas': 'AUK',
-            'london kentucky': 'LOZ',
-            'london arkansas': 'AUK',
-            'london california': 'AON',
-            'london florida': 'LOF',
-            'london indiana': 'LZD',
-            'london iowa': 'LOL',
-            'london kansas': 'LOK',
-            'london maryland': 'W48',
-            'london minnesota': 'D33',
-            'london mississippi': '0R0',
-            'london missouri': '0F7',
-            'london nebraska': '0V3',
-            'london new hampshire': '2B3',
-            'london new york': '0G6',
-            'london north carolina': 'HBI',
-            'london ohio': 'I43',
-            'london oklahoma': 'H76',
-            'london oregon': '8S5',
-            'london pennsylvania': '9G0',
-            'london south carolina': 'HVS',
-            'london tennessee': '0A3',
-            'london texas': '0F2',
-            'london utah': 'U41',
-            'london vermont': '1B1',
-            'london virginia': 'W66',
-            'london washington': '8W2',
-            'london west virginia': '9G3',
-            'london wisconsin': 'H91',
-            'london wyoming': '44U',
-        }
-        iata_to_city = {v: k.title() for k, v in city_to_iata.items()}  # Reverse and title case
-
-        # Safely extract flight offers list from Amadeus API response
-        # Amadeus returns {"data": [...], "meta": {...}} or just [...] depending on endpoint
-        if amadeus_data is None:
-            logger.warning("Amadeus data is None")
-            return []
-        
-        if isinstance(amadeus_data, dict):
-            # Standard Amadeus response format: {"data": [...], ...}
-            flight_offers = amadeus_data.get('data', [])
-            if not isinstance(flight_offers, list):
-                logger.error(f"Unexpected 'data' field type from Amadeus API: {type(flight_offers)}")
-                return []
-        elif isinstance(amadeus_data, list):
-            # Direct list response (some Amadeus endpoints return list directly)
-            flight_offers = amadeus_data
-        else:
-            logger.error(f"Unexpected Amadeus response type: {type(amadeus_data)}")
-            return []
-
-        flights = []
-        for offer in flight_offers[:10]:  # Limit to 10 results
-            try:
-                itinerary = offer['itineraries'][0]
-                segment = itinerary['segments'][0]
-
-                flight = {
-                    'id': offer['id'],
-                    'flightNumber': segment['carrierCode'] + segment['number'],
-                    'from_location': iata_to_city.get(segment['departure']['iataCode'], segment['departure']['iataCode']),
-                    'to': iata_to_city.get(segment['arrival']['iataCode'], segment['arrival']['iataCode']),
-                    'departureTime': segment['departure']['at'],
-                    'arrivalTime': segment['arrival']['at'],
-                    'duration': itinerary['duration'],
-                    'stops': len(itinerary['segments']) - 1,
-                    'price': float(offer['price']['total']),
-                    'currency': offer['price']['currency'],
-                    'airline': segment.get('carrierCode', 'Unknown'),
-                    'status': 'scheduled'  # Default status for scheduled flights
-                }
-                flights.append(flight)
-            except (KeyError, IndexError, ValueError) as e:
-                logger.error(f"Error mapping Amadeus flight data: {e}")
-                continue
-        return flights
+        return map_amadeus_flights(amadeus_data)
 
 class FlightStatusView(generics.RetrieveAPIView):
     serializer_class = FlightSerializer
@@ -640,10 +595,11 @@ class AirportSearchView(generics.ListAPIView):
         if not keyword:
             return Response({'error': 'Keyword is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        airlabs_client = AirLabsClient()
-        airports = airlabs_client.search_airports(keyword, country)
+        airports = airport_autocomplete.get().search(keyword, limit=10, country=country)
         if airports:
-            return Response(airports)
+            return Response({'data': airports})
+        # Unknown locally: let AirLabs fill the index in the background for next time
+        request_enrichment(keyword, country)
         return Response({'error': 'No airports found'}, status=status.HTTP_404_NOT_FOUND)
 
 
@@ -811,6 +767,12 @@ from .serializers import (
 )
 
 
+def vendors_with_products():
+    """Vendors with their owner and products loaded up front instead of per vendor/product."""
+    products = Prefetch('products', queryset=VendorProduct.objects.order_by('id'))
+    return Vendor.objects.select_related('user').prefetch_related(products)
+
+
 class VendorRegisterView(APIView):
     """APIView for registering as a vendor."""
     permission_classes = [IsAuthenticated, IsApprovedUser]
@@ -847,7 +809,7 @@ class VendorProfileView(APIView):
                 'error': 'You do not have a vendor profile'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        vendor = request.user.vendor_profile
+        vendor = vendors_with_products().get(pk=request.user.vendor_profile.pk)
         serializer = VendorSerializer(vendor)
         return Response(serializer.data)
 
@@ -873,11 +835,12 @@ class VendorProductListView(generics.ListCreateAPIView):
     """APIView for listing and creating vendor products."""
     serializer_class = VendorProductSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         if not hasattr(self.request.user, 'vendor_profile'):
             return VendorProduct.objects.none()
-        return VendorProduct.objects.filter(vendor=self.request.user.vendor_profile)
+        return VendorProduct.objects.filter(vendor=self.request.user.vendor_profile).select_related('vendor')
 
     def perform_create(self, serializer):
         if not hasattr(self.request.user, 'vendor_profile'):
@@ -893,7 +856,7 @@ class VendorProductDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         if not hasattr(self.request.user, 'vendor_profile'):
             return VendorProduct.objects.none()
-        return VendorProduct.objects.filter(vendor=self.request.user.vendor_profile)
+        return VendorProduct.objects.filter(vendor=self.request.user.vendor_profile).select_related('vendor')
 
     def perform_update(self, serializer):
         serializer.save(vendor=self.request.user.vendor_profile)
@@ -903,9 +866,10 @@ class PublicVendorListView(generics.ListAPIView):
     """Public APIView for listing approved vendors and their products."""
     serializer_class = VendorSerializer
     permission_classes = [AllowAny]
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
-        queryset = Vendor.objects.filter(is_approved=True)
+        queryset = vendors_with_products().filter(is_approved=True)
         category = self.request.query_params.get('category')
         
         if category:
@@ -919,9 +883,10 @@ class PublicVendorProductsView(generics.ListAPIView):
     """Public APIView for listing products from approved vendors."""
     serializer_class = VendorProductSerializer
     permission_classes = [AllowAny]
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
-        queryset = VendorProduct.objects.filter(vendor__is_approved=True, is_active=True)
+        queryset = VendorProduct.objects.filter(vendor__is_approved=True, is_active=True).select_related('vendor')
         
         category = self.request.query_params.get('category')
         vendor_id = self.request.query_params.get('vendor_id')
@@ -969,17 +934,13 @@ class HotelSearchView(APIView):
             
             # If latitude and longitude are provided, search by geolocation
             if latitude and longitude:
-                hotel_data = amadeus_client.search_hotels_by_geocode(
-                    latitude=latitude,
-                    longitude=longitude,
-                    check_in=check_in_date,
-                    check_out=check_out_date,
-                    guests=int(guests)
+                hotel_data = self._search_hotels_by_geocode(
+                    amadeus_client, latitude, longitude, check_in_date, check_out_date, int(guests)
                 )
             # Otherwise search by city name
             elif location:
                 # Convert city name to IATA code
-                city_iata = get_iata_code(location)
+                city_iata = get_iata_code_fuzzy(location)
                 if not city_iata:
                     # Try to get airport code from iata_utils
                     city_info = get_airport_info(location)
@@ -1018,6 +979,53 @@ class HotelSearchView(APIView):
             fallback_location = location or "your area"
             return Response(self._get_fallback_hotels(fallback_location, check_in_date, check_out_date))
 
+    def _search_hotels_by_geocode(self, amadeus_client, latitude, longitude, check_in, check_out, guests):
+        """
+        Search hotels by coordinates through the geohash cell cache.
+
+        Amadeus is queried once per cell (from its centre, with a radius wide
+        enough to cover the whole cell); offers are then filtered to
+        HOTEL_SEARCH_RADIUS_KM of the exact point.
+        """
+        try:
+            latitude, longitude = float(latitude), float(longitude)
+        except ValueError:
+            latitude = longitude = None
+        if latitude is None or not is_cacheable(latitude, longitude):
+            return amadeus_client.search_hotels_by_geocode(
+                latitude=latitude,
+                longitude=longitude,
+                check_in=check_in,
+                check_out=check_out,
+                guests=guests,
+                radius=HOTEL_SEARCH_RADIUS_KM
+            )
+
+        def fetch(centre_lat, centre_lon, search_radius):
+            return amadeus_client.search_hotels_by_geocode(
+                latitude=round(centre_lat, 5),
+                longitude=round(centre_lon, 5),
+                check_in=check_in,
+                check_out=check_out,
+                guests=guests,
+                radius=math.ceil(search_radius)
+            )
+
+        hotel_data, _ = hotel_geocode_cache.get_or_fetch(
+            latitude, longitude, HOTEL_SEARCH_RADIUS_KM, fetch, check_in, check_out, guests
+        )
+        if not isinstance(hotel_data, dict):
+            return hotel_data
+
+        def in_range(offer):
+            hotel = offer.get('hotel') or {}
+            if hotel.get('latitude') is None or hotel.get('longitude') is None:
+                return True
+            distance = calculate_distance(latitude, longitude, float(hotel['latitude']), float(hotel['longitude']))
+            return distance <= HOTEL_SEARCH_RADIUS_KM
+
+        return {**hotel_data, 'data': [offer for offer in hotel_data.get('data', []) if in_range(offer)]}
+
     def _map_amadeus_hotels(self, amadeus_data):
         """Map Amadeus hotel API response to frontend-friendly format"""
         hotels = []
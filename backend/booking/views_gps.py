@@ -6,11 +6,97 @@ This module provides API endpoints for finding nearby airports based on GPS coor
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from .iata_utils import find_nearby_airports, get_nearest_airport
+from .iata_utils import calculate_distance, find_nearby_airports, get_nearest_airport
+from .airport_snapshot import get_snapshot
+from .geo_cache import is_cacheable, nearby_airports_cache
+from django.conf import settings
+import bisect
 import logging
+from array import array
 
 logger = logging.getLogger(__name__)
 
+# Defaults for the batch endpoint, overridable in settings
+DEFAULT_BATCH_MAX_POINTS = 10000
+DEFAULT_BATCH_MAX_K = 10
+# Defaults for the nearby endpoint, overridable in settings
+DEFAULT_NEARBY_MAX_LIMIT = 50
+DEFAULT_NEARBY_MAX_DISTANCE = 5000
+# Widest radius served through the cell cache; a wider cell holds most of the snapshot
+DEFAULT_NEARBY_CACHE_MAX_DISTANCE = 1000
+# Radii (km) cached cells are fetched for; a search uses the smallest one covering its radius
+NEARBY_CACHE_RADII = (100, 250, 500)
+# Most airports kept per cached cell
+DEFAULT_NEARBY_CACHE_MAX_AIRPORTS = 500
+
+
+def cache_radius(max_distance, cache_max_distance):
+    """Round a search radius up to the cell radius it is served from."""
+    for radius in NEARBY_CACHE_RADII:
+        if max_distance <= radius < cache_max_distance:
+            return radius
+    return cache_max_distance
+
+
+def cached_nearby_airports(latitude, longitude, limit, max_distance):
+    """
+    find_nearby_airports through the geohash cell cache.
+
+    The cell caches the codes of the airports that could be within its radius
+    of any point in it, with their distances from the cell centre, nearest
+    first. Radii are rounded up to a few fixed cell radii so every search
+    shares one entry per cell and step, and the snapshot fingerprint is part
+    of the key so an airport resync never serves old cells. Distances are
+    recomputed for the exact point, stopping once the centre distance minus
+    the cell's reach (a lower bound on the exact distance) cannot beat the
+    current results.
+
+    A cell keeps at most NEARBY_AIRPORTS_CACHE_MAX_AIRPORTS airports; when it
+    was cut short and the kept ones cannot prove the answer, the search runs
+    uncached. Radii above NEARBY_AIRPORTS_CACHE_MAX_DISTANCE skip the cache,
+    since their cells would each hold a large share of every airport.
+    """
+    cache_max_distance = getattr(settings, 'NEARBY_AIRPORTS_CACHE_MAX_DISTANCE', DEFAULT_NEARBY_CACHE_MAX_DISTANCE)
+    if (latitude is None or longitude is None or max_distance > cache_max_distance
+            or not is_cacheable(latitude, longitude)):
+        return find_nearby_airports(latitude, longitude, limit=limit, max_distance=max_distance)
+
+    snapshot = get_snapshot()
+    radius = cache_radius(max_distance, cache_max_distance)
+    max_airports = getattr(settings, 'NEARBY_AIRPORTS_CACHE_MAX_AIRPORTS', DEFAULT_NEARBY_CACHE_MAX_AIRPORTS)
+
+    def fetch(centre_lat, centre_lon, search_radius):
+        nearest = snapshot.spatial_index.nearest(centre_lat, centre_lon, max_airports, search_radius)
+        return {
+            'reach': search_radius - radius,
+            'codes': tuple(code for _, code, _ in nearest),
+            'distances': array('d', (distance for distance, _, _ in nearest)),
+            'truncated': len(nearest) >= max_airports,
+        }
+
+    cell, _ = nearby_airports_cache.get_or_fetch(latitude, longitude, radius, fetch, snapshot.fingerprint[:16])
+    reach = cell['reach']
+    best = []
+    for order, (centre_distance, code) in enumerate(zip(cell['distances'], cell['codes'])):
+        lower_bound = centre_distance - reach
+        if lower_bound > max_distance or (len(best) >= limit and lower_bound > best[-1][0]):
+            break
+        info = snapshot.info(code)
+        distance = calculate_distance(latitude, longitude, info['lat'], info['lon'])
+        if distance <= max_distance:
+            bisect.insort(best, (distance, order, code, info))
+            if len(best) > limit:
+                best.pop()
+    else:
+        if cell['truncated']:
+            # Airports past the last kept one were left out; the kept ones may not be enough
+            return find_nearby_airports(latitude, longitude, limit=limit, max_distance=max_distance)
+    return [
+        {'iataCode': code, 'name': info['name'], 'city': info['city'], 'country': info['country'],
+         'distance': round(distance, 1), 'lat': info['lat'], 'lon': info['lon']}
+        for distance, _, code, info in best
+    ]
+
 
 class NearbyAirportsView(APIView):
     """
@@ -19,8 +105,8 @@ class NearbyAirportsView(APIView):
     GET parameters:
     - latitude: User's latitude
     - longitude: User's longitude  
-    - limit: Maximum number of airports to return (default: 5)
-    - max_distance: Maximum distance in km (default: 500)
+    - limit: Maximum number of airports to return (default: 5, at most 50)
+    - max_distance: Maximum distance in km (default: 500, at most 5000)
     """
     permission_classes = [AllowAny]
 
@@ -33,15 +119,18 @@ class NearbyAirportsView(APIView):
                 'error': 'Valid latitude and longitude are required'
             }, status=400)
 
-        limit = int(request.query_params.get('limit', 5))
-        max_distance = int(request.query_params.get('max_distance', 500))
+        try:
+            limit = int(request.query_params.get('limit', 5))
+            max_distance = int(request.query_params.get('max_distance', 500))
+        except ValueError:
+            return Response({
+                'error': 'limit and max_distance must be integers'
+            }, status=400)
+        # Clamp both: they come from anonymous users and size the cached cell result
+        limit = min(max(limit, 1), getattr(settings, 'NEARBY_AIRPORTS_MAX_LIMIT', DEFAULT_NEARBY_MAX_LIMIT))
+        max_distance = min(max(max_distance, 1), getattr(settings, 'NEARBY_AIRPORTS_MAX_DISTANCE', DEFAULT_NEARBY_MAX_DISTANCE))
 
-        airports = find_nearby_airports(
-            latitude=latitude,
-            longitude=longitude,
-            limit=limit,
-            max_distance=max_distance
-        )
+        airports = cached_nearby_airports(latitude, longitude, limit, max_distance)
 
         return Response({
             'success': True,
@@ -85,3 +174,76 @@ class NearestAirportView(APIView):
                 'error': 'No nearby airport found'
             }, status=404)
 
+
+class NearestAirportBatchView(APIView):
+    """
+    API endpoint to resolve the nearest airports for many GPS coordinates at once.
+
+    POST body:
+    - points: List of [latitude, longitude] pairs or {"latitude", "longitude"} objects
+    - k: Airports to return per point (default: 1)
+    - max_distance: Maximum distance in km (default: 500, null for no limit)
+    """
+    permission_classes = [AllowAny]
+
+    def _parse_points(self, points):
+        latitudes, longitudes = [], []
+        for point in points:
+            if isinstance(point, dict):
+                latitude, longitude = point.get('latitude'), point.get('longitude')
+            elif isinstance(point, (list, tuple)) and len(point) == 2:
+                latitude, longitude = point
+            else:
+                raise ValueError
+            latitude, longitude = float(latitude), float(longitude)
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise ValueError
+            latitudes.append(latitude)
+            longitudes.append(longitude)
+        return latitudes, longitudes
+
+    def post(self, request):
+        points = request.data.get('points')
+        max_points = getattr(settings, 'AIRPORT_BATCH_MAX_POINTS', DEFAULT_BATCH_MAX_POINTS)
+        if not isinstance(points, list) or not points:
+            return Response({'error': 'A non-empty list of points is required'}, status=400)
+        if len(points) > max_points:
+            return Response({'error': f'At most {max_points} points are allowed per request'}, status=400)
+
+        try:
+            latitudes, longitudes = self._parse_points(points)
+            k = int(request.data.get('k', 1))
+            max_distance = request.data.get('max_distance', 500)
+            max_distance = float(max_distance) if max_distance is not None else None
+        except (TypeError, ValueError):
+            return Response({'error': 'Every point needs a valid latitude and longitude'}, status=400)
+        max_k = getattr(settings, 'AIRPORT_BATCH_MAX_K', DEFAULT_BATCH_MAX_K)
+        if not 1 <= k <= max_k:
+            return Response({'error': f'k must be between 1 and {max_k}'}, status=400)
+
+        snapshot = get_snapshot()
+        table = snapshot.table
+        indices, distances = table.nearest(latitudes, longitudes, k=k, max_distance=max_distance)
+
+        codes = table.codes
+        results = []
+        for latitude, longitude, row, row_distances in zip(latitudes, longitudes, indices.tolist(), distances.tolist()):
+            airports = []
+            for index, distance in zip(row, row_distances):
+                if index < 0:
+                    break
+                info = snapshot.info(codes[index])
+                airports.append({
+                    'iataCode': codes[index],
+                    'name': info.get('name', ''),
+                    'city': info.get('city', ''),
+                    'country': info.get('country', ''),
+                    'distance': round(distance, 1),
+                })
+            results.append({'latitude': latitude, 'longitude': longitude, 'airports': airports})
+
+        return Response({
+            'success': True,
+            'data': results,
+            'count': len(results)
+        })
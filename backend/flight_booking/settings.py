@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 import os
 from pathlib import Path
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -155,6 +156,28 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'release-expired-seat-holds': {
+        'task': 'booking.tasks.release_expired_seat_holds',
+        'schedule': 60.0,  # Seconds between expiry sweeps
+    },
+    'rebalance-seat-shards': {
+        'task': 'booking.tasks.rebalance_seat_shards',
+        'schedule': 15.0,  # Seconds between rebalancing sharded seat counters
+    },
+    'reconcile-seat-counters': {
+        'task': 'booking.tasks.reconcile_seat_counters',
+        'schedule': 300.0,  # Seconds between checks of sharded counters against bookings
+    },
+    'fold-booking-stats-deltas': {
+        'task': 'booking.tasks.fold_booking_stats_deltas',
+        'schedule': 60.0,  # Seconds between folds of booking stats deltas into the stats row
+    },
+    'reconcile-booking-stats': {
+        'task': 'booking.tasks.reconcile_booking_stats',
+        'schedule': crontab(hour=3, minute=0),  # Nightly recount of the admin booking stats row
+    },
+}
 
 # Email Configuration (Console backend for development)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -167,15 +190,23 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 # Aviation Stack API Configuration (free API for flight data)
 AVIATIONSTACK_API_KEY = '0670773d74d58859d1dbfa0e1d9e4a8e'
+AVIATIONSTACK_BASE_URL = os.environ.get('AVIATIONSTACK_BASE_URL', 'http://api.aviationstack.com/v1')
 
 
 # Amadeus API Configuration
 AMADEUS_API_KEY = 'tjuAHSp8jfUfuADdv1xcRbpzlHwHA6mR'
 AMADEUS_API_SECRET = 'yAutGkVfnC4PE2uT'
-AMADEUS_BASE_URL = 'https://test.api.amadeus.com'
+AMADEUS_BASE_URL = os.environ.get('AMADEUS_BASE_URL', 'https://test.api.amadeus.com')
 
 # AirLabs API Configuration
 AIRLABS_API_KEY = 'your-airlabs-api-key-here'  # Replace with actual key
+AIRLABS_BASE_URL = os.environ.get('AIRLABS_BASE_URL', 'https://airlabs.co/api/v9')
+
+# OpenSky Network Configuration (no API key required)
+OPENSKY_BASE_URL = os.environ.get('OPENSKY_BASE_URL', 'https://opensky-network.org/api')
+
+# Base URLs can point at the local provider simulator for load tests:
+#   python manage.py run_provider_simulator --port 8099
 
 # CORS Configuration
 CORS_ORIGIN_ALLOW_ALL = True
@@ -218,6 +249,8 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'booking.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
         'rest_framework.throttling.UserRateThrottle',
@@ -275,9 +308,80 @@ else:
         }
     }
 
+# Flight search result cache (stale-while-revalidate)
+SEARCH_CACHE_FRESH_TTL = int(os.environ.get('SEARCH_CACHE_FRESH_TTL', 300))  # Seconds a search is served as fresh
+SEARCH_CACHE_STALE_TTL = int(os.environ.get('SEARCH_CACHE_STALE_TTL', 1800))  # Extra seconds a stale search may be served
+
+# Shared HTTP connection pools for external provider clients
+PROVIDER_HTTP_POOL_CONNECTIONS = 10  # Number of per-host pools kept alive
+PROVIDER_HTTP_POOL_MAXSIZE = 20  # Keep-alive connections per host (>= threads per worker)
+PROVIDER_HTTP_CONNECT_TIMEOUT = 3.05  # Seconds to establish a connection
+PROVIDER_HTTP_READ_TIMEOUT = 30  # Default seconds to wait for a response
+
+# Multi-provider flight search
+FLIGHT_SEARCH_PROVIDERS = ['amadeus', 'aviationstack', 'opensky']  # Also available: 'amadeus_service'
+FLIGHT_SEARCH_DEADLINE = 2.5  # Global deadline in seconds for a fan-out search
+FLIGHT_SEARCH_GRACE_PERIOD = 0.25  # Seconds to wait for slower providers once results have arrived
+FLIGHT_SEARCH_MAX_WORKERS = 16  # Size of the shared provider thread pool
+FLIGHT_SEARCH_MAX_IN_FLIGHT = 4  # Calls one provider may have on the pool at once, so a hanging provider cannot take every worker
+
+# Cross-worker coalescing of identical provider requests
+# (the lock, and the followers' wait, last PROVIDER_HTTP_CONNECT_TIMEOUT + PROVIDER_HTTP_READ_TIMEOUT + 2s)
+SINGLE_FLIGHT_RESULT_TTL = 5  # Seconds the leader's result stays visible to late arrivals
+
+# Per-endpoint provider circuit breakers and adaptive timeouts
+CIRCUIT_BREAKER_FAILURE_RATE = 0.5  # Rolling error ratio that opens a breaker
+CIRCUIT_BREAKER_MIN_REQUESTS = 10  # Requests in the window before the error ratio is trusted
+CIRCUIT_BREAKER_WINDOW = 60  # Rolling window in seconds
+CIRCUIT_BREAKER_BUCKET = 10  # Width of each counting bucket in seconds
+CIRCUIT_BREAKER_COOLDOWN = 30  # Seconds an open breaker waits before a half-open probe
+ADAPTIVE_TIMEOUT_MULTIPLIER = 2.0  # Read timeout = observed p99 * multiplier, capped by the static timeout
+ADAPTIVE_TIMEOUT_FLOOR = 1.0  # Adaptive read timeouts never go below this many seconds
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 20  # Latency samples needed before timeouts adapt
+
+# Client-side provider rate limits (token bucket per provider and API key, shared via Redis)
+PROVIDER_RATE_LIMITS = {
+    'amadeus': {'rate': 10, 'burst': 10},  # Amadeus self-service allows 10 transactions per second
+    'airlabs': {'rate': 1, 'burst': 5},
+    'aviationstack': {'rate': 1, 'burst': 5},
+    'opensky': {'rate': 0.1, 'burst': 10},  # Anonymous OpenSky access has a small daily credit budget
+}
+PROVIDER_RATE_LIMIT_MAX_WAIT = 0.5  # Seconds a call may queue for a token before QuotaExhausted
+
+# Batch nearest-airport endpoint
+AIRPORT_BATCH_MAX_POINTS = 10000  # Coordinates accepted per request
+AIRPORT_BATCH_MAX_K = 10  # Maximum airports returned per coordinate
+
+# Nearby-airport endpoint
+NEARBY_AIRPORTS_MAX_LIMIT = 50  # Larger limits are clamped
+NEARBY_AIRPORTS_MAX_DISTANCE = 5000  # Larger radii (km) are clamped
+NEARBY_AIRPORTS_CACHE_MAX_DISTANCE = 1000  # Wider searches (km) bypass the geohash cell cache
+NEARBY_AIRPORTS_CACHE_MAX_AIRPORTS = 500  # Most airports kept per cached cell
+
+# In-process airport autocomplete (AirLabs only enriches it in the background)
+AIRPORT_AUTOCOMPLETE_REFRESH_INTERVAL = 60  # Seconds between checks for newly enriched airports
+AIRPORT_AUTOCOMPLETE_ENRICH_COOLDOWN = 3600  # Seconds before a missed keyword is sent to AirLabs again
+
+# Geohash cell cache for nearby-airport and hotel-by-coordinates searches
+GEO_CACHE_PRECISION = int(os.environ.get('GEO_CACHE_PRECISION', 5))  # Geohash length; 5 is a ~4.9 km cell
+GEO_CACHE_TTL = int(os.environ.get('GEO_CACHE_TTL', 600))  # Seconds a cell's result stays cached
+
+# Precomputed airport-pair distance/block-time matrix (manage.py build_route_matrix)
+ROUTE_MATRIX_DIR = os.environ.get('ROUTE_MATRIX_DIR', os.path.join(BASE_DIR, 'data'))  # Holds route_matrix.npy and its code list
+
+# Streamed admin list/export responses
+STREAMING_CHUNK_SIZE = 2000  # Rows fetched from the database cursor and serialized per step
+
+# Seat holds for unpaid bookings (released by the release_expired_seat_holds beat task)
+SEAT_HOLD_TTL = 900  # Seconds a pending booking keeps its seat while the user pays
+SEAT_HOLD_SWEEP_BATCH_SIZE = 500  # Expired holds released per UPDATE chunk
+
+# Sharded seat counters for hot flights (enabled per flight with the "Shard seat counters" admin action)
+SEAT_COUNTER_SHARDS = 8  # Sub-counters per cabin; bookings pick one at random
+
 # Amadeus Service Configuration
 AMADEUS_TOKEN_CACHE_KEY = 'amadeus_access_token'
-AMADEUS_TOKEN_EXPIRY = 1800  # 30 minutes in seconds
+AMADEUS_TOKEN_EXPIRY = 1800  # 30 minutes in seconds, used when Amadeus omits expires_in
 
 # JWT Configuration
 from datetime import timedelta
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'flight_booking.settings')
 
 application = get_wsgi_application()
+
+# Build the airport snapshot now; under `gunicorn --preload` this runs once in
+# the master and every worker shares the pages after fork.
+from booking.airport_snapshot import preload  # noqa: E402
+
+preload()
@@ -20,7 +20,7 @@ export const fetchBookings = createAsyncThunk(
         throw new Error('Failed to fetch bookings');
       }
       const data = await response.json();
-      return data;
+      return data.results ?? data;
     } catch (error) {
       return rejectWithValue(error.message);
     }
@@ -16,7 +16,8 @@ const TravelInsightsPage = () => {
           headers: { 'Authorization': `Bearer ${token}` }
         });
         if (response.ok) {
-          const bookings = await response.json();
+          const data = await response.json();
+          const bookings = data.results ?? data;
           const history = bookings.map(booking => ({
             id: booking.id,
             destination: booking.flight.arrival,
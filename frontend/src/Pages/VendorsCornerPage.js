@@ -76,25 +76,26 @@ const VendorsCornerPage = () => {
     setLoading(true);
     try {
       const response = await api.get('/vendors/products/public/');
-      setProducts(response.data);
+      const products = response.data.results ?? response.data;
+      setProducts(products);
       // Extract unique vendors from products
       const uniqueVendors = [];
       const vendorMap = new Map();
-      response.data.forEach(product => {
+      products.forEach(product => {
         if (product.vendor_name && !vendorMap.has(product.vendor_name)) {
           vendorMap.set(product.vendor_name, true);
           uniqueVendors.push({
             name: product.vendor_name,
             rating: Math.floor(Math.random() * 20) + 80, // Simulated rating
             reviewCount: Math.floor(Math.random() * 50) + 5,
-            productCount: response.data.filter(p => p.vendor_name === product.vendor_name).length
+            productCount: products.filter(p => p.vendor_name === product.vendor_name).length
           });
         }
       });
       setVendors(uniqueVendors.slice(0, 6)); // Top 6 vendors
       setStats({
         vendors: uniqueVendors.length,
-        products: response.data.length,
+        products: products.length,
         categories: categories.length - 1
       });
     } catch (error) {
@@ -107,7 +108,7 @@ const VendorsCornerPage = () => {
     setLoading(true);
     try {
       const response = await api.get(`/vendors/products/public/?category=${category}`);
-      setProducts(response.data);
+      setProducts(response.data.results ?? response.data);
     } catch (error) {
       console.error('Error fetching products by category:', error);
     }